@@ -1,21 +1,46 @@
 # CalcE/data_manager.py
-import json
 import os
 import traceback
 import uuid
-from datetime import date, datetime
+from datetime import datetime
 from typing import List, Optional, Dict, Any
 from PySide6.QtCore import QObject, Signal
 
-class JSONEncoder(json.JSONEncoder):
-    """自定义JSON编码器，处理datetime和date对象"""
-    def default(self, obj):
-        if isinstance(obj, (datetime, date)):
-            return obj.isoformat()
-        return super().default(obj)
+from data_storage import JSONEncoder, JsonStorage, ShardedJsonStorage, SqliteStorage
+
+
+class ChangeEvent:
+    """
+    细粒度数据变更事件。
+    collection: 集合或文档名（如 "countdowns"、"process_design.equipment"、"settings"）
+    operation: "add" / "update" / "delete"
+    item_id: 条目 ID（文档变更时为 None）
+    fields: 发生变化的字段名元组（add/delete 时为空）
+    item: 变更后的条目或文档（delete 时为 None）
+    """
+    __slots__ = ("collection", "operation", "item_id", "fields", "item")
+
+    def __init__(self, collection, operation, item_id=None, fields=(), item=None):
+        self.collection = collection
+        self.operation = operation
+        self.item_id = item_id
+        self.fields = tuple(fields)
+        self.item = item
+
+    def __repr__(self):
+        return (f"ChangeEvent({self.collection!r}, {self.operation!r}, "
+                f"item_id={self.item_id!r}, fields={self.fields!r})")
+
+
+def _changed_fields(old, new):
+    """比较两个字典，返回值不同的字段名"""
+    old = old if isinstance(old, dict) else {}
+    new = new if isinstance(new, dict) else {}
+    return tuple(k for k in {**old, **new} if old.get(k) != new.get(k))
+
 
 class DataManager(QObject):
-    """数据管理类，负责JSON文件的读写 - 单例模式"""
+    """数据管理类，负责数据的读写 - 单例模式。实际存储由 data_storage 中的后端完成"""
     
     # 单例实例
     _instance = None
@@ -23,6 +48,11 @@ class DataManager(QObject):
     
     # 定义信号
     data_changed = Signal(str)  # 数据变更信号，参数为变更的数据类型
+    item_changed = Signal(object)  # 细粒度变更信号，参数为 ChangeEvent
+
+    # 存储后端："sharded"（默认，按集合分片的 JSON 目录）、"json"（单文件）或 "sqlite"；
+    # 也可通过环境变量 CALCE_STORAGE 指定
+    STORAGE_BACKEND = "sharded"
     
     def __new__(cls, data_file=None):
         """单例模式的 __new__ 方法"""
@@ -37,15 +67,33 @@ class DataManager(QObject):
             return
             
         super().__init__()
+
+        backend = os.environ.get("CALCE_STORAGE", self.STORAGE_BACKEND).lower()
         
         # 如果没有指定数据文件，使用默认路径
         if data_file is None:
             data_file = self._get_default_data_file_path()
         
-        self.data_file = data_file
-        print(f"数据文件路径: {self.data_file}")
-        self.data = self._load_or_create_data()
+        # 分片目录 / SQLite 数据库与旧版 JSON 文件放在同一目录，首次打开时导入旧文件
+        legacy_json = data_file if data_file.endswith(".json") else None
+        if backend == "sqlite":
+            data_file = os.path.splitext(data_file)[0] + ".db"
+            self.data_file = data_file
+            print(f"数据文件路径: {self.data_file}")
+            self._storage = SqliteStorage(data_file, self.get_default_data, legacy_json=legacy_json)
+        elif backend == "sharded":
+            data_file = os.path.splitext(data_file)[0]
+            self.data_file = data_file
+            print(f"数据目录路径: {self.data_file}")
+            self._storage = ShardedJsonStorage(data_file, self.get_default_data, legacy_json=legacy_json)
+        else:
+            self.data_file = data_file
+            print(f"数据文件路径: {self.data_file}")
+            self._storage = JsonStorage(data_file, self.get_default_data)
         
+        # 变更订阅：集合名 -> 回调列表
+        self._subscribers = {}
+
         DataManager._initialized = True
     
     @classmethod
@@ -72,149 +120,91 @@ class DataManager(QObject):
         except Exception:
             # 如果 Qt 不可用，使用当前目录
             return os.path.join(os.path.abspath("."), "CalcE_data.json")
-    
-    def _load_or_create_data(self):
-        """加载或创建数据文件"""
-        # 如果文件存在，尝试加载
-        if os.path.exists(self.data_file):
-            try:
-                with open(self.data_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    print("数据文件加载成功")
-                    
-                    # 迁移旧版本的工程信息数据
-                    data = self._migrate_project_info_data(data)
-                    
-                    # 确保 process_design 数据结构存在且包含 msds_documents
-                    data = self._ensure_process_design_data(data)
-                    
-                    # 确保设备数据结构存在
-                    data = self._ensure_equipment_data(data)
-                    
-                    return data
-            except (json.JSONDecodeError, FileNotFoundError, Exception) as e:
-                print(f"加载数据文件失败: {e}")
-        
-        # 如果文件不存在或加载失败，创建默认数据
-        print("创建默认数据文件")
-        default_data = self.get_default_data()
-        self._save_data(default_data)
-        return default_data
-    
-    def _migrate_project_info_data(self, data):
-        """迁移旧版本的工程信息数据"""
-        if "project_info" in data:
-            old_info = data["project_info"]
-            new_info = {}
-            
-            # 迁移公司名称（从旧的设计单位）
-            if "design_unit" in old_info:
-                new_info["company_name"] = old_info["design_unit"]
-            else:
-                new_info["company_name"] = ""
-                
-            # 迁移工程编号（从旧的项目名称或空）
-            if "project_name" in old_info:
-                # 如果旧的项目名称看起来像是一个编号，可以作为工程编号
-                if any(char.isdigit() for char in old_info["project_name"]):
-                    new_info["project_number"] = old_info["project_name"]
-                else:
-                    new_info["project_number"] = ""
-                new_info["project_name"] = old_info["project_name"]
-            else:
-                new_info["project_number"] = ""
-                new_info["project_name"] = ""
-                
-            # 子项名称默认为空
-            new_info["subproject_name"] = ""
-            
-            # 保留计算人员和审核人员到自定义字段（如果需要）
-            if "calculator" in old_info:
-                data["_old_calculator"] = old_info["calculator"]
-            if "reviewer" in old_info:
-                data["_old_reviewer"] = old_info["reviewer"]
-                
-            data["project_info"] = new_info
-            
-            print("已迁移工程信息数据到新格式")
-            
-        return data
-    
-    def _ensure_process_design_data(self, data):
-        """确保 process_design 数据结构完整"""
-        if "process_design" not in data:
-            data["process_design"] = {
-                "projects": [],
-                "materials": [],
-                "equipment": [],
-                "msds_documents": [],
-                "streams": []
-            }
+
+    @property
+    def data(self):
+        """
+        完整数据树。JSON 后端返回内存中的实时数据，分片后端返回按需加载分片的字典视图
+        （修改后需调用 _save_data）；SQLite 后端返回只读快照，修改请使用对应的 add/update 方法。
+        """
+        return self._storage.to_dict()
+    
+    def _save_data(self):
+        """通知后端数据树已被直接修改，由后端安排持久化；SQLite 后端无法保存直接修改，返回 False"""
+        return self._storage.mark_dirty()
+
+    def flush(self):
+        """立即把未写盘的修改同步写入（退出、备份前调用）"""
+        return self._storage.flush()
+
+    def backup(self, path):
+        """把当前数据完整复制到 path"""
+        self._storage.backup(path)
+
+    def close(self):
+        self._storage.close()
+
+    # ==================== 变更订阅 ====================
+    def subscribe(self, collections, callback):
+        """
+        订阅指定集合的变更，callback(event: ChangeEvent)。
+        collections 可为单个名称或列表；订阅 "process_design" 同时收到其下所有集合的变更。
+        callback 为 QObject 的方法时，对象销毁后自动取消订阅。
+        """
+        if isinstance(collections, str):
+            collections = [collections]
+        for name in collections:
+            callbacks = self._subscribers.setdefault(name, [])
+            if callback not in callbacks:
+                callbacks.append(callback)
+
+        owner = getattr(callback, "__self__", None)
+        if isinstance(owner, QObject):
+            owner.destroyed.connect(lambda *_: self.unsubscribe(callback))
+        return callback
+
+    def unsubscribe(self, callback, collections=None):
+        """取消订阅；collections 为空时从所有集合中移除"""
+        if isinstance(collections, str):
+            collections = [collections]
+        for name in list(collections or self._subscribers):
+            callbacks = self._subscribers.get(name)
+            if callbacks and callback in callbacks:
+                callbacks.remove(callback)
+                if not callbacks:
+                    del self._subscribers[name]
+
+    def _notify(self, collection, operation, item_id=None, fields=(), item=None):
+        """发送细粒度事件、通知订阅者，并保持原有的 data_changed 信号"""
+        event = ChangeEvent(collection, operation, item_id, fields, item)
+        parts = collection.split(".")
+        names = [".".join(parts[:i]) for i in range(len(parts), 0, -1)]
+        for name in names:
+            for callback in list(self._subscribers.get(name, ())):
+                try:
+                    callback(event)
+                except Exception as e:
+                    print(f"变更回调执行失败 {collection}: {e}")
+                    traceback.print_exc()
+        self.item_changed.emit(event)
+        self.data_changed.emit(collection)
+        return event
+
+    def _set_document(self, name, value):
+        """写入文档并发送 update 事件（字段为发生变化的键）"""
+        old = self._storage.get_document(name)
+        if old is value:
+            # 调用方原地修改了同一个对象，旧值已不可知
+            fields = tuple(value) if isinstance(value, dict) else ()
         else:
-            # 确保 msds_documents 字段存在
-            if "msds_documents" not in data["process_design"]:
-                data["process_design"]["msds_documents"] = []
-            
-            # 确保所有必要的字段都存在
-            required_fields = ["projects", "materials", "equipment", "msds_documents", "streams"]
-            for field in required_fields:
-                if field not in data["process_design"]:
-                    data["process_design"][field] = []
-        
-        return data
-    
-    def _ensure_equipment_data(self, data):
-        """确保设备数据结构存在"""
-        # 检查是否有独立的 equipment 数据，如果有则合并到 process_design 中
-        if "equipment" in data and "process_design" in data:
-            # 合并独立的 equipment 数据到 process_design.equipment
-            for eq in data.get("equipment", []):
-                # 检查是否已存在于 process_design.equipment 中
-                eq_id = eq.get('equipment_id')
-                found = False
-                for existing_eq in data["process_design"].get("equipment", []):
-                    if existing_eq.get('equipment_id') == eq_id:
-                        found = True
-                        break
-                if not found:
-                    data["process_design"].setdefault("equipment", []).append(eq)
-            
-            # 移除独立的 equipment 字段
-            if "equipment" in data:
-                del data["equipment"]
-                print("已合并独立的设备数据到 process_design.equipment")
-        
-        # 确保 process_design.equipment 存在
-        if "process_design" not in data:
-            data["process_design"] = {}
-        
-        if "equipment" not in data["process_design"]:
-            data["process_design"]["equipment"] = []
-        
-        return data
-    
-    def _save_data(self, data=None):
-        """保存数据到文件"""
-        if data is None:
-            data = self.data
-        
-        try:
-            # 确保目录存在
-            os.makedirs(os.path.dirname(self.data_file), exist_ok=True)
-            
-            # 使用自定义编码器处理datetime对象
-            with open(self.data_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=4, cls=JSONEncoder)
-            print("数据保存成功")
-            return True
-        except Exception as e:
-            print(f"保存数据失败: {e}")
-            return False
+            fields = _changed_fields(old, value)
+        self._storage.set_document(name, value)
+        self._notify(name, "update", fields=fields, item=value)
 
     # ==================== 工程信息存储方法（新格式）====================
     def get_project_info(self):
         """获取工程信息（新格式）"""
-        return self.data.get("project_info", {
+        return self._storage.get_document("project_info", {
             "company_name": "",
             "project_number": "",
             "project_name": "",
@@ -234,23 +224,19 @@ class DataManager(QObject):
         # 合并默认值和提供的值
         merged_info = {**default_info, **project_info}
         
-        self.data["project_info"] = merged_info
-        if self._save_data():
-            self.data_changed.emit("project_info")
-            print(f"工程信息已保存: {merged_info}")
+        self._set_document("project_info", merged_info)
+        print(f"工程信息已保存: {merged_info}")
         return True
     
     # ==================== 报告计数器相关方法 ====================
     def get_report_counter(self):
         """获取通用的报告计数器"""
-        return self.data.get("report_counter", {})
+        return self._storage.get_document("report_counter", {})
     
     def update_report_counter(self, counter):
         """更新通用的报告计数器"""
-        self.data["report_counter"] = counter
-        if self._save_data():
-            self.data_changed.emit("report_counter")
-            print(f"报告计数器已更新: {counter}")
+        self._set_document("report_counter", counter)
+        print(f"报告计数器已更新: {counter}")
         return True
     
     def get_next_report_number(self, prefix="PD"):
@@ -276,20 +262,18 @@ class DataManager(QObject):
     # ==================== 设置相关方法 ====================
     def get_settings(self):
         """获取设置"""
-        return self.data.get("settings", {})
+        return self._storage.get_document("settings", {})
     
     def update_settings(self, settings):
         """更新设置"""
-        self.data["settings"] = settings
-        if self._save_data():
-            self.data_changed.emit("settings")
-            print("设置已更新")
+        self._set_document("settings", settings)
+        print("设置已更新")
         return True
     
     # ==================== 设备相关方法 ====================
     def get_equipment_data(self) -> List[Dict]:
         """获取所有设备数据"""
-        return self.data.get("process_design", {}).get("equipment", [])
+        return self._storage.items("process_design.equipment")
     
     def add_equipment(self, equipment_data: Dict) -> bool:
         """添加设备"""
@@ -325,27 +309,20 @@ class DataManager(QObject):
             # 更新更新时间
             equipment_data['updated_at'] = datetime.now().isoformat()
             
-            # 获取设备列表
-            equipment_list = self.data.setdefault("process_design", {}).setdefault("equipment", [])
-            
-            # 检查是否已存在
+            # 已存在则更新，否则添加
             eq_id = equipment_data['equipment_id']
-            existing_idx = -1
-            for i, eq in enumerate(equipment_list):
-                if eq.get("equipment_id") == eq_id:
-                    existing_idx = i
-                    break
-            
-            if existing_idx >= 0:
-                # 更新现有设备
-                equipment_list[existing_idx] = equipment_data
+            old = self._storage.get("process_design.equipment", eq_id)
+            old = dict(old) if old is not None else None
+            if self._storage.put("process_design.equipment", eq_id, equipment_data):
                 print(f"更新设备: {eq_id}")
+                self._notify("process_design.equipment", "update", eq_id,
+                             _changed_fields(old, equipment_data), equipment_data)
             else:
-                # 添加新设备
-                equipment_list.append(equipment_data)
+                self._storage.add("process_design.equipment", equipment_data)
                 print(f"添加设备: {eq_id}")
+                self._notify("process_design.equipment", "add", eq_id, item=equipment_data)
             
-            return self._save_data()
+            return True
         except Exception as e:
             print(f"添加设备失败: {e}")
             traceback.print_exc()
@@ -354,19 +331,22 @@ class DataManager(QObject):
     def update_equipment(self, equipment_id: str, update_data: Dict) -> bool:
         """更新设备"""
         try:
-            equipment_list = self.get_equipment_data()
-            for i, eq in enumerate(equipment_list):
-                if eq.get("equipment_id") == equipment_id:
-                    # 合并数据
-                    equipment_list[i].update(update_data)
-                    # 更新更新时间
-                    equipment_list[i]["updated_at"] = datetime.now().isoformat()
-                    
-                    print(f"更新设备: {equipment_id}")
-                    return self._save_data()
+            equipment = self._storage.get("process_design.equipment", equipment_id)
+            if equipment is None:
+                print(f"设备未找到: {equipment_id}")
+                return False
+
+            # 合并数据
+            old = dict(equipment)
+            equipment.update(update_data)
+            # 更新更新时间
+            equipment["updated_at"] = datetime.now().isoformat()
+            self._storage.put("process_design.equipment", equipment_id, equipment)
             
-            print(f"设备未找到: {equipment_id}")
-            return False
+            print(f"更新设备: {equipment_id}")
+            self._notify("process_design.equipment", "update", equipment_id,
+                         _changed_fields(old, equipment), equipment)
+            return True
         except Exception as e:
             print(f"更新设备失败: {e}")
             return False
@@ -374,12 +354,10 @@ class DataManager(QObject):
     def delete_equipment(self, equipment_id: str) -> bool:
         """删除设备"""
         try:
-            equipment_list = self.get_equipment_data()
-            for i, eq in enumerate(equipment_list):
-                if eq.get("equipment_id") == equipment_id:
-                    del equipment_list[i]
-                    print(f"删除设备: {equipment_id}")
-                    return self._save_data()
+            if self._storage.delete("process_design.equipment", equipment_id):
+                print(f"删除设备: {equipment_id}")
+                self._notify("process_design.equipment", "delete", equipment_id)
+                return True
             
             print(f"设备未找到: {equipment_id}")
             return False
@@ -389,57 +367,49 @@ class DataManager(QObject):
     
     def get_equipment_by_id(self, equipment_id: str) -> Optional[Dict]:
         """根据ID获取设备"""
-        for eq in self.get_equipment_data():
-            if eq.get("equipment_id") == equipment_id:
-                return eq
-        return None
+        return self._storage.get("process_design.equipment", equipment_id)
     
     def get_equipment_by_unique_code(self, unique_code: str) -> Optional[Dict]:
         """根据唯一编码获取设备"""
-        for eq in self.get_equipment_data():
-            if eq.get("unique_code") == unique_code:
-                return eq
-        return None
+        return self._storage.find("process_design.equipment", "unique_code", unique_code)
     
     # ==================== 物料名称映射相关方法 ====================
     def get_equipment_name_mapping(self):
         """获取设备名称对照表"""
-        return self.data.get("equipment_name_mapping", {})
+        return self._storage.get_document("equipment_name_mapping", {})
 
     def add_equipment_name_mapping(self, chinese_name, english_name):
         """添加设备名称对照"""
-        mapping = self.data.setdefault("equipment_name_mapping", {})
+        mapping = dict(self.get_equipment_name_mapping())
         mapping[chinese_name] = english_name
-        if self._save_data():
-            self.data_changed.emit("equipment_name_mapping")
+        self._set_document("equipment_name_mapping", mapping)
         return True
 
     def remove_equipment_name_mapping(self, chinese_name):
         """移除设备名称对照"""
-        if "equipment_name_mapping" in self.data:
-            if chinese_name in self.data["equipment_name_mapping"]:
-                del self.data["equipment_name_mapping"][chinese_name]
-                if self._save_data():
-                    self.data_changed.emit("equipment_name_mapping")
-                return True
+        mapping = dict(self.get_equipment_name_mapping())
+        if chinese_name in mapping:
+            del mapping[chinese_name]
+            self._set_document("equipment_name_mapping", mapping)
+            return True
         return False
 
     def get_english_name(self, chinese_name):
         """根据中文名称获取英文名称"""
-        mapping = self.data.get("equipment_name_mapping", {})
+        mapping = self.get_equipment_name_mapping()
         return mapping.get(chinese_name, "")
 
     # ==================== 物料相关方法 ====================
     def get_materials(self) -> List[Dict]:
         """获取所有物料数据"""
-        return self.data.get("process_design", {}).get("materials", [])
+        return self._storage.items("process_design.materials")
     
     def add_material(self, material_data: Dict) -> bool:
         """添加物料"""
         try:
-            materials_list = self.data.setdefault("process_design", {}).setdefault("materials", [])
-            materials_list.append(material_data)
-            return self._save_data()
+            self._storage.add("process_design.materials", material_data)
+            self._notify("process_design.materials", "add", material_data.get("material_id"), item=material_data)
+            return True
         except Exception as e:
             print(f"添加物料失败: {e}")
             return False
@@ -447,14 +417,14 @@ class DataManager(QObject):
     # ==================== MSDS相关方法 ====================
     def get_msds_documents(self) -> List[Dict]:
         """获取所有MSDS文档"""
-        return self.data.get("process_design", {}).get("msds_documents", [])
+        return self._storage.items("process_design.msds_documents")
     
     def add_msds_document(self, msds_data: Dict) -> bool:
         """添加MSDS文档"""
         try:
-            msds_list = self.data.setdefault("process_design", {}).setdefault("msds_documents", [])
-            msds_list.append(msds_data)
-            return self._save_data()
+            self._storage.add("process_design.msds_documents", msds_data)
+            self._notify("process_design.msds_documents", "add", msds_data.get("msds_id"), item=msds_data)
+            return True
         except Exception as e:
             print(f"添加MSDS文档失败: {e}")
             return False
@@ -462,14 +432,14 @@ class DataManager(QObject):
     # ==================== 项目相关方法 ====================
     def get_projects(self) -> List[Dict]:
         """获取所有项目数据"""
-        return self.data.get("process_design", {}).get("projects", [])
+        return self._storage.items("process_design.projects")
     
     def add_project(self, project_data: Dict) -> bool:
         """添加项目"""
         try:
-            projects_list = self.data.setdefault("process_design", {}).setdefault("projects", [])
-            projects_list.append(project_data)
-            return self._save_data()
+            self._storage.add("process_design.projects", project_data)
+            self._notify("process_design.projects", "add", project_data.get("id"), item=project_data)
+            return True
         except Exception as e:
             print(f"添加项目失败: {e}")
             return False
@@ -477,52 +447,57 @@ class DataManager(QObject):
     # ==================== 通用CRUD操作方法 ====================
     def _add_item(self, data_key, item_data, id_field="id"):
         """通用添加项目方法"""
-        items = self.data.setdefault(data_key, [])
         if id_field not in item_data:
             item_data[id_field] = self._get_next_id(data_key)
-        items.append(item_data)
-        if self._save_data():
-            self.data_changed.emit(data_key)
-            print(f"成功添加项目到 {data_key}: {item_data}")
-        else:
-            print(f"保存数据失败")
+        self._storage.add(data_key, item_data)
+        self._notify(data_key, "add", item_data[id_field], item=item_data)
+        print(f"成功添加项目到 {data_key}: {item_data}")
         return item_data
     
     def _update_item(self, data_key, item_id, updates, id_field="id"):
         """通用更新项目方法"""
-        for item in self.data.get(data_key, []):
-            if item.get(id_field) == item_id:
-                for key, value in updates.items():
-                    item[key] = value
-                if self._save_data():
-                    self.data_changed.emit(data_key)
-                return True
-        return False
+        item = self._storage.get(data_key, item_id, id_field)
+        if not isinstance(item, dict):
+            return False
+        old = dict(item)
+        for key, value in updates.items():
+            item[key] = value
+        self._storage.put(data_key, item_id, item, id_field)
+        self._notify(data_key, "update", item_id, _changed_fields(old, item), item)
+        return True
     
     def _delete_item(self, data_key, item_id, id_field="id"):
         """通用删除项目方法"""
-        self.data[data_key] = [
-            item for item in self.data.get(data_key, []) 
-            if item.get(id_field) != item_id
-        ]
-        if self._save_data():
-            self.data_changed.emit(data_key)
+        if self._storage.delete(data_key, item_id, id_field):
+            self._notify(data_key, "delete", item_id)
     
     def _get_items(self, data_key):
         """通用获取项目列表方法"""
-        return self.data.get(data_key, [])
+        return self._storage.items(data_key)
     
     def _get_next_id(self, data_key):
-        """获取下一个可用的ID"""
-        items = self.data.get(data_key, [])
-        if not items:
-            return 1
-        return max(item.get("id", 0) for item in items) + 1
+        """获取下一个可用的ID（按集合记录已分配的最大ID，不再扫描列表）"""
+        counters = self._storage.get_document("id_counters", {})
+        next_id = counters.get(data_key)
+        if next_id is None:
+            # 首次分配：从现有条目初始化
+            next_id = max(
+                (item["id"] for item in self._storage.items(data_key)
+                 if isinstance(item, dict) and isinstance(item.get("id"), int)),
+                default=0,
+            )
+        next_id += 1
+        # 跳过外部显式写入的 ID（走 ID 索引）
+        while self._storage.get(data_key, next_id, "id") is not None:
+            next_id += 1
+        counters[data_key] = next_id
+        self._storage.set_document("id_counters", counters)
+        return next_id
     
     # ==================== 文件夹相关方法 ====================
     def get_folders(self):
         """获取所有文件夹"""
-        folders_data = self.data.get("folders", [])
+        folders_data = self._storage.items("folders")
         
         # 处理不同类型的数据结构
         if not folders_data:
@@ -549,42 +524,38 @@ class DataManager(QObject):
             "created_at": datetime.now().isoformat()
         }
         result = self._add_item("folders", folder, id_field="name")
-        
-        if result:
-            self.data_changed.emit("folders")
-            return True
-        return False
+        return bool(result)
     
     def delete_folder(self, folder_name):
         """删除文件夹"""
-        self.data["folders"] = [
-            folder for folder in self.data.get("folders", []) 
-            if folder.get("name") != folder_name
-        ]
-        
-        if self._save_data():
-            self.data_changed.emit("folders")
+        if self._storage.delete("folders", folder_name, "name"):
+            self._notify("folders", "delete", folder_name)
         return True
     
     def rename_folder(self, old_name, new_name):
         """重命名文件夹"""
         # 检查新名称是否已存在
-        if new_name in [folder.get("name") for folder in self.data.get("folders", [])]:
+        if new_name in self.get_folders():
             return False
         
         # 更新文件夹名称
-        for folder in self.data.get("folders", []):
-            if folder.get("name") == old_name:
+        folder = self._storage.get("folders", old_name, "name")
+        if folder is not None:
+            if isinstance(folder, dict):
                 folder["name"] = new_name
-                break
-        
-        if self._save_data():
-            self.data_changed.emit("folders")
+            else:
+                folder = new_name
+            self._storage.put("folders", old_name, folder, "name")
+            self._notify("folders", "update", old_name, ("name",), folder)
         return True
 
     # ==================== 倒计时相关方法 ====================
     def get_countdowns(self):
         return self._get_items("countdowns")
+
+    def get_countdown(self, countdown_id):
+        """按 ID 获取倒计时（走 ID 索引）"""
+        return self._storage.get("countdowns", countdown_id)
     
     def add_countdown(self, name, target_date, target_time="23:59"):
         countdown = {
@@ -742,17 +713,14 @@ class DataManager(QObject):
     def save_flow_diagram(self, diagram_data: dict) -> bool:
         """保存工艺流程图数据"""
         try:
-            # 确保 process_design 数据结构存在
-            if "process_design" not in self.data:
-                self.data["process_design"] = {}
-            
             # 保存流程图数据
-            self.data["process_design"]["flow_diagram"] = diagram_data
+            self._storage.set_document("process_design.flow_diagram", diagram_data)
             
             # 保存更新时间
-            self.data["process_design"]["flow_diagram_updated"] = datetime.now().isoformat()
+            self._storage.set_document("process_design.flow_diagram_updated", datetime.now().isoformat())
+            self._notify("process_design.flow_diagram", "update", item=diagram_data)
             
-            return self._save_data()
+            return True
         except Exception as e:
             print(f"保存工艺流程图数据失败: {e}")
             return False
@@ -761,7 +729,7 @@ class DataManager(QObject):
         """加载工艺流程图数据"""
         try:
             # 获取流程图数据
-            diagram_data = self.data.get("process_design", {}).get("flow_diagram", {})
+            diagram_data = self._storage.get_document("process_design.flow_diagram", {})
             
             # 如果没有数据，返回空结构
             if not diagram_data:
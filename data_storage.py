@@ -0,0 +1,901 @@
+# CalcE/data_storage.py
+"""
+DataManager 存储后端。
+- JsonStorage：单个 JSON 文件，整体加载到内存，修改后防抖合并写入
+- ShardedJsonStorage：每个集合/文档一个 JSON 分片，首次访问时加载，只重写修改过的分片（默认）
+- SqliteStorage：嵌入式 SQLite，每个集合一张表，按条目读写，启动时不加载全部数据
+集合名使用点号表示嵌套路径，如 "process_design.equipment"。
+"""
+import abc
+import atexit
+import json
+import os
+import shutil
+import sqlite3
+from collections.abc import MutableMapping
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+
+from PySide6.QtCore import QTimer
+
+from startup_trace import startup_trace
+
+# 列表型集合 -> 条目 ID 字段
+COLLECTIONS = {
+    "countdowns": "id",
+    "custom_countdown_buttons": "id",
+    "folders": "name",
+    "process_design.projects": "id",
+    "process_design.materials": "material_id",
+    "process_design.equipment": "equipment_id",
+    "process_design.msds_documents": "msds_id",
+    "process_design.streams": "id",
+}
+
+# 除 ID 外需要建立索引的字段
+INDEXED_FIELDS = {
+    "process_design.equipment": ("unique_code",),
+}
+
+# 按子键拆分存储的顶层字典（其余顶层键整体作为一个集合或文档）
+NESTED_DOCUMENTS = ("process_design",)
+
+
+class JSONEncoder(json.JSONEncoder):
+    """自定义JSON编码器，处理datetime和date对象"""
+    def default(self, obj):
+        if isinstance(obj, (datetime, date)):
+            return obj.isoformat()
+        return super().default(obj)
+
+
+def item_key(item, id_field):
+    """条目的 ID（旧版文件夹数据为纯字符串，字符串本身即 ID）"""
+    if isinstance(item, dict):
+        return item.get(id_field)
+    return item
+
+
+# ==================== 旧版 JSON 数据迁移 ====================
+
+def _migrate_project_info(data):
+    """迁移旧版本的工程信息数据"""
+    if "project_info" in data:
+        old_info = data["project_info"]
+        new_info = {}
+
+        # 迁移公司名称（从旧的设计单位）
+        if "design_unit" in old_info:
+            new_info["company_name"] = old_info["design_unit"]
+        else:
+            new_info["company_name"] = ""
+
+        # 迁移工程编号（从旧的项目名称或空）
+        if "project_name" in old_info:
+            # 如果旧的项目名称看起来像是一个编号，可以作为工程编号
+            if any(char.isdigit() for char in old_info["project_name"]):
+                new_info["project_number"] = old_info["project_name"]
+            else:
+                new_info["project_number"] = ""
+            new_info["project_name"] = old_info["project_name"]
+        else:
+            new_info["project_number"] = ""
+            new_info["project_name"] = ""
+
+        # 子项名称默认为空
+        new_info["subproject_name"] = ""
+
+        # 保留计算人员和审核人员到自定义字段（如果需要）
+        if "calculator" in old_info:
+            data["_old_calculator"] = old_info["calculator"]
+        if "reviewer" in old_info:
+            data["_old_reviewer"] = old_info["reviewer"]
+
+        data["project_info"] = new_info
+
+        print("已迁移工程信息数据到新格式")
+
+    return data
+
+
+def _ensure_process_design(data):
+    """确保 process_design 数据结构完整，并合并旧版独立的 equipment 数据"""
+    process_design = data.setdefault("process_design", {})
+    for field in ("projects", "materials", "equipment", "msds_documents", "streams"):
+        process_design.setdefault(field, [])
+
+    if "equipment" in data:
+        existing = {eq.get("equipment_id") for eq in process_design["equipment"]}
+        for eq in data.pop("equipment") or []:
+            if eq.get("equipment_id") not in existing:
+                process_design["equipment"].append(eq)
+                existing.add(eq.get("equipment_id"))
+        print("已合并独立的设备数据到 process_design.equipment")
+
+    return data
+
+
+def migrate_legacy_data(data):
+    """把旧版 JSON 数据整理为当前结构（加载旧文件和导入分片/SQLite 时使用）"""
+    data = _migrate_project_info(data)
+    data = _ensure_process_design(data)
+    return data
+
+
+def split_tree(data):
+    """把完整数据树拆成 (名称, 值)，NESTED_DOCUMENTS 按子键拆分为 "父.子" """
+    for key, value in data.items():
+        if key in NESTED_DOCUMENTS and isinstance(value, dict):
+            for sub_key, sub_value in value.items():
+                yield f"{key}.{sub_key}", sub_value
+        else:
+            yield key, value
+
+
+# ==================== 集合索引 ====================
+
+class CollectionIndex:
+    """单个集合的哈希索引：字段值 -> 第一个匹配条目在列表中的位置"""
+
+    def __init__(self, fields, items=()):
+        self.fields = fields
+        self._by_field = {field: {} for field in fields}
+        self._values = {}  # 位置 -> 各索引字段的值，用于替换条目时撤销旧值
+        for pos, item in enumerate(items):
+            self.insert(item, pos)
+
+    def insert(self, item, pos):
+        values = tuple(item_key(item, field) for field in self.fields)
+        self._values[pos] = values
+        for field, value in zip(self.fields, values):
+            if value is not None:
+                self._by_field[field].setdefault(value, pos)
+
+    def remove(self, pos):
+        for field, value in zip(self.fields, self._values.pop(pos, ())):
+            if self._by_field[field].get(value) == pos:
+                del self._by_field[field][value]
+
+    def lookup(self, field, value):
+        return self._by_field[field].get(value)
+
+
+# ==================== 后端接口 ====================
+
+class StorageBackend(abc.ABC):
+    """存储后端接口。集合条目为 dict（旧版文件夹可为字符串），文档为任意 JSON 值"""
+
+    @abc.abstractmethod
+    def items(self, collection):
+        """集合的全部条目"""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def get(self, collection, key, id_field=None):
+        """按 ID 获取条目，不存在时返回 None"""
+        raise NotImplementedError
+
+    def find(self, collection, field, value):
+        """按任意字段查找第一个匹配的条目（INDEXED_FIELDS 中的字段走索引）"""
+        for item in self.items(collection):
+            if isinstance(item, dict) and item.get(field) == value:
+                return item
+        return None
+
+    @abc.abstractmethod
+    def add(self, collection, item):
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def put(self, collection, key, item, id_field=None):
+        """替换指定 ID 的条目，不存在时返回 False"""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def delete(self, collection, key, id_field=None):
+        """删除指定 ID 的全部条目，返回是否有删除"""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def get_document(self, name, default=None):
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def set_document(self, name, value):
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def delete_document(self, name):
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def to_dict(self):
+        """完整数据树（兼容旧代码直接访问 DataManager.data）"""
+        raise NotImplementedError
+
+    def mark_dirty(self):
+        """数据树被直接修改后调用，安排持久化；返回修改能否被保存"""
+        return True
+
+    def flush(self):
+        """把未写盘的修改同步写入"""
+        return True
+
+    @abc.abstractmethod
+    def backup(self, path):
+        raise NotImplementedError
+
+    def close(self):
+        self.flush()
+
+    @staticmethod
+    def _id_field(collection, id_field=None):
+        return id_field or COLLECTIONS.get(collection, "id")
+
+
+# ==================== JSON 单文件 ====================
+
+class JsonStorage(StorageBackend):
+    """整个数据树保存在一个 JSON 文件中，修改后防抖合并，后台线程原子写入"""
+
+    # 修改后延迟写盘的时间（毫秒），期间的多次修改合并为一次写入
+    SAVE_DEBOUNCE_MS = 500
+
+    def __init__(self, path, default_factory):
+        self.path = path
+
+        # 延迟合并写入：修改只标记脏状态，防抖到期后在后台线程写盘
+        self._dirty = False
+        self._pending_write = None
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="DataManagerWriter")
+        self._save_timer = QTimer()
+        self._save_timer.setSingleShot(True)
+        self._save_timer.timeout.connect(self._flush_async)
+        atexit.register(self.flush)
+
+        # 集合索引：collection -> {字段: {值: 条目在列表中的位置}}，首次查找时建立
+        self._indexes = {}
+
+        self.data = self._load_or_create(default_factory)
+
+    def _load_or_create(self, default_factory):
+        """加载或创建数据文件"""
+        # 如果文件存在，尝试加载
+        if os.path.exists(self.path):
+            try:
+                with startup_trace.span("DataManager", "load", "data"), \
+                        open(self.path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                    print("数据文件加载成功")
+                    return migrate_legacy_data(data)
+            except (json.JSONDecodeError, FileNotFoundError, Exception) as e:
+                print(f"加载数据文件失败: {e}")
+
+        # 如果文件不存在或加载失败，创建默认数据
+        print("创建默认数据文件")
+        data = default_factory()
+        self._write_file(self._serialize(data))
+        return data
+
+    # ------------------------------------------------------------------ 路径
+
+    def _container(self, name, create):
+        """返回 (父字典, 末级键)；create=False 且路径不存在时返回 (None, 键)"""
+        parts = name.split(".")
+        node = self.data
+        for part in parts[:-1]:
+            child = node.get(part)
+            if not isinstance(child, dict):
+                if not create:
+                    return None, parts[-1]
+                child = node[part] = {}
+            node = child
+        return node, parts[-1]
+
+    def _list(self, collection, create=False):
+        parent, key = self._container(collection, create)
+        if parent is None:
+            return []
+        if create:
+            return parent.setdefault(key, [])
+        return parent.get(key, [])
+
+    # ------------------------------------------------------------------ 索引
+
+    def _index(self, collection):
+        """集合索引，首次使用时建立"""
+        index = self._indexes.get(collection)
+        if index is None:
+            id_field = self._id_field(collection)
+            fields = (id_field,) + tuple(f for f in INDEXED_FIELDS.get(collection, ()) if f != id_field)
+            index = self._indexes[collection] = CollectionIndex(fields, self._list(collection))
+        return index
+
+    def _position(self, collection, key, field):
+        """条目位置；字段没有索引时退回线性查找"""
+        items = self._list(collection)
+        index = self._index(collection)
+        if field not in index.fields:
+            for pos, item in enumerate(items):
+                if item_key(item, field) == key:
+                    return pos
+            return None
+        pos = index.lookup(field, key)
+        if pos is not None and (pos >= len(items) or item_key(items[pos], field) != key):
+            # 条目被外部直接修改过，重建索引
+            self._indexes.pop(collection, None)
+            pos = self._index(collection).lookup(field, key)
+        return pos
+
+    # ------------------------------------------------------------------ 集合
+
+    def items(self, collection):
+        return self._list(collection)
+
+    def get(self, collection, key, id_field=None):
+        pos = self._position(collection, key, self._id_field(collection, id_field))
+        return None if pos is None else self._list(collection)[pos]
+
+    def find(self, collection, field, value):
+        pos = self._position(collection, value, field)
+        return None if pos is None else self._list(collection)[pos]
+
+    def add(self, collection, item):
+        items = self._list(collection, create=True)
+        items.append(item)
+        index = self._indexes.get(collection)
+        if index is not None:
+            index.insert(item, len(items) - 1)
+        self._schedule_save(collection)
+
+    def put(self, collection, key, item, id_field=None):
+        pos = self._position(collection, key, self._id_field(collection, id_field))
+        if pos is None:
+            return False
+        self._list(collection)[pos] = item
+        index = self._indexes.get(collection)
+        if index is not None:
+            index.remove(pos)
+            index.insert(item, pos)
+        self._schedule_save(collection)
+        return True
+
+    def delete(self, collection, key, id_field=None):
+        id_field = self._id_field(collection, id_field)
+        if self._position(collection, key, id_field) is None:
+            return False
+        items = self._list(collection)
+        items[:] = [item for item in items if item_key(item, id_field) != key]
+        # 删除后位置整体移动，下次查找时重建
+        self._indexes.pop(collection, None)
+        self._schedule_save(collection)
+        return True
+
+    # ------------------------------------------------------------------ 文档
+
+    def get_document(self, name, default=None):
+        parent, key = self._container(name, create=False)
+        if parent is None:
+            return default
+        return parent.get(key, default)
+
+    def set_document(self, name, value):
+        parent, key = self._container(name, create=True)
+        parent[key] = value
+        self._drop_indexes(name)
+        self._schedule_save(name)
+
+    def delete_document(self, name):
+        parent, key = self._container(name, create=False)
+        if parent is not None and key in parent:
+            del parent[key]
+            self._drop_indexes(name)
+            self._schedule_save(name)
+
+    def _drop_indexes(self, name):
+        """文档覆盖了某个集合（或其上级）时丢弃对应索引"""
+        for collection in list(self._indexes):
+            if collection == name or collection.startswith(name + "."):
+                del self._indexes[collection]
+
+    def to_dict(self):
+        return self.data
+
+    # ------------------------------------------------------------------ 持久化
+
+    def mark_dirty(self):
+        # 数据树被外部直接修改，索引可能失效
+        self._indexes.clear()
+        self._schedule_save()
+        return True
+
+    def _schedule_save(self, name=None):
+        """name 为被修改的集合/文档，None 表示未知（整体）"""
+        self._dirty = True
+        self._save_timer.start(self.SAVE_DEBOUNCE_MS)
+
+    @staticmethod
+    def _serialize(data):
+        """紧凑格式序列化（使用自定义编码器处理datetime对象）"""
+        return json.dumps(data, ensure_ascii=False, separators=(",", ":"), cls=JSONEncoder)
+
+    def _write_file(self, text, path=None):
+        """原子写入：先写临时文件并落盘，再用 os.replace 替换，避免崩溃时留下半个文件"""
+        path = path or self.path
+        try:
+            # 确保目录存在
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+            tmp_file = f"{path}.tmp"
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                f.write(text)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_file, path)
+            print("数据保存成功")
+            return True
+        except Exception as e:
+            print(f"保存数据失败: {e}")
+            return False
+
+    def _write_files(self, writes):
+        """依次写入 [(路径, 文本)]；文本为 None 表示删除该文件"""
+        ok = True
+        for path, text in writes:
+            if text is not None:
+                ok = self._write_file(text, path) and ok
+            elif os.path.exists(path):
+                os.remove(path)
+        return ok
+
+    def _take_writes(self):
+        """在界面线程序列化待写入的数据并清除脏标记"""
+        if not self._dirty:
+            return []
+        self._dirty = False
+        return [(self.path, self._serialize(self.data))]
+
+    def _flush_async(self):
+        """防抖到期：在界面线程序列化快照，交给写盘线程"""
+        writes = self._take_writes()
+        if writes:
+            self._pending_write = self._writer.submit(self._write_files, writes)
+
+    def flush(self):
+        try:
+            self._save_timer.stop()
+        except RuntimeError:
+            # 退出阶段 Qt 对象可能已销毁
+            pass
+        if self._pending_write is not None:
+            self._pending_write.result()
+            self._pending_write = None
+        return self._write_files(self._take_writes())
+
+    def backup(self, path):
+        self.flush()
+        shutil.copy2(self.path, path)
+
+
+# ==================== JSON 分片 ====================
+
+class ShardedJsonStorage(JsonStorage):
+    """
+    数据目录下每个集合/文档一个 JSON 分片（如 countdowns.json、process_design.msds_documents.json）。
+    分片在首次访问时才解析，修改只重写对应分片；目录中的 _meta.json 标记迁移已完成。
+    """
+
+    META_FILE = "_meta.json"
+    FORMAT_VERSION = 1
+
+    def __init__(self, path, default_factory, legacy_json=None):
+        self._legacy_json = legacy_json
+        self._shards = {}           # 已加载的分片：名称 -> 值
+        self._shard_names = set()   # 磁盘上已有的分片
+        self._dirty_shards = set()
+        super().__init__(path, default_factory)
+
+    def _shard_path(self, name, directory=None):
+        return os.path.join(directory or self.path, f"{name}.json")
+
+    def _load_or_create(self, default_factory):
+        """首次使用时从旧版单文件迁移，之后只列出分片，不解析内容"""
+        if not os.path.exists(os.path.join(self.path, self.META_FILE)):
+            shards = self._migrate(default_factory)
+            if shards is not None:
+                self._shards = shards
+                return LazyDataTree(self)
+        self._shard_names = {
+            f[:-len(".json")] for f in os.listdir(self.path)
+            if f.endswith(".json") and f != self.META_FILE
+        }
+        return LazyDataTree(self)
+
+    def _migrate(self, default_factory):
+        """
+        把旧版 CalcE_data.json 拆分为分片（旧文件保留不动），没有旧文件时写入默认数据。
+        有分片写入失败时不提交迁移，返回内存中的分片供本次运行使用，否则返回 None
+        """
+        data = None
+        if self._legacy_json and os.path.exists(self._legacy_json):
+            try:
+                with startup_trace.span("DataManager", "migrate", "data"), \
+                        open(self._legacy_json, "r", encoding="utf-8") as f:
+                    data = migrate_legacy_data(json.load(f))
+                print(f"已拆分旧版数据文件: {self._legacy_json}")
+            except (OSError, json.JSONDecodeError) as e:
+                print(f"拆分旧版数据文件失败: {e}")
+        if data is None:
+            print("创建默认数据文件")
+            data = default_factory()
+
+        # 先写到临时目录，全部完成后整体替换，中途失败下次启动会重新迁移
+        tmp_dir = f"{self.path}.tmp"
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        os.makedirs(tmp_dir)
+        shards = dict(split_tree(data))
+        meta = {"version": self.FORMAT_VERSION, "source": self._legacy_json}
+        # _meta.json 最后写入，且只在所有分片都写成功后写入
+        ok = (self._write_files([(self._shard_path(name, tmp_dir), self._serialize(value))
+                                 for name, value in shards.items()])
+              and self._write_file(self._serialize(meta), os.path.join(tmp_dir, self.META_FILE)))
+        if not ok:
+            print("数据分片写入失败，本次使用内存中的数据，下次启动时重新迁移")
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            return shards
+        if os.path.exists(self.path):
+            shutil.rmtree(self.path)
+        os.replace(tmp_dir, self.path)
+        return None
+
+    def _load_shard(self, name):
+        if name in self._shards or name not in self._shard_names:
+            return
+        try:
+            with startup_trace.span(f"DataManager.{name}", "load", "data"), \
+                    open(self._shard_path(name), "r", encoding="utf-8") as f:
+                self._shards[name] = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"加载数据分片失败 {name}: {e}")
+
+    def _container(self, name, create):
+        """每个分片直接以名称为键挂在 self._shards 下"""
+        self._load_shard(name)
+        return self._shards, name
+
+    def _known_names(self):
+        return self._shard_names | set(self._shards)
+
+    # ------------------------------------------------------------------ 持久化
+
+    def _schedule_save(self, name=None):
+        # 名称未知时（数据树被直接修改）重写所有已加载的分片
+        self._dirty_shards.update([name] if name else self._shards)
+        self._save_timer.start(self.SAVE_DEBOUNCE_MS)
+
+    def _take_writes(self):
+        writes = []
+        for name in self._dirty_shards:
+            if name in self._shards:
+                writes.append((self._shard_path(name), self._serialize(self._shards[name])))
+                self._shard_names.add(name)
+            else:
+                writes.append((self._shard_path(name), None))
+                self._shard_names.discard(name)
+        self._dirty_shards.clear()
+        return writes
+
+    def backup(self, path):
+        self.flush()
+        shutil.copytree(self.path, path)
+
+
+class LazyDataTree(MutableMapping):
+    """分片数据的字典视图（兼容 DataManager.data），取值时才加载对应分片"""
+
+    def __init__(self, storage, prefix=""):
+        self._storage = storage
+        self._prefix = prefix
+
+    def _children(self):
+        children = set()
+        for name in self._storage._known_names():
+            if name.startswith(self._prefix):
+                children.add(name[len(self._prefix):].split(".", 1)[0])
+        return children
+
+    def _is_nested(self, full):
+        return full in NESTED_DOCUMENTS or any(n.startswith(full + ".") for n in self._storage._known_names())
+
+    def __contains__(self, key):
+        # 只检查分片是否存在，不触发加载
+        return key in self._children()
+
+    def __getitem__(self, key):
+        full = self._prefix + key
+        if full in self._storage._known_names():
+            self._storage._load_shard(full)
+            if full in self._storage._shards:
+                return self._storage._shards[full]
+        elif self._is_nested(full):
+            return LazyDataTree(self._storage, full + ".")
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        full = self._prefix + key
+        if isinstance(value, dict) and self._is_nested(full):
+            for sub_key, sub_value in value.items():
+                self._storage.set_document(f"{full}.{sub_key}", sub_value)
+        else:
+            self._storage.set_document(full, value)
+
+    def __delitem__(self, key):
+        full = self._prefix + key
+        names = [n for n in self._storage._known_names() if n == full or n.startswith(full + ".")]
+        if not names:
+            raise KeyError(key)
+        for name in names:
+            self._storage.delete_document(name)
+
+    def __iter__(self):
+        return iter(sorted(self._children()))
+
+    def __len__(self):
+        return len(self._children())
+
+
+# ==================== SQLite ====================
+
+class SqliteStorage(StorageBackend):
+    """
+    每个集合一张表 (seq, item_key, body)，条目以 JSON 保存；非列表数据保存在 documents 表。
+    每次修改立即提交（WAL + synchronous=NORMAL，提交不做 fsync），无需整体重写。
+    """
+
+    PRAGMAS = (
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        "PRAGMA foreign_keys=ON",
+    )
+
+    def __init__(self, path, default_factory, legacy_json=None):
+        self.path = path
+        self._default_factory = default_factory
+        self._legacy_json = legacy_json
+        self._tables = set()
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path)
+        for pragma in self.PRAGMAS:
+            self._conn.execute(pragma)
+        with startup_trace.span("DataManager", "load", "data"):
+            self._migrate()
+        self._tables.update(
+            r[0] for r in self._conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+        )
+
+    # ------------------------------------------------------------------ 迁移
+
+    def _migrate(self):
+        """按 PRAGMA user_version 依次执行未完成的迁移"""
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        for target, migration in enumerate(self.MIGRATIONS, start=1):
+            if version >= target:
+                continue
+            with self._conn:
+                migration(self)
+                self._conn.execute(f"PRAGMA user_version = {target}")
+            print(f"数据库迁移完成: v{target}")
+
+    def _migration_v1_schema(self):
+        """v1：创建文档表和已知集合表"""
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS documents (
+                name TEXT PRIMARY KEY,
+                body TEXT NOT NULL
+            )
+        """)
+        for collection in COLLECTIONS:
+            self._create_table(collection)
+
+    def _migration_v2_import(self):
+        """v2：导入旧版 JSON 数据文件（经过旧版结构迁移），没有旧文件时写入默认数据"""
+        data = None
+        if self._legacy_json and os.path.exists(self._legacy_json):
+            try:
+                with open(self._legacy_json, "r", encoding="utf-8") as f:
+                    data = migrate_legacy_data(json.load(f))
+                print(f"已导入旧版数据文件: {self._legacy_json}")
+            except (OSError, json.JSONDecodeError) as e:
+                print(f"导入旧版数据文件失败: {e}")
+        if data is None:
+            data = self._default_factory()
+        self._import_tree(data)
+
+    def _migration_v3_field_indexes(self):
+        """v3：为 INDEXED_FIELDS 建立表达式索引"""
+        for collection in INDEXED_FIELDS:
+            self._create_field_indexes(collection, self._existing_table(collection) or self._create_table(collection))
+
+    MIGRATIONS = [_migration_v1_schema, _migration_v2_import, _migration_v3_field_indexes]
+
+    def _import_tree(self, data):
+        """把数据树写入表：已知集合及其他列表写入集合表，其余写入文档表"""
+        for name, value in split_tree(data):
+            if name in COLLECTIONS or isinstance(value, list):
+                for item in value:
+                    self._insert(name, item)
+            else:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO documents (name, body) VALUES (?, ?)",
+                    (name, self._encode(value)),
+                )
+
+    # ------------------------------------------------------------------ 表
+
+    @staticmethod
+    def _table(collection):
+        return "c_" + collection.replace(".", "__")
+
+    def _create_table(self, collection):
+        table = self._table(collection)
+        self._conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS "{table}" (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                item_key TEXT,
+                body TEXT NOT NULL
+            )
+        """)
+        self._conn.execute(f'CREATE INDEX IF NOT EXISTS "{table}_key" ON "{table}"(item_key)')
+        self._create_field_indexes(collection, table)
+        self._tables.add(table)
+        return table
+
+    def _create_field_indexes(self, collection, table):
+        for field in INDEXED_FIELDS.get(collection, ()):
+            self._conn.execute(
+                f'CREATE INDEX IF NOT EXISTS "{table}_{field}" ON "{table}"({self._field_expr(field)})'
+            )
+
+    @staticmethod
+    def _field_expr(field):
+        """json_extract 表达式，查询与索引必须使用完全相同的写法才能命中表达式索引"""
+        return f"json_extract(body, '$.\"{field}\"')"
+
+    def _existing_table(self, collection):
+        table = self._table(collection)
+        return table if table in self._tables else None
+
+    @staticmethod
+    def _encode(value):
+        return json.dumps(value, ensure_ascii=False, separators=(",", ":"), cls=JSONEncoder)
+
+    @staticmethod
+    def _key_text(key):
+        return None if key is None else str(key)
+
+    def _insert(self, collection, item):
+        table = self._existing_table(collection) or self._create_table(collection)
+        key = item_key(item, self._id_field(collection))
+        self._conn.execute(
+            f'INSERT INTO "{table}" (item_key, body) VALUES (?, ?)',
+            (self._key_text(key), self._encode(item)),
+        )
+
+    def _key_clause(self, collection, id_field):
+        """注册的 ID 字段走 item_key 索引，其他字段用 json_extract"""
+        if id_field == COLLECTIONS.get(collection, "id"):
+            return "item_key = ?", self._key_text
+        return f"{self._field_expr(id_field)} = ?", (lambda k: k)
+
+    # ------------------------------------------------------------------ 集合
+
+    def items(self, collection):
+        table = self._existing_table(collection)
+        if table is None:
+            return []
+        return [json.loads(r[0]) for r in self._conn.execute(f'SELECT body FROM "{table}" ORDER BY seq')]
+
+    def get(self, collection, key, id_field=None):
+        table = self._existing_table(collection)
+        if table is None:
+            return None
+        clause, convert = self._key_clause(collection, self._id_field(collection, id_field))
+        row = self._conn.execute(
+            f'SELECT body FROM "{table}" WHERE {clause} ORDER BY seq LIMIT 1', (convert(key),)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def find(self, collection, field, value):
+        table = self._existing_table(collection)
+        if table is None:
+            return None
+        row = self._conn.execute(
+            f'SELECT body FROM "{table}" WHERE {self._field_expr(field)} = ? ORDER BY seq LIMIT 1',
+            (value,),
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def add(self, collection, item):
+        with self._conn:
+            self._insert(collection, item)
+
+    def put(self, collection, key, item, id_field=None):
+        table = self._existing_table(collection)
+        if table is None:
+            return False
+        id_field = self._id_field(collection, id_field)
+        clause, convert = self._key_clause(collection, id_field)
+        with self._conn:
+            row = self._conn.execute(
+                f'SELECT seq FROM "{table}" WHERE {clause} ORDER BY seq LIMIT 1', (convert(key),)
+            ).fetchone()
+            if row is None:
+                return False
+            self._conn.execute(
+                f'UPDATE "{table}" SET item_key = ?, body = ? WHERE seq = ?',
+                (self._key_text(item_key(item, COLLECTIONS.get(collection, "id"))), self._encode(item), row[0]),
+            )
+        return True
+
+    def delete(self, collection, key, id_field=None):
+        table = self._existing_table(collection)
+        if table is None:
+            return False
+        clause, convert = self._key_clause(collection, self._id_field(collection, id_field))
+        with self._conn:
+            cur = self._conn.execute(f'DELETE FROM "{table}" WHERE {clause}', (convert(key),))
+        return cur.rowcount > 0
+
+    # ------------------------------------------------------------------ 文档
+
+    def get_document(self, name, default=None):
+        row = self._conn.execute("SELECT body FROM documents WHERE name = ?", (name,)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def set_document(self, name, value):
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO documents (name, body) VALUES (?, ?)", (name, self._encode(value))
+            )
+
+    def delete_document(self, name):
+        with self._conn:
+            self._conn.execute("DELETE FROM documents WHERE name = ?", (name,))
+
+    def to_dict(self):
+        """从各表重建完整数据树（只读快照，修改不会写回数据库）"""
+        data = {}
+        for name, body in self._conn.execute("SELECT name, body FROM documents"):
+            self._set_path(data, name, json.loads(body))
+        for table in sorted(self._tables):
+            if table.startswith("c_"):
+                collection = table[2:].replace("__", ".")
+                self._set_path(data, collection, self.items(collection))
+        return data
+
+    def mark_dirty(self):
+        """to_dict 返回的是快照，直接修改无法写回数据库"""
+        print("SQLite 存储不支持直接修改数据树，修改未保存；请使用对应的 add/update/delete 方法")
+        return False
+
+    @staticmethod
+    def _set_path(data, name, value):
+        parts = name.split(".")
+        node = data
+        for part in parts[:-1]:
+            node = node.setdefault(part, {})
+        node[parts[-1]] = value
+
+    # ------------------------------------------------------------------ 持久化
+
+    def backup(self, path):
+        """使用 SQLite 在线备份接口复制数据库"""
+        dst = sqlite3.connect(path)
+        try:
+            self._conn.backup(dst)
+        finally:
+            dst.close()
+
+    def close(self):
+        self._conn.close()
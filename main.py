@@ -21,7 +21,8 @@ from PySide6.QtGui import QAction, QFont, QDesktopServices
 
 from data_manager import DataManager
 from theme_manager import ThemeManager
-from module_loader import ModuleLoader
+from module_loader import ModuleLoader, DeferredModuleWidget
+from startup_trace import startup_trace, StartupBudgetExceeded
 
 # 配置日志：输出到控制台 + 写入文件
 _log_dir = os.path.join(os.path.expanduser("~"), ".calce", "logs")
@@ -47,6 +48,10 @@ class CalcE(QMainWindow):
         ("modules.countdowns", "CountdownsWidget", "倒计时"),
     ]
 
+    # 延迟加载：启动时只构建当前可见的标签页，其余在切换时或窗口显示后空闲时构建
+    DEFERRED_LOADING = True
+    DEFERRED_IDLE_MS = 300  # 首次绘制后开始后台构建剩余标签页的延迟（毫秒）
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("CalcE - 个人生产力工具")
@@ -55,11 +60,13 @@ class CalcE(QMainWindow):
         self.theme_manager = ThemeManager()
         self.data_manager = DataManager.get_instance()
         self.modules = {}          # tab_name -> widget
-        self._module_status = {}   # tab_name -> bool (加载成功与否)
+        self._module_status = {}   # tab_name -> bool (加载成功与否)，None 表示尚未加载
 
         self._setup_ui()
         self._load_settings()
-        logger.info("CalcE 启动成功，加载模块数: {}", len(self.modules))
+        logger.info("CalcE 启动成功，加载模块数: {}/{}", len(self.modules), len(self._module_status))
+        if not self.DEFERRED_LOADING:
+            QTimer.singleShot(0, self._finish_startup_trace)
 
     # ------------------------------------------------------------------ UI
 
@@ -80,6 +87,9 @@ class CalcE(QMainWindow):
         self.theme_manager.theme_changed.connect(self._apply_theme)
 
     def _create_modules(self):
+        if self.DEFERRED_LOADING:
+            self._create_deferred_modules()
+            return
         for module_file, class_name, tab_name in self.MODULES_CONFIG:
             try:
                 widget = ModuleLoader.load_module(module_file, class_name, self, self.data_manager)
@@ -93,6 +103,57 @@ class CalcE(QMainWindow):
                 self.tab_widget.addTab(error_widget, tab_name)
                 self._module_status[tab_name] = False
 
+    def _create_deferred_modules(self):
+        """为每个标签页放置占位部件，仅构建当前可见的标签页"""
+        for module_file, class_name, tab_name in self.MODULES_CONFIG:
+            placeholder = ModuleLoader.load_deferred(module_file, class_name, self, self.data_manager, tab_name)
+            placeholder.loaded.connect(lambda widget, ok, name=tab_name: self._on_module_loaded(name, widget, ok))
+            self.tab_widget.addTab(placeholder, tab_name)
+            self._module_status[tab_name] = None
+
+        self._load_tab(self.tab_widget.currentIndex())
+
+        # 窗口首次绘制后，利用空闲时间逐个构建剩余标签页
+        self._deferred_timer = QTimer(self)
+        self._deferred_timer.setSingleShot(True)
+        self._deferred_timer.timeout.connect(self._load_next_deferred)
+        self._deferred_timer.start(self.DEFERRED_IDLE_MS)
+
+    def _load_tab(self, index):
+        """构建指定标签页的真实模块（已构建则直接返回）"""
+        widget = self.tab_widget.widget(index)
+        if isinstance(widget, DeferredModuleWidget):
+            return widget.load()
+        return widget
+
+    def _load_next_deferred(self):
+        """空闲时构建下一个尚未加载的标签页，每次只构建一个以保持界面响应"""
+        for i in range(self.tab_widget.count()):
+            widget = self.tab_widget.widget(i)
+            if isinstance(widget, DeferredModuleWidget) and not widget.is_loaded:
+                widget.load()
+                self._deferred_timer.start(0)
+                return
+        self._finish_startup_trace()
+
+    def _finish_startup_trace(self):
+        """所有标签页构建完成后输出启动追踪报告，严格模式下超出预算则退出"""
+        if startup_trace.finished:
+            return
+        try:
+            startup_trace.finish()
+        except StartupBudgetExceeded as e:
+            logger.critical("{}", e)
+            QApplication.exit(1)
+
+    def _on_module_loaded(self, tab_name, widget, ok):
+        self._module_status[tab_name] = ok
+        if ok:
+            self.modules[tab_name] = widget
+            logger.info("模块加载成功: {}", tab_name)
+        else:
+            logger.error("模块加载失败: {}", tab_name)
+
     # ------------------------------------------------------------------ 菜单
 
     def _setup_menu(self):
@@ -113,6 +174,14 @@ class CalcE(QMainWindow):
             act.triggered.connect(lambda checked, n=name: self.theme_manager.set_theme(n))
             theme_menu.addAction(act)
 
+        # 设置菜单
+        settings_menu = menubar.addMenu("设置")
+        self.steam_table_act = QAction("水蒸气物性查表计算", self)
+        self.steam_table_act.setCheckable(True)
+        self.steam_table_act.setStatusTip("蒸汽管道、管网等扫描计算改用预计算物性网格（首次启用时后台生成，约 10 s）")
+        self.steam_table_act.toggled.connect(self._set_steam_table_mode)
+        settings_menu.addAction(self.steam_table_act)
+
         # 帮助菜单
         help_menu = menubar.addMenu("帮助")
         self._add_action(help_menu, "用户手册", self._show_user_manual)
@@ -156,6 +225,7 @@ class CalcE(QMainWindow):
     def _load_settings(self):
         settings = self.data_manager.get_settings()
         self.theme_manager.set_theme(settings.get("theme", "light"))
+        self.steam_table_act.setChecked(settings.get("steam_table", False))
         QApplication.setFont(QFont("Microsoft YaHei", 10))
         self.tab_widget.setFont(QFont("Microsoft YaHei", 12, QFont.Bold))
 
@@ -164,7 +234,7 @@ class CalcE(QMainWindow):
     def _on_tab_changed(self, index):
         if index >= 0:
             self.statusBar().showMessage(f"当前标签页: {self.tab_widget.tabText(index)}", 3000)
-            widget = self.tab_widget.widget(index)
+            widget = self._load_tab(index)
             if hasattr(widget, "on_activate"):
                 widget.on_activate()
 
@@ -176,6 +246,18 @@ class CalcE(QMainWindow):
         self.data_manager.update_settings(settings)
         logger.info("主题切换为: {}", theme_name)
 
+    def _set_steam_table_mode(self, enabled):
+        """切换水蒸气物性计算模式；启用查表时在后台线程加载物性网格，加载完成前仍按精确计算"""
+        from thermo import steam_table
+        steam_table.set_mode(steam_table.TABLE if enabled else steam_table.EXACT)
+        if enabled:
+            steam_table.preload()
+        settings = self.data_manager.get_settings()
+        if settings.get("steam_table", False) != enabled:
+            settings["steam_table"] = enabled
+            self.data_manager.update_settings(settings)
+        logger.info("水蒸气物性计算模式: {}", steam_table.get_mode())
+
     # ------------------------------------------------------------------ 功能
 
     def _refresh_all_modules(self):
@@ -190,15 +272,15 @@ class CalcE(QMainWindow):
         QMessageBox.information(self, "刷新完成", f"已刷新 {count} 个模块")
 
     def _backup_data(self):
-        import shutil
         src = self.data_manager.data_file
         if not os.path.exists(src):
             QMessageBox.warning(self, "备份失败", "数据文件不存在")
             return
         ts = datetime.now().strftime("%Y%m%d_%H%M%S")
-        dst = src.replace(".json", f"_backup_{ts}.json")
+        base, ext = os.path.splitext(src)
+        dst = f"{base}_backup_{ts}{ext}"
         try:
-            shutil.copy2(src, dst)
+            self.data_manager.backup(dst)
             logger.info("数据备份成功: {}", dst)
             QMessageBox.information(self, "备份成功", f"数据已备份至:\n{dst}")
         except Exception as e:
@@ -208,6 +290,8 @@ class CalcE(QMainWindow):
     def closeEvent(self, event):
         if hasattr(self, "_time_timer"):
             self._time_timer.stop()
+        if hasattr(self, "_deferred_timer"):
+            self._deferred_timer.stop()
         for name, widget in self.modules.items():
             if hasattr(widget, "save_data"):
                 try:
@@ -215,9 +299,15 @@ class CalcE(QMainWindow):
                 except Exception as e:
                     logger.error("保存模块数据失败: {} | {}", name, e)
         try:
-            self.data_manager._save_data()
+            self.data_manager.flush()
         except Exception as e:
             logger.error("主数据保存失败: {}", e)
+        try:
+            from modules.history_db import HistoryDB
+            if HistoryDB._instance is not None:
+                HistoryDB().close()
+        except Exception as e:
+            logger.error("历史数据库关闭失败: {}", e)
         logger.info("CalcE 正常退出")
         event.accept()
 
@@ -319,8 +409,15 @@ A: 结果仅供参考，实际工程须由专业工程师审核确认。<br><br>
         data_file = self.data_manager.data_file
         file_info = ""
         if os.path.exists(data_file):
-            sz = os.path.getsize(data_file)
-            mt = datetime.fromtimestamp(os.path.getmtime(data_file)).strftime("%Y-%m-%d %H:%M:%S")
+            # 分片存储时 data_file 为目录，大小和修改时间按目录内的文件统计
+            if os.path.isdir(data_file):
+                files = [os.path.join(data_file, f) for f in os.listdir(data_file)]
+                files = [f for f in files if os.path.isfile(f)]
+            else:
+                files = [data_file]
+            sz = sum(os.path.getsize(f) for f in files)
+            mtime = max((os.path.getmtime(f) for f in files), default=os.path.getmtime(data_file))
+            mt = datetime.fromtimestamp(mtime).strftime("%Y-%m-%d %H:%M:%S")
             file_info = f"- 数据文件：{data_file}<br>- 文件大小：{sz} 字节 ({sz/1024:.1f} KB)<br>- 最后修改：{mt}<br>"
         loaded = sum(1 for ok in self._module_status.values() if ok)
         total = len(self._module_status)
@@ -353,7 +450,8 @@ A: 结果仅供参考，实际工程须由专业工程师审核确认。<br><br>
         log_file = os.path.join(log_dir, f"calce_{today}.log")
 
         status_lines = "".join(
-            f"- {name}：{'已加载' if ok else '加载失败'}<br>" for name, ok in self._module_status.items()
+            f"- {name}：{'未加载' if ok is None else '已加载' if ok else '加载失败'}<br>"
+            for name, ok in self._module_status.items()
         )
 
         if os.path.exists(log_file):
@@ -438,6 +536,7 @@ def main():
     try:
         window = CalcE()
         window.show()
+        startup_trace.mark("window_shown")
         return app.exec()
     except Exception as e:
         logger.critical("应用程序启动失败: {}", e)
@@ -2,7 +2,9 @@
 import importlib
 import traceback
 from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel, QTextEdit
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, Signal
+
+from startup_trace import startup_trace
 
 
 class ModuleLoader:
@@ -19,14 +21,30 @@ class ModuleLoader:
         :return: 模块实例（加载失败时返回错误部件）
         """
         try:
-            module = importlib.import_module(module_path)
-            cls = getattr(module, class_name)
-            return cls(parent, data_manager) if data_manager is not None else cls(parent)
+            return ModuleLoader._instantiate(module_path, class_name, parent, data_manager)
         except Exception as e:
             print(f"[ModuleLoader] 加载失败: {module_path}.{class_name} — {e}")
             traceback.print_exc()
             return ModuleLoader.create_error_widget(f"模块加载失败: {module_path}", str(e))
 
+    @staticmethod
+    def load_deferred(module_path: str, class_name: str, parent=None, data_manager=None, title: str = ""):
+        """
+        创建延迟加载的模块占位部件，真实模块在首次调用 load() 时才导入和构建。
+        :param title: 标签名，用于占位提示和错误信息
+        :return: DeferredModuleWidget 实例
+        """
+        return DeferredModuleWidget(module_path, class_name, parent, data_manager, title)
+
+    @staticmethod
+    def _instantiate(module_path: str, class_name: str, parent=None, data_manager=None):
+        """导入模块并实例化类，失败时抛出异常"""
+        with startup_trace.span(module_path, "import", "module"):
+            module = importlib.import_module(module_path)
+            cls = getattr(module, class_name)
+        with startup_trace.span(module_path, "construct", "module"):
+            return cls(parent, data_manager) if data_manager is not None else cls(parent)
+
     @staticmethod
     def create_error_widget(title: str, error_msg: str) -> QWidget:
         """创建模块加载失败时的占位部件"""
@@ -53,3 +71,52 @@ class ModuleLoader:
         layout.addWidget(hint)
 
         return widget
+
+
+class DeferredModuleWidget(QWidget):
+    """延迟加载占位部件 - 先显示轻量提示，首次激活时再构建真实模块"""
+
+    # 真实模块构建完成信号：(模块部件, 是否加载成功)
+    loaded = Signal(object, bool)
+
+    def __init__(self, module_path, class_name, parent=None, data_manager=None, title=""):
+        super().__init__(parent)
+        self.module_path = module_path
+        self.class_name = class_name
+        self.title = title or class_name
+        self._data_manager = data_manager
+        self.widget = None
+        self.ok = None  # None 表示尚未加载
+
+        self._layout = QVBoxLayout(self)
+        self._layout.setContentsMargins(0, 0, 0, 0)
+        self._placeholder = QLabel(f"{self.title}\n正在加载...")
+        self._placeholder.setAlignment(Qt.AlignCenter)
+        self._placeholder.setStyleSheet("color: #7f8c8d; font-size: 14px; padding: 20px;")
+        self._layout.addWidget(self._placeholder)
+
+    @property
+    def is_loaded(self):
+        return self.widget is not None
+
+    def load(self):
+        """构建真实模块（仅执行一次），返回模块部件或错误部件"""
+        if self.widget is not None:
+            return self.widget
+
+        try:
+            widget = ModuleLoader._instantiate(self.module_path, self.class_name, self, self._data_manager)
+            self.ok = True
+        except Exception as e:
+            print(f"[ModuleLoader] 加载失败: {self.module_path}.{self.class_name} — {e}")
+            traceback.print_exc()
+            widget = ModuleLoader.create_error_widget(f"{self.title} 加载失败", str(e))
+            self.ok = False
+
+        self._layout.removeWidget(self._placeholder)
+        self._placeholder.deleteLater()
+        self._placeholder = None
+        self._layout.addWidget(widget)
+        self.widget = widget
+        self.loaded.emit(widget, self.ok)
+        return widget
@@ -20,13 +20,6 @@ def init_database(data_file=None):
         
         # 检查是否有默认的工艺设计数据
         if "process_design" not in data_manager.data:
-            data_manager.data["process_design"] = {
-                "projects": [],
-                "materials": [],
-                "equipment": [],
-                "streams": []
-            }
-            
             # 添加示例物料
             example_materials = [
                 {
@@ -58,8 +51,8 @@ def init_database(data_file=None):
                 }
             ]
             
-            data_manager.data["process_design"]["materials"] = example_materials
-            data_manager._save_data()
+            for material in example_materials:
+                data_manager.add_material(material)
         
         return data_manager
         
@@ -172,10 +165,17 @@ if __name__ == "__main__":
             materials_count = len(dm.data["process_design"].get("materials", []))
             print(f"工艺设计数据存在，包含 {materials_count} 个物料")
         
-        # 清理测试文件
-        if os.path.exists(test_data_file):
-            os.remove(test_data_file)
-            print(f"已清理测试文件: {test_data_file}")
+        # 清理测试文件（分片存储时数据文件为目录）
+        import shutil
+        dm.flush()
+        for path in {test_data_file, dm.data_file}:
+            if os.path.isdir(path):
+                shutil.rmtree(path)
+            elif os.path.exists(path):
+                os.remove(path)
+            else:
+                continue
+            print(f"已清理测试文件: {path}")
             
     except Exception as e:
         print(f"数据库初始化测试失败: {e}")
@@ -11,6 +11,11 @@ import re
 from datetime import datetime
 from enum import Enum
 
+from thermo.property_service import service
+
+# 标准大气压，表压换算绝压用
+ATMOSPHERIC_PRESSURE_MPA = 0.101325
+
 # ==================== 枚举定义 ====================
 
 class FlowArrangement(Enum):
@@ -75,56 +80,20 @@ class 换热器面积(QWidget):
     
     def calculate_steam_properties_from_gauge(self, pressure_gauge_MPa):
         """
-        根据表压计算蒸汽物性参数
+        根据表压计算蒸汽物性参数（IAPWS-IF97，大气压取 0.101325 MPa）
         输入：表压 (MPa)
         返回：饱和温度 (°C), 汽化潜热 (kJ/kg)
         """
-        # 蒸汽表数据（表压MPa，饱和温度°C，汽化潜热kJ/kg）
-        steam_data_gauge = [
-            (0.0, 100.0, 2256.4),
-            (0.1, 120.2, 2201.6),
-            (0.2, 133.5, 2163.2),
-            (0.3, 143.6, 2133.0),  # 常用压力点
-            (0.4, 151.8, 2107.4),
-            (0.5, 158.8, 2084.3),
-            (0.6, 165.0, 2063.0),
-            (0.7, 170.4, 2043.1),
-            (0.8, 175.4, 2024.3),
-            (0.9, 179.9, 2006.5),
-            (1.0, 184.1, 1989.8)
-        ]
-        
-        # 边界检查
-        if pressure_gauge_MPa <= steam_data_gauge[0][0]:
-            return {
-                "saturation_temp": steam_data_gauge[0][1],
-                "latent_heat": steam_data_gauge[0][2]
-            }
-        elif pressure_gauge_MPa >= steam_data_gauge[-1][0]:
-            return {
-                "saturation_temp": steam_data_gauge[-1][1],
-                "latent_heat": steam_data_gauge[-1][2]
-            }
+        pressure_abs = pressure_gauge_MPa + ATMOSPHERIC_PRESSURE_MPA
+        liquid = service.get("water", P=pressure_abs, phase=0.0)
+        vapor = service.get("water", P=pressure_abs, phase=1.0)
         
-        # 线性插值
-        for i in range(len(steam_data_gauge)-1):
-            P1, T1, r1 = steam_data_gauge[i]
-            P2, T2, r2 = steam_data_gauge[i+1]
-            
-            if P1 <= pressure_gauge_MPa <= P2:
-                factor = (pressure_gauge_MPa - P1) / (P2 - P1)
-                T_sat = T1 + factor * (T2 - T1)
-                latent_heat = r1 + factor * (r2 - r1)
-                
-                return {
-                    "saturation_temp": round(T_sat, 1),
-                    "latent_heat": round(latent_heat, 1)
-                }
+        if math.isnan(liquid["T"]):
+            raise ValueError(f"蒸汽压力超出饱和区范围: 表压 {pressure_gauge_MPa} MPa")
         
-        # 默认返回100°C
         return {
-            "saturation_temp": 100.0,
-            "latent_heat": 2256.4
+            "saturation_temp": round(liquid["T"] - 273.15, 1),
+            "latent_heat": round(vapor["h"] - liquid["h"], 1)
         }
     
     def setup_ui(self):
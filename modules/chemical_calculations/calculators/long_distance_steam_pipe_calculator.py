@@ -5,6 +5,9 @@ from PySide6.QtCore import Qt
 from PySide6.QtGui import QFont, QDoubleValidator
 import math
 
+from thermo import steam_line
+from thermo.property_service import service
+
 
 class LongDistanceSteamPipeCalculator(QWidget):
     """长输蒸汽管道温降计算器"""
@@ -185,6 +188,8 @@ class LongDistanceSteamPipeCalculator(QWidget):
         self.velocity_result = QLabel("--")
         self.reynolds_result = QLabel("--")
         self.flow_regime_result = QLabel("--")
+        self.outlet_quality_result = QLabel("--")
+        self.condensation_result = QLabel("--")
         
         result_layout.addRow("出口温度:", self.outlet_temp_result)
         result_layout.addRow("出口压力:", self.outlet_pressure_result)
@@ -194,6 +199,8 @@ class LongDistanceSteamPipeCalculator(QWidget):
         result_layout.addRow("蒸汽流速:", self.velocity_result)
         result_layout.addRow("雷诺数:", self.reynolds_result)
         result_layout.addRow("流动状态:", self.flow_regime_result)
+        result_layout.addRow("出口干度:", self.outlet_quality_result)
+        result_layout.addRow("开始冷凝位置:", self.condensation_result)
         
         scroll_layout.addWidget(result_group)
         
@@ -204,7 +211,8 @@ class LongDistanceSteamPipeCalculator(QWidget):
         <h4>计算说明:</h4>
         <ul>
         <li>基于能量平衡和动量平衡方程计算蒸汽在长距离输送过程中的温降和压降</li>
-        <li>考虑管道摩擦阻力、局部阻力和热损失的影响</li>
+        <li>沿管长自适应步长积分压力、温度和干度，按误差自动加密，蒸汽降至饱和后按冷凝计算</li>
+        <li>考虑管道摩擦阻力和热损失的影响</li>
         <li>适用于过热蒸汽和饱和蒸汽的长距离输送计算</li>
         <li>计算结果为近似值，实际工程中建议使用专业软件进行详细计算</li>
         </ul>
@@ -230,7 +238,8 @@ class LongDistanceSteamPipeCalculator(QWidget):
         # 清空结果
         for label in [self.outlet_temp_result, self.outlet_pressure_result,
                      self.temp_drop_result, self.pressure_drop_result, self.heat_loss_result,
-                     self.velocity_result, self.reynolds_result, self.flow_regime_result]:
+                     self.velocity_result, self.reynolds_result, self.flow_regime_result,
+                     self.outlet_quality_result, self.condensation_result]:
             label.setText("--")
     
     def calculate(self):
@@ -324,7 +333,8 @@ class LongDistanceSteamPipeCalculator(QWidget):
                 "出口压力_MPa": round(results.get('outlet_pressure', 0), 3),
                 "温降_C": round(results.get('temp_drop', 0), 1),
                 "压降_MPa": round(results.get('pressure_drop', 0), 3),
-                "总热损失_kW": round(results.get('total_heat_loss', 0), 1)
+                "总热损失_kW": round(results.get('heat_loss', 0), 1),
+                "出口干度": round(results.get('outlet_quality', 1), 4)
             }
         except Exception as e:
             outputs["计算错误"] = str(e)
@@ -334,88 +344,27 @@ class LongDistanceSteamPipeCalculator(QWidget):
     def calculate_steam_pipe_loss(self, steam_type, mass_flow, inlet_temp, inlet_pressure,
                                  pipe_length, pipe_diameter, roughness,
                                  insulation_thickness, insulation_conductivity, ambient_temp):
-        """计算蒸汽管道温降和压降"""
-        # 蒸汽物性参数 (简化计算，实际应使用蒸汽表)
-        def get_steam_properties(temp, pressure):
-            # 简化计算，实际应使用IAPWS公式或蒸汽表
-            # 这里使用近似公式
-            density = pressure * 100 / (0.4615 * (temp + 273.15))  # kg/m³
-            viscosity = 1.2e-5  # Pa·s (近似值)
-            specific_heat = 2.0  # kJ/(kg·K) (近似值)
-            thermal_conductivity = 0.03  # W/(m·K) (近似值)
-            
-            return density, viscosity, specific_heat, thermal_conductivity
-        
-        # 初始参数
-        current_temp = inlet_temp
-        current_pressure = inlet_pressure
-        
-        # 分段计算 (将管道分成若干段)
-        num_segments = 10
-        segment_length = pipe_length / num_segments
-        
-        total_heat_loss = 0
-        
-        for i in range(num_segments):
-            # 获取当前段的蒸汽物性
-            density, viscosity, specific_heat, steam_conductivity = get_steam_properties(
-                current_temp, current_pressure
-            )
-            
-            # 计算流速
-            cross_area = math.pi * (pipe_diameter / 2) ** 2
-            velocity = mass_flow / (density * cross_area)
-            
-            # 计算雷诺数
-            reynolds = density * velocity * pipe_diameter / viscosity
-            
-            # 计算摩擦系数 (Churchill公式)
-            f = self.calculate_friction_factor(reynolds, pipe_diameter, roughness)
-            
-            # 计算压力降 (Darcy-Weisbach公式)
-            pressure_drop_segment = f * (segment_length / pipe_diameter) * (density * velocity ** 2) / 2
-            pressure_drop_mpa = pressure_drop_segment / 1e6
-            
-            # 更新压力
-            current_pressure -= pressure_drop_mpa
-            
-            # 计算热损失
-            if insulation_thickness > 0:
-                # 有保温层
-                inner_radius = pipe_diameter / 2
-                outer_radius = inner_radius + insulation_thickness
-                
-                # 热阻计算
-                r_pipe = math.log((inner_radius + 0.001) / inner_radius) / (2 * math.pi * 50 * segment_length)  # 管道热阻
-                r_insulation = math.log(outer_radius / inner_radius) / (2 * math.pi * insulation_conductivity * segment_length)
-                r_total = r_pipe + r_insulation
-                
-                heat_loss_segment = (current_temp - ambient_temp) / r_total  # W
-            else:
-                # 无保温层
-                heat_loss_segment = 2 * math.pi * (pipe_diameter / 2) * segment_length * 10 * (current_temp - ambient_temp)  # 估算
-            
-            total_heat_loss += heat_loss_segment
-            
-            # 计算温度降
-            temp_drop_segment = heat_loss_segment / (mass_flow * specific_heat * 1000)  # kJ/s to °C
-            current_temp -= temp_drop_segment
-        
-        # 最终结果
-        outlet_temp = current_temp
-        outlet_pressure = current_pressure
-        temp_drop = inlet_temp - outlet_temp
-        pressure_drop = inlet_pressure - outlet_pressure
-        
-        # 计算最终段的流速和雷诺数
-        density_out, viscosity_out, _, _ = get_steam_properties(outlet_temp, outlet_pressure)
-        velocity_out = mass_flow / (density_out * cross_area)
-        reynolds_out = density_out * velocity_out * pipe_diameter / viscosity_out
+        """计算蒸汽管道温降和压降（沿管长自适应步长积分）"""
+        # 入口状态：温度不高于饱和温度时按干饱和蒸汽
+        inlet = service.get("water", inlet_temp + 273.15, inlet_pressure, "vapor")
+        if math.isnan(inlet["h"]):
+            raise ValueError(f"蒸汽状态超出 IAPWS-IF97 适用范围: {inlet_pressure:.4f} MPa, {inlet_temp:.1f} °C")
+        
+        line = steam_line.march(
+            mass_flow, inlet_pressure, inlet["h"], pipe_length, pipe_diameter, roughness,
+            insulation_thickness, insulation_conductivity, ambient_temp
+        )
+        if not line.ok:
+            raise ValueError(f"蒸汽压力在距入口约 {line.failed_at:.0f} m 处耗尽，管道压降过大，"
+                             f"请增大管径或降低流量")
+        
+        outlet_temp = line.T_out - 273.15
+        outlet_pressure = line.p_out
         
         # 判断流动状态
-        if reynolds_out < 2300:
+        if line.reynolds_out < 2300:
             flow_regime = "层流"
-        elif reynolds_out < 4000:
+        elif line.reynolds_out < 4000:
             flow_regime = "过渡流"
         else:
             flow_regime = "湍流"
@@ -423,25 +372,21 @@ class LongDistanceSteamPipeCalculator(QWidget):
         return {
             'outlet_temp': outlet_temp,
             'outlet_pressure': outlet_pressure,
-            'temp_drop': temp_drop,
-            'pressure_drop': pressure_drop,
-            'heat_loss': total_heat_loss / 1000,  # 转换为kW
-            'velocity': velocity_out,
-            'reynolds': reynolds_out,
-            'flow_regime': flow_regime
+            'temp_drop': inlet["T"] - 273.15 - outlet_temp,
+            'pressure_drop': inlet_pressure - outlet_pressure,
+            'heat_loss': line.heat_loss,  # kW
+            'velocity': line.velocity_out,
+            'reynolds': line.reynolds_out,
+            'flow_regime': flow_regime,
+            'outlet_quality': line.x_out,
+            'condensation_at': None if math.isnan(line.condensation_at) else line.condensation_at,
+            'profile': line.profile()
         }
     
     def calculate_friction_factor(self, reynolds, diameter, roughness):
         """计算摩擦系数"""
-        if reynolds < 2300:
-            # 层流
-            return 64 / reynolds
-        else:
-            # 湍流 (Colebrook-White方程简化)
-            relative_roughness = roughness / diameter
-            # 使用Swamee-Jain近似公式
-            f = 0.25 / (math.log10(relative_roughness / 3.7 + 5.74 / reynolds ** 0.9)) ** 2
-            return f
+        # 层流 64/Re，湍流按 Swamee-Jain 近似公式
+        return steam_line.friction_factor(reynolds, diameter, roughness)
     
     def display_results(self, results):
         """显示计算结果"""
@@ -453,12 +398,18 @@ class LongDistanceSteamPipeCalculator(QWidget):
         self.velocity_result.setText(f"{results['velocity']:.1f} m/s")
         self.reynolds_result.setText(f"{results['reynolds']:.0f}")
         self.flow_regime_result.setText(results['flow_regime'])
+        self.outlet_quality_result.setText(f"{results['outlet_quality']:.4f}")
+        if results['condensation_at'] is None:
+            self.condensation_result.setText("全程未冷凝")
+        else:
+            self.condensation_result.setText(f"距入口 {results['condensation_at']:.0f} m")
     
     def show_error(self, message):
         """显示错误信息"""
         for label in [self.outlet_temp_result, self.outlet_pressure_result,
                      self.temp_drop_result, self.pressure_drop_result, self.heat_loss_result,
-                     self.velocity_result, self.reynolds_result, self.flow_regime_result]:
+                     self.velocity_result, self.reynolds_result, self.flow_regime_result,
+                     self.outlet_quality_result, self.condensation_result]:
             label.setText("计算错误")
         
         # 在实际应用中，这里可以显示一个错误对话框
@@ -5,6 +5,8 @@ from PySide6.QtWidgets import (
 from PySide6.QtGui import QFont, QDoubleValidator
 from PySide6.QtCore import Qt
 
+from thermo.property_service import service
+
 
 class NPSHaCalculator(QWidget):
     """离心泵NPSHa计算（左右布局优化版）"""
@@ -108,20 +110,11 @@ class NPSHaCalculator(QWidget):
         input_layout.addWidget(self.vapor_pressure_input, row, 1)
         
         self.vapor_pressure_combo = QComboBox()
+        # 水的饱和蒸汽压 (IAPWS-IF97，经共享物性服务)
         self.vapor_pressure_combo.addItems([
-            "0.61 kPa - 水在0°C",
-            "1.23 kPa - 水在10°C",
-            "2.34 kPa - 水在20°C",
-            "4.24 kPa - 水在30°C",
-            "7.38 kPa - 水在40°C",
-            "12.34 kPa - 水在50°C",
-            "19.92 kPa - 水在60°C",
-            "31.19 kPa - 水在70°C",
-            "47.39 kPa - 水在80°C",
-            "70.14 kPa - 水在90°C",
-            "101.33 kPa - 水在100°C",
-            "自定义蒸汽压"
-        ])
+            f"{service.get('water', t + 273.15, phase=0.0)['p'] * 1000:.2f} kPa - 水在{t}°C"
+            for t in range(0, 101, 10)
+        ] + ["自定义蒸汽压"])
         self.vapor_pressure_combo.setFixedWidth(combo_width)
         self.vapor_pressure_combo.currentTextChanged.connect(self.on_vapor_pressure_changed)
         input_layout.addWidget(self.vapor_pressure_combo, row, 2)
@@ -10,6 +10,8 @@ import math
 import re
 from datetime import datetime
 
+from thermo.property_service import service
+
 
 class 管径计算(QWidget):
     """管道直径计算器 - 基于表格数据（统一UI风格版）"""
@@ -453,6 +455,7 @@ class 管径计算(QWidget):
         self.pressure_input.setPlaceholderText("例如: 0.9")
         self.pressure_input.setValidator(QDoubleValidator(0.0, 30.0, 2))
         self.pressure_input.setFixedWidth(input_width)
+        self.pressure_input.textChanged.connect(self.on_pressure_changed)
         input_layout.addWidget(self.pressure_input, row, 1)
         
         # 压力范围标签
@@ -847,13 +850,26 @@ class 管径计算(QWidget):
         self.condition_combo.blockSignals(False)
     
     def update_density(self, fluid):
-        """更新密度值"""
-        if fluid in self.fluid_data:
-            density = self.fluid_data[fluid]
+        """更新密度值；饱和蒸汽按输入压力（表压）取 IAPWS-IF97 饱和蒸汽密度"""
+        density = self.fluid_data.get(fluid)
+        if fluid == "饱和蒸汽":
+            try:
+                pressure_abs = float(self.pressure_input.text()) + 0.101325
+                steam_density = service.get("water", P=pressure_abs, phase=1.0)["rho"]
+                if not math.isnan(steam_density):
+                    density = steam_density
+            except ValueError:
+                pass  # 压力未输入时沿用表中 0.9MPa(G) 的默认值
+        if density is not None:
             self.density_input.setText(f"{density:.2f}")
         else:
             self.density_input.setText("")
     
+    def on_pressure_changed(self, text):
+        """压力变化时刷新随压力变化的密度（饱和蒸汽）"""
+        if self.fluid_combo.currentText() == "饱和蒸汽":
+            self.update_density("饱和蒸汽")
+    
     def on_condition_changed(self, text):
         """处理条件变化 - 更新参数范围和推荐值"""
         # 检查是否为空选项
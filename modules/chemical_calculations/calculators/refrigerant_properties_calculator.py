@@ -8,6 +8,8 @@ from PySide6.QtGui import QFont, QDoubleValidator
 import math
 import json
 
+from thermo.refrigerant import load as load_refrigerant, cycle as refrigerant_cycle
+
 
 class RefrigerantPropertiesCalculator(QWidget):
     """制冷剂物性计算器"""
@@ -620,7 +622,7 @@ class RefrigerantPropertiesCalculator(QWidget):
             self.display_results(results, calc_type)
             
         except ValueError as e:
-            self.show_error("输入参数格式错误，请检查输入值")
+            self.show_error(f"输入参数错误: {str(e)}")
         except Exception as e:
             self.show_error(f"计算错误: {str(e)}")
 
@@ -636,7 +638,7 @@ class RefrigerantPropertiesCalculator(QWidget):
             "制冷剂": refrigerant,
             "计算类型": calc_type,
             "温度_C": temperature,
-            "压力_MPa": pressure,
+            "压力_kPa": pressure,
             "干度": quality
         }
 
@@ -651,8 +653,8 @@ class RefrigerantPropertiesCalculator(QWidget):
                 "比焓_kJ_kg": round(results.get('enthalpy', 0), 2),
                 "比熵_kJ_kgK": round(results.get('entropy', 0), 4),
                 "比容_m3_kg": round(results.get('specific_volume', 0), 5),
-                "动力粘度_Pa_s": round(results.get('viscosity', 0), 6),
-                "热导率_W_mK": round(results.get('conductivity', 0), 4)
+                "动力粘度_uPa_s": round(results.get('viscosity', 0), 3),
+                "热导率_W_mK": round(results.get('thermal_cond', 0), 4)
             }
         except Exception as e:
             outputs["计算错误"] = str(e)
@@ -660,270 +662,168 @@ class RefrigerantPropertiesCalculator(QWidget):
         return {"inputs": inputs, "outputs": outputs}
 
     def calculate_refrigerant_properties(self, refrigerant, info, calc_type, T, P, x):
-        """计算制冷剂物性"""
-        # 转换为绝对温度
-        T_k = T + 273.15 if T else None
-        T_k_sat = None
-        
-        # 计算对比参数
-        tc_k = info['tc'] + 273.15
-        Tr = T_k / tc_k if T_k else None
-        Pr = P / info['pc'] if P else None
-        
+        """计算制冷剂物性（T 为 °C，P 为 kPa 绝压，x 为干度）"""
+        fluid = load_refrigerant(refrigerant)
+        T_k = T + 273.15 if T is not None else None
+        P_mpa = P / 1000 if P is not None else None
+
         # 根据计算类型执行相应计算
         if calc_type == "饱和性质计算":
             if T is not None:
-                # 给定温度计算饱和压力
-                P_sat = self.calculate_saturation_pressure(refrigerant, T)
-                results = self.calculate_saturated_properties(refrigerant, T, P_sat)
-                results['temperature'] = T
-                results['pressure'] = P_sat
-            elif P is not None:
-                # 给定压力计算饱和温度
-                T_sat = self.calculate_saturation_temperature(refrigerant, P)
-                results = self.calculate_saturated_properties(refrigerant, T_sat, P)
-                results['temperature'] = T_sat
-                results['pressure'] = P
-            else:
+                # 给定温度按泡点温度取饱和压力
+                P_mpa = fluid.psat(T_k)
+            elif P is None:
                 raise ValueError("需要输入温度或压力")
-                
+            results = self.calculate_saturated_properties(fluid, P_mpa, x, T_k)
+
         elif calc_type == "过热性质计算":
-            if T is not None and P is not None:
-                results = self.calculate_superheated_properties(refrigerant, T, P)
-            else:
+            if T is None or P is None:
                 raise ValueError("过热性质计算需要温度和压力")
-                
+            results = self.calculate_superheated_properties(fluid, T_k, P_mpa)
+
         elif calc_type == "过冷性质计算":
-            if T is not None and P is not None:
-                results = self.calculate_subcooled_properties(refrigerant, T, P)
-            else:
+            if T is None or P is None:
                 raise ValueError("过冷性质计算需要温度和压力")
-                
+            results = self.calculate_subcooled_properties(fluid, T_k, P_mpa)
+
         elif calc_type == "压缩因子计算":
-            if T is not None and P is not None:
-                results = self.calculate_compressibility(refrigerant, T, P, info)
-            else:
+            if T is None or P is None:
                 raise ValueError("压缩因子计算需要温度和压力")
-                
+            results = self.calculate_compressibility(fluid, T_k, P_mpa)
+
         else:  # 热力循环分析
-            if T is not None:
-                # 简化循环分析
-                results = self.analyze_refrigeration_cycle(refrigerant, T)
-            else:
+            if T is None:
                 raise ValueError("热力循环分析需要蒸发温度")
-        
-        # 计算传输性质
-        transport_props = self.calculate_transport_properties(refrigerant, T, P, results.get('density', 0))
-        results.update(transport_props)
-        
+            results = self.analyze_refrigeration_cycle(refrigerant, T_k)
+
         # 计算性能参数
         performance = self.calculate_performance_parameters(refrigerant, results)
         results.update(performance)
-        
+
         return results
-    
+
     def calculate_saturation_pressure(self, refrigerant, T):
-        """计算饱和压力"""
-        # 使用Antoine方程近似计算饱和压力
-        # 实际应用中应使用更精确的方程或查表
-        if refrigerant == "R134a":
-            # R134a的Antoine方程参数
-            A = 4.222
-            B = 1142.9
-            C = -19.15
-            P_sat = math.exp(A - B/(T + C)) * 100  # 转换为kPa
-        elif refrigerant == "R22":
-            A = 4.310
-            B = 1135.2
-            C = -22.25
-            P_sat = math.exp(A - B/(T + C)) * 100
-        else:
-            # 通用近似
-            tc = self.get_refrigerant_info(refrigerant)['tc']
-            P_sat = math.exp(11.67 - 3800/(T + 273.15)) * 100
-        
-        return P_sat
-    
+        """计算饱和压力（泡点），T 为 °C，返回 kPa"""
+        return load_refrigerant(refrigerant).psat(T + 273.15) * 1000
+
     def calculate_saturation_temperature(self, refrigerant, P):
-        """计算饱和温度"""
-        # 使用Antoine方程反算饱和温度
-        if refrigerant == "R134a":
-            A = 4.222
-            B = 1142.9
-            C = -19.15
-            T_sat = B/(A - math.log(P/100)) - C
-        elif refrigerant == "R22":
-            A = 4.310
-            B = 1135.2
-            C = -22.25
-            T_sat = B/(A - math.log(P/100)) - C
-        else:
-            # 通用近似
-            T_sat = 3800/(11.67 - math.log(P/100)) - 273.15
-        
-        return T_sat
-    
-    def calculate_saturated_properties(self, refrigerant, T, P):
-        """计算饱和性质"""
-        # 简化计算，实际应使用状态方程或查表
-        tc = self.get_refrigerant_info(refrigerant)['tc']
-        pc = self.get_refrigerant_info(refrigerant)['pc']
-        
-        # 计算饱和液体和饱和蒸汽性质
-        hf = 100 + 2.5 * T  # 简化计算
-        hg = 300 + 1.8 * T  # 简化计算
-        hfg = hg - hf
-        
-        sf = 0.5 + 0.01 * T  # 简化计算
-        sg = 1.5 + 0.008 * T  # 简化计算
-        sfg = sg - sf
-        
-        # 计算密度
-        density_f = 1000 - 5 * T  # 简化计算
-        density_g = 20 - 0.1 * T  # 简化计算
-        
-        return {
-            'temperature': T,
-            'pressure': P,
-            'density': density_f,  # 默认返回液体密度
-            'enthalpy': hf,  # 默认返回液体焓
-            'entropy': sf,   # 默认返回液体熵
-            'internal_energy': hf - P/1000,  # 简化计算
-            'gibbs': hf - (T + 273.15) * sf / 1000,  # 简化计算
-            'hf': hf,
-            'hg': hg,
-            'hfg': hfg,
-            'sf': sf,
-            'sg': sg,
-            'sfg': sfg,
-            'density_f': density_f,
-            'density_g': density_g
-        }
-    
-    def calculate_superheated_properties(self, refrigerant, T, P):
-        """计算过热性质"""
-        # 简化计算
-        h = 350 + 1.5 * T + 0.01 * P  # 简化计算
-        s = 1.7 + 0.009 * T + 0.0001 * P  # 简化计算
-        density = 15 - 0.08 * T + 0.001 * P  # 简化计算
-        
-        return {
-            'temperature': T,
-            'pressure': P,
-            'density': density,
-            'enthalpy': h,
-            'entropy': s,
-            'internal_energy': h - P/1000,  # 简化计算
-            'gibbs': h - (T + 273.15) * s / 1000  # 简化计算
-        }
-    
-    def calculate_subcooled_properties(self, refrigerant, T, P):
-        """计算过冷性质"""
-        # 简化计算
-        h = 80 + 2.2 * T + 0.001 * P  # 简化计算
-        s = 0.4 + 0.008 * T + 0.00005 * P  # 简化计算
-        density = 1050 - 4.5 * T + 0.002 * P  # 简化计算
-        
-        return {
-            'temperature': T,
-            'pressure': P,
+        """计算饱和温度（泡点），P 为 kPa，返回 °C"""
+        return load_refrigerant(refrigerant).tsat(P / 1000) - 273.15
+
+    def calculate_saturated_properties(self, fluid, P, x=None, T_bubble=None):
+        """
+        计算饱和性质（P 为 MPa，T_bubble 为已知的泡点温度 K）；
+        给定干度时基本物性为该干度的湿蒸汽，否则为饱和液体
+        """
+        sat = fluid.saturated(p=P)
+        if math.isnan(sat['h_l']) or math.isnan(sat['h_v']):
+            raise ValueError(f"超出饱和表范围（{fluid.t_min - 273.15:.0f} ~ {fluid.t_top - 273.15:.0f} °C）")
+        x = 0.0 if x is None else x
+        if not 0 <= x <= 1:
+            raise ValueError("干度应在 0 ~ 1 之间")
+
+        if T_bubble is None:
+            T_bubble = sat['T_l']
+        T = T_bubble + x * sat['glide']
+        density = 1 / ((1 - x) / sat['rho_l'] + x / sat['rho_v'])
+        h = (1 - x) * sat['h_l'] + x * sat['h_v']
+        s = (1 - x) * sat['s_l'] + x * sat['s_v']
+        # 输运性质和比热取干度对应一侧的饱和相
+        side = '_v' if x >= 1 else '_l'
+        state = {name: sat[name + side] for name in ('rho', 'cp', 'cv', 'w', 'mu', 'k')}
+
+        results = self._state_results(fluid, P, T, density, h, s, state)
+        results.update({
+            'hf': sat['h_l'],
+            'hg': sat['h_v'],
+            'hfg': sat['h_v'] - sat['h_l'],
+            'sf': sat['s_l'],
+            'sg': sat['s_v'],
+            'sfg': sat['s_v'] - sat['s_l'],
+            'density_f': sat['rho_l'],
+            'density_g': sat['rho_v'],
+            'glide': sat['glide'],
+        })
+        return results
+
+    def calculate_superheated_properties(self, fluid, T, P):
+        """计算过热性质（T 为 K，P 为 MPa）"""
+        state = fluid.props_pt(P, T)
+        if state['x'] != 1:
+            T_dew = fluid.tsat(P, dew=True) - 273.15
+            raise ValueError(f"该状态不是过热蒸汽（露点温度 {T_dew:.2f} °C）或超出物性表范围")
+        return self._state_results(fluid, P, T, state['rho'], state['h'], state['s'], state)
+
+    def calculate_subcooled_properties(self, fluid, T, P):
+        """计算过冷性质（T 为 K，P 为 MPa）"""
+        state = fluid.props_pt(P, T)
+        if state['x'] != 0:
+            T_bubble = fluid.tsat(P) - 273.15
+            raise ValueError(f"该状态不是过冷液体（泡点温度 {T_bubble:.2f} °C）或超出物性表范围")
+        return self._state_results(fluid, P, T, state['rho'], state['h'], state['s'], state)
+
+    def calculate_compressibility(self, fluid, T, P):
+        """计算压缩因子 Z = p / (ρ R T)（T 为 K，P 为 MPa）"""
+        state = fluid.props_pt(P, T)
+        if math.isnan(state['h']):
+            raise ValueError("该温度、压力处于两相区或超出物性表范围")
+        return self._state_results(fluid, P, T, state['rho'], state['h'], state['s'], state)
+
+    def _state_results(self, fluid, P, T, density, h, s, state):
+        """由状态点物性整理结果（P 为 MPa、T 为 K，结果中温度 °C、压力 kPa、粘度 μPa·s）"""
+        P_kpa = P * 1000
+        u = h - P_kpa / density                     # kPa·m³/kg = kJ/kg
+        results = {
+            'temperature': T - 273.15,
+            'pressure': P_kpa,
             'density': density,
+            'specific_volume': 1 / density,
             'enthalpy': h,
             'entropy': s,
-            'internal_energy': h - P/1000,  # 简化计算
-            'gibbs': h - (T + 273.15) * s / 1000  # 简化计算
+            'internal_energy': u,
+            'gibbs': h - T * s,
+            'z_factor': P_kpa / (density * fluid.R * T),
         }
-    
-    def calculate_compressibility(self, refrigerant, T, P, info):
-        """计算压缩因子"""
-        # 使用对应状态原理计算压缩因子
-        tc_k = info['tc'] + 273.15
-        Tr = (T + 273.15) / tc_k
-        Pr = P / info['pc']
-        
-        # 简化计算
-        Z = 1.0  # 默认值
-        
-        if Tr < 1.0 and Pr < 1.0:
-            # 在临界区以下，使用简化对应状态方程
-            Z = 1.0 - 0.1 * Pr / Tr
-        elif Tr > 1.0:
-            # 在临界区以上
-            Z = 1.0 + 0.1 * Pr / Tr
-        
-        # 计算其他性质
-        R = 8.314 / info['mw'] * 1000  # 气体常数，J/(kg·K)
-        density = P * 1000 / (Z * R * (T + 273.15))  # kg/m³
-        
-        return {
-            'temperature': T,
-            'pressure': P,
-            'z_factor': Z,
-            'density': density,
-            'enthalpy': 200 + 1.5 * T,  # 简化计算
-            'entropy': 1.0 + 0.005 * T,  # 简化计算
-            'internal_energy': 180 + 1.4 * T,  # 简化计算
-            'gibbs': 150 + 1.2 * T  # 简化计算
-        }
-    
+        results.update(self.calculate_transport_properties(state))
+        return results
+
     def analyze_refrigeration_cycle(self, refrigerant, T_evap):
-        """分析制冷循环"""
-        # 简化循环分析
-        T_cond = T_evap + 20  # 假设冷凝温度比蒸发温度高20°C
-        
-        # 计算蒸发压力和冷凝压力
-        P_evap = self.calculate_saturation_pressure(refrigerant, T_evap)
-        P_cond = self.calculate_saturation_pressure(refrigerant, T_cond)
-        
-        # 计算循环性能
-        h1 = 400  # 压缩机进口焓值，简化
-        h2 = 450  # 压缩机出口焓值，简化
-        h3 = 250  # 冷凝器出口焓值，简化
-        h4 = h3   # 节流过程，焓值不变
-        
-        refrigeration_effect = h1 - h4  # 单位制冷量
-        compressor_work = h2 - h1       # 单位压缩功
-        cop = refrigeration_effect / compressor_work  # 理论COP
-        
-        # 计算单位容积制冷量
-        density = 20 - 0.1 * T_evap  # 简化计算
-        volumetric_capacity = refrigeration_effect * density
-        
-        return {
-            'temperature': T_evap,
-            'pressure': P_evap,
-            'cop': cop,
-            'refrigeration_effect': refrigeration_effect,
-            'volumetric_capacity': volumetric_capacity,
-            'glide': 0.0,  # 纯物质温度滑移为0
-            'density': density,
-            'enthalpy': h1,
-            'entropy': 1.7  # 简化计算
-        }
-    
-    def calculate_transport_properties(self, refrigerant, T, P, density):
-        """计算传输性质"""
-        # 简化计算
-        viscosity = 10 + 0.1 * T  # μPa·s
-        thermal_cond = 0.01 + 0.0005 * T  # W/(m·K)
-        cp = 1.0 + 0.005 * T  # kJ/(kg·K)
-        cv = 0.8 + 0.004 * T  # kJ/(kg·K)
-        
+        """分析制冷循环（理论循环，T_evap 为 K，冷凝温度取蒸发温度 + 20 K）"""
+        T_cond = T_evap + 20
+        c = refrigerant_cycle(refrigerant, T_evap, T_cond)
+        fluid = load_refrigerant(refrigerant)
+        sat = fluid.saturated(p=c['p_evap'])
+        state = {name: sat[name + '_v'] for name in ('rho', 'cp', 'cv', 'w', 'mu', 'k')}
+
+        # 基本物性显示压缩机进口（蒸发器出口饱和蒸汽）状态
+        results = self._state_results(fluid, c['p_evap'], c['T1'], c['rho1'],
+                                      c['h1'], c['s1'], state)
+        results.update({
+            'cop': c['cop'],
+            'refrigeration_effect': c['q_evap'],
+            'volumetric_capacity': c['q_vol'],
+            'glide': c['glide_evap'],
+        })
+        return results
+
+    def calculate_transport_properties(self, state):
+        """整理输运性质和比热（μ 换算为 μPa·s）"""
+        viscosity = state['mu'] * 1e6
+        thermal_cond = state['k']
+        cp = state['cp']
+
         # 计算普朗特数
-        Pr = viscosity * 1e-6 * cp * 1000 / (thermal_cond) if thermal_cond > 0 else 0
-        
-        # 计算音速
-        sound_speed = 100 + 2 * T  # m/s，简化计算
-        
+        Pr = state['mu'] * cp * 1000 / thermal_cond if thermal_cond > 0 else 0
+
         return {
             'viscosity': viscosity,
             'thermal_cond': thermal_cond,
             'prandtl': Pr,
-            'sound_speed': sound_speed,
+            'sound_speed': state['w'],
             'cp': cp,
-            'cv': cv
+            'cv': state['cv']
         }
-    
+
     def calculate_performance_parameters(self, refrigerant, properties):
         """计算性能参数"""
         # 这里可以添加更复杂的性能计算
@@ -5,7 +5,8 @@ from PySide6.QtWidgets import (
 )
 from PySide6.QtCore import Qt
 from PySide6.QtGui import QFont, QDoubleValidator
-import math
+
+from thermo.refrigerant import cycle as refrigerant_cycle
 
 
 class RefrigerationCycleCalculator(QWidget):
@@ -366,58 +367,24 @@ class RefrigerationCycleCalculator(QWidget):
         self.superheat_label.setVisible(is_actual)
         self.superheat_input.setVisible(is_actual)
     
-    def calculate_saturation_pressure(self, refrigerant, temperature):
-        """计算饱和压力（简化计算）"""
-        # 使用Antoine方程简化计算
-        if refrigerant == "R134a":
-            A, B, C = 6.9094, 1169.0, 224.0
-        elif refrigerant == "R22":
-            A, B, C = 6.9399, 1117.0, 231.0
-        elif refrigerant == "R410A":
-            A, B, C = 6.9454, 1125.0, 232.0
-        elif refrigerant == "R32":
-            A, B, C = 6.8935, 1083.0, 236.0
-        elif refrigerant == "R717 (氨)":
-            A, B, C = 7.3605, 926.0, 240.0
-        elif refrigerant == "R744 (CO₂)":
-            A, B, C = 6.8123, 1301.0, 273.0
-        else:
-            A, B, C = 6.9094, 1169.0, 224.0  # 默认R134a
-        
-        T = temperature + 273.15  # 转换为K
-        P_sat = math.exp(A - B/(T - C)) * 100  # kPa
-        return P_sat
-    
-    def calculate_enthalpy(self, refrigerant, temperature, pressure, is_vapor=True):
-        """计算焓值（简化计算）"""
-        # 简化计算，实际应用中应使用详细的物性表或方程
-        if refrigerant == "R134a":
-            if is_vapor:
-                # 蒸汽焓值
-                return 250 + 1.8 * temperature  # kJ/kg
-            else:
-                # 液体焓值
-                return 100 + 1.5 * temperature  # kJ/kg
-        else:
-            # 其他制冷剂的简化计算
-            if is_vapor:
-                return 250 + 1.8 * temperature
-            else:
-                return 100 + 1.5 * temperature
-    
-    def calculate_entropy(self, refrigerant, temperature, pressure, is_vapor=True):
-        """计算熵值（简化计算）"""
-        if refrigerant == "R134a":
-            if is_vapor:
-                return 0.9 + 0.01 * temperature  # kJ/kg·K
-            else:
-                return 0.4 + 0.005 * temperature  # kJ/kg·K
-        else:
-            if is_vapor:
-                return 0.9 + 0.01 * temperature
-            else:
-                return 0.4 + 0.005 * temperature
-    
+    def calculate_state_points(self, refrigerant, evap_temp, cond_temp, subcool, superheat, comp_efficiency):
+        """计算循环各状态点（温度 °C，压力 kPa，焓 kJ/kg），物性由制冷剂物性表计算"""
+        c = refrigerant_cycle(refrigerant, evap_temp + 273.15, cond_temp + 273.15,
+                              superheat, subcool, comp_efficiency)
+        return {
+            "P_evap": c["p_evap"] * 1000,
+            "P_cond": c["p_cond"] * 1000,
+            "T1": c["T1"] - 273.15,
+            "T2": c["T2"] - 273.15,
+            "T3": c["T3"] - 273.15,
+            "T4": c["T4"] - 273.15,
+            "h1": c["h1"],
+            "h2": c["h2"],
+            "h3": c["h3"],
+            "h4": c["h4"],
+            "x4": c["x4"],
+        }
+
     def calculate_cycle(self):
         """计算制冷循环"""
         try:
@@ -444,25 +411,11 @@ class RefrigerationCycleCalculator(QWidget):
                 superheat = 0
             
             # 计算各状态点参数
-            # 点1: 压缩机进口 (蒸发器出口)
-            P_evap = self.calculate_saturation_pressure(refrigerant, evap_temp)
-            T1 = evap_temp + superheat
-            h1 = self.calculate_enthalpy(refrigerant, T1, P_evap, is_vapor=True)
-            s1 = self.calculate_entropy(refrigerant, T1, P_evap, is_vapor=True)
-            
-            # 点2: 压缩机出口 (等熵压缩)
-            P_cond = self.calculate_saturation_pressure(refrigerant, cond_temp)
-            h2s = h1 + (P_cond - P_evap) * 0.1  # 简化计算
-            h2 = h1 + (h2s - h1) / comp_efficiency
-            T2 = cond_temp + 20  # 简化计算
-            
-            # 点3: 冷凝器出口
-            T3 = cond_temp - subcool
-            h3 = self.calculate_enthalpy(refrigerant, T3, P_cond, is_vapor=False)
-            
-            # 点4: 膨胀阀出口 (等焓膨胀)
-            h4 = h3
-            T4 = evap_temp
+            # 点1: 压缩机进口 (蒸发器出口)，点2: 压缩机出口，点3: 冷凝器出口，点4: 膨胀阀出口 (等焓膨胀)
+            states = self.calculate_state_points(
+                refrigerant, evap_temp, cond_temp, subcool, superheat, comp_efficiency
+            )
+            h1, h2, h3, h4 = states["h1"], states["h2"], states["h3"], states["h4"]
             
             # 计算循环性能参数
             refrigeration_effect = h1 - h4  # kJ/kg
@@ -480,7 +433,7 @@ class RefrigerationCycleCalculator(QWidget):
             # 显示结果
             result = self.format_results(
                 cycle_type, refrigerant, evap_temp, cond_temp, subcool, superheat,
-                mass_flow, comp_efficiency, P_evap, P_cond, h1, h2, h3, h4,
+                mass_flow, comp_efficiency, states,
                 refrigeration_effect, compressor_work, heat_rejection, COP,
                 compressor_power, refrigeration_capacity, carnot_COP, efficiency
             )
@@ -488,7 +441,7 @@ class RefrigerationCycleCalculator(QWidget):
             self.result_text.setText(result)
             
         except ValueError as e:
-            QMessageBox.critical(self, "计算错误", f"参数输入格式错误: {str(e)}")
+            QMessageBox.critical(self, "计算错误", f"参数输入错误: {str(e)}")
         except Exception as e:
             QMessageBox.critical(self, "计算错误", f"计算过程中发生错误: {str(e)}")
 
@@ -522,14 +475,10 @@ class RefrigerationCycleCalculator(QWidget):
                 subcool = 0
                 superheat = 0
 
-            P_evap = self.calculate_saturation_pressure(refrigerant, evap_temp)
-            T1 = evap_temp + superheat
-            h1 = self.calculate_enthalpy(refrigerant, T1, P_evap, is_vapor=True)
-            P_cond = self.calculate_saturation_pressure(refrigerant, cond_temp)
-            h2s = h1 + (P_cond - P_evap) * 0.1
-            h2 = h1 + (h2s - h1) / comp_efficiency
-            h3 = self.calculate_enthalpy(refrigerant, cond_temp - subcool, P_cond, is_vapor=False)
-            h4 = h3
+            states = self.calculate_state_points(
+                refrigerant, evap_temp, cond_temp, subcool, superheat, comp_efficiency
+            )
+            h1, h2, h4 = states["h1"], states["h2"], states["h4"]
             refrigeration_effect = h1 - h4
             compressor_work = h2 - h1
             COP = refrigeration_effect / compressor_work
@@ -552,8 +501,7 @@ class RefrigerationCycleCalculator(QWidget):
         return {"inputs": inputs, "outputs": outputs}
 
     def format_results(self, cycle_type, refrigerant, evap_temp, cond_temp, subcool, 
-                      superheat, mass_flow, comp_efficiency, P_evap, P_cond, h1, h2, 
-                      h3, h4, refrigeration_effect, compressor_work, heat_rejection, 
+                      superheat, mass_flow, comp_efficiency, states, refrigeration_effect, compressor_work, heat_rejection, 
                       COP, compressor_power, refrigeration_capacity, carnot_COP, efficiency):
         """格式化计算结果"""
         return f"""═══════════════════════════════════════════════════
@@ -574,20 +522,20 @@ class RefrigerationCycleCalculator(QWidget):
 ═══════════════════════════════════════════════════
 
 • 点1 (压缩机进口):
-  温度: {evap_temp + superheat:.1f} °C, 压力: {P_evap:.1f} kPa
-  焓值: {h1:.2f} kJ/kg
+  温度: {states['T1']:.1f} °C, 压力: {states['P_evap']:.1f} kPa
+  焓值: {states['h1']:.2f} kJ/kg
 
 • 点2 (压缩机出口):
-  温度: {cond_temp + 20:.1f} °C, 压力: {P_cond:.1f} kPa  
-  焓值: {h2:.2f} kJ/kg
+  温度: {states['T2']:.1f} °C, 压力: {states['P_cond']:.1f} kPa  
+  焓值: {states['h2']:.2f} kJ/kg
 
 • 点3 (冷凝器出口):
-  温度: {cond_temp - subcool:.1f} °C, 压力: {P_cond:.1f} kPa
-  焓值: {h3:.2f} kJ/kg
+  温度: {states['T3']:.1f} °C, 压力: {states['P_cond']:.1f} kPa
+  焓值: {states['h3']:.2f} kJ/kg
 
 • 点4 (膨胀阀出口):
-  温度: {evap_temp:.1f} °C, 压力: {P_evap:.1f} kPa
-  焓值: {h4:.2f} kJ/kg
+  温度: {states['T4']:.1f} °C, 压力: {states['P_evap']:.1f} kPa
+  焓值: {states['h4']:.2f} kJ/kg, 干度: {states['x4']:.3f}
 
 ═══════════════════════════════════════════════════
                         性能参数
@@ -612,10 +560,10 @@ class RefrigerationCycleCalculator(QWidget):
 ═══════════════════════════════════════════════════
 
 • 基于蒸汽压缩制冷循环理论计算
-• 使用简化物性计算方法
-• 假设压缩过程为等熵过程
+• 物性由制冷剂物性表（状态方程数据）单调样条插值计算
+• 压缩过程按等熵焓升 / 压缩机效率计算
 • 膨胀过程为等焓过程
-• 冷凝器和蒸发器压力为饱和压力
+• 冷凝器和蒸发器压力取对应温度下的露点压力
 • 结果仅供参考，实际系统性能可能有所不同"""
 
 
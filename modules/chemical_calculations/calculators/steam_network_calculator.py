@@ -0,0 +1,360 @@
+from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QGroupBox, QLabel,
+                              QPushButton, QPlainTextEdit, QTableWidget, QTableWidgetItem,
+                              QHeaderView, QFileDialog, QMessageBox, QSplitter, QAbstractItemView)
+from PySide6.QtCore import Qt, Signal, QThread
+from PySide6.QtGui import QFont
+import csv
+import io
+import math
+import time
+
+from thermo import steam_network
+
+# 示例管网：一个汽源经主管向四个用户供汽
+SAMPLE_NODES = """节点,类型,压力_MPa,温度_C,用汽量_t/h
+锅炉房,汽源,1.3,250,
+A,节点,,,
+B,节点,,,
+车间1,用户,,,4
+车间2,用户,,,2.5
+车间3,用户,,,3
+车间4,用户,,,1.5
+"""
+
+SAMPLE_PIPES = """管段,起点,终点,长度_m,内径_mm,粗糙度_mm,保温厚度_mm,保温导热系数_W_mK,环境温度_C
+主管1,锅炉房,A,400,250,0.2,80,0.04,20
+主管2,A,B,300,200,0.2,80,0.04,20
+支管1,A,车间1,150,125,0.2,60,0.04,20
+支管2,A,车间2,220,100,0.2,60,0.04,20
+支管3,B,车间3,180,100,0.2,60,0.04,20
+支管4,B,车间4,260,80,0.2,50,0.04,20
+"""
+
+RESULT_HEADERS = ["管段", "上游", "下游", "流量 (t/h)", "上游压力 (MPa)", "下游压力 (MPa)", "压降 (kPa)",
+                  "上游温度 (°C)", "下游温度 (°C)", "出口干度", "热损失 (kW)", "出口流速 (m/s)",
+                  "开始冷凝 (m)"]
+
+
+class SolveWorker(QThread):
+    """管网求解工作线程：大管网求解需要数秒，放到后台避免界面卡住"""
+    solved = Signal(object, float)   # NetworkResult, 用时 s
+    invalid = Signal(str)            # 输入或求解条件不合理（ValueError）
+    error = Signal(str)
+
+    def __init__(self, network):
+        super().__init__()
+        self.network = network
+
+    def run(self):
+        try:
+            start = time.perf_counter()
+            result = self.network.solve()
+            self.solved.emit(result, time.perf_counter() - start)
+        except ValueError as e:
+            self.invalid.emit(str(e))
+        except Exception as e:
+            self.error.emit(f"管网计算失败: {str(e)}")
+
+
+class SteamNetworkCalculator(QWidget):
+    """蒸汽管网计算器：节点、管段从表格导入，联立求解各管段流量、压力、温度和热损失"""
+
+    # 后台求解完成并显示结果后发出（供历史记录保存）
+    calculation_finished = Signal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._result = None
+        self.worker = None
+        self.setup_ui()
+
+    def setup_ui(self):
+        """设置蒸汽管网计算界面"""
+        main_layout = QVBoxLayout(self)
+        main_layout.setSpacing(10)
+
+        # 标题
+        title_label = QLabel("蒸汽管网计算")
+        title_label.setFont(QFont("Arial", 14, QFont.Bold))
+        title_label.setAlignment(Qt.AlignCenter)
+        title_label.setStyleSheet("color: #2c3e50; margin: 10px;")
+        main_layout.addWidget(title_label)
+
+        # 说明文本
+        desc_label = QLabel("汽源经多条管段向多个用户供汽时，联立求解各管段流量分配、沿程压降、温降和冷凝。"
+                            "节点表和管段表可从 CSV/TSV 文件导入或直接粘贴（第一行为表头），压力为绝压。")
+        desc_label.setWordWrap(True)
+        desc_label.setStyleSheet("color: #7f8c8d; margin: 5px;")
+        main_layout.addWidget(desc_label)
+
+        splitter = QSplitter(Qt.Vertical)
+
+        # 输入表格
+        input_widget = QWidget()
+        input_layout = QHBoxLayout(input_widget)
+        input_layout.setContentsMargins(0, 0, 0, 0)
+        self.nodes_edit = self._table_group(
+            input_layout, "节点表",
+            "列：节点, 类型(汽源/用户/节点), 压力_MPa, 温度_C, 用汽量_t/h（汽源填压力和温度，用户填用汽量）")
+        self.pipes_edit = self._table_group(
+            input_layout, "管段表",
+            "列：管段, 起点, 终点, 长度_m, 内径_mm, 粗糙度_mm, 保温厚度_mm, 保温导热系数_W_mK, 环境温度_C"
+            "（后四列可省略，缺省 0.2 / 0 / 0.04 / 20）")
+        splitter.addWidget(input_widget)
+
+        # 结果
+        result_widget = QWidget()
+        result_layout = QVBoxLayout(result_widget)
+        result_layout.setContentsMargins(0, 0, 0, 0)
+
+        button_layout = QHBoxLayout()
+        self.calc_btn = QPushButton("计算")
+        self.calc_btn.setStyleSheet("QPushButton { background-color: #3498db; color: white; padding: 8px; border-radius: 4px; }"
+                                    "QPushButton:hover { background-color: #2980b9; }")
+        self.calc_btn.clicked.connect(self.calculate)
+
+        self.sample_btn = QPushButton("载入示例")
+        self.sample_btn.clicked.connect(self.load_sample)
+
+        self.export_btn = QPushButton("导出结果")
+        self.export_btn.clicked.connect(self.export_results)
+
+        self.clear_btn = QPushButton("清空")
+        self.clear_btn.setStyleSheet("QPushButton { background-color: #95a5a6; color: white; padding: 8px; border-radius: 4px; }"
+                                     "QPushButton:hover { background-color: #7f8c8d; }")
+        self.clear_btn.clicked.connect(self.clear_inputs)
+
+        button_layout.addWidget(self.calc_btn)
+        button_layout.addWidget(self.sample_btn)
+        button_layout.addWidget(self.export_btn)
+        button_layout.addWidget(self.clear_btn)
+        button_layout.addStretch()
+        result_layout.addLayout(button_layout)
+
+        self.summary_label = QLabel("")
+        self.summary_label.setWordWrap(True)
+        self.summary_label.setStyleSheet("color: #2c3e50; margin: 5px;")
+        result_layout.addWidget(self.summary_label)
+
+        self.result_table = QTableWidget(0, len(RESULT_HEADERS))
+        self.result_table.setHorizontalHeaderLabels(RESULT_HEADERS)
+        self.result_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.result_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.result_table.verticalHeader().setVisible(False)
+        self.result_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        result_layout.addWidget(self.result_table)
+        splitter.addWidget(result_widget)
+
+        splitter.setStretchFactor(0, 1)
+        splitter.setStretchFactor(1, 2)
+        main_layout.addWidget(splitter)
+
+    def _table_group(self, layout, title, hint):
+        """创建一个表格输入区（文本框 + 导入按钮），返回文本框"""
+        group = QGroupBox(title)
+        group_layout = QVBoxLayout(group)
+
+        hint_label = QLabel(hint)
+        hint_label.setWordWrap(True)
+        hint_label.setStyleSheet("color: #7f8c8d; font-size: 11px;")
+        group_layout.addWidget(hint_label)
+
+        edit = QPlainTextEdit()
+        edit.setLineWrapMode(QPlainTextEdit.NoWrap)
+        group_layout.addWidget(edit)
+
+        import_btn = QPushButton(f"导入{title}...")
+        import_btn.clicked.connect(lambda: self.load_file(edit, title))
+        group_layout.addWidget(import_btn)
+
+        layout.addWidget(group)
+        return edit
+
+    def load_file(self, edit, title):
+        """导入 CSV/TSV/文本文件到对应的表格输入区"""
+        file_path, _ = QFileDialog.getOpenFileName(
+            self, f"导入{title}", "", "数据文件 (*.csv *.tsv *.txt);;所有文件 (*)"
+        )
+        if not file_path:
+            return
+        text = None
+        for encoding in ("utf-8-sig", "gbk"):
+            try:
+                with open(file_path, "r", encoding=encoding) as f:
+                    text = f.read()
+                break
+            except UnicodeDecodeError:
+                continue
+            except OSError as e:
+                QMessageBox.critical(self, "导入失败", f"读取文件时发生错误: {str(e)}")
+                return
+        if text is None:
+            QMessageBox.critical(self, "导入失败", "无法识别文件编码")
+            return
+        edit.setPlainText(text)
+
+    def load_sample(self):
+        """填入示例管网"""
+        self.nodes_edit.setPlainText(SAMPLE_NODES)
+        self.pipes_edit.setPlainText(SAMPLE_PIPES)
+
+    def clear_inputs(self):
+        """清空输入和结果"""
+        self.nodes_edit.clear()
+        self.pipes_edit.clear()
+        self.result_table.setRowCount(0)
+        self.summary_label.setText("")
+        self._result = None
+
+    def calculate(self):
+        """读取节点表、管段表，在工作线程中求解管网"""
+        if self.worker is not None and self.worker.isRunning():
+            return
+        self._result = None
+        try:
+            network = steam_network.SteamNetwork(
+                steam_network.read_table(self.nodes_edit.toPlainText()),
+                steam_network.read_table(self.pipes_edit.toPlainText()),
+            )
+        except ValueError as e:
+            self.on_solve_invalid(str(e))
+            return
+        except Exception as e:
+            self.on_solve_error(f"管网计算失败: {str(e)}")
+            return
+
+        self.calc_btn.setEnabled(False)
+        self.calc_btn.setText("计算中...")
+        self.result_table.setRowCount(0)
+        self.summary_label.setText(f"正在求解：节点 {len(network.node_names)} 个，"
+                                   f"管段 {len(network.pipe_names)} 条...")
+        self.worker = SolveWorker(network)
+        self.worker.solved.connect(self.on_solved)
+        self.worker.invalid.connect(self.on_solve_invalid)
+        self.worker.error.connect(self.on_solve_error)
+        self.worker.finished.connect(self.on_worker_finished)
+        self.worker.start()
+
+    def on_solved(self, result, elapsed):
+        """求解完成：显示结果"""
+        self._result = result
+        self.display_results(result, elapsed)
+        self.calculation_finished.emit()
+
+    def on_solve_invalid(self, message):
+        """输入或求解条件不合理"""
+        self.result_table.setRowCount(0)
+        self.summary_label.setText("")
+        QMessageBox.warning(self, "计算错误", message)
+
+    def on_solve_error(self, message):
+        """求解过程中的意外错误"""
+        self.result_table.setRowCount(0)
+        self.summary_label.setText("")
+        QMessageBox.critical(self, "计算错误", message)
+
+    def on_worker_finished(self):
+        """工作线程结束：恢复计算按钮"""
+        self.calc_btn.setEnabled(True)
+        self.calc_btn.setText("计算")
+
+    def _rows(self, result):
+        """结果表各行的显示文本"""
+        network = result.network
+        rows = []
+        for i, name in enumerate(network.pipe_names):
+            condensation = result.condensation_at[i]
+            rows.append([
+                name, result.upstream[i], result.downstream[i],
+                f"{abs(result.flow[i]) * 3.6:.3f}",
+                f"{result.p_in[i]:.4f}", f"{result.p_out[i]:.4f}",
+                f"{result.pressure_drop[i] * 1000:.2f}",
+                f"{result.t_in[i]:.1f}", f"{result.t_out[i]:.1f}",
+                f"{result.x_out[i]:.4f}", f"{result.heat_loss[i]:.2f}",
+                f"{result.velocity[i]:.1f}",
+                "—" if math.isnan(condensation) else f"{condensation:.0f}",
+            ])
+        return rows
+
+    def display_results(self, result, elapsed):
+        """显示各管段结果和汇总"""
+        rows = self._rows(result)
+        self.result_table.setRowCount(len(rows))
+        for r, row in enumerate(rows):
+            for c, text in enumerate(row):
+                item = QTableWidgetItem(text)
+                if c >= 3:
+                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                self.result_table.setItem(r, c, item)
+
+        network = result.network
+        consumers = network.demand > 0
+        summary = (f"节点 {len(network.node_names)} 个，管段 {len(network.pipe_names)} 条，"
+                   f"迭代 {result.iterations} 次，用时 {elapsed:.2f} s。"
+                   f"总用汽量 {network.demand.sum() * 3.6:.2f} t/h，总热损失 {result.heat_loss.sum():.1f} kW")
+        if consumers.any():
+            lowest = result.node_p[consumers].argmin()
+            summary += (f"；用户最低压力 {result.node_p[consumers][lowest]:.4f} MPa"
+                        f"（{network.node_names[consumers][lowest]}），"
+                        f"最低温度 {result.node_t[consumers].min():.1f} °C，"
+                        f"最低干度 {result.node_x[consumers].min():.4f}")
+        self.summary_label.setText(summary)
+
+    def export_results(self):
+        """保存各管段结果为 CSV"""
+        if self._result is None:
+            QMessageBox.warning(self, "提示", "没有可导出的计算结果")
+            return
+        file_path, _ = QFileDialog.getSaveFileName(
+            self, "导出管网计算结果", "蒸汽管网计算结果.csv", "CSV Files (*.csv)"
+        )
+        if not file_path:
+            return
+        try:
+            buffer = io.StringIO()
+            writer = csv.writer(buffer, lineterminator="\n")
+            writer.writerow(RESULT_HEADERS)
+            writer.writerows(self._rows(self._result))
+            # utf-8-sig 便于 Excel 正确识别中文表头
+            with open(file_path, "w", encoding="utf-8-sig", newline="") as f:
+                f.write(buffer.getvalue())
+            QMessageBox.information(self, "导出成功", f"计算结果已保存到:\n{file_path}")
+        except Exception as e:
+            QMessageBox.critical(self, "导出失败", f"保存计算结果时发生错误: {str(e)}")
+
+    def _get_history_data(self):
+        """提供历史记录数据"""
+        result = self._result
+        if result is None:
+            return None
+        network = result.network
+        inputs = {
+            "节点数": len(network.node_names),
+            "管段数": len(network.pipe_names),
+            "汽源数": int(network.source.sum()),
+            "总用汽量_t_h": round(float(network.demand.sum() * 3.6), 3),
+        }
+        consumers = network.demand > 0
+        outputs = {
+            "迭代次数": result.iterations,
+            "总热损失_kW": round(float(result.heat_loss.sum()), 1),
+            "最大压降_kPa": round(float(result.pressure_drop.max() * 1000), 2),
+        }
+        if consumers.any():
+            outputs["用户最低压力_MPa"] = round(float(result.node_p[consumers].min()), 4)
+            outputs["用户最低温度_C"] = round(float(result.node_t[consumers].min()), 1)
+        return {"inputs": inputs, "outputs": outputs}
+
+
+if __name__ == "__main__":
+    # 测试代码
+    import sys
+    from PySide6.QtWidgets import QApplication
+
+    app = QApplication(sys.argv)
+
+    calculator = SteamNetworkCalculator()
+    calculator.resize(1000, 800)
+    calculator.show()
+
+    sys.exit(app.exec())
@@ -9,6 +9,8 @@ import math
 import re
 from datetime import datetime
 
+from thermo.property_service import service
+
 
 class 蒸汽管径流量(QWidget):
     """蒸汽管径和流量查询（左右布局优化版 - 统一UI风格）"""
@@ -768,15 +770,11 @@ class 蒸汽管径流量(QWidget):
     • 计算结果仅供参考，实际应用请考虑具体工况"""
     
     def calculate_steam_density(self, pressure_mpa, temperature_c):
-        """计算蒸汽密度"""
-        pressure_bar = pressure_mpa * 10
-        
-        if temperature_c < 200:
-            density = 0.6 * pressure_bar / (temperature_c + 100)
-        else:
-            density = 0.5 * pressure_bar / (temperature_c + 150)
-        
-        return max(density, 0.1)
+        """计算蒸汽密度（IAPWS-IF97）；温度不高于饱和温度时按干饱和蒸汽计算"""
+        density = service.get("water", temperature_c + 273.15, pressure_mpa, "vapor")["rho"]
+        if math.isnan(density):
+            raise ValueError("蒸汽压力或温度超出 IAPWS-IF97 适用范围")
+        return density
     
     def get_project_info(self):
         """获取工程信息 - 使用共享的项目信息"""
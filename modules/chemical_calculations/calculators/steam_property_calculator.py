@@ -10,6 +10,9 @@ import math
 import re
 from datetime import datetime
 
+from thermo import if97
+from thermo.property_service import service
+
 
 class SteamPropertyCalculator(QWidget):
     """水蒸气性质查询（与压降计算模块保持相同UI风格）"""
@@ -805,6 +808,10 @@ class SteamPropertyCalculator(QWidget):
             pressure_mpa = self.calculate_saturation_pressure(temperature_c)
             saturation_temp = temperature_c
         
+        if math.isnan(pressure_mpa) or math.isnan(saturation_temp):
+            QMessageBox.warning(self, "输入错误", "饱和状态仅适用于三相点至临界点之间（0.01~373.946 °C）")
+            return
+        
         # 计算物性
         density = self.calculate_steam_density(pressure_mpa, saturation_temp, dryness)
         enthalpy = self.calculate_enthalpy(pressure_mpa, saturation_temp, dryness)
@@ -869,7 +876,11 @@ class SteamPropertyCalculator(QWidget):
             # 判断状态
             saturation_temp = self.calculate_saturation_temperature(pressure_mpa)
             
-            if temperature_c < saturation_temp - 0.1:
+            if pressure_mpa >= if97.PC:
+                state = "超临界流体"
+                state_icon = ""
+                dryness = 1
+            elif temperature_c < saturation_temp - 0.1:
                 state = "过冷水"
                 state_icon = ""
                 dryness = 0
@@ -882,56 +893,36 @@ class SteamPropertyCalculator(QWidget):
                 state_icon = ""
                 dryness = 1
         
-        elif "压力 P 和比焓 H" in param_combo:
+        else:
+            # 压力 P 和比焓 H / 压力 P 和比熵 S：由 IAPWS-IF97 反算温度和干度
             pressure_mpa = param1_value
-            enthalpy_kjkg = param2_value
-            
-            # 计算饱和性质
             saturation_temp = self.calculate_saturation_temperature(pressure_mpa)
-            h_f = self.calculate_enthalpy(pressure_mpa, saturation_temp, 0)  # 饱和水焓
-            h_g = self.calculate_enthalpy(pressure_mpa, saturation_temp, 1)  # 饱和蒸汽焓
+            if "压力 P 和比焓 H" in param_combo:
+                point = if97.props_ph(pressure_mpa, param2_value)
+            else:
+                point = if97.props_ps(pressure_mpa, param2_value)
             
-            if enthalpy_kjkg <= h_f:
-                state = "过冷水"
+            if point.region == 0:
+                QMessageBox.warning(self, "输入错误", "参数超出 IAPWS-IF97 适用范围")
+                return
+            
+            temperature_c = point.t_c
+            if pressure_mpa >= if97.PC:
+                state = "超临界流体"
                 state_icon = ""
-                temperature_c = enthalpy_kjkg / 4.18  # 简化计算
-                dryness = 0
-            elif h_f < enthalpy_kjkg < h_g:
+                dryness = 1
+            elif point.region == 4:
                 state = "湿蒸汽"
                 state_icon = ""
-                dryness = (enthalpy_kjkg - h_f) / (h_g - h_f)
-                temperature_c = saturation_temp
-            else:
-                state = "过热蒸汽"
-                state_icon = ""
-                dryness = 1
-                # 简化计算过热蒸汽温度
-                temperature_c = saturation_temp + (enthalpy_kjkg - h_g) / 2.0
-        
-        else:  # 压力 P 和比熵 S
-            pressure_mpa = param1_value
-            entropy_kjkgk = param2_value
-            
-            # 简化计算
-            saturation_temp = self.calculate_saturation_temperature(pressure_mpa)
-            s_f = self.calculate_entropy(pressure_mpa, saturation_temp, 0)  # 饱和水熵
-            s_g = self.calculate_entropy(pressure_mpa, saturation_temp, 1)  # 饱和蒸汽熵
-            
-            if entropy_kjkgk <= s_f:
+                dryness = point.x
+            elif temperature_c < saturation_temp:
                 state = "过冷水"
                 state_icon = ""
-                temperature_c = saturation_temp - 5  # 简化
                 dryness = 0
-            elif s_f < entropy_kjkgk < s_g:
-                state = "湿蒸汽"
-                state_icon = ""
-                dryness = (entropy_kjkgk - s_f) / (s_g - s_f)
-                temperature_c = saturation_temp
             else:
                 state = "过热蒸汽"
                 state_icon = ""
                 dryness = 1
-                temperature_c = saturation_temp + 50  # 简化
         
         # 计算物性
         density = self.calculate_steam_density(pressure_mpa, temperature_c, dryness)
@@ -966,107 +957,34 @@ class SteamPropertyCalculator(QWidget):
             })
     
     def calculate_saturation_temperature(self, pressure_mpa):
-        """计算饱和温度"""
-        # IAPWS-IF97 简化公式（0.001~22.064 MPa）
-        pressure_bar = pressure_mpa * 10
-        
-        # 使用IAPWS近似公式
-        if pressure_bar <= 0.1:
-            return 45.8
-        elif pressure_bar <= 1:
-            return 99.6 + (pressure_bar - 0.1) * 30
-        elif pressure_bar <= 10:
-            return 179.9 + (pressure_bar - 1) * 12
-        elif pressure_bar <= 50:
-            return 263.9 + (pressure_bar - 10) * 3.5
-        elif pressure_bar <= 100:
-            return 311.0 + (pressure_bar - 50) * 1.5
-        elif pressure_bar <= 200:
-            return 365.8 + (pressure_bar - 100) * 1.1
-        else:
-            return 374.1  # 临界温度
+        """计算饱和温度 °C（IAPWS-IF97，超出 611.213 Pa~22.064 MPa 时为 NaN）"""
+        return if97.tsat(pressure_mpa) - 273.15
     
     def calculate_saturation_pressure(self, temperature_c):
-        """计算饱和压力"""
-        # IAPWS-IF97 简化公式（0.01~374 °C）
-        if temperature_c <= 100:
-            return 0.1013 * (temperature_c / 100) ** 4
-        elif temperature_c <= 200:
-            return 0.1013 * (temperature_c / 100) ** 3
-        elif temperature_c <= 300:
-            return 0.1013 * (temperature_c / 100) ** 2.5
-        elif temperature_c <= 374:
-            return 22.064 * ((temperature_c - 300) / 74) ** 2
-        else:
-            return 22.064  # 临界压力
+        """计算饱和压力 MPa（IAPWS-IF97，超出 0.01~373.946 °C 时为 NaN）"""
+        return if97.psat(temperature_c + 273.15)
+    
+    def get_state(self, pressure_mpa, temperature_c, dryness=1):
+        """
+        查询状态点：湿蒸汽（0 < 干度 < 1）或温度与饱和温度相差不足 0.1 °C 时按饱和线计算，
+        否则按 (P, T) 单相计算。返回物性服务的结果字典（rho、h、s 等）
+        """
+        saturation_temp = self.calculate_saturation_temperature(pressure_mpa)
+        if 0 < dryness < 1 or abs(temperature_c - saturation_temp) < 0.1:
+            return service.get("water", P=pressure_mpa, phase=float(dryness))
+        return service.get("water", temperature_c + 273.15, pressure_mpa)
     
     def calculate_steam_density(self, pressure_mpa, temperature_c, dryness=1):
-        """计算蒸汽密度"""
-        pressure_bar = pressure_mpa * 10
-        
-        if dryness < 1:  # 湿蒸汽
-            # 饱和水密度
-            rho_f = 1000 - (temperature_c - 100) * 1.5
-            # 饱和蒸汽密度
-            if temperature_c < 200:
-                rho_g = 0.6 * pressure_bar / (temperature_c + 100)
-            else:
-                rho_g = 0.5 * pressure_bar / (temperature_c + 150)
-            
-            # 混合密度
-            v_f = 1 / rho_f if rho_f > 0 else 0
-            v_g = 1 / rho_g if rho_g > 0 else 0
-            v = (1 - dryness) * v_f + dryness * v_g
-            return 1 / v if v > 0 else 0
-        else:  # 单相
-            if temperature_c < 200:
-                density = 0.6 * pressure_bar / (temperature_c + 100)
-            else:
-                density = 0.5 * pressure_bar / (temperature_c + 150)
-            
-            return max(density, 0.1)
+        """计算蒸汽密度 kg/m³"""
+        return self.get_state(pressure_mpa, temperature_c, dryness)["rho"]
     
     def calculate_enthalpy(self, pressure_mpa, temperature_c, dryness=1):
-        """计算比焓"""
-        saturation_temp = self.calculate_saturation_temperature(pressure_mpa)
-        
-        if dryness < 1:  # 湿蒸汽
-            # 饱和水焓
-            h_f = 4.18 * saturation_temp
-            # 饱和蒸汽焓
-            h_g = 2675 + pressure_mpa * 10
-            
-            return (1 - dryness) * h_f + dryness * h_g
-        else:  # 单相
-            if temperature_c < saturation_temp - 0.1:
-                return 4.18 * temperature_c  # 过冷水
-            elif abs(temperature_c - saturation_temp) < 0.1:
-                return 2675 + pressure_mpa * 10  # 饱和蒸汽
-            else:
-                # 过热蒸汽
-                h_sat = 2675 + pressure_mpa * 10
-                return h_sat + (temperature_c - saturation_temp) * 2.0
+        """计算比焓 kJ/kg"""
+        return self.get_state(pressure_mpa, temperature_c, dryness)["h"]
     
     def calculate_entropy(self, pressure_mpa, temperature_c, dryness=1):
-        """计算比熵"""
-        saturation_temp = self.calculate_saturation_temperature(pressure_mpa)
-        
-        if dryness < 1:  # 湿蒸汽
-            # 饱和水熵
-            s_f = 0.5 + 0.01 * saturation_temp
-            # 饱和蒸汽熵
-            s_g = 6.5 + pressure_mpa * 0.1
-            
-            return (1 - dryness) * s_f + dryness * s_g
-        else:  # 单相
-            if temperature_c < saturation_temp - 0.1:
-                return 0.5 + 0.01 * temperature_c  # 过冷水
-            elif abs(temperature_c - saturation_temp) < 0.1:
-                return 6.5 + pressure_mpa * 0.1  # 饱和蒸汽
-            else:
-                # 过热蒸汽
-                s_sat = 6.5 + pressure_mpa * 0.1
-                return s_sat + (temperature_c - saturation_temp) * 0.005
+        """计算比熵 kJ/(kg·K)"""
+        return self.get_state(pressure_mpa, temperature_c, dryness)["s"]
     
     # ==================== 结果格式化函数 ====================
     
@@ -1115,9 +1033,7 @@ class SteamPropertyCalculator(QWidget):
                         应用建议
 ═══════════════════════════════════════════════════
 
-• 以上数据为工程近似值
-• 实际应用请参考IAPWS-IF97标准
-• 对于精确计算，建议使用专业物性软件
+• 以上数据按 IAPWS-IF97 工业公式计算
 • 在临界点附近物性变化剧烈，需要特别注意"""
     
     def format_other_result(self, param_combo, pressure, param2_value, temperature, saturation_temp,
@@ -1168,9 +1084,7 @@ class SteamPropertyCalculator(QWidget):
                         应用建议
 ═══════════════════════════════════════════════════
 
-• 以上数据为工程近似值
-• 实际应用请参考IAPWS-IF97标准
-• 对于精确计算，建议使用专业物性软件
+• 以上数据按 IAPWS-IF97 工业公式计算
 • 在临界点附近物性变化剧烈，需要特别注意"""
     
     # ==================== 报告生成函数 ====================
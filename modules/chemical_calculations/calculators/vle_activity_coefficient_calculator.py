@@ -9,6 +9,8 @@ import math
 import numpy as np
 from scipy.optimize import fsolve
 
+from thermo.property_service import service, Antoine
+
 
 class VLEActivityCoefficientCalculator(QWidget):
     """气液平衡（活度系数法）计算器"""
@@ -376,12 +378,11 @@ class VLEActivityCoefficientCalculator(QWidget):
         """计算气液平衡"""
         n = len(components)
         
-        # 计算饱和蒸气压
+        # 计算饱和蒸气压（Antoine方程: log10(P) = A - B/(T + C)，经共享物性服务缓存）
         Psat = []
         for comp in components:
-            # Antoine方程: log10(P) = A - B/(T + C)
-            logPsat = comp['antoine_a'] - comp['antoine_b'] / (T + comp['antoine_c'])
-            Psat_i = 10 ** logPsat  # kPa
+            antoine = Antoine(comp['antoine_a'], comp['antoine_b'], comp['antoine_c'])
+            Psat_i = service.get(antoine, T + 273.15)["psat"] * 1000  # kPa
             Psat.append(Psat_i)
         
         # 获取液相组成
@@ -8,9 +8,56 @@ import sys
 import os
 import importlib.util
 
+from startup_trace import startup_trace
+
 class ChemicalCalculationsWidget(QWidget):
     """工程计算模块 - 左侧导航布局"""
     
+    # 懒加载模式：导航列表仅由元数据填充，计算器模块在首次选中时才导入和构建
+    LAZY_PAGES = True
+
+    # 计算器页面配置
+    PAGE_CONFIGS = [
+        # (显示名称, 计算器类名, 模块文件名, 是否支持data_manager)
+        ("篮式过滤器", "篮式过滤器", "basket_filter_design_calculator", True),
+        ("压降计算", "压降计算", "pressure_drop_calculator", True),
+        ("管径计算", "管径计算", "pipe_diameter_calculator", True),
+        ("管道跨距", "管道跨距", "pipe_span_calculator", True),
+        ("管道间距", "管道间距", "pipe_spacing_calculator", True),
+        ("管道补偿", "管道补偿", "pipe_compensation_calculator", True),
+        ("管道壁厚", "管道壁厚", "pipe_thickness_calculator", True),
+        ("蒸汽管径流量", "蒸汽管径流量", "steam_pipe_calculator", True),
+        ("气体标态转压缩态", "气体标态转压缩态", "gas_state_converter", True),
+        ("压力管道定义", "压力管道定义", "pressure_pipe_definition", False),
+        ("消火栓计算", "消火栓计算", "fire_hydrant_calculator", False),
+        ("换热器计算", "换热器计算", "heat_exchanger_calculator", True),
+        ("换热器面积", "换热器面积", "heat_exchanger_area_calculator", True),
+        ("罐体重量", "罐体重量", "tank_weight_calculator", False),
+        ("设备尺寸计算", "设备尺寸计算", "vessel_sizing_calculator", True),
+        ("保温厚度计算", "InsulationThicknessCalculator", "insulation_thickness_calculator", False),
+        ("法兰查询", "FlangeSizeCalculator", "flange_size_calculator", False),
+        ("安全阀计算", "SafetyValveCalculator", "safety_valve_calculator", False),
+        ("长输蒸汽管道温降计算", "LongDistanceSteamPipeCalculator", "long_distance_steam_pipe_calculator", False),
+        ("蒸汽管网计算", "SteamNetworkCalculator", "steam_network_calculator", False),
+        ("泄压面积计算", "ReliefAreaCalculator", "relief_area_calculator", False),
+        ("风机功率计算", "FanPowerCalculator", "fan_power_calculator", False),
+        ("水蒸气性质", "SteamPropertyCalculator", "steam_property_calculator", False),
+        ("纯物质物性查询", "PureSubstanceProperties", "pure_substance_properties", False),
+        ("湿空气计算", "WetAirCalculator", "wet_air_calculator", False),
+        ("混合液体闪点", "MixedLiquidFlashPointCalculator", "mixed_liquid_flash_point_calculator", False),
+        ("EOS状态方程", "EOSCalculator", "eos_calculator", False),
+        ("汽液平衡(活度系数)", "VLEActivityCoefficientCalculator", "vle_activity_coefficient_calculator", False),
+        ("气体混合物(EOS)", "GasMixturePropertiesCalculator", "gas_mixture_properties_calculator", False),
+        ("腐蚀查询", "CorrosionDataQuery", "corrosion_data_query", False),
+        ("固体溶解度", "SolidSolubilityCalculator", "solid_solubility_calculator", False),
+        ("制冷剂物性", "RefrigerantPropertiesCalculator", "refrigerant_properties_calculator", False),
+        ("制冷循环计算", "RefrigerationCycleCalculator", "refrigeration_cycle_calculator", False),
+        ("危险化学品", "HazardousChemicalsQuery", "hazardous_chemicals_query", False),
+        ("离心泵功率计算", "CentrifugalPumpCalculator", "pump_power_calculator", False),
+        ("离心泵NPSHa计算", "NPSHaCalculator", "npsha_calculator", False),
+        ("可压缩流体压降", "CompressibleFlowPressureDrop", "compressible_flow_pressure_drop", False),
+    ]
+
     def __init__(self, parent=None, data_manager=None):
         super().__init__(parent)
 
@@ -28,6 +75,8 @@ class ChemicalCalculationsWidget(QWidget):
 
         # 初始化页面列表
         self.pages = []
+        # 尚未构建的懒加载页面：行号 -> 页面配置
+        self._pending_pages = {}
 
         # 设置UI
         self.setup_ui()
@@ -87,7 +136,7 @@ class ChemicalCalculationsWidget(QWidget):
         self.add_calculator_pages()
         
         # 连接选择事件
-        self.nav_list.currentRowChanged.connect(self.content_stack.setCurrentIndex)
+        self.nav_list.currentRowChanged.connect(self._on_nav_row_changed)
         
         # 创建左侧区域（包含标题和导航列表）
         left_widget = QWidget()
@@ -121,50 +170,18 @@ class ChemicalCalculationsWidget(QWidget):
 
     def add_calculator_pages(self):
         """添加所有计算器页面"""
-        # 定义计算器页面配置
-        page_configs = [
-            # (显示名称, 计算器类名, 模块文件名, 是否支持data_manager)
-            ("篮式过滤器", "篮式过滤器", "basket_filter_design_calculator", True),
-            ("压降计算", "压降计算", "pressure_drop_calculator", True),
-            ("管径计算", "管径计算", "pipe_diameter_calculator", True),
-            ("管道跨距", "管道跨距", "pipe_span_calculator", True),
-            ("管道间距", "管道间距", "pipe_spacing_calculator", True),
-            ("管道补偿", "管道补偿", "pipe_compensation_calculator", True),
-            ("管道壁厚", "管道壁厚", "pipe_thickness_calculator", True),
-            ("蒸汽管径流量", "蒸汽管径流量", "steam_pipe_calculator", True),
-            ("气体标态转压缩态", "气体标态转压缩态", "gas_state_converter", True),
-            ("压力管道定义", "压力管道定义", "pressure_pipe_definition", False),
-            ("消火栓计算", "消火栓计算", "fire_hydrant_calculator", False),
-            ("换热器计算", "换热器计算", "heat_exchanger_calculator", True),
-            ("换热器面积", "换热器面积", "heat_exchanger_area_calculator", True),
-            ("罐体重量", "罐体重量", "tank_weight_calculator", False),
-            ("设备尺寸计算", "设备尺寸计算", "vessel_sizing_calculator", True),
-            ("保温厚度计算", "InsulationThicknessCalculator", "insulation_thickness_calculator", False),
-            ("法兰查询", "FlangeSizeCalculator", "flange_size_calculator", False),
-            ("安全阀计算", "SafetyValveCalculator", "safety_valve_calculator", False),
-            ("长输蒸汽管道温降计算", "LongDistanceSteamPipeCalculator", "long_distance_steam_pipe_calculator", False),
-            ("泄压面积计算", "ReliefAreaCalculator", "relief_area_calculator", False),
-            ("风机功率计算", "FanPowerCalculator", "fan_power_calculator", False),
-            ("水蒸气性质", "SteamPropertyCalculator", "steam_property_calculator", False),
-            ("纯物质物性查询", "PureSubstanceProperties", "pure_substance_properties", False),
-            ("湿空气计算", "WetAirCalculator", "wet_air_calculator", False),
-            ("混合液体闪点", "MixedLiquidFlashPointCalculator", "mixed_liquid_flash_point_calculator", False),
-            ("EOS状态方程", "EOSCalculator", "eos_calculator", False),
-            ("汽液平衡(活度系数)", "VLEActivityCoefficientCalculator", "vle_activity_coefficient_calculator", False),
-            ("气体混合物(EOS)", "GasMixturePropertiesCalculator", "gas_mixture_properties_calculator", False),
-            ("腐蚀查询", "CorrosionDataQuery", "corrosion_data_query", False),
-            ("固体溶解度", "SolidSolubilityCalculator", "solid_solubility_calculator", False),
-            ("制冷剂物性", "RefrigerantPropertiesCalculator", "refrigerant_properties_calculator", False),
-            ("制冷循环计算", "RefrigerationCycleCalculator", "refrigeration_cycle_calculator", False),
-            ("危险化学品", "HazardousChemicalsQuery", "hazardous_chemicals_query", False),
-            ("离心泵功率计算", "CentrifugalPumpCalculator", "pump_power_calculator", False),
-            ("离心泵NPSHa计算", "NPSHaCalculator", "npsha_calculator", False),
-            ("可压缩流体压降", "CompressibleFlowPressureDrop", "compressible_flow_pressure_drop", False),
-        ]
-        
+        if self.LAZY_PAGES:
+            # 仅添加导航项和轻量占位页，计算器在首次选中时构建
+            for config in self.PAGE_CONFIGS:
+                self._pending_pages[len(self.pages)] = config
+                self.add_page(config[0], self.create_loading_widget(config[0]))
+            if len(self.pages) == 0:
+                self.add_fallback_page()
+            return
+
         # 添加所有页面
         success_count = 0
-        for title, calculator_name, module_name, supports_data_manager in page_configs:
+        for title, calculator_name, module_name, supports_data_manager in self.PAGE_CONFIGS:
             try:
                 widget = self.create_calculator_widget(calculator_name, module_name, supports_data_manager)
                 self.add_page(title, widget)
@@ -179,6 +196,33 @@ class ChemicalCalculationsWidget(QWidget):
         if len(self.pages) == 0:
             self.add_fallback_page()
 
+    def _on_nav_row_changed(self, row):
+        """导航切换：按需构建页面后再显示"""
+        self.ensure_page(row)
+        self.content_stack.setCurrentIndex(row)
+
+    def ensure_page(self, row):
+        """确保指定行的计算器页面已构建（懒加载模式下首次访问时导入模块）"""
+        config = self._pending_pages.pop(row, None)
+        if config is None:
+            return self.pages[row] if 0 <= row < len(self.pages) else None
+
+        title, calculator_name, module_name, supports_data_manager = config
+        try:
+            widget = self.create_calculator_widget(calculator_name, module_name, supports_data_manager)
+        except Exception as e:
+            print(f"FAIL: {title} 页面创建失败: {e}")
+            widget = self.create_error_widget(title, str(e))
+            self.nav_list.item(row).setText(f"{title} (错误)")
+
+        # 用真实页面替换占位页
+        placeholder = self.pages[row]
+        self.content_stack.insertWidget(row, widget)
+        self.content_stack.removeWidget(placeholder)
+        placeholder.deleteLater()
+        self.pages[row] = widget
+        return widget
+
     def create_calculator_widget(self, calculator_name, module_name, supports_data_manager):
         """动态创建计算器部件"""
         try:
@@ -192,31 +236,34 @@ class ChemicalCalculationsWidget(QWidget):
                 raise FileNotFoundError(f"计算器文件不存在: {calculator_path}")
 
             # 使用 importlib 动态导入模块
-            spec = importlib.util.spec_from_file_location(module_name, calculator_path)
-            module = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(module)
+            with startup_trace.span(module_name, "import", "calculator"):
+                spec = importlib.util.spec_from_file_location(module_name, calculator_path)
+                module = importlib.util.module_from_spec(spec)
+                spec.loader.exec_module(module)
 
-            # 获取计算器类
-            calculator_class = getattr(module, calculator_name)
+                # 获取计算器类
+                calculator_class = getattr(module, calculator_name)
 
             # 根据是否支持data_manager选择初始化方式
-            if supports_data_manager and self.data_manager is not None:
-                widget = calculator_class(data_manager=self.data_manager)
-            else:
-                widget = calculator_class()
-
-            # 注入计算器元数据（用于历史记录）
-            widget._calc_meta = {
-                "id": module_name,
-                "name": calculator_name,
-                "category": self._get_category_from_module(module_name),
-            }
+            with startup_trace.span(module_name, "construct", "calculator"):
+                if supports_data_manager and self.data_manager is not None:
+                    widget = calculator_class(data_manager=self.data_manager)
+                else:
+                    widget = calculator_class()
 
-            # 连接所有"计算"按钮的 clicked 信号以保存历史
-            self._connect_calculate_buttons(widget)
+            with startup_trace.span(module_name, "wire", "calculator"):
+                # 注入计算器元数据（用于历史记录）
+                widget._calc_meta = {
+                    "id": module_name,
+                    "name": calculator_name,
+                    "category": self._get_category_from_module(module_name),
+                }
 
-            # 安装事件过滤器作为备用方案
-            widget.installEventFilter(self)
+                # 连接所有"计算"按钮的 clicked 信号以保存历史
+                self._connect_calculate_buttons(widget)
+
+                # 安装事件过滤器作为备用方案
+                widget.installEventFilter(self)
 
             return widget
 
@@ -225,6 +272,18 @@ class ChemicalCalculationsWidget(QWidget):
             # 返回占位符部件
             return self.create_placeholder_widget(calculator_name)
 
+    def create_loading_widget(self, title):
+        """创建懒加载占位部件（计算器构建前显示）"""
+        widget = QWidget()
+        layout = QVBoxLayout(widget)
+
+        label = QLabel(f"{title}\n正在加载...")
+        label.setAlignment(Qt.AlignCenter)
+        label.setStyleSheet("color: #7f8c8d; font-size: 14px; padding: 20px;")
+        layout.addWidget(label)
+
+        return widget
+
     def create_placeholder_widget(self, calculator_name):
         """创建占位符部件"""
         widget = QWidget()
@@ -294,7 +353,9 @@ class ChemicalCalculationsWidget(QWidget):
         """拦截计算器子控件事件，保存历史记录"""
         if event.type() == QEvent.Type.MouseButtonPress:
             child = obj.childAt(event.position().toPoint())
-            if isinstance(child, QPushButton) and self._is_calculate_button(child):
+            # 已通过 clicked 信号连接的按钮不再重复保存
+            if (isinstance(child, QPushButton) and self._is_calculate_button(child)
+                    and not child.property("_history_connected")):
                 print(f"[历史] 捕获到计算按钮点击: {child.text()}")
                 QTimer.singleShot(100, lambda w=obj: self._save_history_for(w))
         return super().eventFilter(obj, event)
@@ -305,14 +366,21 @@ class ChemicalCalculationsWidget(QWidget):
         return text in ("计算", "计算功率", "计算结果", "开始计算", "计算压降") or text.startswith("计算")
 
     def _connect_calculate_buttons(self, widget):
-        """查找并连接所有计算按钮的 clicked 信号"""
+        """查找并连接所有计算按钮的 clicked 信号；后台计算的计算器改为连接 calculation_finished 信号"""
         try:
+            # 后台线程计算时点击按钮后结果尚未返回，改在计算完成时保存
+            finished = getattr(widget, "calculation_finished", None)
+            if finished is not None:
+                finished.connect(lambda w=widget: self._save_history_for(w))
+                print(f"[历史] 已连接计算完成信号 -> {widget._calc_meta['name']}")
             # 查找所有按钮
             for btn in widget.findChildren(QPushButton):
                 if self._is_calculate_button(btn):
-                    # 使用 lambda 捕获 widget 引用
-                    btn.clicked.connect(lambda checked, w=widget: self._save_history_for(w))
-                    print(f"[历史] 已连接按钮: {btn.text()} -> {widget._calc_meta['name']}")
+                    if finished is None:
+                        # 使用 lambda 捕获 widget 引用
+                        btn.clicked.connect(lambda checked, w=widget: self._save_history_for(w))
+                        print(f"[历史] 已连接按钮: {btn.text()} -> {widget._calc_meta['name']}")
+                    btn.setProperty("_history_connected", True)
         except Exception as e:
             print(f"[历史] 连接按钮失败: {e}")
 
@@ -332,7 +400,7 @@ class ChemicalCalculationsWidget(QWidget):
                 print(f"[历史] _get_history_data 返回空，跳过")
                 return
             from modules.history_db import HistoryDB
-            HistoryDB().save(
+            HistoryDB().save_async(
                 calculator_id=meta["id"],
                 calculator_name=meta["name"],
                 calculator_category=meta.get("category", ""),
@@ -340,7 +408,7 @@ class ChemicalCalculationsWidget(QWidget):
                 outputs=data.get("outputs", {}),
                 notes=data.get("notes", ""),
             )
-            print(f"[历史] 已保存: {meta['name']} | inputs={data.get('inputs')}")
+            print(f"[历史] 已提交保存: {meta['name']} | inputs={data.get('inputs')}")
         except Exception as e:
             print(f"[历史] 保存失败: {e}")
             import traceback; traceback.print_exc()
@@ -366,6 +434,7 @@ class ChemicalCalculationsWidget(QWidget):
         "flange_size_calculator": "其他",
         "safety_valve_calculator": "安全/消防",
         "long_distance_steam_pipe_calculator": "管道",
+        "steam_network_calculator": "管道",
         "relief_area_calculator": "安全/消防",
         "fan_power_calculator": "流体设备",
         "steam_property_calculator": "热工/制冷",
@@ -13,6 +13,7 @@ from .energy_converter import EnergyConverter
 from .pressure_converter import PressureConverter
 from .power_converter import PowerConverter
 from .force_converter import ForceConverter
+from .batch_converter import BatchConverter
 
 __all__ = [
     'ScientificCalculator',
@@ -28,5 +29,6 @@ __all__ = [
     'EnergyConverter',
     'PressureConverter',
     'PowerConverter',
-    'ForceConverter'
+    'ForceConverter',
+    'BatchConverter'
 ]
\ No newline at end of file
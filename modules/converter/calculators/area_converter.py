@@ -2,8 +2,12 @@ from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
                               QLineEdit, QScrollArea, QGridLayout, QFrame)
 from PySide6.QtCore import Qt
 
+from .unit_registry import registry
+
 class AreaConverter(QWidget):
     """面积单位换算器"""
+
+    quantity = registry.quantity("area")
     
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -89,7 +93,7 @@ class AreaConverter(QWidget):
         layout.addWidget(scroll_area)
     
     def on_unit_input(self, text, source_unit):
-        """处理单位输入"""
+        """处理单位输入：一次向量运算得到所有单位的结果"""
         try:
             source_value = text.strip()
             if not source_value:
@@ -101,72 +105,17 @@ class AreaConverter(QWidget):
                 return
             
             value = float(source_value)
+            results = self.quantity.convert_all(value, source_unit)
             
             for unit_code, entry in self.unit_vars.items():
                 if unit_code != source_unit:
-                    result = self.do_conversion(value, source_unit, unit_code)
                     entry.blockSignals(True)
-                    entry.setText(f"{result:.6g}")
+                    entry.setText(f"{results[self.quantity.index[unit_code]]:.6g}")
                     entry.blockSignals(False)
                     
         except ValueError:
             pass
     
     def do_conversion(self, value, from_unit, to_unit):
-        """执行面积换算"""
-        # 先转换为平方米
-        to_sqm = {
-            # 国际单位制
-            "km2": value * 1000000,      # 1平方公里 = 1,000,000平方米
-            "m2": value,                 # 1平方米 = 1平方米
-            "ha": value * 10000,         # 1公顷 = 10,000平方米
-            "a": value * 100,            # 1公亩 = 100平方米
-            "dm2": value * 0.01,         # 1平方分米 = 0.01平方米
-            "cm2": value * 0.0001,       # 1平方厘米 = 0.0001平方米
-            "mm2": value * 0.000001,     # 1平方毫米 = 0.000001平方米
-            "um2": value * 0.000000000001, # 1平方微米 = 10^-12平方米
-            
-            # 英制单位
-            "mi2": value * 2589988.110336, # 1平方英里 = 2,589,988.110336平方米
-            "ac": value * 4046.8564224,    # 1英亩 = 4,046.8564224平方米
-            "yd2": value * 0.83612736,     # 1平方码 = 0.83612736平方米
-            "ft2": value * 0.09290304,     # 1平方英尺 = 0.09290304平方米
-            "in2": value * 0.00064516,     # 1平方英寸 = 0.00064516平方米
-            "rd2": value * 25.29285264,    # 1平方竿 = 25.29285264平方米
-            
-            # 中国市制单位
-            "qing": value * 66666.6667,    # 1市顷 = 66,666.6667平方米
-            "mu": value * 666.666667,      # 1市亩 = 666.666667平方米
-            "chi2": value * 1/9,           # 1平方尺 = 1/9平方米 ≈ 0.111111平方米
-            "cun2": value * 1/900          # 1平方寸 = 1/900平方米 ≈ 0.00111111平方米
-        }
-        
-        # 从平方米转换为目标单位
-        from_sqm = {
-            # 国际单位制
-            "km2": 0.000001,              # 1平方米 = 0.000001平方公里
-            "m2": 1,                      # 1平方米 = 1平方米
-            "ha": 0.0001,                 # 1平方米 = 0.0001公顷
-            "a": 0.01,                    # 1平方米 = 0.01公亩
-            "dm2": 100,                   # 1平方米 = 100平方分米
-            "cm2": 10000,                 # 1平方米 = 10,000平方厘米
-            "mm2": 1000000,               # 1平方米 = 1,000,000平方毫米
-            "um2": 1000000000000,         # 1平方米 = 10^12平方微米
-            
-            # 英制单位
-            "mi2": 1/2589988.110336,      # 1平方米 ≈ 0.000000386102平方英里
-            "ac": 1/4046.8564224,         # 1平方米 ≈ 0.000247105英亩
-            "yd2": 1/0.83612736,          # 1平方米 ≈ 1.19599平方码
-            "ft2": 1/0.09290304,          # 1平方米 ≈ 10.7639平方英尺
-            "in2": 1/0.00064516,          # 1平方米 ≈ 1550平方英寸
-            "rd2": 1/25.29285264,         # 1平方米 ≈ 0.0395369平方竿
-            
-            # 中国市制单位
-            "qing": 1/66666.6667,         # 1平方米 ≈ 0.000015市顷
-            "mu": 1/666.666667,           # 1平方米 ≈ 0.0015市亩
-            "chi2": 9,                    # 1平方米 = 9平方尺
-            "cun2": 900                   # 1平方米 = 900平方寸
-        }
-        
-        sqm = to_sqm.get(from_unit, value)
-        return sqm * from_sqm.get(to_unit, 1)
\ No newline at end of file
+        """执行单位换算（换算系数见 unit_registry）"""
+        return self.quantity.convert(value, from_unit, to_unit)
@@ -0,0 +1,364 @@
+from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QComboBox,
+                              QPushButton, QPlainTextEdit, QTableView, QSpinBox, QCheckBox,
+                              QSplitter, QHeaderView, QFileDialog, QMessageBox, QApplication,
+                              QAbstractItemView)
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex, QTimer
+from PySide6.QtGui import QColor
+import csv
+import io
+import re
+import numpy as np
+
+from .unit_registry import registry
+
+# 物理量显示名称
+QUANTITY_LABELS = {
+    "length": "长度", "weight": "重量", "area": "面积", "volume": "体积",
+    "temperature": "温度", "speed": "速度", "energy": "热能", "pressure": "压强",
+    "power": "功率", "force": "力",
+}
+
+# 每次事件循环处理的行数，大批量数据分块换算，避免界面卡顿
+CHUNK_ROWS = 5000
+
+
+# 带千位分隔符的数字，如 1,234.5 / 1 234 567 / 1 234,5（同一数字内分隔符一致，空格分组时小数点可为逗号）
+THOUSANDS_NUMBER = re.compile(
+    r"[+-]?\d{1,3}(?P<sep>[,\u00a0 ])\d{3}(?:(?P=sep)\d{3})*(?P<decimal>[.,]\d*)?(?:[eE][+-]?\d+)?")
+# 以空格分组的数字开头（如 1 234 56 中无法归入分组的残余），按空白拆分会截断数值
+GROUPED_PREFIX = re.compile(r"[+-]?\d{1,3}[\u00a0 ]\d{3}")
+
+
+def detect_delimiter(lines):
+    """
+    由第一个非空行确定分隔符（制表符/分号/逗号），整批数据共用；返回 None 表示按空白拆分。
+    整行是一个数值时（如单列的 1,234.5）不把其中的逗号当作分隔符
+    """
+    line = next((line.strip() for line in lines if line.strip()), "")
+    sep = next((sep for sep in ("\t", ";", ",") if sep in line), None)
+    if sep == "," and not np.isnan(parse_number(line.strip('"'))):
+        return None
+    return sep
+
+
+def split_field(line, column, delimiter):
+    """
+    按 delimiter 拆分一行（支持引号包裹的字段），取第 column 列（从 0 开始）。
+    按空白拆分时整行是一个数值（如 1 234 567）则整行为第 0 列；以空格分组的数字开头但整行
+    无法解析时返回整行，由 parse_number 标为无法解析，不截断为第一段
+    """
+    if delimiter is None:
+        text = line.strip()
+        if not np.isnan(parse_number(text)):
+            fields = [text]
+        elif GROUPED_PREFIX.match(text):
+            return text
+        else:
+            fields = text.split()
+    else:
+        fields = next(csv.reader([line], delimiter=delimiter), [])
+    if column >= len(fields):
+        return ""
+    return fields[column].strip().strip('"').strip()
+
+
+def parse_number(text):
+    """文本转数值，去掉千位分隔符（空格分组时逗号小数点转为 .）；无法解析时返回 NaN"""
+    match = THOUSANDS_NUMBER.fullmatch(text)
+    if match:
+        sep, decimal = match.group("sep"), match.group("decimal") or ""
+        if sep == "," and decimal.startswith(","):
+            return np.nan
+        text = text.replace(sep, "").replace(",", ".")
+    try:
+        return float(text)
+    except ValueError:
+        return np.nan
+
+
+def parse_values(lines, column, delimiter):
+    """解析一块文本行，返回 (原始文本列表, 数值数组)；无法解析的值为 NaN"""
+    raw = [split_field(line, column, delimiter) for line in lines]
+    values = np.array([parse_number(text) for text in raw], dtype=float)
+    return raw, values
+
+
+class BatchResultModel(QAbstractTableModel):
+    """批量换算结果表：原始值 + 换算结果，数据按块追加，视图只绘制可见行"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._raw = []
+        self._results = np.empty(0)
+        self._count = 0
+        self.headers = ["原始值", "换算结果"]
+
+    def reset(self, total, source_unit, target_unit):
+        """开始新一批换算，预分配 total 行"""
+        self.beginResetModel()
+        self._raw = []
+        self._results = np.full(total, np.nan)
+        self._count = 0
+        self.headers = [f"原始值 ({source_unit})", f"换算结果 ({target_unit})"]
+        self.endResetModel()
+
+    def append_chunk(self, raw, results):
+        """追加一块换算结果"""
+        if not raw:
+            return
+        first = self._count
+        last = first + len(raw) - 1
+        self.beginInsertRows(QModelIndex(), first, last)
+        self._raw.extend(raw)
+        self._results[first:last + 1] = results
+        self._count = last + 1
+        self.endInsertRows()
+
+    def results(self):
+        return self._results[:self._count]
+
+    def row_text(self, row):
+        value = self._results[row]
+        return self._raw[row], "" if np.isnan(value) else f"{value:.6g}"
+
+    def invalid_count(self):
+        return int(np.count_nonzero(np.isnan(self.results())))
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._count
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else 2
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row, col = index.row(), index.column()
+        if role == Qt.DisplayRole:
+            if col == 0:
+                return self._raw[row]
+            value = self._results[row]
+            return "无效" if np.isnan(value) else f"{value:.6g}"
+        if role == Qt.TextAlignmentRole:
+            return int(Qt.AlignRight | Qt.AlignVCenter)
+        if role == Qt.ForegroundRole and col == 1 and np.isnan(self._results[row]):
+            return QColor("#c0392b")
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return self.headers[section]
+        return str(section + 1)
+
+
+class BatchConverter(QWidget):
+    """批量单位换算：粘贴或导入 CSV/TSV 列，整列换算"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._lines = []
+        self._pos = 0
+        self._job = None        # (quantity, source_unit, target_unit, column, delimiter)
+        self._chunk_timer = QTimer(self)
+        self._chunk_timer.setSingleShot(True)
+        self._chunk_timer.timeout.connect(self._process_chunk)
+        self.setup_ui()
+
+    def setup_ui(self):
+        """设置批量换算UI"""
+        layout = QVBoxLayout(self)
+
+        # 单位选择
+        unit_layout = QHBoxLayout()
+        unit_layout.addWidget(QLabel("物理量:"))
+        self.quantity_combo = QComboBox()
+        for name in registry.quantities():
+            self.quantity_combo.addItem(QUANTITY_LABELS.get(name, name), name)
+        self.quantity_combo.currentIndexChanged.connect(self.on_quantity_changed)
+        unit_layout.addWidget(self.quantity_combo)
+
+        unit_layout.addWidget(QLabel("源单位:"))
+        self.source_combo = QComboBox()
+        unit_layout.addWidget(self.source_combo)
+        unit_layout.addWidget(QLabel("目标单位:"))
+        self.target_combo = QComboBox()
+        unit_layout.addWidget(self.target_combo)
+
+        unit_layout.addWidget(QLabel("数据列:"))
+        self.column_spin = QSpinBox()
+        self.column_spin.setRange(1, 99)
+        unit_layout.addWidget(self.column_spin)
+        self.skip_header_check = QCheckBox("跳过首行")
+        unit_layout.addWidget(self.skip_header_check)
+        unit_layout.addStretch()
+        layout.addLayout(unit_layout)
+
+        # 操作按钮
+        button_layout = QHBoxLayout()
+        load_btn = QPushButton("导入文件")
+        load_btn.clicked.connect(self.load_file)
+        button_layout.addWidget(load_btn)
+        self.convert_btn = QPushButton("换算")
+        self.convert_btn.clicked.connect(self.start_conversion)
+        button_layout.addWidget(self.convert_btn)
+        copy_btn = QPushButton("复制结果")
+        copy_btn.clicked.connect(self.copy_results)
+        button_layout.addWidget(copy_btn)
+        save_btn = QPushButton("保存结果")
+        save_btn.clicked.connect(self.save_results)
+        button_layout.addWidget(save_btn)
+        clear_btn = QPushButton("清空")
+        clear_btn.clicked.connect(self.clear)
+        button_layout.addWidget(clear_btn)
+        button_layout.addStretch()
+        layout.addLayout(button_layout)
+
+        # 输入区与结果表
+        splitter = QSplitter(Qt.Horizontal)
+        self.input_edit = QPlainTextEdit()
+        self.input_edit.setPlaceholderText("粘贴数据，每行一个值；也可粘贴 CSV/TSV 多列数据并选择数据列")
+        splitter.addWidget(self.input_edit)
+
+        self.model = BatchResultModel(self)
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        # 固定行高，避免大数据量时按内容计算行高
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.table.verticalHeader().setDefaultSectionSize(22)
+        splitter.addWidget(self.table)
+        splitter.setSizes([300, 400])
+        layout.addWidget(splitter, 1)
+
+        self.status_label = QLabel("")
+        self.status_label.setStyleSheet("color: #666666;")
+        layout.addWidget(self.status_label)
+
+        self.on_quantity_changed()
+
+    def on_quantity_changed(self, *args):
+        """切换物理量时刷新单位列表"""
+        quantity = registry.quantity(self.quantity_combo.currentData())
+        for combo in (self.source_combo, self.target_combo):
+            combo.clear()
+            combo.addItems(quantity.units)
+        if len(quantity.units) > 1:
+            self.target_combo.setCurrentIndex(1)
+
+    def load_file(self):
+        """导入 CSV/TSV/文本文件到输入区"""
+        file_path, _ = QFileDialog.getOpenFileName(
+            self, "导入数据", "", "数据文件 (*.csv *.tsv *.txt);;所有文件 (*)"
+        )
+        if not file_path:
+            return
+        text = None
+        for encoding in ("utf-8-sig", "gbk"):
+            try:
+                with open(file_path, "r", encoding=encoding) as f:
+                    text = f.read()
+                break
+            except UnicodeDecodeError:
+                continue
+            except OSError as e:
+                QMessageBox.critical(self, "导入失败", f"读取文件时发生错误: {str(e)}")
+                return
+        if text is None:
+            QMessageBox.critical(self, "导入失败", "无法识别文件编码")
+            return
+        self.input_edit.setPlainText(text)
+
+    def start_conversion(self):
+        """开始换算：按块解析和换算，每块结果追加到表格"""
+        lines = self.input_edit.toPlainText().splitlines()
+        if self.skip_header_check.isChecked():
+            lines = lines[1:]
+        # 忽略末尾空行
+        while lines and not lines[-1].strip():
+            lines.pop()
+        if not lines:
+            self.status_label.setText("没有可换算的数据")
+            return
+
+        quantity = registry.quantity(self.quantity_combo.currentData())
+        source_unit = self.source_combo.currentText()
+        target_unit = self.target_combo.currentText()
+
+        self._chunk_timer.stop()
+        self._lines = lines
+        self._pos = 0
+        self._job = (quantity, source_unit, target_unit, self.column_spin.value() - 1,
+                     detect_delimiter(lines))
+        self.model.reset(len(lines), source_unit, target_unit)
+        self._process_chunk()
+
+    def _process_chunk(self):
+        """解析并换算一块数据，未完成时让出事件循环后继续"""
+        if self._job is None:
+            return
+        quantity, source_unit, target_unit, column, delimiter = self._job
+        chunk = self._lines[self._pos:self._pos + CHUNK_ROWS]
+        raw, values = parse_values(chunk, column, delimiter)
+        self.model.append_chunk(raw, quantity.convert(values, source_unit, target_unit))
+        self._pos += len(chunk)
+
+        total = len(self._lines)
+        if self._pos < total:
+            self.status_label.setText(f"换算中... {self._pos}/{total}")
+            self._chunk_timer.start(0)
+        else:
+            self._job = None
+            self._lines = []
+            invalid = self.model.invalid_count()
+            message = f"已换算 {total} 行"
+            if invalid:
+                message += f"，其中 {invalid} 行无法解析"
+            self.status_label.setText(message)
+
+    def _export_rows(self):
+        """导出的行号：有选中行时只导出选中行"""
+        rows = sorted({index.row() for index in self.table.selectionModel().selectedRows()})
+        return rows or range(self.model.rowCount())
+
+    def copy_results(self):
+        """复制换算结果到剪贴板（每行一个值，可直接粘贴回表格软件）"""
+        if self.model.rowCount() == 0:
+            QMessageBox.warning(self, "提示", "没有可复制的换算结果")
+            return
+        text = "\n".join(self.model.row_text(row)[1] for row in self._export_rows())
+        QApplication.clipboard().setText(text)
+        self.status_label.setText("换算结果已复制到剪贴板")
+
+    def save_results(self):
+        """保存原始值和换算结果为 CSV"""
+        if self.model.rowCount() == 0:
+            QMessageBox.warning(self, "提示", "没有可保存的换算结果")
+            return
+        file_path, _ = QFileDialog.getSaveFileName(
+            self, "保存换算结果", "换算结果.csv", "CSV Files (*.csv)"
+        )
+        if not file_path:
+            return
+        try:
+            buffer = io.StringIO()
+            writer = csv.writer(buffer, lineterminator="\n")
+            writer.writerow(self.model.headers)
+            writer.writerows(self.model.row_text(row) for row in self._export_rows())
+            # utf-8-sig 便于 Excel 正确识别中文表头
+            with open(file_path, "w", encoding="utf-8-sig", newline="") as f:
+                f.write(buffer.getvalue())
+            QMessageBox.information(self, "保存成功", f"换算结果已保存到:\n{file_path}")
+        except Exception as e:
+            QMessageBox.critical(self, "保存失败", f"保存换算结果时发生错误: {str(e)}")
+
+    def clear(self):
+        """清空输入和结果"""
+        self._chunk_timer.stop()
+        self._job = None
+        self._lines = []
+        self.input_edit.clear()
+        self.model.reset(0, self.source_combo.currentText(), self.target_combo.currentText())
+        self.status_label.setText("")
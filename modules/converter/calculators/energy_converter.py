@@ -2,8 +2,12 @@ from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
                               QLineEdit, QScrollArea, QGridLayout, QFrame)
 from PySide6.QtCore import Qt
 
+from .unit_registry import registry
+
 class EnergyConverter(QWidget):
     """热能单位换算器"""
+
+    quantity = registry.quantity("energy")
     
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -86,7 +90,7 @@ class EnergyConverter(QWidget):
         layout.addWidget(scroll_area)
     
     def on_unit_input(self, text, source_unit):
-        """处理单位输入"""
+        """处理单位输入：一次向量运算得到所有单位的结果"""
         try:
             source_value = text.strip()
             if not source_value:
@@ -98,46 +102,17 @@ class EnergyConverter(QWidget):
                 return
             
             value = float(source_value)
+            results = self.quantity.convert_all(value, source_unit)
             
             for unit_code, entry in self.unit_vars.items():
                 if unit_code != source_unit:
-                    result = self.do_conversion(value, source_unit, unit_code)
                     entry.blockSignals(True)
-                    entry.setText(f"{result:.6g}")
+                    entry.setText(f"{results[self.quantity.index[unit_code]]:.6g}")
                     entry.blockSignals(False)
                     
         except ValueError:
             pass
     
     def do_conversion(self, value, from_unit, to_unit):
-        """执行热能换算"""
-        # 先转换为焦耳
-        to_joule = {
-            "J": value,                     # 1焦耳 = 1焦耳
-            "kJ": value * 1000,             # 1千焦 = 1000焦耳
-            "kWh": value * 3600000,         # 1千瓦时 = 3,600,000焦耳
-            "kgm": value * 9.80665,         # 1千克·米 = 9.80665焦耳
-            "psh": value * 2647795.5,       # 1米制马力·时 = 2,647,795.5焦耳
-            "hph": value * 2684519.5,       # 1英制马力·时 = 2,684,519.5焦耳
-            "cal": value * 4.184,           # 1卡路里 = 4.184焦耳
-            "kcal": value * 4184,           # 1千卡 = 4184焦耳
-            "BTU": value * 1055.06,         # 1英热单位 = 1055.06焦耳
-            "ftlb": value * 1.35582         # 1英尺·磅 = 1.35582焦耳
-        }
-        
-        # 从焦耳转换为目标单位
-        from_joule = {
-            "J": 1,                         # 1焦耳 = 1焦耳
-            "kJ": 0.001,                    # 1焦耳 = 0.001千焦
-            "kWh": 1/3600000,               # 1焦耳 ≈ 2.77778e-7千瓦时
-            "kgm": 1/9.80665,               # 1焦耳 ≈ 0.101972千克·米
-            "psh": 1/2647795.5,             # 1焦耳 ≈ 3.77673e-7米制马力·时
-            "hph": 1/2684519.5,             # 1焦耳 ≈ 3.72506e-7英制马力·时
-            "cal": 1/4.184,                 # 1焦耳 ≈ 0.239006卡路里
-            "kcal": 1/4184,                 # 1焦耳 ≈ 0.000239006千卡
-            "BTU": 1/1055.06,               # 1焦耳 ≈ 0.000947817英热单位
-            "ftlb": 1/1.35582               # 1焦耳 ≈ 0.737562英尺·磅
-        }
-        
-        joules = to_joule.get(from_unit, value)
-        return joules * from_joule.get(to_unit, 1)
\ No newline at end of file
+        """执行单位换算（换算系数见 unit_registry）"""
+        return self.quantity.convert(value, from_unit, to_unit)
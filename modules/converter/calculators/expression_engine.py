@@ -0,0 +1,408 @@
+# calculators/expression_engine.py
+"""
+表达式求值引擎 - 科学计算器使用。
+词法分析 -> Pratt 语法分析 -> 生成 Python AST 并编译为代码对象，编译结果按 (表达式, 角度制) 缓存。
+只允许白名单中的函数和常数，名称在编译期校验，不使用 eval 执行用户文本。
+函数基于 NumPy 实现，同一表达式可直接对 x 的数组求值（批量列表、绘图）。
+"""
+import ast
+import math
+import re
+from functools import lru_cache
+
+import numpy as np
+
+
+class ExpressionError(ValueError):
+    """表达式语法错误、未知名称或无法求值"""
+
+
+# 支持的变量名
+VARIABLES = ("x",)
+
+# 常数
+CONSTANTS = {"π": math.pi, "pi": math.pi, "e": math.e}
+
+
+# 超过此值的阶乘改用 Γ 函数近似，避免巨大整数运算卡住界面
+_EXACT_FACTORIAL_MAX = 1000
+# 整数乘方结果的二进制位数超过此值时改用浮点计算（9^9^9 之类的大整数乘方会卡住界面）；
+# 约 4200 位十进制，在 Python 整数转字符串的默认上限（4300 位）以内，结果仍可显示
+_EXACT_POWER_MAX_BITS = 14000
+
+
+def _factorial(value):
+    """阶乘：非负整数标量精确计算，其余按 Γ(x+1) 计算（数组中无效值为 NaN）"""
+    if np.ndim(value) == 0:
+        if float(value).is_integer() and 0 <= value <= _EXACT_FACTORIAL_MAX:
+            return math.factorial(int(value))
+        return math.gamma(float(value) + 1)
+    return _gamma_plus_one(np.asarray(value, dtype=float)).astype(float)
+
+
+def _gamma_plus_one_scalar(value):
+    try:
+        return math.gamma(value + 1)
+    except ValueError:      # 负整数
+        return math.nan
+    except OverflowError:
+        return math.inf
+
+
+_gamma_plus_one = np.frompyfunc(_gamma_plus_one_scalar, 1, 1)
+
+
+def _power(base, exponent):
+    """乘方：整数结果不超过 _EXACT_POWER_MAX_BITS 位时精确计算，否则按浮点计算，溢出时报错"""
+    if (isinstance(base, int) and isinstance(exponent, int) and exponent > 0 and abs(base) > 1
+            and exponent * math.log2(abs(base)) > _EXACT_POWER_MAX_BITS):
+        base = float(base)
+    try:
+        return base ** exponent
+    except OverflowError:
+        raise ExpressionError("结果过大") from None
+
+
+def _sind(value):
+    """角度制正弦，180° 整数倍处精确为 0"""
+    r = np.mod(value, 360)
+    return np.where(np.mod(r, 180) == 0, 0.0, np.sin(np.radians(r)))
+
+
+def _cosd(value):
+    """角度制余弦，90° 奇数倍处精确为 0"""
+    r = np.mod(value, 360)
+    return np.where(np.mod(r - 90, 180) == 0, 0.0, np.cos(np.radians(r)))
+
+
+def _tand(value):
+    """角度制正切，180° 整数倍处为 0，90° 奇数倍处无定义"""
+    r = np.mod(value, 360)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        result = np.tan(np.radians(r))
+    result = np.where(np.mod(r, 180) == 0, 0.0, result)
+    return np.where(np.mod(r - 90, 180) == 0, np.nan, result)
+
+
+# 函数名 -> (实现, 参数个数)；角度制下三角函数在编译期替换为 DEGREE_FUNCTIONS 中的实现
+FUNCTIONS = {
+    "sin": (np.sin, 1), "cos": (np.cos, 1), "tan": (np.tan, 1),
+    "asin": (np.arcsin, 1), "acos": (np.arccos, 1), "atan": (np.arctan, 1),
+    "sinh": (np.sinh, 1), "cosh": (np.cosh, 1), "tanh": (np.tanh, 1),
+    "sqrt": (np.sqrt, 1), "√": (np.sqrt, 1),
+    "ln": (np.log, 1), "lg": (np.log10, 1), "log": (np.log10, 1), "log2": (np.log2, 1),
+    "exp": (np.exp, 1), "abs": (np.abs, 1),
+    "floor": (np.floor, 1), "ceil": (np.ceil, 1),
+    "fact": (_factorial, 1),
+}
+
+# 角度制下：正三角函数按角度计算，反三角函数的结果转为角度
+DEGREE_FUNCTIONS = {"sin": _sind, "cos": _cosd, "tan": _tand}
+ANGLE_OUTPUT = {"asin", "acos", "atan"}
+
+# 显示字符的别名
+_ALIASES = {"×": "*", "÷": "/", "−": "-", "**": "^"}
+
+_TOKEN_RE = re.compile(r"""
+    (?P<num>(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+(?![\w.]))?)
+  | (?P<name>[A-Za-z_][A-Za-z_0-9]*|π)
+  | (?P<op>\*\*|[-+*/^(),!²√×÷−])
+  | (?P<space>\s+)
+""", re.VERBOSE)
+
+
+def tokenize(text):
+    """把表达式拆分为 (类型, 值, 位置) 列表"""
+    tokens = []
+    pos = 0
+    num_end = -1        # 上一个数字的结束位置
+    while pos < len(text):
+        match = _TOKEN_RE.match(text, pos)
+        if not match:
+            raise ExpressionError(f"无法识别的字符 {text[pos]!r}（位置 {pos + 1}）")
+        kind = match.lastgroup
+        value = match.group()
+        if kind == "name":
+            tokens.extend(_split_name(value, match.start()))
+        elif kind == "op":
+            tokens.append(("op", _ALIASES.get(value, value), match.start()))
+        elif kind == "num":
+            # 两个数字直接相连或数字后跟 "." 开头的数字（如重复输入小数点的 1.5.5）是输入错误，
+            # 只隔空白的两个数字（1 2）也是，都不能当作隐式乘法
+            if tokens and tokens[-1][0] == "num":
+                if match.start() == num_end or value.startswith("."):
+                    raise ExpressionError(f"数字格式错误（位置 {match.start() + 1}）")
+                raise ExpressionError(f"两个数字之间缺少运算符（位置 {match.start() + 1}）")
+            tokens.append(("num", value, match.start()))
+            num_end = match.end()
+        pos = match.end()
+    tokens.append(("end", "", len(text)))
+    return tokens
+
+
+def _split_name(word, start):
+    """
+    拆分连写的名称：已知名称直接返回；否则按最长前缀拆成已知名称和数字序列，
+    例如 "xsin" -> x, sin；"pie" -> pi, e；"sin30" -> sin, 30。
+    """
+    known = set(FUNCTIONS) | set(CONSTANTS) | set(VARIABLES)
+    if word in known:
+        return [("name", word, start)]
+    parts = []
+    i = 0
+    while i < len(word):
+        for j in range(len(word), i, -1):
+            if word[i:j] in known:
+                parts.append(("name", word[i:j], start + i))
+                i = j
+                break
+        else:
+            # 函数名后直接跟数字：sin30 -> sin, 30
+            digits = re.match(r"\d+", word[i:])
+            if not digits:
+                raise ExpressionError(f"未知名称 {word!r}")
+            parts.append(("num", digits.group(), start + i))
+            i += digits.end()
+    return parts
+
+
+# ---------------------------------------------------------------- 语法分析
+# AST 节点为元组：("num", 值) ("const", 名称) ("var", 名称)
+# ("neg", 操作数) ("binop", 运算符, 左, 右) ("call", 函数名, [参数...])
+
+# 中缀/后缀运算符的左结合力
+_BINARY_POWER = {"+": 10, "-": 10, "*": 20, "/": 20, "^": 40}
+_POSTFIX_POWER = 50
+_UNARY_POWER = 30
+# 无括号函数参数的结合力：sin 30^2 = sin(900)，sin 30 * 2 = sin(30) * 2
+_BARE_ARG_POWER = 35
+
+
+class _Parser:
+    def __init__(self, text):
+        self.tokens = tokenize(text)
+        self.pos = 0
+
+    def peek(self):
+        return self.tokens[self.pos]
+
+    def next(self):
+        token = self.tokens[self.pos]
+        self.pos += 1
+        return token
+
+    def expect(self, value):
+        kind, tok, pos = self.next()
+        if tok != value:
+            raise ExpressionError(f"缺少 {value!r}（位置 {pos + 1}）")
+
+    def parse(self):
+        if self.peek()[0] == "end":
+            raise ExpressionError("表达式为空")
+        node = self.expression(0)
+        kind, value, pos = self.peek()
+        if kind != "end":
+            raise ExpressionError(f"多余的 {value!r}（位置 {pos + 1}）")
+        return node
+
+    def starts_operand(self, token):
+        kind, value, _ = token
+        return kind in ("num", "name") or value in ("(", "√")
+
+    def expression(self, rbp):
+        left = self.prefix()
+        while True:
+            token = self.peek()
+            kind, value, _ = token
+            if value in ("!", "²"):
+                if _POSTFIX_POWER <= rbp:
+                    break
+                self.next()
+                left = ("call", "fact", [left]) if value == "!" else ("binop", "^", left, ("num", 2))
+            elif kind == "op" and value in _BINARY_POWER:
+                power = _BINARY_POWER[value]
+                if power <= rbp:
+                    break
+                self.next()
+                # 乘方右结合
+                right = self.expression(power - 1 if value == "^" else power)
+                left = ("binop", value, left, right)
+            elif self.starts_operand(token):
+                # 隐式乘法：2π、3(4+1)、2sin(30)
+                if _BINARY_POWER["*"] <= rbp:
+                    break
+                left = ("binop", "*", left, self.expression(_BINARY_POWER["*"]))
+            else:
+                break
+        return left
+
+    def prefix(self):
+        kind, value, pos = self.next()
+        if kind == "num":
+            number = float(value) if any(c in value for c in ".eE") else int(value)
+            return ("num", number)
+        if value in ("-", "+"):
+            operand = self.expression(_UNARY_POWER)
+            return ("neg", operand) if value == "-" else operand
+        if value == "(":
+            node = self.expression(0)
+            self.close_paren()
+            return node
+        if kind == "name" or value == "√":
+            if value in CONSTANTS:
+                return ("const", value)
+            if value in VARIABLES:
+                return ("var", value)
+            return self.call(value)
+        if kind == "end":
+            raise ExpressionError("表达式不完整")
+        raise ExpressionError(f"意外的 {value!r}（位置 {pos + 1}）")
+
+    def call(self, name):
+        func, arity = FUNCTIONS[name]
+        if self.peek()[1] == "(":
+            self.next()
+            args = [self.expression(0)]
+            while self.peek()[1] == ",":
+                self.next()
+                args.append(self.expression(0))
+            self.close_paren()
+        else:
+            args = [self.expression(_BARE_ARG_POWER)]
+        if len(args) != arity:
+            raise ExpressionError(f"{name} 需要 {arity} 个参数")
+        return ("call", name, args)
+
+    def close_paren(self):
+        # 计算器习惯：末尾缺少的右括号自动补齐
+        if self.peek()[0] == "end":
+            return
+        self.expect(")")
+
+
+def parse(text):
+    """解析表达式为 AST 元组"""
+    return _Parser(text).parse()
+
+
+# ---------------------------------------------------------------- 编译
+
+_BINOPS = {"+": ast.Add, "-": ast.Sub, "*": ast.Mult, "/": ast.Div}
+
+
+def _to_python(node, deg_mode, names):
+    """把表达式 AST 转为 Python ast 节点，names 收集用到的命名空间条目"""
+    kind = node[0]
+    if kind == "num":
+        return ast.Constant(node[1])
+    if kind == "const":
+        return ast.Constant(CONSTANTS[node[1]])
+    if kind == "var":
+        names.add(node[1])
+        return ast.Name(node[1], ast.Load())
+    if kind == "neg":
+        return ast.UnaryOp(ast.USub(), _to_python(node[1], deg_mode, names))
+    if kind == "binop" and node[1] == "^":
+        names.add("f_pow")
+        return ast.Call(ast.Name("f_pow", ast.Load()),
+                        [_to_python(node[2], deg_mode, names), _to_python(node[3], deg_mode, names)], [])
+    if kind == "binop":
+        return ast.BinOp(_to_python(node[2], deg_mode, names), _BINOPS[node[1]](),
+                         _to_python(node[3], deg_mode, names))
+
+    name, args = node[1], [_to_python(arg, deg_mode, names) for arg in node[2]]
+    func = "f_" + ("sqrt" if name == "√" else name)
+    if deg_mode and name in DEGREE_FUNCTIONS:
+        func = "d_" + name
+    names.add(func)
+    call = ast.Call(ast.Name(func, ast.Load()), args, [])
+    if deg_mode and name in ANGLE_OUTPUT:
+        names.add("f_degrees")
+        call = ast.Call(ast.Name("f_degrees", ast.Load()), [call], [])
+    return call
+
+
+def _namespace():
+    namespace = {"__builtins__": {}, "f_degrees": np.degrees, "f_pow": _power}
+    for name, (func, _) in FUNCTIONS.items():
+        if name != "√":
+            namespace["f_" + name] = func
+    for name, func in DEGREE_FUNCTIONS.items():
+        namespace["d_" + name] = func
+    return namespace
+
+
+_NAMESPACE = _namespace()
+
+
+class CompiledExpression:
+    """编译后的表达式，可对标量或 NumPy 数组求值"""
+
+    def __init__(self, text, deg_mode=True):
+        self.text = text
+        self.deg_mode = deg_mode
+        names = set()
+        tree = ast.Expression(_to_python(parse(text), deg_mode, names))
+        ast.fix_missing_locations(tree)
+        self.variables = tuple(v for v in VARIABLES if v in names)
+        self.code = compile(tree, "<expression>", "eval")
+
+    def __call__(self, x=None):
+        return self.evaluate(x)
+
+    def evaluate(self, x=None):
+        """
+        求值。x 为标量时返回标量，无法求值（除零、定义域外、溢出）时抛出 ExpressionError；
+        x 为数组时逐点计算，无效点（含除零得到的无穷大）为 NaN。
+        """
+        if self.variables and x is None:
+            raise ExpressionError("表达式含变量 x，需要给定 x 的值")
+        scope = {"x": x}
+        if x is not None and np.ndim(x) > 0:
+            with np.errstate(all="ignore"):
+                result = eval(self.code, _NAMESPACE, {"x": np.asarray(x, dtype=float)})
+                # 负数的分数次幂等复数结果视为无效点
+                if np.iscomplexobj(result):
+                    result = np.where(np.imag(result) == 0, np.real(result), np.nan)
+            # 不含 x 的表达式也返回与 x 同形状的数组
+            result = np.broadcast_to(np.asarray(result, dtype=float), np.shape(x)).copy()
+            result[~np.isfinite(result)] = np.nan
+            return result
+
+        try:
+            with np.errstate(all="raise"):
+                result = eval(self.code, _NAMESPACE, scope)
+        except ExpressionError:
+            raise
+        except (ZeroDivisionError, OverflowError, FloatingPointError, ValueError) as e:
+            raise ExpressionError(f"无法求值: {e}") from None
+        if isinstance(result, (np.generic, np.ndarray)):
+            result = result.item()
+        if isinstance(result, complex) or isinstance(result, float) and not math.isfinite(result):
+            raise ExpressionError("结果无效")
+        return result
+
+
+@lru_cache(maxsize=256)
+def compile_expression(text, deg_mode=True):
+    """编译表达式（按文本和角度制缓存）"""
+    return CompiledExpression(text, deg_mode)
+
+
+def evaluate(text, deg_mode=True, x=None):
+    """便捷函数：evaluate("2sin(30)") -> 1.0"""
+    return compile_expression(text.strip(), deg_mode).evaluate(x)
+
+
+def tabulate(text, start, stop, num=1000, deg_mode=True):
+    """在 [start, stop] 上均匀取 num 个 x，一次向量运算返回 (x 数组, f(x) 数组)"""
+    xs = np.linspace(start, stop, int(num))
+    return xs, compile_expression(text.strip(), deg_mode).evaluate(xs)
+
+
+def format_result(value):
+    """结果显示：整数原样，浮点数保留 12 位有效数字以消除末位舍入误差"""
+    if isinstance(value, int):
+        return str(value)
+    text = f"{value:.12g}"
+    return "0" if text == "-0" else text
@@ -2,8 +2,12 @@ from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
                               QLineEdit, QScrollArea, QGridLayout, QFrame)
 from PySide6.QtCore import Qt
 
+from .unit_registry import registry
+
 class ForceConverter(QWidget):
     """力单位换算器"""
+
+    quantity = registry.quantity("force")
     
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -85,7 +89,7 @@ class ForceConverter(QWidget):
         layout.addWidget(scroll_area)
     
     def on_unit_input(self, text, source_unit):
-        """处理单位输入"""
+        """处理单位输入：一次向量运算得到所有单位的结果"""
         try:
             source_value = text.strip()
             if not source_value:
@@ -97,42 +101,17 @@ class ForceConverter(QWidget):
                 return
             
             value = float(source_value)
+            results = self.quantity.convert_all(value, source_unit)
             
             for unit_code, entry in self.unit_vars.items():
                 if unit_code != source_unit:
-                    result = self.do_conversion(value, source_unit, unit_code)
                     entry.blockSignals(True)
-                    entry.setText(f"{result:.6g}")
+                    entry.setText(f"{results[self.quantity.index[unit_code]]:.6g}")
                     entry.blockSignals(False)
                     
         except ValueError:
             pass
     
     def do_conversion(self, value, from_unit, to_unit):
-        """执行力换算"""
-        # 先转换为牛顿
-        to_newton = {
-            "N": value,                     # 1牛顿 = 1牛顿
-            "kN": value * 1000,             # 1千牛 = 1000牛顿
-            "kgf": value * 9.80665,         # 1千克力 = 9.80665牛顿
-            "gf": value * 0.00980665,       # 1克力 = 0.00980665牛顿
-            "tf": value * 9806.65,          # 1公吨力 = 9806.65牛顿
-            "lbf": value * 4.4482216152605, # 1磅力 = 4.4482216152605牛顿
-            "kip": value * 4448.2216152605, # 1千磅力 = 4448.2216152605牛顿
-            "dyn": value * 0.00001          # 1达因 = 0.00001牛顿
-        }
-        
-        # 从牛顿转换为目标单位
-        from_newton = {
-            "N": 1,                         # 1牛顿 = 1牛顿
-            "kN": 0.001,                    # 1牛顿 = 0.001千牛
-            "kgf": 1/9.80665,               # 1牛顿 ≈ 0.101972千克力
-            "gf": 1/0.00980665,             # 1牛顿 ≈ 101.972克力
-            "tf": 1/9806.65,                # 1牛顿 ≈ 0.000101972公吨力
-            "lbf": 1/4.4482216152605,       # 1牛顿 ≈ 0.224809磅力
-            "kip": 1/4448.2216152605,       # 1牛顿 ≈ 0.000224809千磅力
-            "dyn": 100000                   # 1牛顿 = 100,000达因
-        }
-        
-        newtons = to_newton.get(from_unit, value)
-        return newtons * from_newton.get(to_unit, 1)
\ No newline at end of file
+        """执行单位换算（换算系数见 unit_registry）"""
+        return self.quantity.convert(value, from_unit, to_unit)
@@ -2,8 +2,12 @@ from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
                               QLineEdit, QScrollArea, QGridLayout, QFrame)
 from PySide6.QtCore import Qt
 
+from .unit_registry import registry
+
 class PowerConverter(QWidget):
     """功率单位换算器"""
+
+    quantity = registry.quantity("power")
     
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -87,7 +91,7 @@ class PowerConverter(QWidget):
         layout.addWidget(scroll_area)
     
     def on_unit_input(self, text, source_unit):
-        """处理单位输入"""
+        """处理单位输入：一次向量运算得到所有单位的结果"""
         try:
             source_value = text.strip()
             if not source_value:
@@ -99,46 +103,17 @@ class PowerConverter(QWidget):
                 return
             
             value = float(source_value)
+            results = self.quantity.convert_all(value, source_unit)
             
             for unit_code, entry in self.unit_vars.items():
                 if unit_code != source_unit:
-                    result = self.do_conversion(value, source_unit, unit_code)
                     entry.blockSignals(True)
-                    entry.setText(f"{result:.6g}")
+                    entry.setText(f"{results[self.quantity.index[unit_code]]:.6g}")
                     entry.blockSignals(False)
                     
         except ValueError:
             pass
     
     def do_conversion(self, value, from_unit, to_unit):
-        """执行功率换算"""
-        # 先转换为瓦特
-        to_watt = {
-            "W": value,                     # 1瓦特 = 1瓦特
-            "kW": value * 1000,             # 1千瓦 = 1000瓦特
-            "hp": value * 745.699872,       # 1英制马力 = 745.699872瓦特
-            "ps": value * 735.49875,        # 1米制马力 = 735.49875瓦特
-            "J/s": value,                   # 1焦耳/秒 = 1瓦特
-            "kgm_s": value * 9.80665,       # 1公斤·米/秒 = 9.80665瓦特
-            "kcal_s": value * 4184,         # 1千卡/秒 = 4184瓦特
-            "BTU_s": value * 1055.05585,    # 1英热单位/秒 = 1055.05585瓦特
-            "ftlb_s": value * 1.355817948,  # 1英尺·磅/秒 = 1.355817948瓦特
-            "Nm_s": value                   # 1牛顿·米/秒 = 1瓦特
-        }
-        
-        # 从瓦特转换为目标单位
-        from_watt = {
-            "W": 1,                         # 1瓦特 = 1瓦特
-            "kW": 0.001,                    # 1瓦特 = 0.001千瓦
-            "hp": 1/745.699872,             # 1瓦特 ≈ 0.00134102英制马力
-            "ps": 1/735.49875,              # 1瓦特 ≈ 0.00135962米制马力
-            "J/s": 1,                       # 1瓦特 = 1焦耳/秒
-            "kgm_s": 1/9.80665,             # 1瓦特 ≈ 0.101972公斤·米/秒
-            "kcal_s": 1/4184,               # 1瓦特 ≈ 0.000239006千卡/秒
-            "BTU_s": 1/1055.05585,          # 1瓦特 ≈ 0.000947817英热单位/秒
-            "ftlb_s": 1/1.355817948,        # 1瓦特 ≈ 0.737562英尺·磅/秒
-            "Nm_s": 1                       # 1瓦特 = 1牛顿·米/秒
-        }
-        
-        watts = to_watt.get(from_unit, value)
-        return watts * from_watt.get(to_unit, 1)
\ No newline at end of file
+        """执行单位换算（换算系数见 unit_registry）"""
+        return self.quantity.convert(value, from_unit, to_unit)
@@ -2,8 +2,12 @@ from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
                               QLineEdit, QScrollArea, QGridLayout, QFrame)
 from PySide6.QtCore import Qt
 
+from .unit_registry import registry
+
 class PressureConverter(QWidget):
     """压强单位换算器"""
+
+    quantity = registry.quantity("pressure")
     
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -88,7 +92,7 @@ class PressureConverter(QWidget):
         layout.addWidget(scroll_area)
     
     def on_unit_input(self, text, source_unit):
-        """处理单位输入"""
+        """处理单位输入：一次向量运算得到所有单位的结果"""
         try:
             source_value = text.strip()
             if not source_value:
@@ -100,52 +104,17 @@ class PressureConverter(QWidget):
                 return
             
             value = float(source_value)
+            results = self.quantity.convert_all(value, source_unit)
             
             for unit_code, entry in self.unit_vars.items():
                 if unit_code != source_unit:
-                    result = self.do_conversion(value, source_unit, unit_code)
                     entry.blockSignals(True)
-                    entry.setText(f"{result:.6g}")
+                    entry.setText(f"{results[self.quantity.index[unit_code]]:.6g}")
                     entry.blockSignals(False)
                     
         except ValueError:
             pass
     
     def do_conversion(self, value, from_unit, to_unit):
-        """执行压强换算"""
-        # 先转换为帕斯卡
-        to_pascal = {
-            "Pa": value,                    # 1帕斯卡 = 1帕斯卡
-            "kPa": value * 1000,            # 1千帕 = 1000帕斯卡
-            "MPa": value * 1000000,         # 1兆帕 = 1,000,000帕斯卡
-            "hPa": value * 100,             # 1百帕 = 100帕斯卡
-            "bar": value * 100000,          # 1巴 = 100,000帕斯卡
-            "mbar": value * 100,            # 1毫巴 = 100帕斯卡
-            "atm": value * 101325,          # 1标准大气压 = 101,325帕斯卡
-            "mmHg": value * 133.322,        # 1毫米汞柱 = 133.322帕斯卡
-            "inHg": value * 3386.39,        # 1英寸汞柱 = 3,386.39帕斯卡
-            "mmH2O": value * 9.80665,       # 1毫米水柱 = 9.80665帕斯卡
-            "psi": value * 6894.76,         # 1磅力/平方英寸 = 6,894.76帕斯卡
-            "kgf_cm2": value * 98066.5,     # 1公斤力/平方厘米 = 98,066.5帕斯卡
-            "kgf_m2": value * 9.80665       # 1公斤力/平方米 = 9.80665帕斯卡
-        }
-        
-        # 从帕斯卡转换为目标单位
-        from_pascal = {
-            "Pa": 1,                        # 1帕斯卡 = 1帕斯卡
-            "kPa": 0.001,                   # 1帕斯卡 = 0.001千帕
-            "MPa": 0.000001,                # 1帕斯卡 = 0.000001兆帕
-            "hPa": 0.01,                    # 1帕斯卡 = 0.01百帕
-            "bar": 0.00001,                 # 1帕斯卡 = 0.00001巴
-            "mbar": 0.01,                   # 1帕斯卡 = 0.01毫巴
-            "atm": 1/101325,                # 1帕斯卡 ≈ 9.86923e-6标准大气压
-            "mmHg": 1/133.322,              # 1帕斯卡 ≈ 0.00750062毫米汞柱
-            "inHg": 1/3386.39,              # 1帕斯卡 ≈ 0.0002953英寸汞柱
-            "mmH2O": 1/9.80665,             # 1帕斯卡 ≈ 0.101972毫米水柱
-            "psi": 1/6894.76,               # 1帕斯卡 ≈ 0.000145038磅力/平方英寸
-            "kgf_cm2": 1/98066.5,           # 1帕斯卡 ≈ 1.01972e-5公斤力/平方厘米
-            "kgf_m2": 1/9.80665             # 1帕斯卡 ≈ 0.101972公斤力/平方米
-        }
-        
-        pascals = to_pascal.get(from_unit, value)
-        return pascals * from_pascal.get(to_unit, 1)
\ No newline at end of file
+        """执行单位换算（换算系数见 unit_registry）"""
+        return self.quantity.convert(value, from_unit, to_unit)
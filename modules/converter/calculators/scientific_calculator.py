@@ -1,13 +1,22 @@
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
                                QLineEdit, QPushButton, QGridLayout, QGroupBox, 
-                               QTextEdit, QApplication, QMessageBox)
+                               QTextEdit, QApplication, QMessageBox, QSpinBox)
 from PySide6.QtCore import Qt
 from PySide6.QtGui import QFont
-import math
+import numpy as np
+
+from .expression_engine import ExpressionError, evaluate, format_result, tabulate
 
 class ScientificCalculator(QWidget):
     """科学计算器"""
     
+    # 按钮 -> 插入显示框的表达式文本
+    FUNCTION_INPUTS = {
+        'sin': 'sin(', 'cos': 'cos(', 'tan': 'tan(', 'asin': 'asin(', 'acos': 'acos(',
+        'atan': 'atan(', 'lg': 'lg(', 'ln': 'ln(', '√x': '√(',
+    }
+    OPERATOR_INPUTS = {'x^y': '^', 'x!': '!', 'x²': '²'}
+    
     def __init__(self, parent=None):
         super().__init__(parent)
         self.calc_history = []
@@ -138,6 +147,29 @@ class ScientificCalculator(QWidget):
         
         right_layout.addLayout(history_btn_layout)
         
+        # 函数列表：对 x 的等距取值一次性求值，结果可粘贴到表格软件中作图
+        table_group = QGroupBox("函数列表 f(x)")
+        table_layout = QGridLayout(table_group)
+        table_layout.addWidget(QLabel("f(x) ="), 0, 0)
+        self.func_input = QLineEdit()
+        self.func_input.setPlaceholderText("例如 x^2+sin(x)")
+        table_layout.addWidget(self.func_input, 0, 1, 1, 3)
+        table_layout.addWidget(QLabel("x 从"), 1, 0)
+        self.x_start_input = QLineEdit("0")
+        table_layout.addWidget(self.x_start_input, 1, 1)
+        table_layout.addWidget(QLabel("到"), 1, 2)
+        self.x_stop_input = QLineEdit("360")
+        table_layout.addWidget(self.x_stop_input, 1, 3)
+        table_layout.addWidget(QLabel("点数"), 2, 0)
+        self.x_points_spin = QSpinBox()
+        self.x_points_spin.setRange(2, 100000)
+        self.x_points_spin.setValue(1000)
+        table_layout.addWidget(self.x_points_spin, 2, 1)
+        table_btn = QPushButton("生成并复制")
+        table_btn.clicked.connect(self.tabulate_function)
+        table_layout.addWidget(table_btn, 2, 2, 1, 2)
+        right_layout.addWidget(table_group)
+        
         main_layout.addWidget(left_widget)
         main_layout.addWidget(right_widget)
     
@@ -164,63 +196,22 @@ class ScientificCalculator(QWidget):
             self.status_label.setText("DEG" if self.deg_mode else "RAD")
         elif text == '=':
             try:
-                # 替换特殊符号
-                expression = current.replace('×', '*').replace('÷', '/')
-                
-                # 处理函数和常数
-                expression = expression.replace('π', 'math.pi').replace('e', 'math.e')
-                
-                # 处理三角函数
-                if self.deg_mode:
-                    # 角度制：需要将角度转换为弧度
-                    expression = expression.replace('sin', 'math.sin(math.radians')
-                    expression = expression.replace('cos', 'math.cos(math.radians')
-                    expression = expression.replace('tan', 'math.tan(math.radians')
-                    expression = expression.replace('asin', 'math.degrees(math.asin')
-                    expression = expression.replace('acos', 'math.degrees(math.acos')
-                    expression = expression.replace('atan', 'math.degrees(math.atan')
-                else:
-                    # 弧度制：直接使用
-                    expression = expression.replace('sin', 'math.sin')
-                    expression = expression.replace('cos', 'math.cos')
-                    expression = expression.replace('tan', 'math.tan')
-                    expression = expression.replace('asin', 'math.asin')
-                    expression = expression.replace('acos', 'math.acos')
-                    expression = expression.replace('atan', 'math.atan')
-                
-                # 处理其他函数
-                expression = expression.replace('lg', 'math.log10')
-                expression = expression.replace('ln', 'math.log')
-                expression = expression.replace('√x', 'math.sqrt')
-                expression = expression.replace('x^y', '**')
-                expression = expression.replace('1/x', '1/')
-                expression = expression.replace('x²', '**2')
-                
-                # 处理阶乘
-                if 'x!' in expression:
-                    # 简单的阶乘处理
-                    expression = expression.replace('x!', '')
-                    try:
-                        num = float(expression)
-                        result = math.factorial(int(num))
-                    except:
-                        result = "错误"
-                else:
-                    result = eval(expression)
-                
-                self.calc_display.setText(str(result))
-                
-                # 添加到历史记录
-                history_entry = f"{current} = {result}\n"
-                self.calc_history.append(history_entry)
-                self.update_history_display()
-                
-                # 设置标志，表示下次输入应该开始新的计算
-                self.new_input_required = True
-                
-            except Exception as e:
+                result = format_result(evaluate(current, self.deg_mode))
+            except (ExpressionError, ValueError, OverflowError):
+                # 结果位数超出 int 转字符串的上限时 format_result 抛出 ValueError
                 self.calc_display.setText("错误")
                 self.new_input_required = True
+                return
+            
+            self.calc_display.setText(result)
+            
+            # 添加到历史记录
+            history_entry = f"{current} = {result}\n"
+            self.calc_history.append(history_entry)
+            self.update_history_display()
+            
+            # 设置标志，表示下次输入应该开始新的计算
+            self.new_input_required = True
         elif text == '±':
             if current and current != "0":
                 if current[0] == '-':
@@ -243,12 +234,23 @@ class ScientificCalculator(QWidget):
                 self.calc_display.setText(current + 'π')
             else:
                 self.calc_display.setText(current + 'e')
-        elif text in ['sin', 'cos', 'tan', 'asin', 'acos', 'atan', 'lg', 'ln', '√x', 'x^y', '1/x', 'x!', 'x²']:
-            # 如果需要新输入，先清空显示
+        elif text in ['sin', 'cos', 'tan', 'asin', 'acos', 'atan', 'lg', 'ln', '√x']:
+            # 函数：输入函数名和左括号，缺少的右括号在求值时自动补齐
             if self.new_input_required or current == "0" or current == "错误":
-                self.calc_display.setText("")
+                current = ""
                 self.new_input_required = False
-            self.calc_display.setText(current + text)
+            self.calc_display.setText(current + self.FUNCTION_INPUTS[text])
+        elif text in ['x^y', 'x!', 'x²']:
+            # 运算符：接在当前结果后继续输入
+            if current == "错误":
+                current = "0"
+            self.new_input_required = False
+            self.calc_display.setText(current + self.OPERATOR_INPUTS[text])
+        elif text == '1/x':
+            if current == "错误":
+                return
+            self.new_input_required = False
+            self.calc_display.setText(f"1/({current})")
         else:
             # 数字和小数点处理
             if self.new_input_required or current == "0" or current == "错误":
@@ -257,6 +259,29 @@ class ScientificCalculator(QWidget):
             else:
                 self.calc_display.setText(current + text)
     
+    def tabulate_function(self):
+        """对 f(x) 在给定区间上批量求值，结果以制表符分隔复制到剪贴板"""
+        expression = self.func_input.text().strip()
+        try:
+            start = float(self.x_start_input.text())
+            stop = float(self.x_stop_input.text())
+            xs, ys = tabulate(expression, start, stop, self.x_points_spin.value(), self.deg_mode)
+        except ValueError as e:
+            # ExpressionError 也是 ValueError
+            QMessageBox.warning(self, "错误", f"无法生成函数列表: {e}")
+            return
+        
+        lines = ["x\tf(x)"]
+        lines.extend(f"{x:.12g}\t{'' if np.isnan(y) else format(y, '.12g')}" for x, y in zip(xs, ys))
+        QApplication.clipboard().setText("\n".join(lines))
+        
+        invalid = int(np.count_nonzero(np.isnan(ys)))
+        entry = f"f(x) = {expression}, x ∈ [{start:g}, {stop:g}], {len(xs)} 点已复制"
+        if invalid:
+            entry += f"（{invalid} 点无定义）"
+        self.calc_history.append(entry + "\n")
+        self.update_history_display()
+    
     def update_button_labels(self):
         """更新按钮标签（第二功能）"""
         # 这里可以添加第二功能切换的按钮标签更新
@@ -2,8 +2,12 @@ from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
                               QLineEdit, QScrollArea, QGridLayout, QFrame)
 from PySide6.QtCore import Qt
 
+from .unit_registry import registry
+
 class SpeedConverter(QWidget):
     """速度单位换算器"""
+
+    quantity = registry.quantity("speed")
     
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -85,7 +89,7 @@ class SpeedConverter(QWidget):
         layout.addWidget(scroll_area)
     
     def on_unit_input(self, text, source_unit):
-        """处理单位输入"""
+        """处理单位输入：一次向量运算得到所有单位的结果"""
         try:
             source_value = text.strip()
             if not source_value:
@@ -97,40 +101,17 @@ class SpeedConverter(QWidget):
                 return
             
             value = float(source_value)
+            results = self.quantity.convert_all(value, source_unit)
             
             for unit_code, entry in self.unit_vars.items():
                 if unit_code != source_unit:
-                    result = self.do_conversion(value, source_unit, unit_code)
                     entry.blockSignals(True)
-                    entry.setText(f"{result:.6g}")
+                    entry.setText(f"{results[self.quantity.index[unit_code]]:.6g}")
                     entry.blockSignals(False)
                     
         except ValueError:
             pass
     
     def do_conversion(self, value, from_unit, to_unit):
-        """执行速度换算"""
-        # 先转换为米/秒
-        to_mps = {
-            "m/s": value,                    # 1米/秒 = 1米/秒
-            "km/h": value / 3.6,             # 1千米/时 = 1/3.6米/秒
-            "km/s": value * 1000,            # 1千米/秒 = 1000米/秒
-            "c": value * 299792458,          # 1光速 = 299,792,458米/秒
-            "mach": value * 340.3,           # 1马赫 ≈ 340.3米/秒 (在海平面和15°C条件下)
-            "mph": value * 0.44704,          # 1英里/时 = 0.44704米/秒
-            "in/s": value * 0.0254           # 1英寸/秒 = 0.0254米/秒
-        }
-        
-        # 从米/秒转换为目标单位
-        from_mps = {
-            "m/s": 1,                        # 1米/秒 = 1米/秒
-            "km/h": 3.6,                     # 1米/秒 = 3.6千米/时
-            "km/s": 0.001,                   # 1米/秒 = 0.001千米/秒
-            "c": 1/299792458,                # 1米/秒 ≈ 3.3356e-9光速
-            "mach": 1/340.3,                 # 1米/秒 ≈ 0.00293858马赫
-            "mph": 2.23694,                  # 1米/秒 ≈ 2.23694英里/时
-            "in/s": 39.3701                  # 1米/秒 ≈ 39.3701英寸/秒
-        }
-        
-        mps = to_mps.get(from_unit, value)
-        return mps * from_mps.get(to_unit, 1)
\ No newline at end of file
+        """执行单位换算（换算系数见 unit_registry）"""
+        return self.quantity.convert(value, from_unit, to_unit)
@@ -2,8 +2,12 @@ from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
                               QLineEdit, QScrollArea, QGridLayout, QFrame)
 from PySide6.QtCore import Qt
 
+from .unit_registry import registry
+
 class TemperatureConverter(QWidget):
     """温度单位换算器"""
+
+    quantity = registry.quantity("temperature")
     
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -84,7 +88,7 @@ class TemperatureConverter(QWidget):
         layout.addWidget(scroll_area)
     
     def on_unit_input(self, text, source_unit):
-        """处理单位输入"""
+        """处理单位输入：一次向量运算得到所有单位的结果"""
         try:
             source_value = text.strip()
             if not source_value:
@@ -96,43 +100,17 @@ class TemperatureConverter(QWidget):
                 return
             
             value = float(source_value)
+            results = self.quantity.convert_all(value, source_unit)
             
             for unit_code, entry in self.unit_vars.items():
                 if unit_code != source_unit:
-                    result = self.do_conversion(value, source_unit, unit_code)
                     entry.blockSignals(True)
-                    entry.setText(f"{result:.6g}")
+                    entry.setText(f"{results[self.quantity.index[unit_code]]:.6g}")
                     entry.blockSignals(False)
                     
         except ValueError:
             pass
     
     def do_conversion(self, value, from_unit, to_unit):
-        """执行温度换算"""
-        # 先转换为摄氏度
-        if from_unit == "c":
-            celsius = value
-        elif from_unit == "f":
-            celsius = (value - 32) * 5/9
-        elif from_unit == "k":
-            celsius = value - 273.15
-        elif from_unit == "r":
-            celsius = (value - 491.67) * 5/9  # 兰氏度转摄氏度
-        elif from_unit == "re":
-            celsius = value * 5/4  # 列氏度转摄氏度
-        else:
-            celsius = value
-        
-        # 从摄氏度转换为目标单位
-        if to_unit == "c":
-            return celsius
-        elif to_unit == "f":
-            return celsius * 9/5 + 32
-        elif to_unit == "k":
-            return celsius + 273.15
-        elif to_unit == "r":
-            return (celsius + 273.15) * 9/5  # 摄氏度转兰氏度
-        elif to_unit == "re":
-            return celsius * 4/5  # 摄氏度转列氏度
-        else:
-            return celsius
\ No newline at end of file
+        """执行单位换算（换算系数见 unit_registry）"""
+        return self.quantity.convert(value, from_unit, to_unit)
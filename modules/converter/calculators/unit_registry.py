@@ -0,0 +1,186 @@
+# calculators/unit_registry.py
+"""
+单位换算引擎 - 各单位换算器与工程计算器共用。
+每个单位记为基准单位的仿射变换：基准值 = scale * 值 + offset（线性单位 offset 为 0，温度和表压为仿射）。
+每个物理量预先计算换算矩阵 A、B，任意两单位间：目标值 = A[i, j] * 值 + B[i, j]。
+支持标量和 NumPy 数组，一次向量运算即可得到所有单位的结果。
+"""
+import numpy as np
+
+# 标准大气压（Pa），表压 = 绝对压力 - ATM_PA
+ATM_PA = 101325.0
+
+# 物理量 -> [(单位代码, scale, offset)]，基准单位的 scale 为 1
+UNIT_DEFINITIONS = {
+    # 基准：米
+    "length": [
+        # 国际单位制
+        ("km", 1000, 0), ("m", 1, 0), ("dm", 0.1, 0), ("cm", 0.01, 0), ("mm", 0.001, 0),
+        ("um", 1e-6, 0), ("nm", 1e-9, 0), ("pm", 1e-12, 0),
+        # 天文单位
+        ("ly", 9460730472580800, 0), ("au", 149597870700, 0),
+        # 中国市制单位（1里=500米，1丈=10/3米，1尺=1/3米 ...）
+        ("li", 500, 0), ("zhang", 10 / 3, 0), ("chi", 1 / 3, 0), ("cun", 1 / 30, 0),
+        ("fen", 1 / 300, 0), ("li_small", 1 / 3000, 0), ("hao", 1 / 30000, 0),
+        # 英制单位
+        ("nmi", 1852, 0), ("fathom", 1.8288, 0), ("mi", 1609.344, 0), ("fur", 201.168, 0),
+        ("yd", 0.9144, 0), ("ft", 0.3048, 0), ("in", 0.0254, 0), ("mil", 0.0000254, 0),
+    ],
+    # 基准：克
+    "weight": [
+        # 国际单位制
+        ("t", 1e6, 0), ("kg", 1000, 0), ("g", 1, 0), ("mg", 0.001, 0), ("ug", 1e-6, 0),
+        ("q", 100000, 0),
+        # 特殊单位
+        ("ct", 0.2, 0),
+        # 英制单位
+        ("lb", 453.59237, 0), ("oz", 28.349523125, 0), ("gr", 0.06479891, 0),
+        ("long_ton", 1016046.9088, 0), ("short_ton", 907184.74, 0), ("dr", 1.7718451953125, 0),
+        ("cwt", 50802.34544, 0), ("uscwt", 45359.237, 0), ("st", 6350.29318, 0),
+        # 中国市制单位
+        ("jin", 500, 0), ("liang", 50, 0), ("qian", 5, 0), ("dan", 50000, 0),
+    ],
+    # 基准：平方米
+    "area": [
+        # 国际单位制
+        ("km2", 1e6, 0), ("m2", 1, 0), ("ha", 10000, 0), ("a", 100, 0), ("dm2", 0.01, 0),
+        ("cm2", 0.0001, 0), ("mm2", 1e-6, 0), ("um2", 1e-12, 0),
+        # 英制单位
+        ("mi2", 2589988.110336, 0), ("ac", 4046.8564224, 0), ("yd2", 0.83612736, 0),
+        ("ft2", 0.09290304, 0), ("in2", 0.00064516, 0), ("rd2", 25.29285264, 0),
+        # 中国市制单位
+        ("qing", 200000 / 3, 0), ("mu", 2000 / 3, 0), ("chi2", 1 / 9, 0), ("cun2", 1 / 900, 0),
+    ],
+    # 基准：立方米
+    "volume": [
+        # 国际单位制
+        ("m3", 1, 0), ("dm3", 0.001, 0), ("cm3", 1e-6, 0), ("mm3", 1e-9, 0),
+        # 公制容量单位
+        ("hl", 0.1, 0), ("l", 0.001, 0), ("l_metric", 0.001, 0), ("cl", 0.00001, 0), ("ml", 1e-6, 0),
+        # 英制单位
+        ("ft3", 0.028316846592, 0), ("in3", 0.000016387064, 0), ("yd3", 0.764554857984, 0),
+        # 英制容量单位
+        ("gal_uk", 0.00454609, 0), ("gal_us", 0.003785411784, 0),
+        ("oz_uk", 0.0000284130625, 0), ("oz_us", 0.0000295735295625, 0),
+    ],
+    # 基准：开尔文
+    "temperature": [
+        ("c", 1, 273.15),
+        ("f", 5 / 9, 273.15 - 32 * 5 / 9),
+        ("k", 1, 0),
+        ("r", 5 / 9, 0),            # 兰氏度
+        ("re", 5 / 4, 273.15),      # 列氏度
+    ],
+    # 基准：米/秒
+    "speed": [
+        ("m/s", 1, 0), ("km/h", 1 / 3.6, 0), ("km/s", 1000, 0), ("c", 299792458, 0),
+        ("mach", 340.3, 0),         # 海平面、15°C
+        # 英里/时、英寸/秒按定义取精确值；旧版换算器反向换算用四舍五入的 2.23694、39.3701，
+        # 换算到这两个单位的结果相对变化约 2e-6 / 5e-7，6 位有效数字显示时末位可能不同
+        ("mph", 0.44704, 0), ("in/s", 0.0254, 0),
+    ],
+    # 基准：焦耳
+    "energy": [
+        ("J", 1, 0), ("kJ", 1000, 0), ("kWh", 3600000, 0), ("kgm", 9.80665, 0),
+        ("psh", 2647795.5, 0), ("hph", 2684519.5, 0), ("cal", 4.184, 0), ("kcal", 4184, 0),
+        ("BTU", 1055.06, 0), ("ftlb", 1.35582, 0),
+    ],
+    # 基准：帕斯卡（绝对压力）；带 _g 的为表压
+    "pressure": [
+        ("Pa", 1, 0), ("kPa", 1000, 0), ("MPa", 1e6, 0), ("hPa", 100, 0), ("bar", 100000, 0),
+        ("mbar", 100, 0), ("atm", 101325, 0), ("mmHg", 133.322, 0), ("inHg", 3386.39, 0),
+        ("mmH2O", 9.80665, 0), ("psi", 6894.76, 0), ("kgf_cm2", 98066.5, 0), ("kgf_m2", 9.80665, 0),
+        ("kPa_g", 1000, ATM_PA), ("MPa_g", 1e6, ATM_PA), ("bar_g", 100000, ATM_PA),
+        ("psig", 6894.76, ATM_PA), ("kgf_cm2_g", 98066.5, ATM_PA),
+    ],
+    # 基准：瓦特
+    "power": [
+        ("W", 1, 0), ("kW", 1000, 0), ("hp", 745.699872, 0), ("ps", 735.49875, 0), ("J/s", 1, 0),
+        ("kgm_s", 9.80665, 0), ("kcal_s", 4184, 0), ("BTU_s", 1055.05585, 0),
+        ("ftlb_s", 1.355817948, 0), ("Nm_s", 1, 0),
+    ],
+    # 基准：牛顿
+    "force": [
+        ("N", 1, 0), ("kN", 1000, 0), ("kgf", 9.80665, 0), ("gf", 0.00980665, 0), ("tf", 9806.65, 0),
+        ("lbf", 4.4482216152605, 0), ("kip", 4448.2216152605, 0), ("dyn", 0.00001, 0),
+    ],
+}
+
+
+class UnitError(KeyError):
+    """未知的物理量或单位"""
+
+
+class Quantity:
+    """单个物理量的单位集合及预先计算的换算矩阵"""
+
+    def __init__(self, name, definitions):
+        self.name = name
+        self.units = [code for code, _, _ in definitions]
+        self.index = {code: i for i, code in enumerate(self.units)}
+        self.scale = np.array([s for _, s, _ in definitions], dtype=float)
+        self.offset = np.array([o for _, _, o in definitions], dtype=float)
+        # 目标值 = A[i, j] * 值 + B[i, j]（i 为源单位，j 为目标单位）
+        self.A = self.scale[:, None] / self.scale[None, :]
+        self.B = (self.offset[:, None] - self.offset[None, :]) / self.scale[None, :]
+        self.is_affine = bool(np.any(self.offset))
+
+    def _idx(self, unit):
+        try:
+            return self.index[unit]
+        except KeyError:
+            raise UnitError(f"{self.name} 没有单位 {unit!r}") from None
+
+    def convert(self, value, from_unit, to_unit):
+        """标量或数组从 from_unit 换算到 to_unit；标量输入返回 float"""
+        i, j = self._idx(from_unit), self._idx(to_unit)
+        result = np.asarray(value, dtype=float) * self.A[i, j] + self.B[i, j]
+        return float(result) if result.ndim == 0 else result
+
+    def convert_all(self, value, from_unit):
+        """
+        换算到全部单位，列顺序与 self.units 一致。
+        标量输入返回形状 (n_units,)，数组输入返回形状 value.shape + (n_units,)。
+        """
+        i = self._idx(from_unit)
+        value = np.asarray(value, dtype=float)
+        return value[..., None] * self.A[i] + self.B[i]
+
+    def to_base(self, value, unit):
+        """换算到基准单位"""
+        i = self._idx(unit)
+        result = np.asarray(value, dtype=float) * self.scale[i] + self.offset[i]
+        return float(result) if result.ndim == 0 else result
+
+
+class UnitRegistry:
+    """物理量注册表"""
+
+    def __init__(self, definitions=None):
+        self._quantities = {
+            name: Quantity(name, units) for name, units in (definitions or UNIT_DEFINITIONS).items()
+        }
+
+    def quantity(self, name):
+        try:
+            return self._quantities[name]
+        except KeyError:
+            raise UnitError(f"未知物理量 {name!r}") from None
+
+    def quantities(self):
+        return list(self._quantities)
+
+    def convert(self, value, quantity, from_unit, to_unit):
+        return self.quantity(quantity).convert(value, from_unit, to_unit)
+
+    def convert_all(self, value, quantity, from_unit):
+        return self.quantity(quantity).convert_all(value, from_unit)
+
+
+# 进程级注册表
+registry = UnitRegistry()
+
+
+def convert(value, quantity, from_unit, to_unit):
+    """便捷函数：convert(0.5, "pressure", "MPa_g", "MPa")"""
+    return registry.convert(value, quantity, from_unit, to_unit)
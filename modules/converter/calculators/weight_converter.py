@@ -2,8 +2,12 @@ from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
                               QLineEdit, QScrollArea, QGridLayout, QFrame)
 from PySide6.QtCore import Qt
 
+from .unit_registry import registry
+
 class WeightConverter(QWidget):
     """重量单位换算器"""
+
+    quantity = registry.quantity("weight")
     
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -90,7 +94,7 @@ class WeightConverter(QWidget):
         layout.addWidget(scroll_area)
     
     def on_unit_input(self, text, source_unit):
-        """处理单位输入"""
+        """处理单位输入：一次向量运算得到所有单位的结果"""
         try:
             source_value = text.strip()
             if not source_value:
@@ -102,80 +106,17 @@ class WeightConverter(QWidget):
                 return
             
             value = float(source_value)
+            results = self.quantity.convert_all(value, source_unit)
             
             for unit_code, entry in self.unit_vars.items():
                 if unit_code != source_unit:
-                    result = self.do_conversion(value, source_unit, unit_code)
                     entry.blockSignals(True)
-                    entry.setText(f"{result:.6g}")
+                    entry.setText(f"{results[self.quantity.index[unit_code]]:.6g}")
                     entry.blockSignals(False)
                     
         except ValueError:
             pass
     
     def do_conversion(self, value, from_unit, to_unit):
-        """执行重量换算"""
-        # 先转换为克
-        to_gram = {
-            # 国际单位制
-            "t": value * 1000000,        # 1吨 = 1,000,000克
-            "kg": value * 1000,          # 1千克 = 1,000克
-            "g": value,                  # 1克 = 1克
-            "mg": value * 0.001,         # 1毫克 = 0.001克
-            "ug": value * 0.000001,      # 1微克 = 0.000001克
-            "q": value * 100000,         # 1公担 = 100,000克
-            
-            # 特殊单位
-            "ct": value * 0.2,           # 1克拉 = 0.2克
-            
-            # 英制单位
-            "lb": value * 453.59237,     # 1磅 = 453.59237克
-            "oz": value * 28.349523125,  # 1盎司 = 28.349523125克
-            "gr": value * 0.06479891,    # 1格令 = 0.06479891克
-            "long_ton": value * 1016046.9088,    # 1长吨 = 1,016,046.9088克
-            "short_ton": value * 907184.74,      # 1短吨 = 907,184.74克
-            "dr": value * 1.7718451953125,       # 1打兰 = 1.7718451953125克
-            "cwt": value * 50802.34544,          # 1英担 = 50,802.34544克
-            "uscwt": value * 45359.237,          # 1美担 = 45,359.237克
-            "st": value * 6350.29318,            # 1英石 = 6,350.29318克
-            
-            # 中国市制单位
-            "jin": value * 500,          # 1斤 = 500克
-            "liang": value * 50,         # 1两 = 50克
-            "qian": value * 5,           # 1钱 = 5克
-            "dan": value * 50000         # 1担 = 50,000克
-        }
-        
-        # 从克转换为目标单位
-        from_gram = {
-            # 国际单位制
-            "t": 0.000001,               # 1克 = 0.000001吨
-            "kg": 0.001,                 # 1克 = 0.001千克
-            "g": 1,                      # 1克 = 1克
-            "mg": 1000,                  # 1克 = 1,000毫克
-            "ug": 1000000,               # 1克 = 1,000,000微克
-            "q": 0.00001,                # 1克 = 0.00001公担
-            
-            # 特殊单位
-            "ct": 5,                     # 1克 = 5克拉
-            
-            # 英制单位
-            "lb": 0.00220462262185,      # 1克 ≈ 0.00220462磅
-            "oz": 0.03527396195,         # 1克 ≈ 0.03527396盎司
-            "gr": 15.4323583529,         # 1克 ≈ 15.43236格令
-            "long_ton": 1/1016046.9088,  # 1克 ≈ 0.000000984207长吨
-            "short_ton": 1/907184.74,    # 1克 ≈ 0.00000110231短吨
-            "dr": 0.564383391193,        # 1克 ≈ 0.564383打兰
-            "cwt": 1/50802.34544,        # 1克 ≈ 0.00001968413英担
-            "uscwt": 1/45359.237,        # 1克 ≈ 0.00002204623美担
-            "st": 1/6350.29318,          # 1克 ≈ 0.000157473英石
-            
-            # 中国市制单位
-            "jin": 0.002,                # 1克 = 0.002斤
-            "liang": 0.02,               # 1克 = 0.02两
-            "qian": 0.2,                 # 1克 = 0.2钱
-            "dan": 0.00002               # 1克 = 0.00002担
-        }
-        
-        grams = to_gram.get(from_unit, value)
-        return grams * from_gram.get(to_unit, 1)
\ No newline at end of file
+        """执行单位换算（换算系数见 unit_registry）"""
+        return self.quantity.convert(value, from_unit, to_unit)
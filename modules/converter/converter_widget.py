@@ -26,6 +26,7 @@ EnergyConverter = None
 PressureConverter = None
 PowerConverter = None
 ForceConverter = None
+BatchConverter = None
 
 # 单独导入每个计算器，这样如果一个失败不会影响其他
 calculators_to_import = [
@@ -42,7 +43,8 @@ calculators_to_import = [
     ("calculators.energy_converter", "EnergyConverter"),
     ("calculators.pressure_converter", "PressureConverter"),
     ("calculators.power_converter", "PowerConverter"),
-    ("calculators.force_converter", "ForceConverter")
+    ("calculators.force_converter", "ForceConverter"),
+    ("calculators.batch_converter", "BatchConverter")
 ]
 
 for module_path, class_name in calculators_to_import:
@@ -124,7 +126,8 @@ class ConverterWidget(QWidget):
             (EnergyConverter, "热能换算"),
             (PressureConverter, "压强换算"),
             (PowerConverter, "功率换算"),
-            (ForceConverter, "力换算")
+            (ForceConverter, "力换算"),
+            (BatchConverter, "批量换算")
         ]
         
         for calculator_class, title in page_configs:
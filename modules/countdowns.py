@@ -2,9 +2,211 @@
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, 
                                QPushButton, QScrollArea, QGridLayout, QFrame,
                                QMessageBox, QInputDialog, QGroupBox, QSpinBox)
-from PySide6.QtCore import Qt, QTimer, QDateTime, QSize
+from PySide6.QtCore import Qt, QObject, QTimer, QDateTime, QSize, Signal
 from PySide6.QtGui import QFont, QPalette, QColor
 from datetime import datetime, timedelta
+import heapq
+
+
+def parse_target_datetime(countdown):
+    """解析倒计时的目标日期时间，兼容 HH:MM:SS / HH:MM，解析失败时使用当天 23:59:00"""
+    target_time_str = countdown.get("target_time", "23:59:00")  # 默认包含秒数
+    for time_format in ("%Y-%m-%d %H:%M:%S", "%Y-%m-%d %H:%M"):
+        try:
+            return datetime.strptime(f"{countdown['target_date']} {target_time_str}", time_format)
+        except ValueError:
+            continue
+    return datetime.strptime(f"{countdown['target_date']} 23:59:00", "%Y-%m-%d %H:%M:%S")
+
+
+def format_remaining(time_left):
+    """剩余时间文本 - 精确到秒"""
+    if time_left.total_seconds() <= 0:
+        return "已过期"
+    days = time_left.days
+    hours = time_left.seconds // 3600
+    minutes = (time_left.seconds % 3600) // 60
+    seconds = time_left.seconds % 60
+
+    # 根据剩余时间选择合适的显示格式
+    if days > 0:
+        return f"{days}天 {hours:02d}:{minutes:02d}:{seconds:02d}"
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
+
+
+class CountdownScheduler(QObject):
+    """
+    倒计时截止调度：小根堆按目标时间排序，只用一个单次 QTimer 等待最早的截止时间。
+    QTimer 按单调时钟计时，系统时间被调整后可能早醒或晚醒，因此每次最多等待 MAX_WAIT_MS，
+    醒来后按当前系统时间重新判断：已到期的触发，未到期的重新等待。
+    """
+
+    MAX_WAIT_MS = 60 * 1000
+
+    due = Signal(object)  # 参数为到期的倒计时 ID
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._heap = []      # (目标时间, 序号, ID)，过期条目在出堆时丢弃
+        self._targets = {}   # ID -> (目标时间, 序号)，以此判断堆中条目是否仍有效
+        self._seq = 0
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setTimerType(Qt.PreciseTimer)
+        self._timer.timeout.connect(self._on_timeout)
+
+    def schedule(self, countdown_id, target):
+        """安排（或重新安排）倒计时在 target 触发"""
+        current = self._targets.get(countdown_id)
+        if current is not None and current[0] == target:
+            return
+        self._seq += 1
+        self._targets[countdown_id] = (target, self._seq)
+        heapq.heappush(self._heap, (target, self._seq, countdown_id))
+        if len(self._heap) > 2 * len(self._targets) + 16:
+            # 改期/取消留下的无效条目过多时重建堆
+            self._heap = [(t, seq, cid) for cid, (t, seq) in self._targets.items()]
+            heapq.heapify(self._heap)
+        self._arm()
+
+    def cancel(self, countdown_id):
+        if self._targets.pop(countdown_id, None) is not None:
+            self._arm()
+
+    def clear(self):
+        self._heap.clear()
+        self._targets.clear()
+        self._timer.stop()
+
+    def scheduled_ids(self):
+        return set(self._targets)
+
+    def __len__(self):
+        return len(self._targets)
+
+    def _peek(self):
+        """最早的有效条目，顺带丢弃已取消或已改期的堆顶"""
+        while self._heap:
+            target, seq, countdown_id = self._heap[0]
+            if self._targets.get(countdown_id) == (target, seq):
+                return target
+            heapq.heappop(self._heap)
+        return None
+
+    def _arm(self):
+        target = self._peek()
+        if target is None:
+            # 没有待触发的倒计时，不保留任何定时器
+            self._timer.stop()
+            return
+        wait_ms = (target - datetime.now()).total_seconds() * 1000
+        self._timer.start(int(min(max(wait_ms, 0), self.MAX_WAIT_MS)))
+
+    def _on_timeout(self):
+        now = datetime.now()
+        fired = []
+        while True:
+            target = self._peek()
+            if target is None or target > now:
+                break
+            _, _, countdown_id = heapq.heappop(self._heap)
+            del self._targets[countdown_id]
+            fired.append(countdown_id)
+        # 先重新布置定时器再通知，通知里弹出的模态框不会耽误后续截止时间
+        self._arm()
+        for countdown_id in fired:
+            self.due.emit(countdown_id)
+
+
+class CountdownCard(QFrame):
+    """单个倒计时卡片。创建后常驻，数据变化时更新文字，每秒只更新剩余时间"""
+
+    CARD_WIDTH = 288  # 增加卡片宽度以适应较长的标题
+    CARD_HEIGHT = 100
+
+    clicked = Signal(object)  # 参数为倒计时 ID
+
+    def __init__(self, countdown, parent=None):
+        super().__init__(parent)
+        self.countdown_id = countdown["id"]
+        self.target = None
+        self._selected = None
+        self._expired = None
+
+        self.setFrameStyle(QFrame.Box)
+        self.setLineWidth(1)
+        self.setFixedSize(self.CARD_WIDTH, self.CARD_HEIGHT)  # 固定大小
+
+        card_layout = QVBoxLayout(self)
+
+        # 第一行：剩余时间（大字体）
+        self.remaining_label = QLabel()
+        self.remaining_label.setFont(QFont("Arial", 14, QFont.Bold))
+        self.remaining_label.setAlignment(Qt.AlignCenter)
+        card_layout.addWidget(self.remaining_label)
+
+        # 第二行：事件名称
+        self.name_label = QLabel()
+        self.name_label.setFont(QFont("Arial", 10, QFont.Bold))
+        self.name_label.setAlignment(Qt.AlignCenter)
+        card_layout.addWidget(self.name_label)
+
+        # 第三行：目标时间
+        self.target_label = QLabel()
+        self.target_label.setFont(QFont("Arial", 9))
+        self.target_label.setAlignment(Qt.AlignCenter)
+        card_layout.addWidget(self.target_label)
+
+        # 子标签不处理鼠标事件，点击统一由卡片接收
+        for label in (self.remaining_label, self.name_label, self.target_label):
+            label.setAttribute(Qt.WA_TransparentForMouseEvents)
+
+        self.set_selected(False)
+        self.set_countdown(countdown)
+
+    def set_countdown(self, countdown):
+        """倒计时数据变化（添加/编辑）时更新名称和目标时间"""
+        self.target = parse_target_datetime(countdown)
+
+        # 如果名称太长，截断并添加省略号
+        name = countdown["name"]
+        if len(name) > 20:  # 限制名称长度
+            name = name[:20] + "..."
+        self.name_label.setText(name)
+
+        # 格式化显示目标时间（如果包含秒数，去掉秒数以保持简洁）
+        target_time_str = countdown.get("target_time", "23:59:00")
+        display_time = target_time_str
+        if ":" in target_time_str and target_time_str.count(":") == 2:
+            display_time = ":".join(target_time_str.split(":")[:2])
+        self.target_label.setText(f"目标: {countdown['target_date']} {display_time}")
+
+        self.update_remaining(datetime.now())
+
+    def set_selected(self, selected):
+        if selected == self._selected:
+            return
+        self._selected = selected
+        if selected:
+            self.setStyleSheet("QFrame { background-color: lightblue; border: 2px solid blue; }")
+        else:
+            self.setStyleSheet("QFrame { background-color: white; }")
+
+    def update_remaining(self, now):
+        """只更新剩余时间文字；样式仅在过期状态变化时重设"""
+        time_left = self.target - now
+        text = format_remaining(time_left)
+        if text != self.remaining_label.text():
+            self.remaining_label.setText(text)
+        expired = time_left.total_seconds() <= 0
+        if expired != self._expired:
+            self._expired = expired
+            self.remaining_label.setStyleSheet("color: red;" if expired else "color: blue;")
+
+    def mousePressEvent(self, event):
+        self.clicked.emit(self.countdown_id)
+        super().mousePressEvent(event)
+
 
 class CountdownsWidget(QWidget):
     """倒计时模块 - 动态列数版"""
@@ -12,14 +214,21 @@ class CountdownsWidget(QWidget):
     def __init__(self, parent=None, data_manager=None):
         super().__init__(parent)
         self.data_manager = data_manager
-        self.active_countdowns = {}
+        self.scheduler = CountdownScheduler(self)  # 未结束倒计时的截止调度
+        self.scheduler.due.connect(self._on_countdown_due)
         self.selected_countdown_id = None
-        self.countdown_cards = {}  # 存储倒计时卡片的引用
+        self.countdown_cards = {}  # 倒计时 ID -> 常驻的 CountdownCard
+        self._layout_order = []    # 当前网格中的卡片顺序
+        self._layout_columns = 0
+        self._refresh_pending = False
         
         self.setup_ui()
         self.refresh_countdowns()
         self.start_datetime_updater()
         self.auto_start_countdowns()  # 自动开始未完成的倒计时
+
+        # 倒计时集合变化时才重建卡片；添加/编辑/删除后的刷新都经由此订阅，不再直接调用
+        self.data_manager.subscribe("countdowns", self._on_countdowns_changed)
     
     def setup_ui(self):
         """设置倒计时UI - 只保留日期倒计时"""
@@ -102,6 +311,11 @@ class CountdownsWidget(QWidget):
         self.scroll_layout = QGridLayout(self.scroll_widget)
         self.scroll_area.setWidget(self.scroll_widget)
         list_layout.addWidget(self.scroll_area)
+
+        self.empty_label = QLabel("暂无倒计时，请在上方添加新倒计时")
+        self.empty_label.setFont(QFont("Arial", 12))
+        self.empty_label.setAlignment(Qt.AlignCenter)
+        self.scroll_layout.addWidget(self.empty_label, 0, 0)
         
         # 按钮框架
         button_layout = QHBoxLayout()
@@ -130,63 +344,41 @@ class CountdownsWidget(QWidget):
         self.status_label.setFont(QFont("Arial", 9))
         list_layout.addWidget(self.status_label)
         
-        # 设置定时器更新倒计时显示
-        self.countdown_timer = QTimer()
-        self.countdown_timer.timeout.connect(self.refresh_countdowns)
-        self.countdown_timer.start(1000)  # 每秒更新一次
+        # 设置定时器更新倒计时显示（只更新可见卡片的剩余时间；页面隐藏时停止，见 showEvent/hideEvent）
+        self.countdown_timer = QTimer(self)
+        self.countdown_timer.timeout.connect(self.update_remaining_times)
     
     def auto_start_countdowns(self):
         """自动开始所有未完成的倒计时 - 精确到秒"""
-        countdowns = self.data_manager.get_countdowns()
-        auto_started = 0
-        
-        for countdown in countdowns:
-            countdown_id_str = str(countdown["id"])
-            
-            # 如果已经在活动列表中，跳过
-            if countdown_id_str in self.active_countdowns:
-                continue
-                
-            # 检查倒计时是否已完成或过期
-            target_time_str = countdown.get("target_time", "23:59:00")  # 默认包含秒数
-            
-            # 尝试不同的时间格式
-            try:
-                # 先尝试包含秒数的格式
-                target_datetime = datetime.strptime(
-                    f"{countdown['target_date']} {target_time_str}", 
-                    "%Y-%m-%d %H:%M:%S"
-                )
-            except ValueError:
-                try:
-                    # 如果不包含秒数，使用默认格式并添加秒数
-                    target_datetime = datetime.strptime(
-                        f"{countdown['target_date']} {target_time_str}", 
-                        "%Y-%m-%d %H:%M"
-                    )
-                except ValueError:
-                    # 如果还是失败，使用默认时间
-                    target_datetime = datetime.strptime(
-                        f"{countdown['target_date']} 23:59:00", 
-                        "%Y-%m-%d %H:%M:%S"
-                    )
-            
-            now = datetime.now()
-            if target_datetime <= now:
-                continue  # 跳过已过期的倒计时
-                
-            # 自动开始倒计时
-            self.active_countdowns[countdown_id_str] = {
-                "running": True,
-                "target": target_datetime
-            }
-            
-            auto_started += 1
+        auto_started = self._sync_schedule(self.data_manager.get_countdowns())
         
         if auto_started > 0:
             self.status_label.setText(f"已自动开始 {auto_started} 个倒计时")
             QTimer.singleShot(3000, lambda: self.status_label.setText(""))
-            self.refresh_countdowns()
+
+    def _sync_schedule(self, countdowns):
+        """按当前数据重新安排截止时间：已删除的取消，未到期的（重新）安排，返回安排的数量"""
+        now = datetime.now()
+        ids = {countdown["id"] for countdown in countdowns}
+        for countdown_id in self.scheduler.scheduled_ids() - ids:
+            self.scheduler.cancel(countdown_id)
+
+        scheduled = 0
+        for countdown in countdowns:
+            target_datetime = parse_target_datetime(countdown)
+            if target_datetime <= now:
+                # 跳过已过期的倒计时
+                self.scheduler.cancel(countdown["id"])
+                continue
+            self.scheduler.schedule(countdown["id"], target_datetime)
+            scheduled += 1
+        return scheduled
+
+    def _on_countdown_due(self, countdown_id):
+        """调度器在目标时间触发"""
+        countdown = self.data_manager.get_countdown(countdown_id)
+        if countdown is not None:
+            self.countdown_finished(countdown_id, countdown)
     
     def update_datetime(self):
         """更新当前日期和时间显示"""
@@ -202,9 +394,8 @@ class CountdownsWidget(QWidget):
     
     def start_datetime_updater(self):
         """启动日期时间更新器"""
-        self.datetime_timer = QTimer()
-        self.datetime_timer.timeout.connect(self.update_datetime)
-        self.datetime_timer.start(1000)  # 每秒更新一次
+        self.datetime_timer = QTimer(self)
+        self.datetime_timer.timeout.connect(self.update_datetime)  # 页面显示时每秒更新一次
         self.update_datetime()  # 立即更新一次
     
     def add_countdown(self):
@@ -243,7 +434,6 @@ class CountdownsWidget(QWidget):
             self.name_entry.clear()
             self.target_date_entry.clear()
             
-            self.refresh_countdowns()
             self.status_label.setText(f"已添加倒计时: {name}")
             QTimer.singleShot(3000, lambda: self.status_label.setText(""))
             
@@ -306,14 +496,8 @@ class CountdownsWidget(QWidget):
             QMessageBox.critical(self, "错误", "日期或时间格式错误，请使用 YYYY-MM-DD 和 HH:MM 格式")
             return
         
-        # 停止当前的倒计时
-        countdown_id_str = str(countdown["id"])
-        if countdown_id_str in self.active_countdowns:
-            self.active_countdowns[countdown_id_str]["running"] = False
-        
         self.data_manager.update_countdown(countdown["id"], name=new_name, 
                                         target_date=new_date, target_time=new_time)
-        self.refresh_countdowns()
         self.status_label.setText(f"已更新倒计时: {new_name}")
         QTimer.singleShot(3000, lambda: self.status_label.setText(""))
     
@@ -330,18 +514,12 @@ class CountdownsWidget(QWidget):
             QMessageBox.warning(self, "警告", "选择的倒计时不存在")
             return
         
-        # 停止倒计时
-        countdown_id_str = str(countdown["id"])
-        if countdown_id_str in self.active_countdowns:
-            self.active_countdowns[countdown_id_str]["running"] = False
-        
         reply = QMessageBox.question(self, "确认", f"确定要删除倒计时 '{countdown['name']}' 吗？",
                                    QMessageBox.Yes | QMessageBox.No)
         
         if reply == QMessageBox.Yes:
             self.data_manager.delete_countdown(countdown["id"])
             self.selected_countdown_id = None
-            self.refresh_countdowns()
             self.status_label.setText(f"已删除倒计时: {countdown['name']}")
             QTimer.singleShot(3000, lambda: self.status_label.setText(""))
     
@@ -356,199 +534,119 @@ class CountdownsWidget(QWidget):
                                    QMessageBox.Yes | QMessageBox.No)
         
         if reply == QMessageBox.Yes:
-            # 停止所有活动倒计时
-            for countdown_id in list(self.active_countdowns.keys()):
-                self.active_countdowns[countdown_id]["running"] = False
-            
-            # 删除所有倒计时
+            # 删除所有倒计时（调度在同步时一并取消）
             for countdown in countdowns:
                 self.data_manager.delete_countdown(countdown["id"])
             
             self.selected_countdown_id = None
-            self.refresh_countdowns()
             self.status_label.setText("已清空所有倒计时")
             QTimer.singleShot(3000, lambda: self.status_label.setText(""))
     
     def select_countdown(self, countdown_id):
         """选择倒计时"""
+        previous = self.countdown_cards.get(self.selected_countdown_id)
+        if previous is not None:
+            previous.set_selected(False)
         self.selected_countdown_id = countdown_id
-        self.refresh_countdowns()  # 刷新显示以突出显示选中的倒计时
-    
-    def check_countdown_finished(self, countdown_id, countdown):
-        """检查倒计时是否结束"""
-        countdown_id_str = str(countdown_id)
-        if countdown_id_str in self.active_countdowns:
-            target_datetime = self.active_countdowns[countdown_id_str]["target"]
-            now = datetime.now()
-            
-            if now >= target_datetime:
-                # 倒计时结束
-                self.countdown_finished(countdown_id, countdown)
-                return True
-        return False
+        card = self.countdown_cards.get(countdown_id)
+        if card is not None:
+            card.set_selected(True)  # 突出显示选中的倒计时
     
     def countdown_finished(self, countdown_id, countdown):
         """倒计时结束处理"""
+        card = self.countdown_cards.get(countdown_id)
+        if card is not None:
+            card.update_remaining(datetime.now())
+        
         # 显示通知
         QMessageBox.information(self, "倒计时结束", f"'{countdown['name']}' 的时间到了！")
-        
-        # 从活动倒计时中移除
-        countdown_id_str = str(countdown_id)
-        if countdown_id_str in self.active_countdowns:
-            del self.active_countdowns[countdown_id_str]
-        
-        # 刷新显示
-        self.refresh_countdowns()
     
+    def _on_countdowns_changed(self, event):
+        """倒计时集合变化（添加/编辑/删除）：合并到下一次事件循环统一同步，批量删除时只同步一次"""
+        if not self._refresh_pending:
+            self._refresh_pending = True
+            QTimer.singleShot(0, self.refresh_countdowns)
+
     def refresh_countdowns(self):
-        """刷新倒计时列表 - 动态列数布局，精确到秒"""
+        """
+        按当前数据同步卡片：新增的创建、删除的销毁、其余只更新文字；
+        卡片顺序或列数变化时才重新排列网格。
+        """
+        self._refresh_pending = False
         countdowns = self.data_manager.get_countdowns()
-        
-        # 清除现有显示
-        for i in reversed(range(self.scroll_layout.count())):
-            widget = self.scroll_layout.itemAt(i).widget()
-            if widget:
-                widget.deleteLater()
-        
-        self.countdown_cards = {}
-        
-        if not countdowns:
-            no_countdowns_label = QLabel("暂无倒计时，请在上方添加新倒计时")
-            no_countdowns_label.setFont(QFont("Arial", 12))
-            no_countdowns_label.setAlignment(Qt.AlignCenter)
-            self.scroll_layout.addWidget(no_countdowns_label, 0, 0)
-            return
-        
-        # 计算每行可以放置的列数
-        # 增加卡片宽度以适应较长的标题
-        card_width = 288  # 增加卡片宽度
+        ids = [countdown["id"] for countdown in countdowns]
+        self._sync_schedule(countdowns)
+
+        for countdown_id in set(self.countdown_cards) - set(ids):
+            card = self.countdown_cards.pop(countdown_id)
+            self.scroll_layout.removeWidget(card)
+            card.deleteLater()
+
+        for countdown in countdowns:
+            card = self.countdown_cards.get(countdown["id"])
+            if card is None:
+                card = CountdownCard(countdown)
+                card.clicked.connect(self.select_countdown)
+                self.countdown_cards[countdown["id"]] = card
+            else:
+                card.set_countdown(countdown)
+            card.set_selected(countdown["id"] == self.selected_countdown_id)
+
+        self.empty_label.setVisible(not countdowns)
+        self._relayout(ids)
+
+    def _columns(self):
+        """计算每行可以放置的卡片数量"""
         scroll_width = self.scroll_area.width()
-        
         # 如果滚动区域宽度为0（未初始化），使用默认值
         if scroll_width <= 1:
             scroll_width = 800  # 默认宽度
-        
-        # 计算每行可以放置的卡片数量
-        columns = max(1, scroll_width // card_width)
-        
-        # 使用网格布局
-        for i, countdown in enumerate(countdowns):
-            row = i // columns
-            col = i % columns
-            
-            # 创建倒计时卡片框架
-            countdown_frame = QFrame()
-            countdown_frame.setFrameStyle(QFrame.Box)
-            countdown_frame.setLineWidth(1)
-            countdown_frame.setFixedSize(card_width, 100)  # 固定大小
-            
-            # 检查是否被选中
-            is_selected = self.selected_countdown_id == countdown["id"]
-            if is_selected:
-                countdown_frame.setStyleSheet("QFrame { background-color: lightblue; border: 2px solid blue; }")
-            else:
-                countdown_frame.setStyleSheet("QFrame { background-color: white; }")
-            
-            # 设置网格列权重，使列均匀分布
-            self.scroll_layout.setColumnStretch(col, 1)
-            
-            # 绑定点击事件来选择倒计时
-            countdown_id = countdown["id"]
-            countdown_frame.mousePressEvent = lambda event, cid=countdown_id: self.select_countdown(cid)
-            
-            # 计算剩余时间 - 精确到秒
-            target_time_str = countdown.get("target_time", "23:59:00")
-            
-            # 尝试解析包含秒数的时间格式
-            try:
-                # 先尝试包含秒数的格式
-                time_format = "%Y-%m-%d %H:%M:%S"
-                target_datetime = datetime.strptime(
-                    f"{countdown['target_date']} {target_time_str}", 
-                    time_format
-                )
-            except ValueError:
-                # 如果不包含秒数，使用默认格式
-                try:
-                    time_format = "%Y-%m-%d %H:%M"
-                    target_datetime = datetime.strptime(
-                        f"{countdown['target_date']} {target_time_str}", 
-                        time_format
-                    )
-                except ValueError:
-                    # 如果还是失败，使用默认时间
-                    target_datetime = datetime.strptime(
-                        f"{countdown['target_date']} 23:59:00", 
-                        "%Y-%m-%d %H:%M:%S"
-                    )
-            
-            now = datetime.now()
-            time_left = target_datetime - now
-            
-            # 检查倒计时是否结束
-            if self.check_countdown_finished(countdown_id, countdown):
-                continue
-            
-            if time_left.total_seconds() <= 0:
-                remaining_str = "已过期"
-            else:
-                days = time_left.days
-                hours = time_left.seconds // 3600
-                minutes = (time_left.seconds % 3600) // 60
-                seconds = time_left.seconds % 60
-                
-                # 根据剩余时间选择合适的显示格式
-                if days > 0:
-                    remaining_str = f"{days}天 {hours:02d}:{minutes:02d}:{seconds:02d}"
-                else:
-                    remaining_str = f"{hours:02d}:{minutes:02d}:{seconds:02d}"
-            
-            # 创建卡片布局
-            card_layout = QVBoxLayout(countdown_frame)
-            
-            # 第一行：剩余时间（大字体）
-            remaining_label = QLabel(remaining_str)
-            remaining_label.setFont(QFont("Arial", 14, QFont.Bold))
-            if time_left.total_seconds() <= 0:
-                remaining_label.setStyleSheet("color: red;")
-            else:
-                remaining_label.setStyleSheet("color: blue;")
-            remaining_label.setAlignment(Qt.AlignCenter)
-            remaining_label.mousePressEvent = lambda event, cid=countdown_id: self.select_countdown(cid)
-            card_layout.addWidget(remaining_label)
-            
-            # 第二行：事件名称
-            # 如果名称太长，截断并添加省略号
-            name = countdown["name"]
-            if len(name) > 20:  # 限制名称长度
-                name = name[:20] + "..."
-                
-            name_label = QLabel(name)
-            name_label.setFont(QFont("Arial", 10, QFont.Bold))
-            name_label.setAlignment(Qt.AlignCenter)
-            name_label.mousePressEvent = lambda event, cid=countdown_id: self.select_countdown(cid)
-            card_layout.addWidget(name_label)
-            
-            # 第三行：目标时间
-            # 格式化显示目标时间（如果包含秒数，去掉秒数以保持简洁）
-            display_time = target_time_str
-            if ":" in target_time_str and target_time_str.count(":") == 2:
-                # 如果包含秒数，只显示到分钟
-                display_time = ":".join(target_time_str.split(":")[:2])
-            
-            target_time_str_display = f"{countdown['target_date']} {display_time}"
-            target_label = QLabel(f"目标: {target_time_str_display}")
-            target_label.setFont(QFont("Arial", 9))
-            target_label.setAlignment(Qt.AlignCenter)
-            target_label.mousePressEvent = lambda event, cid=countdown_id: self.select_countdown(cid)
-            card_layout.addWidget(target_label)
-            
-            # 添加到网格布局
-            self.scroll_layout.addWidget(countdown_frame, row, col, Qt.AlignCenter)
-            self.countdown_cards[countdown_id] = countdown_frame
+        return max(1, scroll_width // CountdownCard.CARD_WIDTH)
+
+    def _relayout(self, ids=None):
+        """按列数把卡片放入网格；顺序和列数都未变化时不做任何事"""
+        ids = self._layout_order if ids is None else ids
+        columns = self._columns()
+        if ids == self._layout_order and columns == self._layout_columns:
+            return
+
+        for countdown_id in self._layout_order:
+            card = self.countdown_cards.get(countdown_id)
+            if card is not None:
+                self.scroll_layout.removeWidget(card)
+
+        # 设置网格列权重，使列均匀分布
+        for col in range(max(columns, self._layout_columns)):
+            self.scroll_layout.setColumnStretch(col, 1 if col < columns else 0)
+
+        for i, countdown_id in enumerate(ids):
+            self.scroll_layout.addWidget(self.countdown_cards[countdown_id], i // columns, i % columns, Qt.AlignCenter)
+
+        self._layout_order = list(ids)
+        self._layout_columns = columns
+
+    def update_remaining_times(self):
+        """页面可见时每秒调用：只更新可见卡片的剩余时间（是否结束由调度器负责）"""
+        now = datetime.now()
+        for card in self.countdown_cards.values():
+            if not card.visibleRegion().isEmpty():
+                card.update_remaining(now)
     
+    def showEvent(self, event):
+        """页面显示时才启动每秒刷新"""
+        super().showEvent(event)
+        self.update_datetime()
+        self.update_remaining_times()
+        self.datetime_timer.start(1000)
+        self.countdown_timer.start(1000)
+
+    def hideEvent(self, event):
+        """页面隐藏时停止每秒刷新，截止提醒仍由调度器按时触发"""
+        super().hideEvent(event)
+        self.datetime_timer.stop()
+        self.countdown_timer.stop()
+
     def resizeEvent(self, event):
-        """当窗口大小改变时，重新计算列数"""
+        """当窗口大小改变时，列数变化才重新排列"""
         super().resizeEvent(event)
-        # 刷新倒计时列表以重新布局
-        self.refresh_countdowns()
\ No newline at end of file
+        self._relayout()
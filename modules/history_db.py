@@ -3,17 +3,77 @@
 import sqlite3
 import json
 import os
+import queue
+import re
+import threading
+import time
 from datetime import datetime
 from PySide6.QtCore import QObject, Signal
 
+from startup_trace import startup_trace
+
+# 中日韩字符逐字切分，使 unicode61 分词器把每个汉字作为独立词元，
+# 查询时以短语匹配相邻汉字即可实现任意长度的中文子串检索
+_CJK_RE = re.compile(r"([\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff\uff00-\uffef])")
+_TOKEN_RE = re.compile(r"[^\W_]+")
+
+
+def _fts_text(text):
+    """全文索引文本预处理（注册为 SQLite 函数 calce_fts_text，供触发器调用）"""
+    if not text:
+        return ""
+    return _CJK_RE.sub(r" \1 ", str(text))
+
+
+# 参数值开头的数字，如 "200.0 mm" -> 200.0
+_NUMBER_RE = re.compile(r"^\s*([-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)")
+
+
+def _param_rows(record_id, inputs, outputs):
+    """把输入/输出字典展开为参数索引行 (record_id, key, numeric_value, text_value)"""
+    rows = []
+    for values in (inputs, outputs):
+        if not isinstance(values, dict):
+            continue
+        for key, value in values.items():
+            if isinstance(value, bool) or value is None:
+                numeric = None
+            elif isinstance(value, (int, float)):
+                numeric = float(value)
+            else:
+                m = _NUMBER_RE.match(str(value))
+                numeric = float(m.group(1)) if m else None
+            rows.append((record_id, str(key), numeric, str(value)))
+    return rows
+
+
+def _fts_query(keyword):
+    """把搜索关键词转换为 FTS5 查询：每个词为一个前缀短语，多个词之间为 AND；无有效词元时返回空串"""
+    phrases = []
+    for term in keyword.split():
+        tokens = _TOKEN_RE.findall(_fts_text(term))
+        if tokens:
+            phrases.append('"' + " ".join(tokens) + '"*')
+    return " ".join(phrases)
+
 
 class HistoryDB(QObject):
     """历史记录数据库，支持单例和刷新信号"""
     record_added = Signal()  # 保存新记录后发送此信号
 
-    _instance = None
     _instance = None
 
+    # 每个连接缓存的预编译语句数量（sqlite3 按 SQL 文本复用已编译语句）
+    STATEMENT_CACHE_SIZE = 128
+    # 连接级 PRAGMA：WAL 模式下 synchronous=NORMAL 提交时不做 fsync，仅在检查点时同步
+    PRAGMAS = (
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        "PRAGMA cache_size=-8000",      # 约 8 MB 页缓存
+        "PRAGMA temp_store=MEMORY",
+        "PRAGMA busy_timeout=3000",
+    )
+
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super().__new__(cls)
@@ -30,10 +90,55 @@ class HistoryDB(QObject):
         os.makedirs(db_dir, exist_ok=True)
         self.db_path = os.path.join(db_dir, "calc_history.db")
 
-        self._init_db()
+        # 每个线程持有一个长连接，避免每次操作重复打开/关闭数据库
+        self._local = threading.local()
+        self._conns = []
+        self._conns_lock = threading.Lock()
+        self._fts_enabled = False
+        self._writer = None
+        self._writer_lock = threading.Lock()
+
+        with startup_trace.span("HistoryDB", "schema", "data"):
+            self._init_db()
 
     def _get_conn(self):
-        return sqlite3.connect(self.db_path)
+        """获取当前线程的长连接（首次调用时创建并设置 PRAGMA）"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, cached_statements=self.STATEMENT_CACHE_SIZE)
+            for pragma in self.PRAGMAS:
+                conn.execute(pragma)
+            conn.create_function("calce_fts_text", 1, _fts_text, deterministic=True)
+            self._local.conn = conn
+            with self._conns_lock:
+                self._conns.append(conn)
+        return conn
+
+    def _close_thread_conn(self):
+        """关闭当前线程的连接（工作线程退出前调用）"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            return
+        with self._conns_lock:
+            if conn in self._conns:
+                self._conns.remove(conn)
+        conn.close()
+        self._local.conn = None
+
+    def close(self):
+        """写入队列落盘后关闭所有线程的连接（应用退出时调用）"""
+        if self._writer is not None:
+            self._writer.stop()
+            self._writer = None
+        with self._conns_lock:
+            conns, self._conns = self._conns, []
+        for conn in conns:
+            try:
+                conn.close()
+            except sqlite3.ProgrammingError:
+                # 其他线程创建的连接只能由其所属线程关闭，进程退出时自动释放
+                pass
+        self._local = threading.local()
 
     def _init_db(self):
         conn = self._get_conn()
@@ -62,39 +167,285 @@ class HistoryDB(QObject):
             CREATE INDEX IF NOT EXISTS idx_created_at
             ON calculation_history(created_at DESC)
         """)
+        # 游标分页索引：(created_at, id) 全局及按计算器
+        cur.execute("""
+            CREATE INDEX IF NOT EXISTS idx_created_id
+            ON calculation_history(created_at DESC, id DESC)
+        """)
+        cur.execute("""
+            CREATE INDEX IF NOT EXISTS idx_calculator_created_id
+            ON calculation_history(calculator_id, created_at DESC, id DESC)
+        """)
         conn.commit()
-        conn.close()
+        self._init_counts(conn)
+        self._init_params(conn)
+        self._fts_enabled = self._init_fts(conn)
 
-    def save(self, calculator_id, calculator_name, calculator_category,
-             inputs, outputs, notes=""):
-        """保存一条计算历史"""
-        conn = self._get_conn()
-        cur = conn.cursor()
-        cur.execute("""
-            INSERT INTO calculation_history
-                (calculator_id, calculator_name, calculator_category,
-                 inputs, outputs, notes, created_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        """, (
+    _INSERT_PARAM_SQL = """
+        INSERT INTO calculation_params (record_id, key, numeric_value, text_value)
+        VALUES (?, ?, ?, ?)
+    """
+
+    def _init_params(self, conn):
+        """创建参数数值索引表（每条记录的输入/输出逐项展开），首次创建时从历史 JSON 回填"""
+        exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'calculation_params'"
+        ).fetchone() is not None
+        with conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS calculation_params (
+                    record_id INTEGER NOT NULL,
+                    key TEXT NOT NULL,
+                    numeric_value REAL,
+                    text_value TEXT
+                )
+            """)
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_params_key_value
+                ON calculation_params(key, numeric_value, record_id)
+            """)
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_params_record
+                ON calculation_params(record_id)
+            """)
+            conn.execute("""
+                CREATE TRIGGER IF NOT EXISTS calculation_params_ad
+                AFTER DELETE ON calculation_history BEGIN
+                    DELETE FROM calculation_params WHERE record_id = old.id;
+                END
+            """)
+            if not exists:
+                cur = conn.execute("SELECT id, inputs, outputs FROM calculation_history")
+                while True:
+                    rows = cur.fetchmany(1000)
+                    if not rows:
+                        break
+                    params = []
+                    for record_id, inputs, outputs in rows:
+                        try:
+                            params.extend(_param_rows(record_id, json.loads(inputs), json.loads(outputs)))
+                        except (TypeError, ValueError):
+                            continue
+                    conn.executemany(self._INSERT_PARAM_SQL, params)
+
+    def _init_counts(self, conn):
+        """创建按计算器的记录计数表及维护触发器，首次创建时从历史表回填"""
+        exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'calculation_counts'"
+        ).fetchone() is not None
+        with conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS calculation_counts (
+                    calculator_id TEXT PRIMARY KEY,
+                    calculator_name TEXT NOT NULL,
+                    record_count INTEGER NOT NULL DEFAULT 0
+                )
+            """)
+            conn.execute("""
+                CREATE TRIGGER IF NOT EXISTS calculation_counts_ai
+                AFTER INSERT ON calculation_history BEGIN
+                    INSERT INTO calculation_counts(calculator_id, calculator_name, record_count)
+                    VALUES (new.calculator_id, new.calculator_name, 1)
+                    ON CONFLICT(calculator_id) DO UPDATE SET
+                        record_count = record_count + 1,
+                        calculator_name = excluded.calculator_name;
+                END
+            """)
+            conn.execute("""
+                CREATE TRIGGER IF NOT EXISTS calculation_counts_ad
+                AFTER DELETE ON calculation_history BEGIN
+                    UPDATE calculation_counts SET record_count = record_count - 1
+                    WHERE calculator_id = old.calculator_id;
+                    DELETE FROM calculation_counts
+                    WHERE calculator_id = old.calculator_id AND record_count <= 0;
+                END
+            """)
+            conn.execute("""
+                CREATE TRIGGER IF NOT EXISTS calculation_counts_au
+                AFTER UPDATE OF calculator_id ON calculation_history
+                WHEN old.calculator_id != new.calculator_id BEGIN
+                    UPDATE calculation_counts SET record_count = record_count - 1
+                    WHERE calculator_id = old.calculator_id;
+                    DELETE FROM calculation_counts
+                    WHERE calculator_id = old.calculator_id AND record_count <= 0;
+                    INSERT INTO calculation_counts(calculator_id, calculator_name, record_count)
+                    VALUES (new.calculator_id, new.calculator_name, 1)
+                    ON CONFLICT(calculator_id) DO UPDATE SET record_count = record_count + 1;
+                END
+            """)
+            if not exists:
+                conn.execute("""
+                    INSERT INTO calculation_counts(calculator_id, calculator_name, record_count)
+                    SELECT calculator_id, MAX(calculator_name), COUNT(*)
+                    FROM calculation_history GROUP BY calculator_id
+                """)
+
+    # 全文索引列权重（bm25）：计算器名称 > 备注 > 输入/输出
+    FTS_WEIGHTS = (10.0, 1.0, 1.0, 2.0)
+
+    def _init_fts(self, conn):
+        """创建 FTS5 全文索引及同步触发器，首次创建时回填已有记录。SQLite 未编译 FTS5 时返回 False"""
+        exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'calculation_history_fts'"
+        ).fetchone() is not None
+        try:
+            with conn:
+                conn.execute("""
+                    CREATE VIRTUAL TABLE IF NOT EXISTS calculation_history_fts
+                    USING fts5(calculator_name, inputs, outputs, notes, content='')
+                """)
+                conn.execute("""
+                    CREATE TRIGGER IF NOT EXISTS calculation_history_fts_ai
+                    AFTER INSERT ON calculation_history BEGIN
+                        INSERT INTO calculation_history_fts(rowid, calculator_name, inputs, outputs, notes)
+                        VALUES (new.id, calce_fts_text(new.calculator_name), calce_fts_text(new.inputs),
+                                calce_fts_text(new.outputs), calce_fts_text(new.notes));
+                    END
+                """)
+                conn.execute("""
+                    CREATE TRIGGER IF NOT EXISTS calculation_history_fts_ad
+                    AFTER DELETE ON calculation_history BEGIN
+                        INSERT INTO calculation_history_fts(calculation_history_fts, rowid,
+                                                            calculator_name, inputs, outputs, notes)
+                        VALUES ('delete', old.id, calce_fts_text(old.calculator_name), calce_fts_text(old.inputs),
+                                calce_fts_text(old.outputs), calce_fts_text(old.notes));
+                    END
+                """)
+                conn.execute("""
+                    CREATE TRIGGER IF NOT EXISTS calculation_history_fts_au
+                    AFTER UPDATE ON calculation_history BEGIN
+                        INSERT INTO calculation_history_fts(calculation_history_fts, rowid,
+                                                            calculator_name, inputs, outputs, notes)
+                        VALUES ('delete', old.id, calce_fts_text(old.calculator_name), calce_fts_text(old.inputs),
+                                calce_fts_text(old.outputs), calce_fts_text(old.notes));
+                        INSERT INTO calculation_history_fts(rowid, calculator_name, inputs, outputs, notes)
+                        VALUES (new.id, calce_fts_text(new.calculator_name), calce_fts_text(new.inputs),
+                                calce_fts_text(new.outputs), calce_fts_text(new.notes));
+                    END
+                """)
+                if not exists:
+                    conn.execute("""
+                        INSERT INTO calculation_history_fts(rowid, calculator_name, inputs, outputs, notes)
+                        SELECT id, calce_fts_text(calculator_name), calce_fts_text(inputs),
+                               calce_fts_text(outputs), calce_fts_text(notes)
+                        FROM calculation_history
+                    """)
+            return True
+        except sqlite3.OperationalError as e:
+            print(f"[历史] FTS5 不可用，关键词搜索使用 LIKE: {e}")
+            return False
+
+    _INSERT_SQL = """
+        INSERT INTO calculation_history
+            (calculator_id, calculator_name, calculator_category,
+             inputs, outputs, notes, created_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+    """
+
+    @staticmethod
+    def _encode_row(calculator_id, calculator_name, calculator_category,
+                    inputs, outputs, notes, created_at):
+        return (
             calculator_id,
             calculator_name,
             calculator_category,
             json.dumps(inputs, ensure_ascii=False),
             json.dumps(outputs, ensure_ascii=False),
             notes,
-            datetime.now().isoformat()
-        ))
-        conn.commit()
-        record_id = cur.lastrowid
-        conn.close()
+            created_at,
+        )
+
+    def save(self, calculator_id, calculator_name, calculator_category,
+             inputs, outputs, notes=""):
+        """同步保存一条计算历史，返回记录 ID"""
+        conn = self._get_conn()
+        cur = conn.cursor()
+        with conn:
+            cur.execute(self._INSERT_SQL, self._encode_row(
+                calculator_id, calculator_name, calculator_category,
+                inputs, outputs, notes, datetime.now().isoformat()
+            ))
+            record_id = cur.lastrowid
+            cur.executemany(self._INSERT_PARAM_SQL, _param_rows(record_id, inputs, outputs))
         self.record_added.emit()  # 通知界面刷新
         return record_id
 
-    def get_all(self, calculator_id=None, keyword="", limit=100, offset=0):
-        """查询历史记录，支持按计算器筛选和关键词搜索"""
+    def save_async(self, calculator_id, calculator_name, calculator_category,
+                   inputs, outputs, notes=""):
+        """
+        提交到后台写入线程保存（界面线程不做 JSON 编码和磁盘写入）。
+        短时间内重复的 (calculator_id, inputs, outputs) 只保存一次；
+        一批写入完成后发送一次 record_added 信号。
+        """
+        item = (calculator_id, calculator_name, calculator_category,
+                dict(inputs), dict(outputs), notes, datetime.now().isoformat())
+        if not self._get_writer().submit(item):
+            print("[历史] 写入队列已满，改为同步保存")
+            self.save(*item[:6])
+
+    def _get_writer(self):
+        with self._writer_lock:
+            if self._writer is None:
+                self._writer = HistoryWriter(self)
+                self._writer.start()
+            return self._writer
+
+    _SELECT_COLUMNS = """
+        SELECT id, calculator_id, calculator_name, calculator_category,
+               inputs, outputs, notes, created_at
+        FROM calculation_history
+    """
+
+    @staticmethod
+    def _row_to_record(row):
+        return {
+            "id": row[0],
+            "calculator_id": row[1],
+            "calculator_name": row[2],
+            "calculator_category": row[3],
+            "inputs": json.loads(row[4]),
+            "outputs": json.loads(row[5]),
+            "notes": row[6],
+            "created_at": row[7],
+        }
+
+    def get_all(self, calculator_id=None, keyword="", limit=100, offset=0, ranked=False,
+                param_ranges=None):
+        """
+        查询历史记录，支持按计算器筛选、关键词搜索和参数数值范围筛选。
+        关键词优先走 FTS5 全文索引（前缀匹配），不可用时回退到 LIKE。
+        :param ranked: 为 True 且使用全文索引时按相关度（bm25）排序，否则按时间倒序
+        :param param_ranges: {参数名: (下限, 上限)}，None 表示该侧不限
+        """
         conn = self._get_conn()
         cur = conn.cursor()
 
+        if ranked and keyword and self._fts_enabled and not param_ranges:
+            match = _fts_query(keyword)
+            if match:
+                return self._search_ranked(cur, match, calculator_id, limit, offset)
+
+        where_clauses, params = self._build_filter(calculator_id, keyword, param_ranges)
+        where_sql = " AND ".join(where_clauses) if where_clauses else "1=1"
+
+        sql = f"""
+            {self._SELECT_COLUMNS}
+            WHERE {where_sql}
+            ORDER BY created_at DESC
+            LIMIT ? OFFSET ?
+        """
+        cur.execute(sql, params + [limit, offset])
+        records = [self._row_to_record(row) for row in cur.fetchall()]
+
+        if keyword or param_ranges:
+            cur.execute(f"SELECT COUNT(*) FROM calculation_history WHERE {where_sql}", params)
+            total = cur.fetchone()[0]
+        else:
+            total = self.count(calculator_id)
+        return records, total
+
+    def _build_filter(self, calculator_id=None, keyword="", param_ranges=None):
+        """构造 WHERE 子句列表和参数"""
         where_clauses = []
         params = []
 
@@ -102,45 +453,136 @@ class HistoryDB(QObject):
             where_clauses.append("calculator_id = ?")
             params.append(calculator_id)
 
-        if keyword:
+        match = _fts_query(keyword) if keyword and self._fts_enabled else ""
+        if match:
+            where_clauses.append(
+                "id IN (SELECT rowid FROM calculation_history_fts WHERE calculation_history_fts MATCH ?)"
+            )
+            params.append(match)
+        elif keyword:
             where_clauses.append(
                 "(calculator_name LIKE ? OR inputs LIKE ? OR outputs LIKE ? OR notes LIKE ?)"
             )
             kw = f"%{keyword}%"
             params.extend([kw, kw, kw, kw])
 
-        where_sql = " AND ".join(where_clauses) if where_clauses else "1=1"
+        # 每个数值范围条件走 (key, numeric_value) 索引
+        for key, (low, high) in (param_ranges or {}).items():
+            cond = ["key = ?", "numeric_value IS NOT NULL"]
+            params.append(key)
+            if low is not None:
+                cond.append("numeric_value >= ?")
+                params.append(low)
+            if high is not None:
+                cond.append("numeric_value <= ?")
+                params.append(high)
+            where_clauses.append(
+                f"id IN (SELECT record_id FROM calculation_params WHERE {' AND '.join(cond)})"
+            )
 
-        sql = f"""
-            SELECT id, calculator_id, calculator_name, calculator_category,
-                   inputs, outputs, notes, created_at
-            FROM calculation_history
-            WHERE {where_sql}
-            ORDER BY created_at DESC
+        return where_clauses, params
+
+    def _search_ranked(self, cur, match, calculator_id, limit, offset):
+        """全文检索并按 bm25 相关度排序"""
+        weights = ", ".join(str(w) for w in self.FTS_WEIGHTS)
+        filter_sql = "AND h.calculator_id = ?" if calculator_id else ""
+        params = [match] + ([calculator_id] if calculator_id else [])
+        cur.execute(f"""
+            SELECT h.id, h.calculator_id, h.calculator_name, h.calculator_category,
+                   h.inputs, h.outputs, h.notes, h.created_at
+            FROM calculation_history_fts f
+            JOIN calculation_history h ON h.id = f.rowid
+            WHERE calculation_history_fts MATCH ? {filter_sql}
+            ORDER BY bm25(calculation_history_fts, {weights})
             LIMIT ? OFFSET ?
-        """
-        params.extend([limit, offset])
-        cur.execute(sql, params)
-        rows = cur.fetchall()
-
-        records = []
-        for row in rows:
-            records.append({
-                "id": row[0],
-                "calculator_id": row[1],
-                "calculator_name": row[2],
-                "calculator_category": row[3],
-                "inputs": json.loads(row[4]),
-                "outputs": json.loads(row[5]),
-                "notes": row[6],
-                "created_at": row[7],
-            })
-
-        cur.execute(f"SELECT COUNT(*) FROM calculation_history WHERE {where_sql}", params[:-2])
+        """, params + [limit, offset])
+        records = [self._row_to_record(row) for row in cur.fetchall()]
+
+        cur.execute(f"""
+            SELECT COUNT(*)
+            FROM calculation_history_fts f
+            JOIN calculation_history h ON h.id = f.rowid
+            WHERE calculation_history_fts MATCH ? {filter_sql}
+        """, params)
         total = cur.fetchone()[0]
-        conn.close()
         return records, total
 
+    def get_by_id(self, record_id):
+        """按主键获取单条记录，不存在时返回 None"""
+        row = self._get_conn().execute(
+            f"{self._SELECT_COLUMNS} WHERE id = ?", (record_id,)
+        ).fetchone()
+        return self._row_to_record(row) if row else None
+
+    def get_many(self, ids):
+        """按主键批量获取记录，返回 {id: 记录}，不存在的 id 不出现在结果中"""
+        ids = list(ids)
+        result = {}
+        conn = self._get_conn()
+        # 分批查询，避免超出 SQLite 参数个数上限
+        for i in range(0, len(ids), 500):
+            chunk = ids[i:i + 500]
+            placeholders = ", ".join("?" * len(chunk))
+            for row in conn.execute(f"{self._SELECT_COLUMNS} WHERE id IN ({placeholders})", chunk):
+                result[row[0]] = self._row_to_record(row)
+        return result
+
+    def get_page(self, calculator_id=None, keyword="", limit=100, cursor=None, param_ranges=None):
+        """
+        游标（keyset）分页查询，按 (created_at, id) 倒序。每页代价与页码无关。
+        :param cursor: 上一页返回的游标，None 表示第一页
+        :param param_ranges: {参数名: (下限, 上限)}，见 get_all
+        :return: (记录列表, 下一页游标)，没有更多记录时游标为 None
+        """
+        conn = self._get_conn()
+        cur = conn.cursor()
+
+        where_clauses, params = self._build_filter(calculator_id, keyword, param_ranges)
+        if cursor is not None:
+            where_clauses.append("(created_at, id) < (?, ?)")
+            params.extend(cursor)
+
+        where_sql = " AND ".join(where_clauses) if where_clauses else "1=1"
+        cur.execute(f"""
+            {self._SELECT_COLUMNS}
+            WHERE {where_sql}
+            ORDER BY created_at DESC, id DESC
+            LIMIT ?
+        """, params + [limit])
+        records = [self._row_to_record(row) for row in cur.fetchall()]
+
+        next_cursor = None
+        if len(records) == limit:
+            last = records[-1]
+            next_cursor = (last["created_at"], last["id"])
+        return records, next_cursor
+
+    def count(self, calculator_id=None, keyword="", param_ranges=None):
+        """记录总数。无关键词和参数条件时直接读取增量维护的计数表，不扫描历史表"""
+        conn = self._get_conn()
+        if keyword or param_ranges:
+            _, total = self.get_all(calculator_id=calculator_id, keyword=keyword, limit=0,
+                                    param_ranges=param_ranges)
+            return total
+        if calculator_id:
+            row = conn.execute(
+                "SELECT record_count FROM calculation_counts WHERE calculator_id = ?",
+                (calculator_id,)
+            ).fetchone()
+            return row[0] if row else 0
+        return conn.execute("SELECT COALESCE(SUM(record_count), 0) FROM calculation_counts").fetchone()[0]
+
+    def get_param_keys(self, calculator_id):
+        """获取某计算器历史记录中出现过的数值参数名"""
+        cur = self._get_conn().execute("""
+            SELECT DISTINCT p.key
+            FROM calculation_history h
+            JOIN calculation_params p ON p.record_id = h.id
+            WHERE h.calculator_id = ? AND p.numeric_value IS NOT NULL
+            ORDER BY p.key
+        """, (calculator_id,))
+        return [r[0] for r in cur.fetchall()]
+
     def get_categories(self):
         """获取所有分类列表"""
         conn = self._get_conn()
@@ -150,7 +592,6 @@ class HistoryDB(QObject):
             "WHERE calculator_category != '' ORDER BY calculator_category"
         )
         categories = [r[0] for r in cur.fetchall()]
-        conn.close()
         return categories
 
     def get_calculator_ids(self):
@@ -158,11 +599,10 @@ class HistoryDB(QObject):
         conn = self._get_conn()
         cur = conn.cursor()
         cur.execute(
-            "SELECT DISTINCT calculator_id, calculator_name "
-            "FROM calculation_history ORDER BY calculator_name"
+            "SELECT calculator_id, calculator_name "
+            "FROM calculation_counts ORDER BY calculator_name"
         )
         result = {r[0]: r[1] for r in cur.fetchall()}
-        conn.close()
         return result
 
     def delete(self, record_id):
@@ -172,5 +612,84 @@ class HistoryDB(QObject):
         cur.execute("DELETE FROM calculation_history WHERE id = ?", (record_id,))
         conn.commit()
         affected = cur.rowcount
-        conn.close()
         return affected > 0
+
+
+class HistoryWriter(threading.Thread):
+    """历史记录后台写入线程：合并突发写入为一次提交，并丢弃短时间内的重复保存"""
+
+    BATCH_WINDOW = 0.05     # 收到第一条后继续收集同批记录的时间（秒）
+    MAX_BATCH = 200
+    DEDUP_WINDOW = 2.0      # 相同 (calculator_id, inputs, outputs) 在此时间内视为重复（秒）
+    QUEUE_SIZE = 1000
+
+    _STOP = object()
+
+    def __init__(self, db):
+        super().__init__(name="HistoryWriter", daemon=True)
+        self._db = db
+        self._queue = queue.Queue(self.QUEUE_SIZE)
+        self._recent = {}  # 去重键 -> 最近写入时间（monotonic）
+
+    def submit(self, item):
+        """加入写入队列，队列已满时返回 False"""
+        try:
+            self._queue.put_nowait(item)
+            return True
+        except queue.Full:
+            return False
+
+    def stop(self, timeout=5.0):
+        """写完队列中剩余记录后退出"""
+        self._queue.put(self._STOP)
+        self.join(timeout)
+
+    def run(self):
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is self._STOP:
+                break
+            batch = [item]
+            deadline = time.monotonic() + self.BATCH_WINDOW
+            while len(batch) < self.MAX_BATCH:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is self._STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            self._write(batch)
+        self._db._close_thread_conn()
+
+    def _write(self, batch):
+        now = time.monotonic()
+        self._recent = {k: t for k, t in self._recent.items() if now - t < self.DEDUP_WINDOW}
+
+        rows = []
+        for item in batch:
+            row = HistoryDB._encode_row(*item)
+            key = (row[0], row[3], row[4])
+            if key in self._recent:
+                print(f"[历史] 忽略重复保存: {row[1]}")
+                continue
+            self._recent[key] = now
+            rows.append((row, item[3], item[4]))
+        if not rows:
+            return
+
+        try:
+            conn = self._db._get_conn()
+            with conn:
+                for row, inputs, outputs in rows:
+                    record_id = conn.execute(HistoryDB._INSERT_SQL, row).lastrowid
+                    conn.executemany(HistoryDB._INSERT_PARAM_SQL, _param_rows(record_id, inputs, outputs))
+        except sqlite3.Error as e:
+            print(f"[历史] 批量保存失败: {e}")
+            return
+        self._db.record_added.emit()  # 每批只通知一次
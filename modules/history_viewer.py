@@ -1,6 +1,7 @@
 # CalcE/modules/history_viewer.py
 """计算历史记录查看器"""
 import json
+from collections import OrderedDict
 from datetime import datetime
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QListWidget,
@@ -15,15 +16,19 @@ class HistoryViewer(QWidget):
     """历史记录查看器"""
 
     PAGE_SIZE = 50
+    RECORD_CACHE_SIZE = 256  # 已解码记录的 LRU 缓存容量
 
     def __init__(self, parent=None, data_manager=None):
         super().__init__(parent)
         self._db = None
         self._current_page = 0
+        self._cursor = None        # 下一页游标 (created_at, id)，None 表示没有更多
         self._current_keyword = ""
         self._current_calculator = ""
+        self._param_ranges = {}    # 参数名 -> (下限, 上限)，仅在选定计算器时生效
         self._current_record = None
         self._total = 0
+        self._record_cache = OrderedDict()  # record_id -> 记录（LRU）
         self.setup_ui()
 
     @property
@@ -83,11 +88,46 @@ class HistoryViewer(QWidget):
         """)
         left_layout.addWidget(self.calc_filter)
 
+        # 参数数值范围筛选（选定计算器后可用）
+        range_layout = QHBoxLayout()
+        range_layout.setSpacing(4)
+        self.param_key_combo = QComboBox()
+        self.param_key_combo.setFixedHeight(28)
+        self.param_key_combo.setToolTip("按参数数值范围筛选")
+        self.param_min_edit = QLineEdit()
+        self.param_min_edit.setPlaceholderText("最小")
+        self.param_min_edit.setFixedSize(56, 28)
+        self.param_max_edit = QLineEdit()
+        self.param_max_edit.setPlaceholderText("最大")
+        self.param_max_edit.setFixedSize(56, 28)
+        self.param_add_btn = QPushButton("添加")
+        self.param_add_btn.setFixedHeight(28)
+        self.param_add_btn.clicked.connect(self._add_param_range)
+        range_layout.addWidget(self.param_key_combo, 1)
+        range_layout.addWidget(self.param_min_edit)
+        range_layout.addWidget(self.param_max_edit)
+        range_layout.addWidget(self.param_add_btn)
+        left_layout.addLayout(range_layout)
+
+        ranges_row = QHBoxLayout()
+        self.param_ranges_label = QLabel("")
+        self.param_ranges_label.setWordWrap(True)
+        self.param_ranges_label.setStyleSheet("color: #2980b9; font-size: 12px;")
+        self.param_clear_btn = QPushButton("清除条件")
+        self.param_clear_btn.setFixedHeight(24)
+        self.param_clear_btn.clicked.connect(self._clear_param_ranges)
+        ranges_row.addWidget(self.param_ranges_label, 1)
+        ranges_row.addWidget(self.param_clear_btn)
+        left_layout.addLayout(ranges_row)
+        self._refresh_param_keys()
+
         # 历史列表
         self.history_list = QListWidget()
         self.history_list.setAlternatingRowColors(True)
         self.history_list.setSelectionBehavior(QAbstractItemView.SelectRows)
         self.history_list.itemClicked.connect(self._on_item_clicked)
+        # 滚动到底部时自动加载下一页
+        self.history_list.verticalScrollBar().valueChanged.connect(self._on_scroll)
         self.history_list.setStyleSheet("""
             QListWidget {
                 border: 1px solid #dee2e6;
@@ -204,18 +244,24 @@ class HistoryViewer(QWidget):
         self.calc_filter.blockSignals(False)
 
     def _load_history(self, append=False):
-        """加载历史记录"""
+        """加载历史记录（游标分页，总数仅在首页查询一次）"""
         if not append:
             self._current_page = 0
+            self._cursor = None
             self.history_list.clear()
+            self._total = self.db.count(
+                calculator_id=self._current_calculator or None,
+                keyword=self._current_keyword,
+                param_ranges=self._active_param_ranges(),
+            )
 
-        records, total = self.db.get_all(
+        records, self._cursor = self.db.get_page(
             calculator_id=self._current_calculator or None,
             keyword=self._current_keyword,
             limit=self.PAGE_SIZE,
-            offset=self._current_page * self.PAGE_SIZE
+            cursor=self._cursor,
+            param_ranges=self._active_param_ranges(),
         )
-        self._total = total
 
         for rec in records:
             item = QListWidgetItem()
@@ -226,14 +272,22 @@ class HistoryViewer(QWidget):
             item.setData(Qt.UserRole, rec["id"])
             item.setSizeHint(item.sizeHint())
             self.history_list.addItem(item)
+            self._cache_record(rec)
 
+        self.load_more_btn.setEnabled(self._cursor is not None)
         self._update_page_label()
         return records
 
     def _load_more(self):
+        if self._cursor is None:
+            return
         self._current_page += 1
         self._load_history(append=True)
 
+    def _on_scroll(self, value):
+        if value >= self.history_list.verticalScrollBar().maximum() and self._cursor is not None:
+            self._load_more()
+
     def _update_page_label(self):
         shown = self.history_list.count()
         self.page_label.setText(f"共 {self._total} 条记录 (显示 {shown} 条)")
@@ -252,37 +306,91 @@ class HistoryViewer(QWidget):
 
     def _on_filter_changed(self, index):
         self._current_calculator = self.calc_filter.currentData()
+        self._param_ranges = {}
+        self._refresh_param_keys()
         self._current_page = 0
         self._load_history()
         self.detail_text.clear()
         self._current_record = None
         self.delete_btn.setEnabled(False)
 
+    # ------------------------------------------------------------------ 参数范围筛选
+
+    def _active_param_ranges(self):
+        return self._param_ranges if self._current_calculator else None
+
+    def _refresh_param_keys(self):
+        """刷新参数名下拉（来自当前计算器的数值参数索引）"""
+        self.param_key_combo.clear()
+        keys = self.db.get_param_keys(self._current_calculator) if self._current_calculator else []
+        self.param_key_combo.addItems(keys)
+        enabled = bool(keys)
+        for w in (self.param_key_combo, self.param_min_edit, self.param_max_edit, self.param_add_btn):
+            w.setEnabled(enabled)
+        self._update_param_ranges_label()
+
+    def _add_param_range(self):
+        key = self.param_key_combo.currentText()
+        if not key:
+            return
+        try:
+            low = float(self.param_min_edit.text()) if self.param_min_edit.text().strip() else None
+            high = float(self.param_max_edit.text()) if self.param_max_edit.text().strip() else None
+        except ValueError:
+            QMessageBox.warning(self, "输入错误", "范围必须为数字")
+            return
+        if low is None and high is None:
+            return
+        self._param_ranges[key] = (low, high)
+        self.param_min_edit.clear()
+        self.param_max_edit.clear()
+        self._update_param_ranges_label()
+        self._load_history()
+
+    def _clear_param_ranges(self):
+        if not self._param_ranges:
+            return
+        self._param_ranges = {}
+        self._update_param_ranges_label()
+        self._load_history()
+
+    def _update_param_ranges_label(self):
+        parts = []
+        for key, (low, high) in self._param_ranges.items():
+            if low is not None and high is not None:
+                parts.append(f"{low:g} ≤ {key} ≤ {high:g}")
+            elif low is not None:
+                parts.append(f"{key} ≥ {low:g}")
+            else:
+                parts.append(f"{key} ≤ {high:g}")
+        self.param_ranges_label.setText("；".join(parts))
+        self.param_clear_btn.setVisible(bool(parts))
+
     def _on_item_clicked(self, item):
         record_id = item.data(Qt.UserRole)
-        records, _ = self.db.get_all(keyword="", limit=1000, offset=0)
-        rec = next((r for r in records if r["id"] == record_id), None)
-        if rec is None:
-            # 从当前页找
-            rec = self._find_record_in_list(record_id)
+        rec = self._get_record(record_id)
 
         self._current_record = rec
         self.delete_btn.setEnabled(rec is not None)
         if rec:
             self.detail_text.setHtml(self._format_detail(rec))
 
-    def _find_record_in_list(self, record_id):
-        for i in range(self.history_list.count()):
-            item = self.history_list.item(i)
-            if item.data(Qt.UserRole) == record_id:
-                records, _ = self.db.get_all(
-                    keyword=self._current_keyword,
-                    calculator_id=self._current_calculator or None,
-                    limit=1000,
-                    offset=0
-                )
-                return next((r for r in records if r["id"] == record_id), None)
-        return None
+    def _get_record(self, record_id):
+        """先查 LRU 缓存，未命中时按主键查询数据库"""
+        rec = self._record_cache.get(record_id)
+        if rec is not None:
+            self._record_cache.move_to_end(record_id)
+            return rec
+        rec = self.db.get_by_id(record_id)
+        if rec is not None:
+            self._cache_record(rec)
+        return rec
+
+    def _cache_record(self, rec):
+        self._record_cache[rec["id"]] = rec
+        self._record_cache.move_to_end(rec["id"])
+        while len(self._record_cache) > self.RECORD_CACHE_SIZE:
+            self._record_cache.popitem(last=False)
 
     def _format_inputs_preview(self, inputs):
         if not inputs:
@@ -365,6 +473,7 @@ class HistoryViewer(QWidget):
         if reply != QMessageBox.Yes:
             return
         self.db.delete(record_id)
+        self._record_cache.pop(record_id, None)
         self.detail_text.clear()
         self._current_record = None
         self.delete_btn.setEnabled(False)
@@ -0,0 +1,161 @@
+# CalcE/startup_trace.py
+"""启动耗时追踪 - 分阶段记录模块导入、构建、信号连接耗时，输出启动报告并检查耗时预算"""
+import json
+import os
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+from loguru import logger
+
+TRACE_DIR = os.path.join(os.path.expanduser("~"), ".calce", "logs")
+TRACE_FILE = os.path.join(TRACE_DIR, "startup_trace.json")
+
+# 预算配置文件，可通过环境变量 CALCE_STARTUP_BUDGET 指定其他路径。格式：
+# {"default_ms": 400, "strict": false, "modules": {"steam_pipe_calculator": 200}}
+# strict 为 true（或环境变量 CALCE_STARTUP_STRICT=1）时超出预算视为启动失败
+BUDGET_FILE = os.path.join(os.path.expanduser("~"), ".calce", "startup_budget.json")
+
+
+class StartupBudgetExceeded(RuntimeError):
+    """严格模式下模块启动耗时超出预算"""
+
+    def __init__(self, violations):
+        self.violations = violations
+        detail = ", ".join(f"{name} {total:.1f}ms > {limit:.1f}ms" for name, total, limit in violations)
+        super().__init__(f"启动耗时超出预算: {detail}")
+
+
+class StartupTrace:
+    """启动追踪器，按 (名称, 阶段) 累计耗时（毫秒）"""
+
+    def __init__(self):
+        self._t0 = time.perf_counter()
+        self.entries = {}   # name -> {"category", "start_ms", "phases": {phase: ms}}
+        self.marks = {}     # 里程碑 -> 距启动的毫秒数
+        self.finished = False
+
+    def elapsed_ms(self):
+        return (time.perf_counter() - self._t0) * 1000
+
+    @contextmanager
+    def span(self, name, phase, category=""):
+        """计时上下文：with startup_trace.span("pump_power_calculator", "import", "calculator"): ..."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, phase, (time.perf_counter() - start) * 1000, category, start)
+
+    def record(self, name, phase, duration_ms, category="", start=None):
+        entry = self.entries.get(name)
+        if entry is None:
+            start_ms = ((start or time.perf_counter()) - self._t0) * 1000
+            entry = self.entries[name] = {"category": category, "start_ms": round(start_ms, 3), "phases": {}}
+        elif category and not entry["category"]:
+            entry["category"] = category
+        phases = entry["phases"]
+        phases[phase] = phases.get(phase, 0.0) + duration_ms
+
+    def mark(self, label):
+        """记录启动里程碑（如窗口显示）"""
+        self.marks[label] = round(self.elapsed_ms(), 3)
+
+    def total_ms(self, name):
+        entry = self.entries.get(name)
+        return sum(entry["phases"].values()) if entry else 0.0
+
+    # ------------------------------------------------------------------ 预算
+
+    @staticmethod
+    def load_budget(path=None):
+        """读取预算配置，文件不存在时返回空配置"""
+        path = path or os.environ.get("CALCE_STARTUP_BUDGET") or BUDGET_FILE
+        if not os.path.exists(path):
+            return {}
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning("启动预算配置读取失败: {} | {}", path, e)
+            return {}
+
+    def check_budget(self, budget):
+        """返回超出预算的条目列表 [(名称, 实际耗时, 预算)]"""
+        limits = budget.get("modules", {})
+        default = budget.get("default_ms")
+        violations = []
+        for name in self.entries:
+            limit = limits.get(name, default)
+            if limit is None:
+                continue
+            total = self.total_ms(name)
+            if total > limit:
+                violations.append((name, total, float(limit)))
+        return violations
+
+    # ------------------------------------------------------------------ 报告
+
+    def report(self):
+        """生成结构化启动追踪数据"""
+        entries = []
+        for name, entry in sorted(self.entries.items(), key=lambda kv: kv[1]["start_ms"]):
+            entries.append({
+                "name": name,
+                "category": entry["category"],
+                "start_ms": entry["start_ms"],
+                "phases": {k: round(v, 3) for k, v in entry["phases"].items()},
+                "total_ms": round(sum(entry["phases"].values()), 3),
+            })
+        return {
+            "created_at": datetime.now().isoformat(),
+            "elapsed_ms": round(self.elapsed_ms(), 3),
+            "marks": dict(self.marks),
+            "entries": entries,
+        }
+
+    def format_table(self, report=None):
+        """格式化为可读表格"""
+        report = report or self.report()
+        phases = ["import", "construct", "wire"]
+        for entry in report["entries"]:
+            for phase in entry["phases"]:
+                if phase not in phases:
+                    phases.append(phase)
+
+        header = f"{'名称':<40}{'类别':<12}" + "".join(f"{p:>11}" for p in phases) + f"{'合计':>11}"
+        lines = [header, "-" * len(header)]
+        for entry in sorted(report["entries"], key=lambda e: e["total_ms"], reverse=True):
+            cells = "".join(
+                f"{entry['phases'][p]:>11.1f}" if p in entry["phases"] else f"{'-':>11}" for p in phases
+            )
+            lines.append(f"{entry['name']:<40}{entry['category']:<12}{cells}{entry['total_ms']:>11.1f}")
+        for label, ms in report["marks"].items():
+            lines.append(f"[{label}] {ms:.1f} ms")
+        lines.append(f"启动总耗时: {report['elapsed_ms']:.1f} ms")
+        return "\n".join(lines)
+
+    def finish(self, path=TRACE_FILE, budget=None):
+        """写出 JSON 追踪文件和日志表格；严格模式下超出预算时抛出 StartupBudgetExceeded"""
+        report = self.report()
+        self.finished = True
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+        except OSError as e:
+            logger.warning("启动追踪写入失败: {} | {}", path, e)
+        logger.info("启动耗时追踪:\n{}", self.format_table(report))
+
+        budget = self.load_budget() if budget is None else budget
+        violations = self.check_budget(budget)
+        for name, total, limit in violations:
+            logger.warning("启动耗时超出预算: {} {:.1f} ms > {:.1f} ms", name, total, limit)
+        strict = budget.get("strict") or os.environ.get("CALCE_STARTUP_STRICT") == "1"
+        if violations and strict:
+            raise StartupBudgetExceeded(violations)
+        return report
+
+
+# 进程级追踪器
+startup_trace = StartupTrace()
@@ -0,0 +1,37 @@
+# 批量换算的列拆分和数值解析
+import numpy as np
+import pytest
+
+pytest.importorskip("PySide6")
+
+from modules.converter.calculators.batch_converter import detect_delimiter, parse_values
+
+
+def convert(text, column=0):
+    lines = text.splitlines()
+    return parse_values(lines, column, detect_delimiter(lines))[1]
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("1,234.5\n2,000", [1234.5, 2000]),
+    ("1 234 567\n12", [1234567, 12]),
+    ("1 234,5\n2", [1234.5, 2]),
+    ("-1 234.5", [-1234.5]),
+])
+def test_single_column_thousands(text, expected):
+    assert convert(text).tolist() == expected
+
+
+def test_delimiter_from_first_line():
+    assert convert("a;1,234.5\nb;2", column=1).tolist() == [1234.5, 2]
+    assert convert('"1,234.5",7\n"2",8').tolist() == [1234.5, 2]
+    assert convert("x\t1 234.5\ny\t3", column=1).tolist() == [1234.5, 3]
+
+
+def test_leftover_fragments_are_invalid():
+    # 空格分组的数字后有无法归入分组的残余时整行无法解析，不截断为 1
+    assert np.isnan(convert("12\n1 234 56")[1])
+
+
+def test_whitespace_columns():
+    assert convert("1 2\n3 4", column=1).tolist() == [2, 4]
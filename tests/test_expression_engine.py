@@ -0,0 +1,33 @@
+# 科学计算器表达式引擎
+import numpy as np
+import pytest
+
+pytest.importorskip("PySide6")
+
+from modules.converter.calculators.expression_engine import ExpressionError, evaluate, tabulate
+
+
+@pytest.mark.parametrize("text", ["1 2", "1.5.5", "12 .5", "sin30 2"])
+def test_numbers_need_an_operator(text):
+    with pytest.raises(ExpressionError):
+        evaluate(text)
+
+
+def test_implicit_multiplication():
+    assert evaluate("2π") == pytest.approx(2 * np.pi)
+    assert evaluate("3(4+1)") == 15
+    assert evaluate("2 x", x=3) == 6
+
+
+def test_exact_integer_power():
+    assert evaluate("2^10000") == 2 ** 10000
+    assert evaluate("(-3)^5") == -243
+    with pytest.raises(ExpressionError):
+        evaluate("9^9^9")
+
+
+def test_tabulate_invalid_points_are_nan():
+    xs, ys = tabulate("1/x", -1, 1, num=3)
+    assert xs.tolist() == [-1, 0, 1]
+    assert np.isnan(ys[1]) and ys[[0, 2]].tolist() == [-1, 1]
+    assert np.isnan(tabulate("sqrt(x)", -1, 0, num=2)[1][0])
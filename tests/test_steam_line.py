@@ -0,0 +1,31 @@
+# 蒸汽管道沿程积分
+import numpy as np
+import pytest
+
+from thermo import if97, steam_line
+
+
+def march(mass_flow, length=2000.0):
+    h_in = if97.props_pt(1.0, 523.15).h
+    return steam_line.march(mass_flow, 1.0, h_in, length, 0.2, 2e-4, 0.05, 0.04, 20)
+
+
+def test_profile_index():
+    result = march(np.array([1.0, 2.0, 3.0]))
+    for lane in range(3):
+        by_int = result.profile(lane)
+        by_tuple = result.profile((lane,))
+        assert by_int["z"][-1] == pytest.approx(2000)
+        assert by_int["p"][-1] == pytest.approx(result.p_out[lane])
+        assert np.array_equal(by_int["p"], by_tuple["p"])
+
+
+def test_profile_index_2d():
+    result = march(np.array([[1.0], [2.0]]), np.array([500.0, 2000.0]))
+    assert result.profile((1, 0))["z"][-1] == pytest.approx(500)
+    assert result.profile((1, 1))["p"][-1] == pytest.approx(result.p_out[1, 1])
+
+
+def test_scalar_profile():
+    result = march(2.0)
+    assert result.profile()["p"][-1] == pytest.approx(result.p_out)
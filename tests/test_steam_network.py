@@ -0,0 +1,103 @@
+# 蒸汽管网求解：停滞管段（死端、闲置环路管段）和数百管段规模的计算时间
+import time
+
+import numpy as np
+import pytest
+
+from thermo import steam_network, steam_table
+
+NODES = """节点,类型,压力_MPa,温度_C,用汽量_t/h
+锅炉房,汽源,1.3,250,
+A,节点,,,
+B,节点,,,
+车间1,用户,,,4
+车间2,用户,,,2.5
+备用1,节点,,,
+备用2,用户,,,0
+"""
+
+PIPES = """管段,起点,终点,长度_m,内径_mm,粗糙度_mm,保温厚度_mm,保温导热系数_W_mK,环境温度_C
+主管1,锅炉房,A,400,250,0.2,80,0.04,20
+主管2,A,B,300,200,0.2,80,0.04,20
+支管1,A,车间1,150,125,0.2,60,0.04,20
+支管2,B,车间2,220,100,0.2,60,0.04,20
+备用A,B,备用1,300,80,0.2,50,0.04,20
+备用B,备用1,备用2,200,80,0.2,50,0.04,20
+"""
+
+# 需求：数百管段的管网 1 s 内求解
+BENCHMARK_SECONDS = 1.0
+
+
+def header_network(mains, rings=0, dead_ends=True):
+    """一条主管带 mains 个分支点，每点两个用户、一条死端支路；rings 条跨接管构成环网"""
+    nodes = [{"节点": "S", "类型": "汽源", "压力_MPa": "1.0", "温度_C": "250"}]
+    pipes = []
+    previous = "S"
+    for i in range(mains):
+        junction = f"J{i}"
+        nodes.append({"节点": junction, "类型": "节点"})
+        pipes.append({"管段": f"M{i}", "起点": previous, "终点": junction, "长度_m": "40",
+                      "内径_mm": "300", "保温厚度_mm": "50"})
+        for k in range(2):
+            nodes.append({"节点": f"C{i}_{k}", "类型": "用户", "用汽量_t/h": "0.2"})
+            pipes.append({"管段": f"B{i}_{k}", "起点": junction, "终点": f"C{i}_{k}", "长度_m": "60",
+                          "内径_mm": "50", "保温厚度_mm": "40"})
+        if dead_ends:
+            nodes.append({"节点": f"D{i}", "类型": "节点"})
+            pipes.append({"管段": f"X{i}", "起点": junction, "终点": f"D{i}", "长度_m": "100",
+                          "内径_mm": "80", "保温厚度_mm": "40"})
+        previous = junction
+    for r in range(rings):
+        pipes.append({"管段": f"R{r}", "起点": f"J{10 * r + 3}", "终点": f"J{10 * r + 13}", "长度_m": "800",
+                      "内径_mm": "80", "保温厚度_mm": "40"})
+    return steam_network.SteamNetwork(nodes, pipes)
+
+
+@pytest.fixture(params=[steam_table.EXACT, steam_table.TABLE])
+def mode(request):
+    previous = steam_table.get_mode()
+    if request.param == steam_table.TABLE:
+        steam_table.load()
+    steam_table.set_mode(request.param)
+    yield request.param
+    steam_table.set_mode(previous)
+
+
+def test_dead_end_branch():
+    network = steam_network.SteamNetwork(steam_network.read_table(NODES), steam_network.read_table(PIPES))
+    result = network.solve()
+    names = list(network.node_names)
+    b, spare1, spare2 = names.index("B"), names.index("备用1"), names.index("备用2")
+    spare = [list(network.pipe_names).index(name) for name in ("备用A", "备用B")]
+
+    assert np.abs(result.flow[spare]).max() < steam_network.MIN_FLOW
+    assert result.heat_loss[spare].tolist() == [0.0, 0.0]
+    # 死端节点的压力、比焓与所接分支点相同，不出现非物理的比焓
+    assert result.node_p[[spare1, spare2]] == pytest.approx(result.node_p[b], abs=1e-6)
+    assert result.node_h[[spare1, spare2]] == pytest.approx(result.node_h[b], abs=1e-3)
+    assert np.isfinite(result.node_t).all()
+    assert result.profile(spare[0])["z"][-1] == 300
+
+
+def test_idle_pipe_in_loop():
+    nodes = [{"节点": "S", "类型": "汽源", "压力_MPa": "1", "温度_C": "250"},
+             {"节点": "A", "类型": "用户", "用汽量_t/h": "2"},
+             {"节点": "B", "类型": "用户", "用汽量_t/h": "2"}]
+    pipes = [{"管段": "SA", "起点": "S", "终点": "A", "长度_m": "500", "内径_mm": "100", "保温厚度_mm": "50"},
+             {"管段": "SB", "起点": "S", "终点": "B", "长度_m": "500", "内径_mm": "100", "保温厚度_mm": "50"},
+             {"管段": "AB", "起点": "A", "终点": "B", "长度_m": "300", "内径_mm": "50", "保温厚度_mm": "50"}]
+    result = steam_network.SteamNetwork(nodes, pipes).solve()
+    assert abs(result.flow[2]) < steam_network.MIN_FLOW
+    assert result.node_p[1] == pytest.approx(result.node_p[2])
+
+
+@pytest.mark.parametrize("rings", [0, 6], ids=["tree", "looped"])
+def test_benchmark(mode, rings):
+    network = header_network(75, rings)
+    assert network.pipe_names.size >= 300
+    start = time.perf_counter()
+    result = network.solve()
+    elapsed = time.perf_counter() - start
+    assert elapsed < BENCHMARK_SECONDS
+    assert result.node_t.min() > 150
@@ -0,0 +1,11 @@
+# CalcE/thermo/__init__.py
+"""
+热力学物性计算（纯计算模块，不依赖 Qt，可在脚本和批量计算中直接使用）
+
+    if97            水和水蒸气 IAPWS-IF97 工业公式（向量化）
+    steam_table     IF97 物性预计算网格（memmap 加载，双三次插值，可切换精确/查表模式）
+    property_service 进程级物性服务（按流体和状态点缓存，各计算器共享）
+    steam_line      蒸汽管道沿程自适应步长积分（压力、温度、干度分布，可多流量/多管道同时计算）
+    steam_network   蒸汽管网稳态计算（稀疏牛顿法联立求解流量分配、压力、温度和热损失）
+    refrigerant     制冷剂物性（按制冷剂懒加载的饱和表/过热表，单调三次样条插值）和单级压缩制冷循环
+"""
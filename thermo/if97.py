@@ -0,0 +1,743 @@
+# CalcE/thermo/if97.py
+"""
+水和水蒸气热力性质 IAPWS-IF97 工业公式（向量化实现）
+
+- 区域 1（压缩水）、2（过热蒸汽）、5（高温蒸汽）使用 Gibbs 自由能方程，区域 3（近临界）使用
+  Helmholtz 自由能方程，区域 4（饱和线）使用饱和压力/温度方程，区域 2/3 边界使用 B23 方程。
+- 已知 (p, T) 直接计算；区域 3 的 (p, T) 以及所有 (p, h)、(p, s) 输入用带区间保护的牛顿法
+  在基本方程上求解（区域 1 的 (p, s) 以 IF97 逆向方程 T(p,s) 为初值），结果与基本方程自洽。
+- 所有函数接受标量或 NumPy 数组（按广播规则组合），标量输入返回 float。
+- 单位：压力 MPa，温度 K，密度 kg/m³，比容 m³/kg，比焓/比内能 kJ/kg，比熵/比热 kJ/(kg·K)，
+  声速 m/s，动力粘度 Pa·s，导热系数 W/(m·K)。
+
+适用范围：273.15 K ≤ T ≤ 1073.15 K 时 p ≤ 100 MPa；1073.15 K < T ≤ 2273.15 K 时 p ≤ 50 MPa。
+超出范围的点结果为 NaN，区域号为 0。
+"""
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+# 比气体常数 kJ/(kg·K) 与临界参数
+R = 0.461526
+TC = 647.096
+PC = 22.064
+RHOC = 322.0
+
+T_MIN = 273.15
+T13 = 623.15            # 区域 1/3 边界温度
+T25 = 1073.15           # 区域 2/5 边界温度
+T_MAX = 2273.15
+P_MAX = 100.0
+P5_MAX = 50.0
+
+# 大数组分块计算，控制中间矩阵（点数 × 项数）的内存
+CHUNK_SIZE = 8192
+
+
+# ---------------------------------------------------------------- 多项式级数
+
+class _Series:
+    """
+    级数 Σ n·a^I·b^J 及其对 a、b 的一、二阶导数（要求 a、b > 0，IF97 各方程在适用范围内均满足）。
+    各项按 exp(I·ln a + J·ln b) 计算，指数矩阵由一次矩阵乘法得到，比逐项求幂快一个数量级；
+    各阶导数共用同一个项矩阵，再通过一次矩阵乘法求出。
+    """
+
+    def __init__(self, I, J, n):
+        I = np.asarray(I, dtype=float)
+        J = np.asarray(J, dtype=float)
+        n = np.asarray(n, dtype=float)
+        self.exponents = np.stack([I, J])
+        self.coef = np.stack([n, n * I, n * I * (I - 1), n * J, n * J * (J - 1), n * I * J], axis=1)
+
+    def __call__(self, a, b):
+        """返回 (g, g_a, g_aa, g_b, g_bb, g_ab)"""
+        terms = np.exp(np.stack([np.log(a), np.log(b)], axis=1) @ self.exponents)
+        g, ga, gaa, gb, gbb, gab = (terms @ self.coef).T
+        return g, ga / a, gaa / (a * a), gb / b, gbb / (b * b), gab / (a * b)
+
+
+class _Series1D:
+    """一元级数 Σ n·x^J 及其一、二阶导数（x > 0）"""
+
+    def __init__(self, J, n):
+        J = np.asarray(J, dtype=float)
+        n = np.asarray(n, dtype=float)
+        self.J = J
+        self.coef = np.stack([n, n * J, n * J * (J - 1)], axis=1)
+
+    def __call__(self, x):
+        g, gx, gxx = (np.exp(np.log(x)[:, None] * self.J) @ self.coef).T
+        return g, gx / x, gxx / (x * x)
+
+
+# ---------------------------------------------------------------- 区域 1
+
+_R1 = _Series(
+    [0, 0, 0, 0, 0, 0, 0, 0, 1, 1, 1, 1, 1, 1, 2, 2, 2, 2, 2, 3, 3, 3, 4, 4, 4, 5, 8, 8,
+     21, 23, 29, 30, 31, 32],
+    [-2, -1, 0, 1, 2, 3, 4, 5, -9, -7, -1, 0, 1, 3, -3, 0, 1, 3, 17, -4, 0, 6, -5, -2, 10, -8,
+     -11, -6, -29, -31, -38, -39, -40, -41],
+    [0.14632971213167, -0.84548187169114, -0.37563603672040e1, 0.33855169168385e1,
+     -0.95791963387872, 0.15772038513228, -0.16616417199501e-1, 0.81214629983568e-3,
+     0.28319080123804e-3, -0.60706301565874e-3, -0.18990068218419e-1, -0.32529748770505e-1,
+     -0.21841717175414e-1, -0.52838357969930e-4, -0.47184321073267e-3, -0.30001780793026e-3,
+     0.47661393906987e-4, -0.44141845330846e-5, -0.72694996297594e-15, -0.31679644845054e-4,
+     -0.28270797985312e-5, -0.85205128120103e-9, -0.22425281908000e-5, -0.65171222895601e-6,
+     -0.14341729937924e-12, -0.40516996860117e-6, -0.12734301741641e-8, -0.17424871230634e-9,
+     -0.68762131295531e-18, 0.14478307828521e-19, 0.26335781662795e-22, -0.11947622640071e-22,
+     0.18228094581404e-23, -0.93537087292458e-25],
+)
+
+
+def _gibbs_props(p, T, pi, tau, g, gp, gpp, gt, gtt, gpt):
+    """由无量纲 Gibbs 自由能 γ 及其导数计算性质"""
+    v = R * T * pi * gp / p * 1e-3
+    h = R * T * tau * gt
+    s = R * (tau * gt - g)
+    u = R * T * (tau * gt - pi * gp)
+    cp = -R * tau * tau * gtt
+    cv = R * (-tau * tau * gtt + (gp - tau * gpt) ** 2 / gpp)
+    w2 = 1e3 * R * T * gp * gp / ((gp - tau * gpt) ** 2 / (tau * tau * gtt) - gpp)
+    return {"rho": 1.0 / v, "h": h, "s": s, "u": u, "cp": cp, "cv": cv, "w": np.sqrt(w2)}
+
+
+def _region1(p, T):
+    pi = p / 16.53
+    tau = 1386.0 / T
+    g, ga, gaa, gb, gbb, gab = _R1(7.1 - pi, tau - 1.222)
+    # a = 7.1 - π，对 π 求导时变号
+    return _gibbs_props(p, T, pi, tau, g, -ga, gaa, gb, gbb, -gab)
+
+
+# 区域 1 逆向方程 T(p, s)，用作牛顿迭代初值
+_R1_TPS = _Series(
+    [0, 0, 0, 0, 0, 0, 1, 1, 1, 1, 1, 1, 2, 2, 2, 2, 2, 3, 3, 4],
+    [0, 1, 2, 3, 11, 31, 0, 1, 2, 3, 12, 31, 0, 1, 2, 9, 31, 10, 32, 32],
+    [0.17478268058307e3, 0.34806930892873e2, 0.65292584978455e1, 0.33039981775489,
+     -0.19281382923196e-6, -0.24909197244573e-22, -0.26107636489332, 0.22592965981586,
+     -0.64256463395226e-1, 0.78876289270526e-2, 0.35672110607366e-9, 0.17332496994895e-23,
+     0.56608900654837e-3, -0.32635483139717e-3, 0.44778286690632e-4, -0.51322156908507e-9,
+     -0.42522657042207e-25, 0.26400441360689e-12, 0.78124600459723e-28, -0.30732199903668e-30],
+)
+
+
+def _t1_ps(p, s):
+    # 只用级数值，不用导数；p 加微小量避免导数项除零
+    return _R1_TPS(p + 1e-300, s + 2.0)[0]
+
+
+def _t1_ph(p, h):
+    """区域 1 由 (p, h) 估算温度的初值（液态水比热约 4.18 kJ/(kg·K)）"""
+    return T_MIN + h / 4.18
+
+
+# ---------------------------------------------------------------- 区域 2
+
+_R2_IDEAL = _Series1D(
+    [0, 1, -5, -4, -3, -2, -1, 2, 3],
+    [-0.96927686500217e1, 0.10086655968018e2, -0.56087911283020e-2, 0.71452738081455e-1,
+     -0.40710498223928, 0.14240819171444e1, -0.43839511319450e1, -0.28408632460772,
+     0.21268463753307e-1],
+)
+
+_R2 = _Series(
+    [1, 1, 1, 1, 1, 2, 2, 2, 2, 2, 3, 3, 3, 3, 3, 4, 4, 4, 5, 6, 6, 6, 7, 7, 7, 8, 8, 9, 10, 10,
+     10, 16, 16, 18, 20, 20, 20, 21, 22, 23, 24, 24, 24],
+    [0, 1, 2, 3, 6, 1, 2, 4, 7, 36, 0, 1, 3, 6, 35, 1, 2, 3, 7, 3, 16, 35, 0, 11, 25, 8, 36, 13,
+     4, 10, 14, 29, 50, 57, 20, 35, 48, 21, 53, 39, 26, 40, 58],
+    [-0.17731742473213e-2, -0.17834862292358e-1, -0.45996013696365e-1, -0.57581259083432e-1,
+     -0.50325278727930e-1, -0.33032641670203e-4, -0.18948987516315e-3, -0.39392777243355e-2,
+     -0.43797295650573e-1, -0.26674547914087e-4, 0.20481737692309e-7, 0.43870667284435e-6,
+     -0.32277677238570e-4, -0.15033924542148e-2, -0.40668253562649e-1, -0.78847309559367e-9,
+     0.12790717852285e-7, 0.48225372718507e-6, 0.22922076337661e-5, -0.16714766451061e-10,
+     -0.21171472321355e-2, -0.23895741934104e2, -0.59059564324270e-17, -0.12621808899101e-5,
+     -0.38946842435739e-1, 0.11256211360459e-10, -0.82311340897998e1, 0.19809712802088e-7,
+     0.10406965210174e-18, -0.10234747095929e-12, -0.10018179379511e-8, -0.80882908646985e-10,
+     0.10693031879409, -0.33662250574171, 0.89185845355421e-24, 0.30629316876232e-12,
+     -0.42002467698208e-5, -0.59056029685639e-25, 0.37826947613457e-5, -0.12768608934681e-14,
+     0.73087610595061e-28, 0.55414715350778e-16, -0.94369707241210e-6],
+)
+
+
+def _ideal_plus_residual(p, T, pi, tau, ideal, residual, tau_shift):
+    g0, g0t, g0tt = ideal(tau)
+    gr, grp, grpp, grt, grtt, grpt = residual(pi, tau - tau_shift)
+    g = np.log(pi) + g0 + gr
+    gp = 1.0 / pi + grp
+    gpp = -1.0 / (pi * pi) + grpp
+    return _gibbs_props(p, T, pi, tau, g, gp, gpp, g0t + grt, g0tt + grtt, grpt)
+
+
+def _region2(p, T):
+    return _ideal_plus_residual(p, T, p, 540.0 / T, _R2_IDEAL, _R2, 0.5)
+
+
+# ---------------------------------------------------------------- 区域 5
+
+_R5_IDEAL = _Series1D(
+    [0, 1, -3, -2, -1, 2],
+    [-0.13179983674201e2, 0.68540841634434e1, -0.24805148933466e-1, 0.36901534980333,
+     -0.31161318213925e1, -0.32961626538917],
+)
+
+_R5 = _Series(
+    [1, 1, 1, 2, 2, 3],
+    [1, 2, 3, 3, 9, 7],
+    [0.15736404855259e-2, 0.90153761673944e-3, -0.50270077677648e-2, 0.22440037409485e-5,
+     -0.41163275453471e-5, 0.37919454823456e-7],
+)
+
+
+def _region5(p, T):
+    return _ideal_plus_residual(p, T, p, 1000.0 / T, _R5_IDEAL, _R5, 0.0)
+
+
+# ---------------------------------------------------------------- 区域 3
+
+_R3_N1 = 0.10658070028513e1
+_R3 = _Series(
+    [0, 0, 0, 0, 0, 0, 0, 1, 1, 1, 1, 2, 2, 2, 2, 2, 2, 3, 3, 3, 3, 3, 4, 4, 4, 4, 5, 5, 5, 6,
+     6, 6, 7, 8, 9, 9, 10, 10, 11],
+    [0, 1, 2, 7, 10, 12, 23, 2, 6, 15, 17, 0, 2, 6, 7, 22, 26, 0, 2, 4, 16, 26, 0, 2, 4, 26, 1,
+     3, 26, 0, 2, 26, 2, 26, 2, 26, 0, 1, 26],
+    [-0.15732845290239e2, 0.20944396974307e2, -0.76867707878716e1, 0.26185947787954e1,
+     -0.28080781148620e1, 0.12053369696517e1, -0.84566812812502e-2, -0.12654315477714e1,
+     -0.11524407806681e1, 0.88521043984318, -0.64207765181607, 0.38493460186167,
+     -0.85214708824206, 0.48972281541877e1, -0.30502617256965e1, 0.39420536879154e-1,
+     0.12558408424308, -0.27999329698710, 0.13899799569460e1, -0.20189915023570e1,
+     -0.82147637173963e-2, -0.47596035734923, 0.43984074473500e-1, -0.44476435428739,
+     0.90572070719733, 0.70522450087967, 0.10770512626332, -0.32913623258954,
+     -0.50871062041158, -0.22175400873096e-1, 0.94260751665092e-1, 0.16436278447961,
+     -0.13503372241348e-1, -0.14834345352472e-1, 0.57922953628084e-3, 0.32308904703711e-2,
+     0.80964802996215e-4, -0.16557679795037e-3, -0.44923899061815e-4],
+)
+
+
+def _helmholtz3(rho, T):
+    delta = rho / RHOC
+    tau = TC / T
+    f, fd, fdd, ft, ftt, fdt = _R3(delta, tau)
+    f = f + _R3_N1 * np.log(delta)
+    fd = fd + _R3_N1 / delta
+    fdd = fdd - _R3_N1 / (delta * delta)
+    return delta, tau, f, fd, fdd, ft, ftt, fdt
+
+
+def _p3(rho, T):
+    """区域 3 压力及 dp/dρ（等温）"""
+    delta, tau, f, fd, fdd, ft, ftt, fdt = _helmholtz3(rho, T)
+    p = rho * R * T * delta * fd * 1e-3
+    dp = R * T * (2 * delta * fd + delta * delta * fdd) * 1e-3
+    return p, dp
+
+
+def _region3_rho(rho, T):
+    """区域 3：由 (ρ, T) 计算性质"""
+    delta, tau, f, fd, fdd, ft, ftt, fdt = _helmholtz3(rho, T)
+    dfd = delta * fd
+    a = 2 * dfd + delta * delta * fdd
+    b = dfd - delta * tau * fdt
+    c = tau * tau * ftt
+    return {
+        "p": rho * R * T * dfd * 1e-3,
+        "rho": rho,
+        "h": R * T * (tau * ft + dfd),
+        "s": R * (tau * ft - f),
+        "u": R * T * tau * ft,
+        "cp": R * (-c + b * b / a),
+        "cv": -R * c,
+        "w": np.sqrt(1e3 * R * T * (a - b * b / c)),
+    }
+
+
+# ---------------------------------------------------------------- 区域 4（饱和线）与 B23 边界
+
+_N4 = [0.11670521452767e4, -0.72421316703206e6, -0.17073846940092e2, 0.12020824702470e5,
+       -0.32325550322333e7, 0.14915108613530e2, -0.48232657361591e4, 0.40511340542057e6,
+       -0.23855557567849, 0.65017534844798e3]
+
+
+def _psat(T):
+    n = _N4
+    theta = T + n[8] / (T - n[9])
+    a = theta * theta + n[0] * theta + n[1]
+    b = n[2] * theta * theta + n[3] * theta + n[4]
+    c = n[5] * theta * theta + n[6] * theta + n[7]
+    return (2 * c / (-b + np.sqrt(b * b - 4 * a * c))) ** 4
+
+
+def _tsat(p):
+    n = _N4
+    beta = p ** 0.25
+    e = beta * beta + n[2] * beta + n[5]
+    f = n[0] * beta * beta + n[3] * beta + n[6]
+    g = n[1] * beta * beta + n[4] * beta + n[7]
+    d = 2 * g / (-f - np.sqrt(f * f - 4 * e * g))
+    return (n[9] + d - np.sqrt((n[9] + d) ** 2 - 4 * (n[8] + n[9] * d))) / 2
+
+
+_B23 = [0.34805185628969e3, -0.11671859879975e1, 0.10192970039326e-2, 0.57254459862746e3,
+        0.13918839778870e2]
+
+
+def _p_b23(T):
+    return _B23[0] + _B23[1] * T + _B23[2] * T * T
+
+
+def _t_b23(p):
+    return _B23[3] + np.sqrt((p - _B23[4]) / _B23[2])
+
+
+P13 = float(_psat(np.float64(T13)))     # 623.15 K 对应的饱和压力，约 16.529 MPa
+
+
+# 饱和液体/蒸汽密度辅助方程（IAPWS 补充公式），用于确定区域 3 密度求解的区间和估算饱和粘度
+def _rho_liquid_aux(T):
+    th = np.maximum(1 - T / TC, 0.0)
+    return RHOC * (1 + 1.99274064 * th ** (1 / 3) + 1.09965342 * th ** (2 / 3)
+                   - 0.510839303 * th ** (5 / 3) - 1.75493479 * th ** (16 / 3)
+                   - 45.5170352 * th ** (43 / 3) - 6.74694450e5 * th ** (110 / 3))
+
+
+def _rho_vapor_aux(T):
+    th = np.maximum(1 - T / TC, 0.0)
+    return RHOC * np.exp(-2.03150240 * th ** (2 / 6) - 2.68302940 * th ** (4 / 6)
+                         - 5.38626492 * th ** (8 / 6) - 17.2991605 * th ** (18 / 6)
+                         - 44.7586581 * th ** (37 / 6) - 63.9201063 * th ** (71 / 6))
+
+
+# ---------------------------------------------------------------- 数值求解
+
+def _solve_increasing(func, lo, hi, x0=None, rtol=1e-11, max_iter=100):
+    """
+    向量化的区间保护牛顿法，求 func(x, idx) = 0。
+    func 返回 (f, df)，要求 f 在 [lo, hi] 上单调递增；牛顿步落在区间外时改用二分。
+    idx 为仍在迭代的元素下标，供 func 取对应的其他参数。
+    """
+    lo = np.array(lo, dtype=float)
+    hi = np.array(hi, dtype=float)
+    x = (lo + hi) / 2 if x0 is None else np.clip(np.array(x0, dtype=float), lo, hi)
+    x = np.where(np.isfinite(x), x, (lo + hi) / 2)
+    active = np.flatnonzero(np.isfinite(lo) & np.isfinite(hi))
+    result = np.full(x.shape, np.nan)
+    for _ in range(max_iter):
+        if active.size == 0:
+            break
+        xa, la, ha = x[active], lo[active], hi[active]
+        f, df = func(xa, active)
+        la = np.where(f < 0, xa, la)
+        ha = np.where(f > 0, xa, ha)
+        step = f / df
+        xn = xa - step
+        bad = ~((xn > la) & (xn < ha) & (df > 0))
+        xn = np.where(bad, (la + ha) / 2, xn)
+        done = (np.abs(xn - xa) <= rtol * np.maximum(np.abs(xa), 1.0)) | (f == 0) | (ha - la <= rtol * np.abs(ha))
+        x[active], lo[active], hi[active] = xn, la, ha
+        result[active[done]] = xn[done]
+        active = active[~done]
+    result[active] = x[active]
+    return result
+
+
+# 区域 3 密度求解上限：区域内最大密度约 762 kg/m³，Helmholtz 方程在 ρ > ~820 kg/m³ 后 p(ρ) 不再单调
+RHO3_MAX = 800.0
+
+
+def _rho3(p, T, liquid):
+    """
+    区域 3 由 (p, T) 求密度。liquid 为 True/False 时取液相/汽相分支（亚临界），
+    超临界温度时 p(ρ) 单调，忽略 liquid。
+    """
+    sub = T < TC
+    rho_l = _rho_liquid_aux(T)
+    rho_v = _rho_vapor_aux(T)
+    # 区间端点离饱和密度留出余量，但不越过亚稳态极限，保证区间内 p(ρ) 单调
+    lo = np.where(sub & liquid, rho_l - 0.25 * (rho_l - RHOC), 1.0)
+    hi = np.where(sub & ~liquid, rho_v + 0.25 * (RHOC - rho_v), RHO3_MAX)
+
+    def func(rho, idx):
+        p_calc, dp = _p3(rho, T[idx])
+        return p_calc - p[idx], dp
+
+    return _solve_increasing(func, lo, hi)
+
+
+# ---------------------------------------------------------------- 区域判断与 (p, T) 计算
+
+_FIELDS = ("p", "T", "rho", "h", "s", "u", "cp", "cv", "w", "x", "region")
+
+
+def _empty(n):
+    out = {name: np.full(n, np.nan) for name in _FIELDS}
+    out["region"] = np.zeros(n, dtype=np.int8)
+    return out
+
+
+def _assign(out, mask, props, region):
+    for name, values in props.items():
+        out[name][mask] = values
+    out["region"][mask] = region
+
+
+def region_pt(p, T):
+    """(p, T) 所在区域：1、2、3、5，超出范围为 0"""
+    p = np.asarray(p, dtype=float)
+    T = np.asarray(T, dtype=float)
+    region = np.zeros(np.broadcast(p, T).shape, dtype=np.int8)
+    valid = (p > 0) & (p <= P_MAX) & (T >= T_MIN) & (T <= T25)
+    psat = _psat(np.minimum(T, T13))
+    region[valid & (T <= T13) & (p >= psat)] = 1
+    region[valid & (T <= T13) & (p < psat)] = 2
+    high = valid & (T > T13)
+    above_b23 = p > _p_b23(T)
+    region[high & (T <= 863.15) & above_b23] = 3
+    region[high & ~((T <= 863.15) & above_b23)] = 2
+    region[(T > T25) & (T <= T_MAX) & (p > 0) & (p <= P5_MAX)] = 5
+    return region
+
+
+def _state_pt(p, T):
+    n = p.size
+    out = _empty(n)
+    region = region_pt(p, T)
+    for r, func in ((1, _region1), (2, _region2), (5, _region5)):
+        mask = region == r
+        if mask.any():
+            _assign(out, mask, func(p[mask], T[mask]), r)
+    mask = region == 3
+    if mask.any():
+        pm, Tm = p[mask], T[mask]
+        liquid = pm >= _psat(np.minimum(Tm, TC))
+        _assign(out, mask, _region3_rho(_rho3(pm, Tm, liquid), Tm), 3)
+    out["p"], out["T"] = p.copy(), T.copy()
+    out["x"] = _single_phase_quality(out)
+    return out
+
+
+def _single_phase_quality(out):
+    """单相时的干度约定：液相 0，汽相 1"""
+    region = out["region"]
+    x = out["x"]
+    x = np.where(region == 1, 0.0, x)
+    x = np.where((region == 2) | (region == 5), 1.0, x)
+    return np.where(region == 3, np.where(out["rho"] >= RHOC, 0.0, 1.0), x)
+
+
+# ---------------------------------------------------------------- 饱和状态
+
+def _saturation(p, T):
+    """饱和液体和饱和蒸汽性质（p、T 为饱和线上对应的值）"""
+    n = p.size
+    liq, vap = _empty(n), _empty(n)
+    low = T <= T13
+    if low.any():
+        _assign(liq, low, _region1(p[low], T[low]), 4)
+        _assign(vap, low, _region2(p[low], T[low]), 4)
+    high = ~low & (T <= TC)
+    if high.any():
+        ph, Th = p[high], T[high]
+        _assign(liq, high, _region3_rho(_rho3(ph, Th, np.ones(ph.shape, bool)), Th), 4)
+        _assign(vap, high, _region3_rho(_rho3(ph, Th, np.zeros(ph.shape, bool)), Th), 4)
+    for out in (liq, vap):
+        out["p"], out["T"] = p.copy(), T.copy()
+    liq["x"][:] = 0.0
+    vap["x"][:] = 1.0
+    return liq, vap
+
+
+def _mix(liq, vap, x):
+    """两相混合：比容、焓、熵、内能按干度加权，比热和声速无定义"""
+    out = _empty(x.size)
+    valid = liq["region"] == 4
+    v = (1 - x) / liq["rho"] + x / vap["rho"]
+    out["rho"] = 1.0 / v
+    for name in ("h", "s", "u"):
+        out[name] = (1 - x) * liq[name] + x * vap[name]
+    out["p"], out["T"], out["x"] = liq["p"], liq["T"], np.where(valid, x, np.nan)
+    out["region"] = np.where(valid, 4, 0).astype(np.int8)
+    return out
+
+
+def _state_px(p, x):
+    T = np.where((p >= _psat(np.float64(T_MIN))) & (p <= PC), _tsat(np.clip(p, 611.2e-6, PC)), np.nan)
+    liq, vap = _saturation(p, T)
+    return _mix(liq, vap, np.where((x >= 0) & (x <= 1), x, np.nan))
+
+
+def _state_tx(T, x):
+    p = np.where((T >= T_MIN) & (T <= TC), _psat(np.clip(T, T_MIN, TC)), np.nan)
+    liq, vap = _saturation(p, T)
+    return _mix(liq, vap, np.where((x >= 0) & (x <= 1), x, np.nan))
+
+
+# ---------------------------------------------------------------- (p, h) 与 (p, s)
+
+def _state_p_y(p, y, name):
+    """
+    已知压力和比焓（name="h"）或比熵（name="s"）求状态。
+    先按边界上的 h/s 值确定区域（含两相区），再在区域内对温度求解。
+    """
+    n = p.size
+    out = _empty(n)
+    T_out = np.full(n, np.nan)
+    valid = (p > 0) & (p <= P_MAX) & np.isfinite(y)
+    sat = valid & (p < PC) & (p >= _psat(np.float64(T_MIN)))
+    Ts = np.where(sat, _tsat(np.clip(p, 611.2e-6, PC)), np.nan)
+
+    def at(func, mask, T):
+        result = np.full(n, np.nan)
+        if mask.any():
+            result[mask] = func(p[mask], T[mask] if np.ndim(T) else np.full(mask.sum(), T))[name]
+        return result
+
+    # 各区域在本压力下的温度区间 [t_lo, t_hi] 及对应的 y 值
+    low_p = valid & (p <= P13)
+    y1_hi = np.where(low_p, at(_region1, low_p & sat, Ts), at(_region1, valid & ~low_p, T13))
+    t1_hi = np.where(low_p, Ts, T13)
+    t2_lo = np.where(low_p, np.where(sat, Ts, T_MIN), np.where(valid, _t_b23(np.maximum(p, P13)), np.nan))
+    y2_lo = at(_region2, valid & np.isfinite(t2_lo), t2_lo)
+    y2_hi = at(_region2, valid, T25)
+    y5_hi = at(_region5, valid & (p <= P5_MAX), T_MAX)
+
+    # 两相区：低压段用区域 1/2，高压段用区域 3 的饱和性质
+    yl = np.where(low_p, y1_hi, np.nan)
+    yv = np.where(low_p, y2_lo, np.nan)
+    sat3 = sat & ~low_p
+    if sat3.any():
+        liq, vap = _saturation(p[sat3], Ts[sat3])
+        yl[sat3], yv[sat3] = liq[name], vap[name]
+    two_phase = sat & (y >= yl) & (y <= yv)
+
+    in1 = valid & ~two_phase & (y <= y1_hi) & (y >= at(_region1, valid, T_MIN))
+    in2 = valid & ~two_phase & (y >= y2_lo) & (y <= y2_hi)
+    in5 = valid & (y > y2_hi) & (y <= y5_hi)
+    in3 = valid & ~two_phase & ~in1 & ~in2 & ~in5 & (y > y1_hi) & (y < y2_lo)
+
+    # 区域 3 的温度区间：亚临界时以饱和温度分为液相段和汽相段
+    t3_lo = np.where(in3 & sat & (y > yv), Ts, T13)
+    t3_hi = np.where(in3 & sat & (y < yl), Ts, t2_lo)
+
+    def deriv(props, T):
+        # dh/dT = cp，ds/dT = cp / T（等压）
+        return props["cp"] if name == "h" else props["cp"] / T
+
+    def solve(func, mask, lo, hi, x0=None):
+        # func(p, T, idx)：idx 为 mask 内仍在迭代的元素下标
+        pm, ym = p[mask], y[mask]
+
+        def f(T, idx):
+            props = func(pm[idx], T, idx)
+            return props[name] - ym[idx], deriv(props, T)
+
+        return _solve_increasing(f, lo[mask], hi[mask], None if x0 is None else x0[mask])
+
+    if in1.any():
+        seed = np.full(n, np.nan)
+        seed[in1] = (_t1_ph if name == "h" else _t1_ps)(p[in1], y[in1])
+        T_out[in1] = solve(lambda pm, T, idx: _region1(pm, T), in1, np.full(n, T_MIN), t1_hi, seed)
+    if in2.any():
+        T_out[in2] = solve(lambda pm, T, idx: _region2(pm, T), in2, t2_lo, np.full(n, T25))
+    if in5.any():
+        T_out[in5] = solve(lambda pm, T, idx: _region5(pm, T), in5, np.full(n, T25), np.full(n, T_MAX))
+    if in3.any():
+        # 亚临界时按 h/s 落在液相侧还是汽相侧选择密度分支
+        liquid = np.where(sat, y < yl, True)[in3]
+        T_out[in3] = solve(lambda pm, T, idx: _region3_rho(_rho3(pm, T, liquid[idx]), T),
+                           in3, t3_lo, t3_hi)
+
+    single = in1 | in2 | in3 | in5
+    if single.any():
+        props = _state_pt(p[single], T_out[single])
+        for key in _FIELDS:
+            out[key][single] = props[key]
+    if two_phase.any():
+        xq = (y[two_phase] - yl[two_phase]) / (yv[two_phase] - yl[two_phase])
+        mixed = _state_px(p[two_phase], xq)
+        for key in _FIELDS:
+            out[key][two_phase] = mixed[key]
+    out["p"] = p.copy()
+    return out
+
+
+# ---------------------------------------------------------------- 输运性质（IAPWS 2008 粘度 / 2011 导热系数）
+
+_VISC_H0 = np.array([1.67752, 2.20462, 0.6366564, -0.241605])
+_VISC_H1 = np.array([
+    [5.20094e-1, 2.22531e-1, -2.81378e-1, 1.61913e-1, -3.25372e-2, 0, 0],
+    [8.50895e-2, 9.99115e-1, -9.06851e-1, 2.57399e-1, 0, 0, 0],
+    [-1.08374, 1.88797, -7.72479e-1, 0, 0, 0, 0],
+    [-2.89555e-1, 1.26613, -4.89837e-1, 0, 6.98452e-2, 0, -4.35673e-3],
+    [0, 0, -2.57040e-1, 0, 0, 8.72102e-3, 0],
+    [0, 1.20573e-1, 0, 0, 0, 0, -5.93264e-4],
+])
+
+_COND_L0 = np.array([2.443221e-3, 1.323095e-2, 6.770357e-3, -3.454586e-3, 4.096266e-4])
+_COND_L1 = np.array([
+    [1.60397357, -0.646013523, 0.111443906, 0.102997357, -0.0504123634, 0.00609859258],
+    [2.33771842, -2.78843778, 1.53616167, -0.463045512, 0.0832827019, -0.00719201245],
+    [2.19650529, -4.54580785, 3.55777244, -1.40944978, 0.275418278, -0.0205938816],
+    [-1.21051378, 1.60812989, -0.621178141, 0.0716373224, 0, 0],
+    [-2.7203370, 4.57586331, -3.18369245, 1.1168348, -0.19268305, 0.012913842],
+])
+
+
+def _dense_term(table, t_bar, rho_bar):
+    """exp(ρ̄ Σ_i Σ_j c_ij (1/T̄ - 1)^i (ρ̄ - 1)^j)"""
+    ti = (1 / t_bar - 1)[..., None] ** np.arange(table.shape[0])
+    rj = (rho_bar - 1)[..., None] ** np.arange(table.shape[1])
+    return np.exp(rho_bar * np.einsum("...i,ij,...j->...", ti, table, rj))
+
+
+def viscosity(T, rho):
+    """动力粘度 Pa·s（不含临界增强项，工业计算适用）"""
+    T, rho = np.broadcast_arrays(np.asarray(T, dtype=float), np.asarray(rho, dtype=float))
+    t_bar = T / TC
+    rho_bar = rho / RHOC
+    mu0 = 100 * np.sqrt(t_bar) / np.sum(_VISC_H0 / t_bar[..., None] ** np.arange(4), axis=-1)
+    return _scalar(mu0 * _dense_term(_VISC_H1, t_bar, rho_bar) * 1e-6)
+
+
+def saturation_viscosity(T):
+    """饱和液体、饱和蒸汽的动力粘度 Pa·s，返回 (液, 汽)；密度取辅助方程，免去饱和状态求解"""
+    T = np.asarray(T, dtype=float)
+    return viscosity(T, _rho_liquid_aux(T)), viscosity(T, _rho_vapor_aux(T))
+
+
+def thermal_conductivity(T, rho):
+    """导热系数 W/(m·K)（不含临界增强项，工业计算适用）"""
+    T, rho = np.broadcast_arrays(np.asarray(T, dtype=float), np.asarray(rho, dtype=float))
+    t_bar = T / TC
+    rho_bar = rho / RHOC
+    k0 = np.sqrt(t_bar) / np.sum(_COND_L0 / t_bar[..., None] ** np.arange(5), axis=-1)
+    return _scalar(k0 * _dense_term(_COND_L1, t_bar, rho_bar) * 1e-3)
+
+
+# ---------------------------------------------------------------- 公共接口
+
+def _scalar(value):
+    return float(value) if np.ndim(value) == 0 else value
+
+
+class SteamState:
+    """
+    物性计算结果。各属性为与输入同形状的数组，标量输入时为 float：
+    p 压力 MPa，T 温度 K，rho 密度，v 比容，h 比焓，s 比熵，u 比内能，cp/cv 比热，w 声速，
+    x 干度（两相区为实际干度，单相液体 0、蒸汽 1），region 区域号（4 为两相区，0 为超出范围）。
+    """
+
+    __slots__ = _FIELDS + ("_mu", "_k")
+
+    def __init__(self, values, shape):
+        for name in _FIELDS:
+            setattr(self, name, self._shaped(values[name], shape))
+        # 输运性质默认在首次访问时由 (T, ρ) 计算；查表计算时由 values 直接给出
+        self._mu = self._shaped(values["mu"], shape) if "mu" in values else None
+        self._k = self._shaped(values["k"], shape) if "k" in values else None
+
+    @staticmethod
+    def _shaped(value, shape):
+        value = value.reshape(shape)
+        return value.item() if shape == () else value
+
+    @property
+    def v(self):
+        return 1.0 / self.rho
+
+    @property
+    def t_c(self):
+        """温度 °C"""
+        return self.T - 273.15
+
+    @property
+    def mu(self):
+        """动力粘度 Pa·s"""
+        if self._mu is None:
+            self._mu = viscosity(self.T, self.rho)
+        return self._mu
+
+    @property
+    def k(self):
+        """导热系数 W/(m·K)"""
+        if self._k is None:
+            self._k = thermal_conductivity(self.T, self.rho)
+        return self._k
+
+    def __repr__(self):
+        return f"SteamState(p={self.p!r}, T={self.T!r}, h={self.h!r}, region={self.region!r})"
+
+
+_executor = None
+
+
+def _pool():
+    """分块并行计算用的线程池（NumPy 运算期间释放 GIL，多核下可线性加速）"""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1),
+                                       thread_name_prefix="if97")
+    return _executor
+
+
+def _evaluate(kernel, a, b):
+    """广播两个输入，按块调用 kernel 并合并为 SteamState"""
+    a, b = np.broadcast_arrays(np.asarray(a, dtype=float), np.asarray(b, dtype=float))
+    shape = a.shape
+    a, b = a.ravel(), b.ravel()
+
+    def run(start):
+        # 超出范围和迭代中间值产生的 NaN 属于预期结果，不输出警告
+        with np.errstate(invalid="ignore", divide="ignore", over="ignore"):
+            return kernel(a[start:start + CHUNK_SIZE], b[start:start + CHUNK_SIZE])
+
+    if a.size <= CHUNK_SIZE:
+        return SteamState(run(0), shape)
+    starts = range(0, a.size, CHUNK_SIZE)
+    parts = _pool().map(run, starts) if (os.cpu_count() or 1) > 1 else map(run, starts)
+    out = {}
+    for start, part in zip(starts, parts):
+        for name, values in part.items():
+            if name not in out:
+                out[name] = np.empty(a.size, dtype=values.dtype)
+            out[name][start:start + CHUNK_SIZE] = values
+    return SteamState(out, shape)
+
+
+def props_pt(p, T):
+    """已知压力 (MPa) 和温度 (K)"""
+    return _evaluate(_state_pt, p, T)
+
+
+def props_ph(p, h):
+    """已知压力 (MPa) 和比焓 (kJ/kg)"""
+    return _evaluate(lambda a, b: _state_p_y(a, b, "h"), p, h)
+
+
+def props_ps(p, s):
+    """已知压力 (MPa) 和比熵 (kJ/(kg·K))"""
+    return _evaluate(lambda a, b: _state_p_y(a, b, "s"), p, s)
+
+
+def props_px(p, x):
+    """已知饱和压力 (MPa) 和干度"""
+    return _evaluate(_state_px, p, x)
+
+
+def props_tx(T, x):
+    """已知饱和温度 (K) 和干度"""
+    return _evaluate(_state_tx, T, x)
+
+
+def psat(T):
+    """饱和压力 MPa（273.15 K ≤ T ≤ 647.096 K，范围外为 NaN）"""
+    T = np.asarray(T, dtype=float)
+    valid = (T >= T_MIN) & (T <= TC)
+    return _scalar(np.where(valid, _psat(np.where(valid, T, T_MIN)), np.nan))
+
+
+def tsat(p):
+    """饱和温度 K（611.213 Pa ≤ p ≤ 22.064 MPa，范围外为 NaN）"""
+    p = np.asarray(p, dtype=float)
+    valid = (p >= 611.212677e-6) & (p <= PC)
+    return _scalar(np.where(valid, _tsat(np.where(valid, p, PC)), np.nan))
@@ -0,0 +1,197 @@
+# CalcE/thermo/property_service.py
+"""
+进程级物性服务：各计算器统一从这里取物性，按 (流体, T, P, 相态) 缓存
+
+- 流体可以是注册名（"water"），也可以是带参数的关联式对象（如 Antoine(a, b, c)），
+  关联式对象按参数值比较，参数修改后自然对应新的缓存键。
+- 缓存为有界 LRU，记录命中/未命中次数。重复点击计算、参数试算时直接命中缓存。
+- get_many 对数组批量查询，未命中的点一次性交给关联式向量化计算；点数超过缓存容量的大批量
+  扫描不进缓存（否则只会把缓存整体冲掉），直接计算。
+- 单位：温度 K，压力 MPa（绝压）。结果为 物性名 → 数值 的字典。
+"""
+import threading
+from collections import OrderedDict
+from typing import NamedTuple
+
+import numpy as np
+
+from . import if97, steam_table
+
+
+class Water:
+    """
+    水和水蒸气（IAPWS-IF97，精确/查表模式由 steam_table.set_mode 切换）
+    phase: None 按 (T, P) 单相计算；"vapor" 按蒸汽计算，温度不高于饱和温度 + 0.1 K 时取干饱和蒸汽；
+           0~1 的数值为该干度的饱和状态，给定 P 时按饱和压力计算，P 为 None 时按饱和温度 T 计算。
+    结果：p, T, rho, h, s, cp, mu, k, x
+    """
+
+    FIELDS = ("p", "T", "rho", "h", "s", "cp", "mu", "k", "x")
+
+    def cache_key(self):
+        # 精确/查表模式不同的结果分开缓存
+        return ("water", steam_table.get_mode())
+
+    def evaluate(self, T, P, phase):
+        if phase is None:
+            return self._fields(steam_table.props_pt(P, T))
+        if phase == "vapor":
+            out = self._fields(steam_table.props_pt(P, T))
+            saturated = T <= if97.tsat(P) + 0.1
+            if saturated.any():
+                sat = self._fields(steam_table.props_px(P[saturated], 1.0))
+                for name in self.FIELDS:
+                    out[name][saturated] = sat[name]
+            return out
+        if P is None:
+            return self._fields(if97.props_tx(T, float(phase)))
+        return self._fields(steam_table.props_px(P, float(phase)))
+
+    def _fields(self, state):
+        return {name: np.array(getattr(state, name), dtype=float, ndmin=1) for name in self.FIELDS}
+
+
+class Antoine(NamedTuple):
+    """
+    Antoine 方程 log10(P/kPa) = A - B / (t/°C + C)，与 VLE 计算器中的参数形式一致
+    结果：psat 饱和蒸气压 MPa
+    """
+
+    a: float
+    b: float
+    c: float
+
+    def cache_key(self):
+        return ("antoine", self.a, self.b, self.c)
+
+    def evaluate(self, T, P, phase):
+        t_c = T - 273.15
+        return {"psat": 10 ** (self.a - self.b / (t_c + self.c)) * 1e-3}
+
+
+class PropertyService:
+    """按 (流体, T, P, 相态) 缓存物性的 LRU 服务，线程安全"""
+
+    DEFAULT_MAXSIZE = 4096
+
+    def __init__(self, maxsize=DEFAULT_MAXSIZE):
+        self.maxsize = maxsize
+        self._fluids = {"water": Water()}
+        self._cache = OrderedDict()     # (流体键, T, P, 相态) -> 物性字典（LRU）
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def register(self, name, fluid):
+        """注册命名流体；fluid 需提供 cache_key() 和 evaluate(T, P, phase)"""
+        self._fluids[name] = fluid
+
+    def fluid(self, fluid):
+        if isinstance(fluid, str):
+            try:
+                return self._fluids[fluid]
+            except KeyError:
+                raise ValueError(f"未注册的流体: {fluid}") from None
+        return fluid
+
+    @staticmethod
+    def _number(value):
+        return None if value is None else float(value)
+
+    def get(self, fluid, T=None, P=None, phase=None):
+        """查询单个状态点，返回 物性名 → float 的字典（副本，可随意修改）"""
+        provider = self.fluid(fluid)
+        T, P = self._number(T), self._number(P)
+        key = (provider.cache_key(), T, P, phase)
+        with self._lock:
+            values = self._cache.get(key)
+            if values is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return dict(values)
+            self.misses += 1
+        values = self._evaluate(provider, None if T is None else np.array([T]),
+                                None if P is None else np.array([P]), phase)
+        values = {name: float(column[0]) for name, column in values.items()}
+        with self._lock:
+            self._store(key, values)
+        return dict(values)
+
+    def get_many(self, fluid, T=None, P=None, phase=None):
+        """批量查询（T、P 为标量或数组，按广播规则组合），返回 物性名 → 数组 的字典"""
+        provider = self.fluid(fluid)
+        arrays = [np.asarray(v, dtype=float) for v in (T, P) if v is not None]
+        shape = np.broadcast_shapes(*(a.shape for a in arrays))
+        T = None if T is None else np.broadcast_to(np.asarray(T, dtype=float), shape).ravel()
+        P = None if P is None else np.broadcast_to(np.asarray(P, dtype=float), shape).ravel()
+        n = int(np.prod(shape))
+
+        if n > self.maxsize:
+            with self._lock:
+                self.misses += n
+            values = self._evaluate(provider, T, P, phase)
+            return {name: column.reshape(shape) for name, column in values.items()}
+
+        fluid_key = provider.cache_key()
+        keys = [(fluid_key, None if T is None else T[i], None if P is None else P[i], phase)
+                for i in range(n)]
+        found = {}
+        missing = {}        # 未命中的键 -> 首次出现的位置（批内去重）
+        with self._lock:
+            for i, key in enumerate(keys):
+                values = self._cache.get(key)
+                if values is not None:
+                    self._cache.move_to_end(key)
+                    found[key] = values
+                    self.hits += 1
+                elif key not in missing:
+                    missing[key] = i
+                    self.misses += 1
+                else:
+                    self.hits += 1
+
+        if missing:
+            index = np.fromiter(missing.values(), dtype=np.intp, count=len(missing))
+            computed = self._evaluate(provider, None if T is None else T[index],
+                                      None if P is None else P[index], phase)
+            with self._lock:
+                for j, key in enumerate(missing):
+                    values = {name: float(column[j]) for name, column in computed.items()}
+                    found[key] = values
+                    self._store(key, values)
+
+        names = next(iter(found.values())).keys() if found else ()
+        return {name: np.array([found[key][name] for key in keys]).reshape(shape) for name in names}
+
+    def _evaluate(self, provider, T, P, phase):
+        with np.errstate(invalid="ignore", divide="ignore", over="ignore"):
+            return provider.evaluate(T, P, phase)
+
+    def _store(self, key, values):
+        self._cache[key] = values
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.maxsize:
+            self._cache.popitem(last=False)
+
+    def stats(self):
+        """缓存统计：命中、未命中、命中率、当前条目数和容量"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "size": len(self._cache),
+                "maxsize": self.maxsize,
+            }
+
+    def clear(self):
+        """清空缓存和计数"""
+        with self._lock:
+            self._cache.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+# 全局唯一的物性服务，各计算器共享
+service = PropertyService()
@@ -0,0 +1,523 @@
+# CalcE/thermo/refrigerant.py
+"""
+制冷剂物性（饱和表 + 过热表，单调三次样条插值），制冷剂物性、制冷循环等计算器共用
+
+- 每种制冷剂一个压缩表文件 data/refrigerants/<名称>.npz，某种制冷剂第一次被用到时才加载，之后常驻内存。
+- 饱和表：温度节点按 T = Tmin + (Ttop - Tmin)(1 - (1 - u)²) 向临界点加密（u 均匀），存储泡点、露点两侧的
+  ln p、ln ρ、h、s、cp、cv、w、μ、k。非共沸混合物（R407C 等）泡点、露点压力不同，按压力取两侧温度即得温度滑移。
+- 过热表：按 ln p 均匀分布的等压线，每条线上 T = Td(p) + ξ² (Thi - Td(p))（Td 为露点温度，ξ 均匀），
+  网格不跨越饱和线，ξ = 0 即饱和蒸汽；存储 ln ρ、h、s、cp、cv、w、μ、k。
+- 插值一律用 Fritsch–Carlson 单调三次 Hermite 样条（PCHIP，斜率取法与 scipy 的 PchipInterpolator 相同），
+  节点数据单调的区间内插值结果也单调，不会过冲。过热表先沿 ln p 在相邻 4 条等压线间插值得到查询压力下的
+  整条等压线，再沿 ξ 插值；按 (p, h)、(p, s) 反算时在这条等压线上二分求解。
+- 过冷液体按饱和液体加压力修正近似：h = hl(T) + vl(T)(p - pb(T))，其余物性取同温度饱和液体值。
+- 两相区按干度线性组合；非共沸混合物两相区温度在泡点、露点温度之间按干度线性近似。
+- 超出表范围（低于 Tmin、接近临界点、超临界压力、高于 Thi）的点结果为 NaN。
+
+表数据由 CoolProp（Helmholtz 自由能状态方程，与 REFPROP 同源）生成，参考态为 IIR（0 °C 饱和液体
+h = 200 kJ/kg、s = 1 kJ/(kg·K)，水为 IAPWS 三相点参考态），运行时不需要 CoolProp。
+重新生成表文件：python -m thermo.refrigerant [制冷剂 ...]
+
+单位：温度 K，压力 MPa（绝压），h kJ/kg，s、cp、cv kJ/(kg·K)，ρ kg/m³，w m/s，μ Pa·s，k W/(m·K)。
+单点查询返回 物性名 → float 的字典，数组查询返回 物性名 → 数组 的字典。
+"""
+import os
+import sys
+import threading
+
+import numpy as np
+
+# 表名 → CoolProp 流体名（仅生成表文件时使用）
+FLUIDS = {
+    "R134a": "R134a",
+    "R22": "R22",
+    "R410A": "R410A",
+    "R407C": "R407C",
+    "R404A": "R404A",
+    "R507": "R507A",
+    "R717": "Ammonia",
+    "R718": "Water",
+    "R290": "Propane",
+    "R600a": "IsoButane",
+    "R1234yf": "R1234yf",
+    "R1234ze": "R1234ze(E)",
+    "R32": "R32",
+    "R125": "R125",
+    "R143a": "R143a",
+    "R744": "CarbonDioxide",
+}
+
+# 表格分辨率（表文件自带尺寸，修改后需重新生成）
+NS = 161                    # 饱和表节点数
+NP = 65                     # 过热表等压线数
+NX = 49                     # 每条等压线上的节点数
+T_FLOOR = 173.15            # K，饱和表下限不低于 -100 °C
+T_GAP = 1.0                 # K，饱和表上限 Ttop = Tc - T_GAP
+SUPERHEAT_SPAN = 150.0      # K，过热表上限 Thi = Tc + SUPERHEAT_SPAN（不超过状态方程适用上限）
+
+_SAT_COLUMNS = ("lnp", "lnrho", "h", "s", "cp", "cv", "w", "mu", "k")
+_VAP_COLUMNS = _SAT_COLUMNS[1:]
+FIELDS = ("p", "T", "rho", "h", "s", "cp", "cv", "w", "mu", "k", "x")
+
+_BISECT = 40                # 二分次数，区间内相对精度约 1e-12
+R_UNIVERSAL = 8.314462618   # J/(mol·K)
+
+_DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "refrigerants")
+
+_loaded = {}
+_lock = threading.Lock()
+
+
+def table_name(name):
+    """计算器中的显示名 → 表名，如 "R717 (氨)" → "R717" """
+    key = name.split()[0] if name.strip() else name
+    if key not in FLUIDS:
+        raise ValueError(f"未收录的制冷剂: {name}")
+    return key
+
+
+def load(name):
+    """取制冷剂物性表（首次使用时从表文件加载，线程安全）"""
+    key = table_name(name)
+    fluid = _loaded.get(key)
+    if fluid is not None:
+        return fluid
+    with _lock:
+        fluid = _loaded.get(key)
+        if fluid is None:
+            path = os.path.join(_DATA_DIR, f"{key}.npz")
+            with np.load(path) as data:
+                fluid = Refrigerant(key, {name: data[name] for name in data.files})
+            _loaded[key] = fluid
+    return fluid
+
+
+# ---------------------------------------------------------------- 单调三次样条
+
+def _end_slope(delta0, delta1):
+    """端点斜率：三点公式，再按 Fritsch–Carlson 条件限制"""
+    d = (3 * delta0 - delta1) / 2
+    d = np.where(np.sign(d) != np.sign(delta0), 0.0, d)
+    return np.where((np.sign(delta0) != np.sign(delta1)) & (np.abs(d) > 3 * np.abs(delta0)), 3 * delta0, d)
+
+
+def _slopes(y, axis=0):
+    """等间距节点（间距取 1）上的 PCHIP 斜率，沿 axis 轴"""
+    y = np.moveaxis(y, axis, 0)
+    delta = np.diff(y, axis=0)
+    d = np.empty_like(y)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # 相邻割线同号时取调和平均，异号或为零（局部极值）时斜率为零
+        d[1:-1] = np.where(delta[:-1] * delta[1:] > 0, 2 / (1 / delta[:-1] + 1 / delta[1:]), 0.0)
+    d[0] = _end_slope(delta[0], delta[1])
+    d[-1] = _end_slope(delta[-1], delta[-2])
+    return np.moveaxis(d, 0, axis)
+
+
+def _hermite(y0, y1, d0, d1, t):
+    t2 = t * t
+    return y0 + t2 * (3 - 2 * t) * (y1 - y0) + t * (t - 1) ** 2 * d0 + t2 * (t - 1) * d1
+
+
+def _pick(y, d, i):
+    """取查询点所在区间两端的节点值和斜率；y 为 (1, n, ...)（共用曲线）或 (N, n, ...)（每点一条曲线）"""
+    rows = np.arange(len(i)) if y.shape[0] > 1 else 0
+    return y[rows, i], y[rows, i + 1], d[rows, i], d[rows, i + 1]
+
+
+def _interp(y, d, position):
+    """
+    在浮点节点坐标 position（形状 (N,)）处求样条值，返回 (N, ...)。
+    y、d 为节点值和斜率，节点沿第 1 轴；超出 [0, n-1] 的点为 NaN。
+    """
+    n = y.shape[1]
+    inside = (position >= 0) & (position <= n - 1)
+    position = np.where(inside, position, 0.0)
+    i = np.minimum(position.astype(np.intp), n - 2)
+    y0, y1, d0, d1 = _pick(y, d, i)
+    t = (position - i).reshape((-1,) + (1,) * (y.ndim - 2))
+    out = _hermite(y0, y1, d0, d1, t)
+    out[~inside] = np.nan
+    return out
+
+
+def _solve(y, d, target):
+    """
+    单调递增样条的反函数：求 y(position) = target 的节点坐标。
+    y、d 为 (1, n) 或 (N, n)；target 超出节点值范围的点为 NaN。
+    """
+    n = y.shape[1]
+    with np.errstate(invalid="ignore"):
+        inside = (target >= y[:, 0]) & (target <= y[:, -1])
+        i = np.clip(np.sum(y <= target[:, None], axis=1) - 1, 0, n - 2)
+    y0, y1, d0, d1 = _pick(y, d, i)
+    lo = np.zeros(len(target))
+    hi = np.ones(len(target))
+    for _ in range(_BISECT):
+        mid = 0.5 * (lo + hi)
+        below = _hermite(y0, y1, d0, d1, mid) < target
+        lo = np.where(below, mid, lo)
+        hi = np.where(below, hi, mid)
+    return np.where(inside, i + 0.5 * (lo + hi), np.nan)
+
+
+# ---------------------------------------------------------------- 物性表
+
+def _flat(*values):
+    """输入按广播规则展平为一维数组，返回数组和原形状"""
+    arrays = np.broadcast_arrays(*(np.asarray(v, dtype=float) for v in values))
+    shape = arrays[0].shape
+    return [a.ravel() for a in arrays], shape
+
+
+def _shaped(values, shape):
+    return {name: (column.item() if shape == () else column.reshape(shape))
+            for name, column in values.items()}
+
+
+def _columns(table, columns):
+    """表格列 → 物性字典（ln p、ln ρ 还原为 p、ρ）"""
+    values = {}
+    for j, name in enumerate(columns):
+        if name.startswith("ln"):
+            values[name[2:]] = np.exp(table[:, j])
+        else:
+            values[name] = table[:, j]
+    return values
+
+
+class Refrigerant:
+    """
+    单个制冷剂的物性表（由 load 加载）
+    tc、pc 为临界温度/压力；t_min ~ t_top 为饱和表范围，p_min ~ p_max 为过热表压力范围，t_hi 为过热表温度上限。
+    """
+
+    def __init__(self, name, data):
+        self.name = name
+        self.tc, self.pc, self.mw, self.t_min, self.t_top, self.t_hi, lnp_lo, lnp_hi = map(float, data["meta"])
+        self.R = R_UNIVERSAL / self.mw          # kJ/(kg·K)
+        self._sat = data["sat"].astype(float)[None]             # (1, NS, 2, 列)
+        self._sat_d = _slopes(self._sat, axis=1)
+        self._ns = self._sat.shape[1]
+        self._lnp_lo = lnp_lo
+        if "vap" in data:
+            self._vap = data["vap"].astype(float)                # (NP, NX, 列)
+            self._dlnp = (lnp_hi - lnp_lo) / (self._vap.shape[0] - 1)
+            self.p_min, self.p_max = np.exp(lnp_lo), np.exp(lnp_hi)
+
+    def __repr__(self):
+        return f"Refrigerant({self.name!r})"
+
+    # ------------------------------------------------------------ 饱和线
+
+    def _sat_position(self, T):
+        with np.errstate(invalid="ignore"):
+            r = (T - self.t_min) / (self.t_top - self.t_min)
+            return (1 - np.sqrt(1 - r)) * (self._ns - 1)
+
+    def _sat_temperature(self, position):
+        u = position / (self._ns - 1)
+        return self.t_min + (self.t_top - self.t_min) * (1 - (1 - u) ** 2)
+
+    def _sat_at(self, T):
+        """饱和表在温度 T 处的值，(N, 2, 列)，第 1 轴 0 为泡点液体、1 为露点蒸汽"""
+        return _interp(self._sat, self._sat_d, self._sat_position(T))
+
+    def _tsat(self, lnp, side):
+        position = _solve(self._sat[:, :, side, 0], self._sat_d[:, :, side, 0], lnp)
+        return self._sat_temperature(position)
+
+    def psat(self, T, dew=False):
+        """饱和压力 MPa；dew=False 为泡点压力，True 为露点压力（纯物质两者相同）"""
+        (T,), shape = _flat(T)
+        p = np.exp(self._sat_at(T)[:, int(dew), 0])
+        return p.item() if shape == () else p.reshape(shape)
+
+    def tsat(self, p, dew=False):
+        """饱和温度 K；dew=False 为泡点温度，True 为露点温度"""
+        (p,), shape = _flat(p)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            T = self._tsat(np.log(p), int(dew))
+        return T.item() if shape == () else T.reshape(shape)
+
+    def saturated(self, T=None, p=None):
+        """
+        饱和性质。给定压力时液相取泡点、汽相取露点；给定温度时取该温度下的泡点压力。
+        结果：p, T_l（泡点温度）, T_v（露点温度）, glide（温度滑移），以及液相/汽相物性
+        rho_l, h_l, s_l, cp_l, cv_l, w_l, mu_l, k_l 和对应的 *_v。
+        """
+        if (T is None) == (p is None):
+            raise ValueError("饱和性质需要给定温度或压力之一")
+        if T is not None:
+            (T,), shape = _flat(T)
+            p = np.exp(self._sat_at(T)[:, 0, 0])
+        else:
+            (p,), shape = _flat(p)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            lnp = np.log(p)
+        t_l, t_v = self._tsat(lnp, 0), self._tsat(lnp, 1)
+        liquid = _columns(self._sat_at(t_l)[:, 0], _SAT_COLUMNS)
+        vapor = _columns(self._sat_at(t_v)[:, 1], _SAT_COLUMNS)
+        values = {"p": p, "T_l": t_l, "T_v": t_v, "glide": t_v - t_l}
+        for name in _VAP_COLUMNS:
+            name = name[2:] if name.startswith("ln") else name
+            values[f"{name}_l"] = liquid[name]
+            values[f"{name}_v"] = vapor[name]
+        return _shaped(values, shape)
+
+    # ------------------------------------------------------------ 单相区
+
+    def _isobar(self, lnp):
+        """查询压力下的整条等压线 (N, NX, 列) 及其沿 ξ 的斜率；压力超出过热表范围的行为 NaN"""
+        n = self._vap.shape[0]
+        position = (lnp - self._lnp_lo) / self._dlnp
+        finite = np.isfinite(position)
+        start = np.clip(np.floor(np.where(finite, position, 0)).astype(np.intp) - 1, 0, n - 4)
+        # 相邻 4 条等压线（表格两端用单侧模板），局部 PCHIP 斜率与整张表上的斜率一致
+        stencil = self._vap[start[:, None] + np.arange(4)]
+        stencil = stencil.reshape(len(lnp), 4, -1)
+        row = _interp(stencil, _slopes(stencil, axis=1), np.where(finite, position - start, -1.0))
+        row = row.reshape((len(lnp),) + self._vap.shape[1:])
+        return row, _slopes(row, axis=1)
+
+    def _isobar_temperature(self, t_d, position):
+        xi = position / (self._vap.shape[1] - 1)
+        return t_d + xi ** 2 * (self.t_hi - t_d)
+
+    def _vapor(self, p, T):
+        lnp = np.log(p)
+        t_d = self._tsat(lnp, 1)
+        with np.errstate(invalid="ignore"):
+            xi = np.sqrt((T - t_d) / (self.t_hi - t_d))
+        row, d = self._isobar(lnp)
+        values = _columns(_interp(row, d, xi * (self._vap.shape[1] - 1)), _VAP_COLUMNS)
+        values["p"], values["T"] = p, T
+        return values
+
+    def _liquid(self, p, T):
+        values = _columns(self._sat_at(T)[:, 0], _SAT_COLUMNS)
+        dp = p - values["p"]
+        with np.errstate(invalid="ignore"):
+            dp[dp < -1e-9 * p] = np.nan           # 低于泡点压力，不是液体
+        values["h"] = values["h"] + dp * 1e3 / values["rho"]
+        values["p"], values["T"] = p, T
+        return values
+
+    @staticmethod
+    def _merge(liquid, vapor):
+        """单相结果合并：汽相有效处取汽相，否则取液相；x 为 1（汽）、0（液），两相或表外为 NaN"""
+        is_vapor = np.isfinite(vapor["h"])
+        is_liquid = ~is_vapor & np.isfinite(liquid["h"])
+        values = {name: np.where(is_vapor, vapor[name], liquid[name]) for name in FIELDS[:-1]}
+        values["x"] = np.where(is_vapor, 1.0, np.where(is_liquid, 0.0, np.nan))
+        return values
+
+    def props_pt(self, p, T):
+        """单相物性（过热蒸汽或过冷液体）；非共沸混合物泡点与露点之间及表外为 NaN"""
+        (p, T), shape = _flat(p, T)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            values = self._merge(self._liquid(p, T), self._vapor(p, T))
+        return _shaped(values, shape)
+
+    def props_ph(self, p, h):
+        """由压力和比焓求状态（过冷液体、两相、过热蒸汽），两相区 cp、cv、w、μ、k 为 NaN"""
+        return self._props_inverse(p, "h", h)
+
+    def props_ps(self, p, s):
+        """由压力和比熵求状态（过冷液体、两相、过热蒸汽），两相区 cp、cv、w、μ、k 为 NaN"""
+        return self._props_inverse(p, "s", s)
+
+    def _props_inverse(self, p, key, value):
+        (p, value), shape = _flat(p, value)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            values = self._inverse(p, key, value)
+        return _shaped(values, shape)
+
+    def _inverse(self, p, key, value):
+        n = len(p)
+        values = {name: np.full(n, np.nan) for name in FIELDS}
+        lnp = np.log(p)
+        t_l, t_v = self._tsat(lnp, 0), self._tsat(lnp, 1)
+        liquid = _columns(self._sat_at(t_l)[:, 0], _SAT_COLUMNS)
+        vapor = _columns(self._sat_at(t_v)[:, 1], _SAT_COLUMNS)
+        x = (value - liquid[key]) / (vapor[key] - liquid[key])
+
+        two_phase = (x >= 0) & (x <= 1)
+        if two_phase.any():
+            xs = x[two_phase]
+            values["p"][two_phase] = p[two_phase]
+            values["T"][two_phase] = t_l[two_phase] + xs * (t_v - t_l)[two_phase]
+            values["rho"][two_phase] = 1 / ((1 - xs) / liquid["rho"][two_phase] + xs / vapor["rho"][two_phase])
+            for name in ("h", "s"):
+                values[name][two_phase] = ((1 - xs) * liquid[name][two_phase] + xs * vapor[name][two_phase])
+            values["x"][two_phase] = xs
+
+        superheated = x > 1
+        if superheated.any():
+            column = _VAP_COLUMNS.index(key)
+            row, d = self._isobar(lnp[superheated])
+            position = _solve(row[:, :, column], d[:, :, column], value[superheated])
+            state = _columns(_interp(row, d, position), _VAP_COLUMNS)
+            state["p"] = p[superheated]
+            state["T"] = self._isobar_temperature(t_v[superheated], position)
+            state["x"] = np.ones(len(position))
+            for name in FIELDS:
+                values[name][superheated] = state[name]
+
+        subcooled = x < 0
+        if subcooled.any():
+            ps = p[subcooled]
+            column = _SAT_COLUMNS.index(key)
+            nodes = np.broadcast_to(self._sat[:, :, 0, column], (len(ps), self._ns)).copy()
+            if key == "h":
+                # 节点值加上到查询压力的压力修正
+                sat = self._sat[0, :, 0]
+                nodes += (ps[:, None] - np.exp(sat[:, 0])) * 1e3 / np.exp(sat[:, 1])
+            position = _solve(nodes, _slopes(nodes, axis=1), value[subcooled])
+            state = self._liquid(ps, self._sat_temperature(position))
+            state["x"] = np.zeros(len(ps))
+            for name in FIELDS:
+                values[name][subcooled] = state[name]
+        return values
+
+
+# ---------------------------------------------------------------- 制冷循环
+
+def cycle(name, t_evap, t_cond, superheat=0.0, subcool=0.0, efficiency=1.0):
+    """
+    单级蒸汽压缩制冷循环（温度 K，过热度/过冷度 K）
+    蒸发、冷凝温度均按露点温度确定压力；压缩机出口按等熵焓升 / 等熵效率计算，节流为等焓过程。
+    结果：p_evap, p_cond (MPa)，状态点 T1~T4、h1、h2s、h2、h3、h4、s1、rho1、x4，
+    q_evap 单位制冷量、w 单位压缩功、q_cond 单位排热量 (kJ/kg)，cop，q_vol 单位容积制冷量 (kJ/m³)，
+    glide_evap / glide_cond 温度滑移 (K)。
+    """
+    fluid = load(name)
+    if not 0 < efficiency <= 1:
+        raise ValueError("压缩机等熵效率应在 0 ~ 1 之间")
+    p_evap = fluid.psat(t_evap, dew=True)
+    p_cond = fluid.psat(t_cond, dew=True)
+    evap = fluid.saturated(p=p_evap)
+    cond = fluid.saturated(p=p_cond)
+
+    T1 = t_evap + superheat
+    state1 = fluid.props_pt(p_evap, T1) if superheat > 0 else {
+        "h": evap["h_v"], "s": evap["s_v"], "rho": evap["rho_v"]}
+    state2s = fluid.props_ps(p_cond, state1["s"])
+    h2 = state1["h"] + (state2s["h"] - state1["h"]) / efficiency
+    state2 = fluid.props_ph(p_cond, h2)
+    T3 = cond["T_l"] - subcool
+    h3 = fluid.props_pt(p_cond, T3)["h"] if subcool > 0 else cond["h_l"]
+    state4 = fluid.props_ph(p_evap, h3)
+
+    result = {
+        "p_evap": p_evap, "p_cond": p_cond,
+        "T1": T1, "h1": state1["h"], "s1": state1["s"], "rho1": state1["rho"],
+        "h2s": state2s["h"], "T2": state2["T"], "h2": h2,
+        "T3": T3, "h3": h3,
+        "T4": state4["T"], "h4": h3, "x4": state4["x"],
+        "glide_evap": evap["glide"], "glide_cond": cond["glide"],
+    }
+    if not all(np.isfinite(v) for v in result.values()):
+        raise ValueError(f"{name} 循环状态点超出物性表范围"
+                         f"（饱和温度 {fluid.t_min - 273.15:.0f} ~ {fluid.t_top - 273.15:.0f} °C，"
+                         f"排气温度不超过 {fluid.t_hi - 273.15:.0f} °C）")
+    result["q_evap"] = result["h1"] - h3
+    result["w"] = h2 - result["h1"]
+    result["q_cond"] = h2 - h3
+    result["cop"] = result["q_evap"] / result["w"]
+    result["q_vol"] = result["q_evap"] * result["rho1"]
+    return result
+
+
+# ---------------------------------------------------------------- 表文件生成（需要 CoolProp）
+
+def _coolprop_state(CP, state, inputs, a, b, phase=None):
+    """逐点计算 CoolProp 物性，返回 (N, 9) 的饱和表列；失败的点（多为输运性质）记为 NaN"""
+    out = np.full((len(a), len(_SAT_COLUMNS)), np.nan)
+    getters = (lambda: np.log(state.p() / 1e6), lambda: np.log(state.rhomass()),
+               lambda: state.hmass() / 1e3, lambda: state.smass() / 1e3,
+               lambda: state.cpmass() / 1e3, lambda: state.cvmass() / 1e3,
+               state.speed_sound, state.viscosity, state.conductivity)
+    if phase is not None:
+        state.specify_phase(phase)
+    for i, (ai, bi) in enumerate(zip(a, b)):
+        try:
+            state.update(inputs, ai, bi)
+        except ValueError:
+            continue
+        for j, getter in enumerate(getters):
+            try:
+                out[i, j] = getter()
+            except ValueError:
+                pass
+    state.unspecify_phase()
+    return out
+
+
+def _fill_gaps(table, axis):
+    """
+    CoolProp 的对应态输运模型在个别状态点求解失败，表中两侧都有值的内部空缺沿 axis 方向线性插补；
+    端部的连续空缺（多为低温段）保留 NaN，查询结果也为 NaN。
+    """
+    table = np.moveaxis(table, axis, -1)
+    flat = table.reshape(-1, table.shape[-1])
+    nodes = np.arange(flat.shape[1])
+    for line in flat:
+        good = np.isfinite(line)
+        if good.sum() < 2:
+            continue
+        first, last = np.flatnonzero(good)[[0, -1]]
+        gap = ~good & (nodes > first) & (nodes < last)
+        line[gap] = np.interp(nodes[gap], nodes[good], line[good])
+    return np.moveaxis(flat.reshape(table.shape), -1, axis)
+
+
+def build(name, directory=_DATA_DIR):
+    """用 CoolProp 生成一种制冷剂的表文件"""
+    import CoolProp
+    import CoolProp.CoolProp as CP
+
+    fluid = FLUIDS[table_name(name)]
+    if fluid != "Water":
+        CP.set_reference_state(fluid, "IIR")
+    state = CoolProp.AbstractState("HEOS", fluid)
+    tc, pc = state.T_critical(), state.p_critical() / 1e6
+    mw = state.molar_mass() * 1e3
+    t_min = max(state.Tmin() + 0.5, T_FLOOR)
+    t_top = tc - T_GAP
+    t_hi = min(state.Tmax(), tc + SUPERHEAT_SPAN)
+
+    u = np.linspace(0, 1, NS)
+    T = t_min + (t_top - t_min) * (1 - (1 - u) ** 2)
+    sat = np.stack([_coolprop_state(CP, state, CoolProp.QT_INPUTS, np.full(NS, q), T)
+                    for q in (0.0, 1.0)], axis=1)
+    sat = _fill_gaps(sat, axis=0).astype(np.float32)
+
+    # 等压线上的温度用与查询时相同的露点温度样条确定，ξ = 0 节点直接取饱和表的露点蒸汽，保证与饱和线一致
+    lnp_lo, lnp_hi = float(sat[0, 1, 0]), float(sat[-1, 1, 0])
+    meta = np.array([tc, pc, mw, t_min, t_top, t_hi, lnp_lo, lnp_hi])
+    saturation = Refrigerant(name, {"meta": meta, "sat": sat})
+    lnp = np.linspace(lnp_lo, lnp_hi, NP)
+    t_d = saturation._tsat(lnp, 1)
+    xi = np.linspace(0, 1, NX)
+    vap = np.empty((NP, NX, len(_VAP_COLUMNS)))
+    vap[:, 0] = saturation._sat_at(t_d)[:, 1, 1:]
+    for j in range(NP):
+        p = np.exp(lnp[j]) * 1e6
+        T = t_d[j] + xi[1:] ** 2 * (t_hi - t_d[j])
+        vap[j, 1:] = _coolprop_state(CP, state, CoolProp.PT_INPUTS, np.full(NX - 1, p), T,
+                                     phase=CoolProp.iphase_gas)[:, 1:]
+
+    vap = _fill_gaps(vap, axis=1)
+
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{table_name(name)}.npz")
+    np.savez_compressed(path, meta=meta, sat=sat, vap=vap.astype(np.float32))
+    missing = int(np.isnan(sat).sum() + np.isnan(vap).sum())
+    print(f"[refrigerant] {name}: {path}" + (f"（{missing} 个值缺失）" if missing else ""))
+    return path
+
+
+if __name__ == "__main__":
+    for _name in sys.argv[1:] or FLUIDS:
+        build(_name)
@@ -0,0 +1,246 @@
+# CalcE/thermo/steam_line.py
+"""
+蒸汽管道沿程自适应积分（压力、温度、干度沿管长的分布）
+
+- 以压力 p (MPa) 和比焓 h (kJ/kg) 为状态量沿管长 z 积分：
+      dp/dz = -f / D · G² / (2ρ) · 1e-6      Darcy-Weisbach 摩擦压降，G 为质量流速 kg/(m²·s)
+      dh/dz = -q' / (m · 1000)               散热损失，q' 为单位管长热损失 W/m
+  温度、干度、密度由 IF97 (p, h) 状态求得（按 steam_table 的计算模式，查表模式下用预计算网格）。
+  蒸汽降到饱和后温度停在饱和温度，散热转为冷凝、干度下降；两相段按均相流计算（密度取混合密度，
+  粘度按 McAdams 干度加权）。
+- 积分器为 Bogacki–Shampine 3(2) 嵌入式 Runge-Kutta，按局部误差自动调整步长：短管通常一步
+  走完，长管按需要分步，冷凝起点附近物性斜率突变处自动加密。
+- 所有输入可为数组（按广播规则组合），每个通道（一个流量或一条管道）独立控制步长、同时推进，
+  一次调用即可计算多个流量或多条管道。
+- 单位：压力 MPa，比焓 kJ/kg，温度 K（环境温度 °C），长度 m，质量流量 kg/s。
+"""
+import math
+
+import numpy as np
+
+from . import if97, steam_table
+
+# 误差控制：压力绝对容差 1 Pa，比焓绝对容差 0.001 kJ/kg
+RTOL = 1e-6
+ATOL_P = 1e-6
+ATOL_H = 1e-3
+
+# 压力低于此值视为管道压降过大（蒸汽压力耗尽）
+P_MIN = 1e-3
+
+# 管壁热阻按 1 mm 钢管、导热系数 50 W/(m·K) 计；无保温时外表面换热系数取 10 W/(m²·K)
+WALL_THICKNESS = 0.001
+WALL_CONDUCTIVITY = 50.0
+BARE_HTC = 10.0
+
+MAX_ITERATIONS = 100000
+
+# Bogacki–Shampine 3(2) 系数
+_B = (2 / 9, 1 / 3, 4 / 9)
+_E = (-5 / 72, 1 / 12, 1 / 9, -1 / 8)
+
+
+def friction_factor(reynolds, diameter, roughness):
+    """Darcy 摩擦系数：层流 64/Re，湍流按 Swamee-Jain 公式"""
+    reynolds = np.asarray(reynolds, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        laminar = 64 / reynolds
+        turbulent = 0.25 / np.log10(np.asarray(roughness) / np.asarray(diameter) / 3.7
+                                    + 5.74 / reynolds ** 0.9) ** 2
+    f = np.where(reynolds < 2300, laminar, turbulent)
+    return float(f) if f.ndim == 0 else f
+
+
+def heat_loss_coefficient(diameter, insulation_thickness, insulation_conductivity):
+    """单位管长散热系数 W/(m·K)：q' = 系数 × (T - 环境温度)"""
+    diameter, thickness, conductivity = np.broadcast_arrays(
+        *(np.asarray(v, dtype=float) for v in (diameter, insulation_thickness, insulation_conductivity)))
+    inner = diameter / 2
+    insulated = thickness > 0
+    outer = inner + np.where(insulated, thickness, 1.0)
+    r_wall = np.log((inner + WALL_THICKNESS) / inner) / (2 * math.pi * WALL_CONDUCTIVITY)
+    r_insulation = np.log(outer / inner) / (2 * math.pi * np.where(insulated, conductivity, 1.0))
+    return np.where(insulated, 1 / (r_wall + r_insulation), 2 * math.pi * inner * BARE_HTC)
+
+
+class LineResult:
+    """
+    沿程积分结果。出口量为与输入广播形状相同的数组，全部输入为标量时为 float：
+    p_out 出口压力 MPa，h_out 出口比焓，T_out 出口温度 K，x_out 出口干度，rho_out 出口密度，
+    velocity_out 出口流速 m/s，reynolds_out 出口雷诺数，heat_loss 总热损失 kW，
+    condensation_at 开始冷凝的位置 m（未冷凝为 NaN），ok 是否算到管道末端，
+    failed_at 压力耗尽或无法收敛的位置 m（正常为 NaN），steps 接受的积分步数，
+    first_step 第一个接受步的步长 m（相近工况再次积分时可作为 march 的 first_step）。
+    沿程分布用 profile(index) 取得。
+    """
+
+    _OUTLETS = ("p_out", "h_out", "T_out", "x_out", "rho_out", "velocity_out", "reynolds_out",
+                "heat_loss", "condensation_at", "ok", "failed_at", "steps", "first_step")
+
+    def __init__(self, shape, outlets, nodes, offsets, flux, mass_flow):
+        self.shape = shape
+        for name in self._OUTLETS:
+            value = outlets[name].reshape(shape)
+            setattr(self, name, value.item() if shape == () else value)
+        # 沿程节点按通道排序后连续存放，第 i 个通道为 offsets[i]:offsets[i + 1]
+        self._nodes = nodes
+        self._offsets = offsets
+        self._flux = flux
+        self._mass_flow = mass_flow
+
+    def profile(self, index=()):
+        """
+        第 index 个通道的沿程分布（标量输入时不需要 index），返回 名称 → 数组 的字典：
+        z 位置 m，p，T，h，x，rho，velocity，reynolds，heat_loss（自入口累计热损失 kW）。
+        index 为整数（一维输入）或各维下标组成的元组
+        """
+        index = (index,) if np.ndim(index) == 0 else tuple(index)
+        lane = np.ravel_multi_index(index, self.shape) if self.shape else 0
+        rows = slice(self._offsets[lane], self._offsets[lane + 1])
+        profile = {name: column[rows] for name, column in self._nodes.items()}
+        profile["velocity"] = self._flux[lane] / profile["rho"]
+        profile["heat_loss"] = self._mass_flow[lane] * (profile["h"][0] - profile["h"])
+        return profile
+
+
+class _Line:
+    """积分过程中各通道的管道参数（已广播、展平）"""
+
+    def __init__(self, mass_flow, diameter, roughness, ua, ambient_temp):
+        self.mass_flow = mass_flow
+        self.diameter = diameter
+        self.roughness = roughness
+        self.ua = ua
+        self.ambient = ambient_temp + 273.15
+        self.flux = mass_flow / (math.pi * diameter ** 2 / 4)
+
+    def rhs(self, lanes, p, h):
+        """各通道在 (p, h) 处的 dp/dz、dh/dz 及该点的 T、x、ρ、Re"""
+        state = steam_table.props_ph(p, h)
+        T, x, rho = state.T, state.x, state.rho
+        mu = np.array(state.mu)
+        wet = (state.region == 4) & (x < 1)
+        if wet.any():
+            # 两相段：饱和液/汽粘度按干度调和平均（McAdams）
+            mu_l, mu_g = if97.saturation_viscosity(T[wet])
+            mu[wet] = 1 / (x[wet] / mu_g + (1 - x[wet]) / mu_l)
+        flux = self.flux[lanes]
+        diameter = self.diameter[lanes]
+        reynolds = flux * diameter / mu
+        f = friction_factor(reynolds, diameter, self.roughness[lanes])
+        dp = -f / diameter * flux ** 2 / (2 * rho) * 1e-6
+        dh = -self.ua[lanes] * (T - self.ambient[lanes]) / (self.mass_flow[lanes] * 1000)
+        return dp, dh, T, x, rho, reynolds
+
+
+def march(mass_flow, p_in, h_in, length, diameter, roughness,
+          insulation_thickness, insulation_conductivity, ambient_temp,
+          rtol=RTOL, max_step=None, first_step=None):
+    """
+    沿管长积分蒸汽状态，返回 LineResult。
+    mass_flow 质量流量 kg/s，p_in 入口压力 MPa，h_in 入口比焓 kJ/kg，length 管长 m，
+    diameter 内径 m，roughness 绝对粗糙度 m，insulation_thickness 保温厚度 m（0 为裸管），
+    insulation_conductivity 保温导热系数 W/(m·K)，ambient_temp 环境温度 °C。
+    max_step 限制最大步长（需要更密的沿程分布时使用），默认不限制。
+    first_step 各通道的初始试探步长 m（可为数组，如上一次相近工况积分结果的 first_step），
+    默认取整个管长；迭代求解中反复积分同一批管道时用它跳过开头的试探和拒绝步。
+    """
+    inputs = np.broadcast_arrays(*(np.asarray(v, dtype=float) for v in (
+        mass_flow, p_in, h_in, length, diameter, roughness,
+        insulation_thickness, insulation_conductivity, ambient_temp)))
+    shape = inputs[0].shape
+    m, p, h, L, D, rough, thickness, conductivity, ambient = (v.ravel().copy() for v in inputs)
+    n = m.size
+    line = _Line(m, D, rough, heat_loss_coefficient(D, thickness, conductivity), ambient)
+    max_step = np.inf if max_step is None else float(max_step)
+
+    z = np.zeros(n)
+    step = np.minimum(L, max_step)
+    if first_step is not None:
+        guess = np.broadcast_to(np.asarray(first_step, dtype=float), shape).ravel()
+        step = np.where(np.isfinite(guess) & (guess > 0), np.minimum(guess, step), step)
+    taken = np.full(n, np.nan)
+    condensation_at = np.full(n, np.nan)
+    failed_at = np.full(n, np.nan)
+    steps = np.zeros(n, dtype=int)
+
+    lanes = np.arange(n)
+    with np.errstate(invalid="ignore", divide="ignore", over="ignore"):
+        k1p, k1h, T, x, rho, reynolds = line.rhs(lanes, p, h)
+    # 沿程节点：每个接受步记录 (通道, z, p, h, T, x, ρ, Re)
+    nodes = [(lanes, z.copy(), p.copy(), h.copy(), T, x, rho, reynolds)]
+    x_node = x.copy()
+    failed_at[~np.isfinite(k1p + k1h)] = 0.0
+    active = lanes[np.isfinite(k1p + k1h) & (L > 0)]
+
+    for _ in range(MAX_ITERATIONS):
+        if active.size == 0:
+            break
+        a = active
+        ds = np.minimum(step[a], L[a] - z[a])
+        pa, ha, k1pa, k1ha = p[a], h[a], k1p[a], k1h[a]
+        with np.errstate(invalid="ignore", divide="ignore", over="ignore"):
+            k2p, k2h, *_ = line.rhs(a, pa + ds / 2 * k1pa, ha + ds / 2 * k1ha)
+            k3p, k3h, *_ = line.rhs(a, pa + 3 * ds / 4 * k2p, ha + 3 * ds / 4 * k2h)
+            p_new = pa + ds * (_B[0] * k1pa + _B[1] * k2p + _B[2] * k3p)
+            h_new = ha + ds * (_B[0] * k1ha + _B[1] * k2h + _B[2] * k3h)
+            k4p, k4h, T, x, rho, reynolds = line.rhs(a, p_new, h_new)
+            err_p = ds * (_E[0] * k1pa + _E[1] * k2p + _E[2] * k3p + _E[3] * k4p)
+            err_h = ds * (_E[0] * k1ha + _E[1] * k2h + _E[2] * k3h + _E[3] * k4h)
+            err = np.maximum(np.abs(err_p) / (ATOL_P + rtol * np.maximum(np.abs(pa), np.abs(p_new))),
+                             np.abs(err_h) / (ATOL_H + rtol * np.maximum(np.abs(ha), np.abs(h_new))))
+            err = np.where(np.isfinite(err) & np.isfinite(k4p + k4h), err, np.inf)
+            factor = np.clip(0.9 * err ** (-1 / 3), 0.2, 5.0)
+
+        accepted = err <= 1
+        if accepted.any():
+            acc = a[accepted]
+            # 冷凝起点：干度由 1 降到 1 以下的一步内，按 h - h''(p) 线性插值定位
+            onset = accepted & np.isnan(condensation_at[a]) & (x_node[a] >= 1) & (x < 1)
+            if onset.any():
+                hg_old, hg_new = steam_table.props_px(np.stack([pa[onset], p_new[onset]]), 1.0).h
+                g_old = np.maximum(ha[onset] - hg_old, 0.0)
+                g_new = h_new[onset] - hg_new
+                fraction = np.where(g_old > g_new, g_old / (g_old - g_new), 0.0)
+                condensation_at[a[onset]] = z[a[onset]] + np.clip(fraction, 0.0, 1.0) * ds[onset]
+
+            opening = accepted & (steps[a] == 0)
+            taken[a[opening]] = ds[opening]
+            z[acc] += ds[accepted]
+            p[acc], h[acc] = p_new[accepted], h_new[accepted]
+            k1p[acc], k1h[acc] = k4p[accepted], k4h[accepted]     # FSAL：末点导数即下一步首点导数
+            x_node[acc] = x[accepted]
+            steps[acc] += 1
+            nodes.append((acc, z[acc], p[acc], h[acc], T[accepted], x[accepted],
+                          rho[accepted], reynolds[accepted]))
+
+        step[a] = np.minimum(ds * factor, max_step)
+
+        # 压力耗尽或步长缩到无法推进的通道终止
+        exhausted = accepted & (p_new < P_MIN)
+        stalled = ~accepted & (ds < 1e-9 * L[a])
+        failed_at[a[exhausted | stalled]] = z[a[exhausted | stalled]]
+        done = accepted & (z[a] >= L[a] * (1 - 1e-12))
+        active = a[~(done | exhausted | stalled)]
+    else:
+        failed_at[active] = z[active]
+
+    # 整理各通道的沿程分布：按通道稳定排序，首尾节点即入口、出口
+    columns = [np.concatenate(column) for column in zip(*nodes)]
+    order = np.argsort(columns[0], kind="stable")
+    offsets = np.r_[0, np.cumsum(np.bincount(columns[0], minlength=n))]
+    names = ("z", "p", "h", "T", "x", "rho", "reynolds")
+    profiles = {name: column[order] for name, column in zip(names, columns[1:])}
+    first, last = offsets[:-1], offsets[1:] - 1
+
+    ok = np.isnan(failed_at)
+    nan = np.where(ok, 1.0, np.nan)
+    outlet = {name: column[last] * nan for name, column in profiles.items()}
+    outlets = {
+        "p_out": outlet["p"], "h_out": outlet["h"], "T_out": outlet["T"], "x_out": outlet["x"],
+        "rho_out": outlet["rho"], "velocity_out": line.flux / outlet["rho"], "reynolds_out": outlet["reynolds"],
+        "heat_loss": m * (profiles["h"][first] - outlet["h"]),
+        "condensation_at": condensation_at, "ok": ok, "failed_at": failed_at, "steps": steps,
+        "first_step": taken,
+    }
+    return LineResult(shape, outlets, profiles, offsets, line.flux, m)
@@ -0,0 +1,436 @@
+# CalcE/thermo/steam_network.py
+"""
+蒸汽管网稳态计算：一个或多个汽源经长度、管径、保温各不相同的管段向多个用户供汽
+
+- 节点分三类：汽源（给定压力、温度）、用户（给定用汽量）、节点（分支/汇合点，用汽量为 0）。
+- 管段按 steam_line 沿程积分计算压降、散热和冷凝；流量可以反向（环状管网）。
+- 未知量为非汽源节点的压力和各管段流量，方程为节点质量守恒和管段压降方程，用稀疏牛顿法
+  联立求解。管段压降对流量、入口压力的偏导数用差分求得：两个扰动点放在同一次向量化积分中，
+  只在线搜索接受的点上计算；线搜索的试探点只积分基准通道，并以上次积分的首步长热启动。
+- 节点比焓由流入管段的出口比焓按流量混合，每次迭代解一个稀疏线性方程组，与牛顿迭代同时收敛。
+- |流量| < MIN_FLOW 的管段（死端、零用汽量支路、环网中的闲置管段）视为停滞，不做沿程积分：
+  压降按层流闭式计算，无散热，出口状态取上游状态；只连着停滞管段的节点比焓取相邻节点的值。
+- read_table 解析 CSV/TSV 文本表格（第一行为表头），节点表和管段表的列见 NODE_COLUMNS、PIPE_COLUMNS。
+- 单位：压力 MPa（绝压），温度 °C，用汽量 t/h，长度 m，管径/粗糙度/保温厚度 mm。
+"""
+import csv
+
+import numpy as np
+from scipy import sparse
+from scipy.sparse.linalg import splu, spsolve
+
+from . import if97, steam_line, steam_table
+from .property_service import service
+
+SOURCE, CONSUMER, JUNCTION = "汽源", "用户", "节点"
+
+# 表格列名：(列名, 缺省值)，缺省值为 None 的列必须填写
+NODE_COLUMNS = (("节点", None), ("类型", None), ("压力_MPa", ""), ("温度_C", ""), ("用汽量_t/h", ""))
+PIPE_COLUMNS = (("管段", None), ("起点", None), ("终点", None), ("长度_m", None), ("内径_mm", None),
+                ("粗糙度_mm", "0.2"), ("保温厚度_mm", "0"), ("保温导热系数_W_mK", "0.04"),
+                ("环境温度_C", "20"))
+
+# 收敛判据：管段压降方程残差 10 Pa，节点质量守恒残差为总用汽量的 1e-6，节点比焓变化 0.1 kJ/kg（约 0.05 K）
+TOL_PRESSURE = 1e-5
+TOL_MASS = 1e-6
+TOL_ENTHALPY = 0.1
+MAX_ITERATIONS = 30
+MAX_HALVINGS = 8
+# 试探点残差在容差的 NORM_ACCEPT 倍以内时直接接受：接近收敛时基准残差是按旧比焓、较松容差算的，
+# 要求试探点严格下降会把可用的牛顿步一路减半
+NORM_ACCEPT = 100
+
+# 管段积分的相对容差（约 10 Pa，与 TOL_PRESSURE 同量级）；残差大时按残差放宽，最多放宽 100 倍
+RTOL = 1e-5
+RTOL_LOOSE = 1e-3
+
+# 差分求导的相对扰动；|流量| 小于 MIN_FLOW 的管段视为停滞，按层流闭式计算
+DIFF_STEP = 1e-2
+MIN_FLOW = 1e-4
+# 只连着停滞管段的节点：比焓方程中保留上次值的权重，保证方程组非奇异
+STAGNANT_ANCHOR = 1e-6
+
+# 初始流量估算的最多迭代轮数（只解稀疏线性方程组，不调用物性）
+INITIAL_SWEEPS = 20
+
+
+def read_table(text):
+    """解析 CSV/TSV 文本表格（第一行为表头），返回 表头 → 文本 的行字典列表；空行和 # 开头的行忽略"""
+    lines = [line for line in text.splitlines() if line.strip() and not line.lstrip().startswith("#")]
+    if not lines:
+        return []
+    header = lines[0]
+    delimiter = next((sep for sep in ("\t", ",", ";") if sep in header), ",")
+    reader = csv.reader(lines, delimiter=delimiter)
+    names = [name.strip() for name in next(reader)]
+    return [dict(zip(names, (field.strip() for field in row))) for row in reader]
+
+
+def _column(rows, table, name, default, number=True):
+    """取一列并转换为数值，缺失或格式错误时给出行号"""
+    values = []
+    for i, row in enumerate(rows, start=2):
+        text = row.get(name, "") or (default or "")
+        if not text and default is None:
+            raise ValueError(f"{table}第 {i} 行缺少“{name}”")
+        if not number:
+            values.append(text)
+            continue
+        try:
+            values.append(float(text) if text else np.nan)
+        except ValueError:
+            raise ValueError(f"{table}第 {i} 行“{name}”不是数值: {text}") from None
+    return np.array(values, dtype=float if number else object)
+
+
+class _PipeStates:
+    """
+    各管段在给定流量、上游状态下的出口状态（数组按管段表顺序）。有流量的管段用 steam_line.march
+    积分；停滞管段不积分：压降按层流 ΔP = 128μLm/(πρD⁴)，resistance 为 ΔP/m，无散热，出口状态同上游
+    """
+
+    def __init__(self, network, mass_flow, p_up, h_up, rtol, first_step=None):
+        e = mass_flow.size
+        moving = mass_flow >= MIN_FLOW
+        lanes = np.flatnonzero(moving)
+        self.moving = moving
+        self.lanes = lanes
+        self.line = steam_line.march(
+            mass_flow[lanes], p_up[lanes], h_up[lanes], network.length[lanes], network.diameter[lanes],
+            network.roughness[lanes], network.insulation_thickness[lanes],
+            network.insulation_conductivity[lanes], network.ambient_temp[lanes],
+            rtol=rtol, first_step=None if first_step is None else first_step[lanes])
+        self.ok = bool(self.line.ok.all())
+
+        state = steam_table.props_ph(p_up, h_up)
+        area = np.pi * network.diameter ** 2 / 4
+        self.resistance = np.where(moving, 0.0, 128 * state.mu * network.length
+                                   / (np.pi * state.rho * network.diameter ** 4) * 1e-6)
+        self.p_in = p_up
+        self.h_in = h_up
+        self.p_out = p_up - self.resistance * mass_flow
+        self.h_out = h_up.copy()
+        self.T_out = np.array(state.T, dtype=float)
+        self.x_out = np.array(state.x, dtype=float)
+        self.rho_out = np.array(state.rho, dtype=float)
+        self.reynolds_out = mass_flow / area * network.diameter / state.mu
+        self.heat_loss = np.zeros(e)
+        self.condensation_at = np.full(e, np.nan)
+        self.first_step = np.full(e, np.nan)
+        for name in ("p_out", "h_out", "T_out", "x_out", "rho_out", "reynolds_out", "heat_loss",
+                     "condensation_at", "first_step"):
+            getattr(self, name)[lanes] = getattr(self.line, name)
+        self.velocity_out = mass_flow / area / self.rho_out
+        self._length = network.length
+
+    def profile(self, edge):
+        """第 edge 个管段的沿程分布（见 steam_line.LineResult.profile）；停滞管段只有首尾两点"""
+        if self.moving[edge]:
+            return self.line.profile((np.searchsorted(self.lanes, edge),))
+        ends = np.ones(2)
+        return {"z": np.array([0.0, self._length[edge]]), "p": np.array([self.p_in[edge], self.p_out[edge]]),
+                "T": self.T_out[edge] * ends, "h": self.h_in[edge] * ends, "x": self.x_out[edge] * ends,
+                "rho": self.rho_out[edge] * ends, "velocity": self.velocity_out[edge] * ends,
+                "reynolds": self.reynolds_out[edge] * ends, "heat_loss": np.zeros(2)}
+
+
+class NetworkResult:
+    """
+    管网计算结果（数组按节点表、管段表的行顺序）
+    节点：node_p 压力 MPa，node_t 温度 °C，node_h 比焓，node_x 干度
+    管段：flow 流量 kg/s（与起点→终点方向相反时为负），upstream/downstream 实际流向的上、下游节点名，
+         p_in/p_out 上、下游端压力，t_in/t_out 温度 °C，x_out 出口干度，pressure_drop 压降 MPa，
+         heat_loss 散热量 kW，velocity 出口流速 m/s，condensation_at 自上游端起开始冷凝的位置 m（未冷凝 NaN）
+    iterations 牛顿迭代次数。管段沿程分布用 profile(edge) 取得。
+    """
+
+    def __init__(self, network, line, node_p, node_h, flow, iterations):
+        # line 为最后一次计算的各管段出口状态（_PipeStates）
+        self.network = network
+        self.iterations = iterations
+        self.node_p = node_p
+        self.node_h = node_h
+        nodes = if97.props_ph(node_p, node_h)
+        self.node_t = nodes.T - 273.15
+        self.node_x = nodes.x
+
+        forward = flow >= 0
+        up = np.where(forward, network.start, network.end)
+        down = np.where(forward, network.end, network.start)
+        names = network.node_names
+        self.flow = flow
+        self.upstream = names[up]
+        self.downstream = names[down]
+        self.p_in = node_p[up]
+        self.p_out = line.p_out
+        self.t_in = self.node_t[up]
+        self.t_out = line.T_out - 273.15
+        self.x_out = line.x_out
+        self.pressure_drop = self.p_in - self.p_out
+        self.heat_loss = line.heat_loss
+        self.velocity = line.velocity_out
+        self.condensation_at = line.condensation_at
+        self._line = line
+
+    def profile(self, edge):
+        """第 edge 个管段自上游端起的沿程分布（见 steam_line.LineResult.profile）"""
+        return self._line.profile(edge)
+
+
+class SteamNetwork:
+    """
+    蒸汽管网。nodes、pipes 为行字典列表（列名见 NODE_COLUMNS、PIPE_COLUMNS，可由 read_table 得到）。
+    构造时检查节点类型、管段端点和连通性，solve() 求解稳态。
+    """
+
+    def __init__(self, nodes, pipes):
+        if not nodes or not pipes:
+            raise ValueError("节点表和管段表都不能为空")
+        self.node_names = _column(nodes, "节点表", "节点", None, number=False)
+        kinds = _column(nodes, "节点表", "类型", None, number=False)
+        index = {}
+        for i, name in enumerate(self.node_names):
+            if name in index:
+                raise ValueError(f"节点名重复: {name}")
+            index[name] = i
+            if kinds[i] not in (SOURCE, CONSUMER, JUNCTION):
+                raise ValueError(f"节点 {name} 的类型应为 {SOURCE}/{CONSUMER}/{JUNCTION}: {kinds[i]}")
+        self.source = kinds == SOURCE
+        if not self.source.any():
+            raise ValueError("管网中至少需要一个汽源")
+
+        pressure = _column(nodes, "节点表", "压力_MPa", "")
+        temperature = _column(nodes, "节点表", "温度_C", "")
+        for i in np.flatnonzero(self.source & ~(np.isfinite(pressure) & np.isfinite(temperature))):
+            raise ValueError(f"汽源 {self.node_names[i]} 需要给定压力和温度")
+        self.source_p = pressure[self.source]
+        self.source_h = np.array([service.get("water", t + 273.15, p, "vapor")["h"]
+                                  for p, t in zip(self.source_p, temperature[self.source])])
+        if np.isnan(self.source_h).any():
+            raise ValueError("汽源压力、温度超出 IAPWS-IF97 适用范围")
+        demand = _column(nodes, "节点表", "用汽量_t/h", "")
+        self.demand = np.where((kinds == CONSUMER) & np.isfinite(demand), demand, 0.0) / 3.6   # kg/s
+
+        self.pipe_names = _column(pipes, "管段表", "管段", None, number=False)
+        ends = []
+        for name in ("起点", "终点"):
+            column = _column(pipes, "管段表", name, None, number=False)
+            for pipe, node in zip(self.pipe_names, column):
+                if node not in index:
+                    raise ValueError(f"管段 {pipe} 的{name}“{node}”不在节点表中")
+            ends.append(np.array([index[node] for node in column], dtype=np.intp))
+        self.start, self.end = ends
+        if (self.start == self.end).any():
+            raise ValueError(f"管段 {self.pipe_names[np.argmax(self.start == self.end)]} 的起点和终点相同")
+        columns = {name: _column(pipes, "管段表", name, default) for name, default in PIPE_COLUMNS[3:]}
+        self.length = columns["长度_m"]
+        self.diameter = columns["内径_mm"] / 1000
+        self.roughness = columns["粗糙度_mm"] / 1000
+        self.insulation_thickness = columns["保温厚度_mm"] / 1000
+        self.insulation_conductivity = columns["保温导热系数_W_mK"]
+        self.ambient_temp = columns["环境温度_C"]
+        if (self.length <= 0).any() or (self.diameter <= 0).any():
+            raise ValueError("管段长度和内径必须大于 0")
+
+        n, e = len(self.node_names), len(self.pipe_names)
+        # 关联矩阵：管段流出起点为 -1，流入终点为 +1
+        self.incidence = sparse.csr_matrix(
+            (np.r_[-np.ones(e), np.ones(e)], (np.r_[self.start, self.end], np.r_[np.arange(e), np.arange(e)])),
+            shape=(n, e))
+        self.unknown = np.flatnonzero(~self.source)
+        self._check_connected()
+
+    def _check_connected(self):
+        """每个节点都要与某个汽源连通，否则方程组奇异"""
+        n = len(self.node_names)
+        adjacency = sparse.csr_matrix((np.ones(2 * self.start.size),
+                                       (np.r_[self.start, self.end], np.r_[self.end, self.start])), shape=(n, n))
+        reached = self.source.copy()
+        frontier = reached.copy()
+        while frontier.any():
+            frontier = (adjacency @ frontier.astype(float) > 0) & ~reached
+            reached |= frontier
+        if not reached.all():
+            names = "、".join(self.node_names[~reached][:5])
+            raise ValueError(f"以下节点与汽源不连通: {names}")
+
+    # ------------------------------------------------------------ 求解
+
+    def _initial_flow(self):
+        """
+        按平方阻力律 ΔP ∝ L·m|m|/D^5 估算初始流量，满足节点质量守恒，树状管网即为精确流量。
+        从线性化阻力（导纳 ∝ D^5/L）出发，每轮按当前流量线性化后解一次稀疏方程组（牛顿迭代），
+        环状管网的环流由此接近实际分配，避免第一步牛顿迭代大幅超调。
+        """
+        u = self.unknown
+        base = self.diameter ** 5 / self.length
+        flow = np.zeros(self.length.size)
+        conductance = base
+        for _ in range(INITIAL_SWEEPS):
+            # ΔP = r·m|m| 在 m0 处线性化：m = ΔP/(2r|m0|) + m0/2
+            laplacian = (self.incidence @ sparse.diags(conductance) @ self.incidence.T).tocsc()
+            potential = np.zeros(len(self.node_names))
+            potential[u] = spsolve(laplacian[u][:, u], (self.incidence @ flow / 2 - self.demand)[u])
+            previous, flow = flow, flow / 2 - conductance * (self.incidence.T @ potential)
+            if np.max(np.abs(flow - previous)) <= 1e-3 * np.max(np.abs(flow), initial=MIN_FLOW):
+                break
+            conductance = base / np.maximum(np.abs(flow), MIN_FLOW)
+        return flow
+
+    def _evaluate(self, p, h, flow, rtol, first_step=None):
+        """给定节点压力、比焓和管段流量，计算各管段，返回残差、上游节点和出口状态；有管段算不通时返回 None"""
+        forward = flow >= 0
+        up = np.where(forward, self.start, self.end)
+        line = _PipeStates(self, np.abs(flow), p[up], h[up], rtol, first_step)
+        if not line.ok:
+            return None
+        sign = np.where(forward, 1.0, -1.0)
+        residual = np.r_[(self.incidence @ flow)[self.unknown] - self.demand[self.unknown],
+                         p[self.start] - p[self.end] - sign * (p[up] - line.p_out)]
+        return residual, up, line
+
+    def _derivatives(self, p, h, flow, rtol, up, line):
+        """
+        差分求管段压降对流量、上游压力的偏导数：有流量管段的两组扰动通道放在一次向量化积分中，
+        以基准积分的首步长热启动；停滞管段按层流压降取解析值（对压力的偏导忽略）
+        """
+        lanes = line.lanes
+        m = np.abs(flow[lanes])
+        p_up, h_up = p[up[lanes]], h[up[lanes]]
+        # 流量向小扰动（压降只会变小，基准可算则扰动点必可算），压力向大扰动
+        tile = lambda v: np.tile(v[lanes], 2)
+        perturbed = steam_line.march(
+            np.r_[m * (1 - DIFF_STEP), m], np.r_[p_up, p_up * (1 + DIFF_STEP)], np.tile(h_up, 2),
+            tile(self.length), tile(self.diameter), tile(self.roughness),
+            tile(self.insulation_thickness), tile(self.insulation_conductivity), tile(self.ambient_temp),
+            rtol=rtol, first_step=tile(line.first_step))
+        if not perturbed.ok.all():
+            raise ValueError("管网求解失败：部分管段压降过大（蒸汽压力耗尽），请检查管径和用汽量")
+        k = lanes.size
+        p_out = line.p_out[lanes]
+        d_flow = line.resistance.copy()
+        d_pressure = np.zeros(flow.size)
+        d_flow[lanes] = (perturbed.p_out[:k] - p_out) / (m * DIFF_STEP)
+        d_pressure[lanes] = ((p_up * (1 + DIFF_STEP) - perturbed.p_out[k:]) - (p_up - p_out)) / (p_up * DIFF_STEP)
+        return d_flow, d_pressure
+
+    def _jacobian(self, flow, d_flow, d_pressure, up):
+        """未知量 [非汽源节点压力, 管段流量] 的稀疏雅可比矩阵"""
+        e = flow.size
+        u = self.unknown
+        column = np.full(len(self.node_names), -1)
+        column[u] = np.arange(u.size)
+        sign = np.where(flow >= 0, 1.0, -1.0)
+        edges = np.arange(e)
+        rows, cols, vals = [], [], []
+        # 质量守恒行：对流量的偏导为关联矩阵
+        incidence = self.incidence[u].tocoo()
+        rows.append(incidence.row)
+        cols.append(u.size + incidence.col)
+        vals.append(incidence.data)
+        # 压降方程行：p_起点 - p_终点 - sign·ΔP(|m|, p_上游, h_上游)
+        for node, value in ((self.start, np.ones(e)), (self.end, -np.ones(e)), (up, -sign * d_pressure)):
+            known = column[node] >= 0
+            rows.append(u.size + edges[known])
+            cols.append(column[node][known])
+            vals.append(value[known])
+        rows.append(u.size + edges)
+        cols.append(u.size + edges)
+        vals.append(-d_flow)
+        size = u.size + e
+        return sparse.csc_matrix((np.concatenate(vals), (np.concatenate(rows), np.concatenate(cols))),
+                                 shape=(size, size))
+
+    def _mix(self, flow, up, h, h_out):
+        """
+        节点比焓：流入管段出口比焓按流量加权；没有流入（只连着停滞管段）的节点取经停滞管段相邻节点的
+        平均值，没有停滞管段时保持原值
+        """
+        n = len(self.node_names)
+        u = self.unknown
+        down = np.where(flow >= 0, self.end, self.start)
+        m = np.abs(flow)
+        stagnant = m < MIN_FLOW
+        m = np.where(stagnant, 0.0, m)
+        # 节点 i：h_i·Σm - Σ m·(h_上游 + Δh) = 0，Δh 为本次计算的管段焓变
+        isolated = np.bincount(down, weights=m, minlength=n) <= 0
+        # 无流入节点 i：(k + ε)·h_i - Σ h_相邻 = ε·h_i(上次)，k 为所连停滞管段数
+        a, b = self.start[stagnant], self.end[stagnant]
+        near, far = np.r_[a, b], np.r_[b, a]
+        keep = isolated[near]
+        near, far = near[keep], far[keep]
+        anchored = np.flatnonzero(isolated)
+        matrix = sparse.csr_matrix(
+            (np.r_[m, -m, np.ones(near.size), -np.ones(far.size), np.full(anchored.size, STAGNANT_ANCHOR)],
+             (np.r_[down, down, near, near, anchored], np.r_[down, up, near, far, anchored])), shape=(n, n))
+        rhs = np.bincount(down, weights=m * (h_out - h[up]), minlength=n)
+        rhs[anchored] = STAGNANT_ANCHOR * h[anchored]
+        rows = matrix[u]
+        mixed = h.copy()
+        mixed[u] = spsolve(rows[:, u].tocsc(), rhs[u] - rows[:, self.source] @ h[self.source])
+        return mixed
+
+    def solve(self):
+        """求解管网稳态，返回 NetworkResult；管段压力耗尽或不收敛时抛出 ValueError"""
+        n = len(self.node_names)
+        u = self.unknown
+        p = np.empty(n)
+        h = np.empty(n)
+        p[self.source] = self.source_p
+        h[self.source] = self.source_h
+        p[u] = self.source_p.min()
+        h[u] = self.source_h.max()
+        flow = self._initial_flow()
+        rtol = RTOL_LOOSE
+        evaluated = self._evaluate(p, h, flow, rtol)
+        if evaluated is None:
+            raise ValueError("按汽源压力估算时已有管段蒸汽压力耗尽，请检查管径和用汽量")
+        mass_scale = max(self.demand.sum(), MIN_FLOW)
+        lu = lu_up = None
+        last_norm = np.inf
+
+        for iteration in range(MAX_ITERATIONS + 1):
+            residual, up, line = evaluated
+            h_new = self._mix(flow, up, h, line.h_out)
+            norm = self._norm(residual, mass_scale)
+            if norm <= 1 and np.max(np.abs(h_new - h)) <= TOL_ENTHALPY and rtol == RTOL:
+                return NetworkResult(self, line, p, h, flow, iteration)
+
+            # 偏导数只在接受的点上求，线搜索的试探点只积分基准通道；上一步已使残差下降一个量级
+            # （或已进入 NORM_ACCEPT 范围）且流向未变时沿用分解好的雅可比矩阵，省去扰动通道的积分
+            # 停滞管段的雅可比元素与流向无关，只比较有流量管段的流向
+            lanes_up = np.where(line.moving, up, -1)
+            if lu is None or norm > max(last_norm / 10, NORM_ACCEPT) or (lanes_up != lu_up).any():
+                d_flow, d_pressure = self._derivatives(p, h, flow, rtol, up, line)
+                lu, lu_up = splu(self._jacobian(flow, d_flow, d_pressure, up)), lanes_up
+            last_norm = norm
+            step = lu.solve(-residual)
+            # 非精确牛顿：远离解时管段积分用较松的容差，接近收敛时收紧到 RTOL
+            line_rtol, rtol = rtol, min(max(RTOL * norm / 10, RTOL), RTOL_LOOSE)
+            # 热启动：上次积分的首步长按容差变化换算（RK23 步长 ∝ rtol^(1/3)）；停滞管段为 NaN，不影响
+            first_step = line.first_step * (rtol / line_rtol) ** (1 / 3)
+            # 阻尼：步长减半直到所有管段可算且残差下降（或已进入 NORM_ACCEPT 范围），
+            # 减到最小步长时接受可算的结果
+            scale = 1.0
+            for halving in range(MAX_HALVINGS + 1):
+                p_trial = p.copy()
+                p_trial[u] = p[u] + scale * step[:u.size]
+                flow_trial = flow + scale * step[u.size:]
+                trial = None
+                if (p_trial[u] > steam_line.P_MIN).all():
+                    trial = self._evaluate(p_trial, h_new, flow_trial, rtol, first_step)
+                if trial is not None and (self._norm(trial[0], mass_scale) < max(norm, NORM_ACCEPT)
+                                          or halving == MAX_HALVINGS):
+                    break
+                scale /= 2
+            if trial is None:
+                raise ValueError("管网求解失败：部分管段压降过大（蒸汽压力耗尽），请检查管径和用汽量")
+            p, h, flow, evaluated = p_trial, h_new, flow_trial, trial
+
+        raise ValueError(f"管网求解在 {MAX_ITERATIONS} 次迭代内未收敛")
+
+    def _norm(self, residual, mass_scale):
+        """按各自容差缩放后的最大残差，不大于 1 即满足收敛判据"""
+        k = self.unknown.size
+        mass = np.max(np.abs(residual[:k]), initial=0.0) / (TOL_MASS * mass_scale)
+        return max(mass, np.max(np.abs(residual[k:]), initial=0.0) / TOL_PRESSURE)
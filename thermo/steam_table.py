@@ -0,0 +1,546 @@
+# CalcE/thermo/steam_table.py
+"""
+水蒸气物性预计算网格（查表 + 双三次插值），用于管网、换热器等需要大量调用物性的扫描计算
+
+- 单相区按压力分为两张网格：汽相侧（T ≥ Ts(p)）和液相侧（T ≤ Ts(p)）。p < 22.064 MPa 时
+  Ts 为饱和温度，超临界压力下沿饱和线在临界点的斜率线性延伸，网格不跨越饱和线。
+- 网格坐标为 (ln p, 相内归一化温度)，温度方向节点按二次分布向分界线加密；存储 ln ρ、h、s、μ、k、cp，
+  逐点双三次（4×4 拉格朗日）插值。
+- 饱和线（两相区的两个端点）单独用一维表，按 ln p 三次插值。
+- 建表时在每个单元内取 3×3 个校核点与 IF97 基本方程比较，记录单元误差上界（乘安全系数）。
+  查表时误差上界超过 TOLERANCE 的单元（临界点附近）和网格外的点（区域 5 等）自动改用精确计算。
+- 网格以 float32 二进制文件缓存在临时目录，通过 numpy.memmap 只读加载，首次使用时自动生成
+  （约 10 s）。界面中切换到查表模式时用 preload() 在后台线程生成，完成前按精确计算；后台生成失败时
+  继续按精确计算，每隔 PRELOAD_RETRY_SECONDS 在后台重试，不在调用线程中建表。
+- (p, h) 查表：先按分界线两侧的网格比焓判断两相区，单相时在网格上沿温度方向反解节点坐标。
+
+计算模式由 set_mode(EXACT / TABLE) 切换，也可在每次调用时用 mode 参数指定；
+props_pt / props_ph / props_px 与 if97 同名函数的输入、单位和返回的 SteamState 一致。
+查表模式不提供 cv 和声速 w（为 NaN）。
+"""
+import os
+import tempfile
+import threading
+import time
+
+import numpy as np
+from loguru import logger
+
+from . import if97
+
+EXACT = "exact"
+TABLE = "table"
+
+# 网格范围与分辨率
+P_LO = 1e-3                 # MPa，低于此压力用精确计算
+P_HI = if97.P_MAX
+NP = 321                    # ln p 方向节点数
+NX = 161                    # 相内温度方向节点数
+NS = 321                    # 饱和线节点数
+GAMMA = 2                   # 温度方向 T - Ts ∝ ξ^GAMMA；取整数保证分界线处插值光滑
+
+# 允许的相对误差（ρ、μ、k、cp 为相对误差；h、s 分别以 10 kJ/kg、0.1 kJ/(kg·K) 为下限归一化）
+TOLERANCE = 1e-4
+SAFETY = 2.0
+FLOAT32_FLOOR = 2e-6        # float32 存储和累加的舍入误差
+
+_PROPS = ("rho", "h", "s", "mu", "k", "cp")
+_FLOORS = np.array([0.0, 10.0, 0.1, 0.0, 0.0, 0.0])
+NPROP = len(_PROPS)
+
+_LN_P_LO = np.log(P_LO)
+_DU = (np.log(P_HI) - _LN_P_LO) / (NP - 1)
+_DU_SAT = (np.log(if97.PC) - _LN_P_LO) / (NS - 1)
+_DX = 1.0 / (NX - 1)
+
+# 饱和温度在临界点的斜率 dT/dp (K/MPa)，用于超临界压力下延伸分界线
+_SLOPE_C = float((if97.TC - if97._tsat(np.float64(if97.PC - 1e-6))) / 1e-6)
+
+# 网格参数或存储格式变化时修改版本号，旧缓存文件自动失效
+_FILE_NAME = f"if97_table_v1_{NP}x{NX}x{NS}.bin"
+_GRID_SIZE = 2 * NPROP * NP * NX
+_BOUND_SIZE = 2 * (NP - 1) * (NX - 1)
+_SAT_SIZE = 2 * NPROP * NS + 2 * (NS - 1)
+
+# 后台加载失败后的重试间隔 (s)
+PRELOAD_RETRY_SECONDS = 60
+
+_mode = EXACT
+_table = None
+_lock = threading.Lock()
+_preload_thread = None
+_preload_failed_at = None   # 最近一次后台加载失败的时刻（time.monotonic）
+
+
+def set_mode(mode):
+    """切换默认计算模式：EXACT（IF97 基本方程）或 TABLE（查表插值）"""
+    global _mode
+    if mode not in (EXACT, TABLE):
+        raise ValueError(f"未知的物性计算模式: {mode}")
+    _mode = mode
+
+
+def get_mode():
+    return _mode
+
+
+# ---------------------------------------------------------------- 坐标变换
+
+def _split_temperature(p):
+    """液相/汽相网格的分界温度 Ts(p)"""
+    low = p < if97.PC
+    return np.where(low, if97._tsat(np.where(low, p, if97.PC)), if97.TC + _SLOPE_C * (p - if97.PC))
+
+
+def _grid_points(u, xi, side):
+    """网格坐标 → (p, T)；side 0 为液相侧（ξ=1 在分界线上），1 为汽相侧（ξ=0 在分界线上）"""
+    p = np.minimum(np.exp(_LN_P_LO + u * _DU), P_HI)
+    ts = _split_temperature(p)
+    if side:
+        return p, ts + xi ** GAMMA * (if97.T25 - ts)
+    return p, ts - (1 - xi) ** GAMMA * (ts - if97.T_MIN)
+
+
+def _xi(T, ts, side):
+    """_grid_points 温度方向的逆变换"""
+    if side:
+        return ((T - ts) / (if97.T25 - ts)) ** (1 / GAMMA)
+    return 1 - ((ts - T) / (ts - if97.T_MIN)) ** (1 / GAMMA)
+
+
+def _cubic_start(position, n):
+    """三次插值模板的起始节点：边界单元使用单侧模板，保证模板始终落在 [0, n-1] 内"""
+    start = np.floor(position).astype(np.intp) - 1
+    return np.minimum(np.maximum(start, 0), n - 4)
+
+
+def _cubic_weights(position, n):
+    """三次拉格朗日插值的起始节点和 4 个权重，position 为浮点节点坐标"""
+    start = _cubic_start(position, n)
+    t = position - start
+    t1, t2, t3 = t - 1, t - 2, t - 3
+    weights = np.empty(t.shape + (4,))
+    weights[..., 0] = -t1 * t2 * t3 / 6
+    weights[..., 1] = t * t2 * t3 / 2
+    weights[..., 2] = -t * t1 * t3 / 2
+    weights[..., 3] = t * t1 * t2 / 6
+    return start, weights
+
+
+def _cubic_slopes(position, n):
+    """_cubic_weights 的 4 个权重对 position 的导数（起始节点相同）"""
+    t = position - _cubic_start(position, n)
+    t1, t2, t3 = t - 1, t - 2, t - 3
+    slopes = np.empty(t.shape + (4,))
+    slopes[..., 0] = -(t2 * t3 + t1 * t3 + t1 * t2) / 6
+    slopes[..., 1] = (t2 * t3 + t * t3 + t * t2) / 2
+    slopes[..., 2] = -(t1 * t3 + t * t3 + t * t1) / 2
+    slopes[..., 3] = (t1 * t2 + t * t2 + t * t1) / 6
+    return slopes
+
+
+# 4×4 模板内各节点相对左下角节点的展平偏移
+_STENCIL = (np.arange(4)[:, None] * NX + np.arange(4)).ravel()
+
+
+def _interp2(grid, iu, wu, ix, wx):
+    """grid: (NP * NX, NPROP)，各节点的物性连续存放，一次 take 取出整个模板；返回 (NPROP, n)"""
+    block = np.take(grid, (iu * NX + ix)[:, None] + _STENCIL, axis=0)
+    weights = (wu[:, :, None] * wx[:, None, :]).reshape(-1, 1, 16).astype(np.float32)
+    return np.matmul(weights, block)[:, 0, :].T.astype(float)
+
+
+def _interp1(line, iu, wu):
+    """line: (NS, NPROP)，返回 (NPROP, n)"""
+    block = np.take(line, iu[:, None] + np.arange(4), axis=0)
+    return np.matmul(wu[:, None, :].astype(np.float32), block)[:, 0, :].T.astype(float)
+
+
+def _to_values(raw):
+    """存储量（ln ρ 等）→ 物性值"""
+    values = np.array(raw, dtype=float)
+    values[0] = np.exp(values[0])
+    return values
+
+
+def _exact_values(p, T):
+    state = if97._state_pt(p, T)
+    return np.stack([state["rho"], state["h"], state["s"],
+                     if97.viscosity(T, state["rho"]), if97.thermal_conductivity(T, state["rho"]),
+                     state["cp"]])
+
+
+def _saturation_values(p):
+    liq, vap = if97._saturation(p, if97._tsat(p))
+    return [np.stack([side["rho"], side["h"], side["s"],
+                      if97.viscosity(side["T"], side["rho"]),
+                      if97.thermal_conductivity(side["T"], side["rho"]), side["cp"]])
+            for side in (liq, vap)]
+
+
+def _stored(values):
+    """物性值 (NPROP, n) → 存储量 (n, NPROP)"""
+    stored = np.array(values, dtype=float)
+    stored[0] = np.log(stored[0])
+    return np.ascontiguousarray(stored.T, dtype=np.float32)
+
+
+def _widen(error):
+    """
+    校核误差 → 单元误差上界：取相邻单元中的最大值再乘安全系数，并不低于 float32 存储精度，
+    避免奇异点（临界点）附近个别单元的校核点恰好漏掉误差峰值
+    """
+    padded = np.pad(error, 1, mode="edge")
+    if error.ndim == 1:
+        near = np.max([padded[i:i + error.shape[0]] for i in range(3)], axis=0)
+    else:
+        near = np.max([padded[i:i + error.shape[0], j:j + error.shape[1]]
+                       for i in range(3) for j in range(3)], axis=0)
+    return np.maximum(near * SAFETY, FLOAT32_FLOOR)
+
+
+def _relative_error(approx, exact):
+    scale = np.maximum(np.abs(exact), _FLOORS.reshape((-1,) + (1,) * (exact.ndim - 1)))
+    error = np.abs(approx - exact) / scale
+    # 任一物性为 NaN（网格外）时该点误差记为 inf
+    return np.where(np.isnan(error).any(axis=0), np.inf, error.max(axis=0))
+
+
+# ---------------------------------------------------------------- 建表
+
+def build(path):
+    """计算网格、饱和线和误差上界并写入 path（先写临时文件再替换，避免留下不完整文件）"""
+    with np.errstate(invalid="ignore", divide="ignore", over="ignore"):
+        u, xi = np.meshgrid(np.arange(NP, dtype=float), np.linspace(0, 1, NX), indexing="ij")
+        grids = np.empty((2, NP * NX, NPROP), dtype=np.float32)
+        bounds = np.empty((2, NP - 1, NX - 1), dtype=np.float32)
+        # 单元内 3×3 个校核点（节点坐标偏移 1/4、1/2、3/4）
+        offsets = np.array([0.25, 0.5, 0.75])
+        cu = (np.arange(NP - 1)[:, None, None, None] + offsets[None, None, :, None])
+        cx = (np.arange(NX - 1)[None, :, None, None] + offsets[None, None, None, :]) * _DX
+        cu, cx = np.broadcast_arrays(cu, cx)
+        cu, cx = cu.ravel(), cx.ravel()
+        for side in (0, 1):
+            p, T = _grid_points(u.ravel(), xi.ravel(), side)
+            values = _exact_values(p, T)
+            if side:
+                # 汽相侧 ξ=0 的节点正好在饱和线上，取饱和蒸汽而非 (p, T) 判为液相的值
+                sat = (p < if97.PC) & (xi.ravel() == 0)
+                values[:, sat] = _saturation_values(p[sat])[1]
+            else:
+                sat = (p < if97.PC) & (xi.ravel() == 1)
+                values[:, sat] = _saturation_values(p[sat])[0]
+            grids[side] = _stored(values)
+
+            iu, wu = _cubic_weights(cu, NP)
+            ix, wx = _cubic_weights(cx / _DX, NX)
+            approx = _to_values(_interp2(grids[side], iu, wu, ix, wx))
+            error = _relative_error(approx, _exact_values(*_grid_points(cu, cx, side)))
+            cell = error.reshape(NP - 1, NX - 1, 9).max(axis=-1)
+            bounds[side] = _widen(cell)
+
+        p_sat = np.exp(_LN_P_LO + np.arange(NS) * _DU_SAT)
+        p_sat[-1] = if97.PC
+        sat_lines = np.stack([_stored(v) for v in _saturation_values(p_sat)])
+        check = (np.arange(NS - 1)[:, None] + offsets).ravel()
+        iu, wu = _cubic_weights(check, NS)
+        sat_bounds = np.stack([
+            _widen(_relative_error(_to_values(_interp1(sat_lines[side], iu, wu)), exact)
+                   .reshape(NS - 1, 3).max(axis=-1))
+            for side, exact in enumerate(_saturation_values(np.exp(_LN_P_LO + check * _DU_SAT)))
+        ]).astype(np.float32)
+
+    data = np.concatenate([grids.ravel(), bounds.ravel(), sat_lines.ravel(), sat_bounds.ravel()])
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data.astype(np.float32).tobytes())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def default_path():
+    return os.path.join(tempfile.gettempdir(), "CalcE", _FILE_NAME)
+
+
+# ---------------------------------------------------------------- 查表
+
+class SteamTable:
+    """以 numpy.memmap 只读加载的物性网格"""
+
+    def __init__(self, path):
+        self.path = path
+        self._memmap = np.memmap(path, dtype=np.float32, mode="r")
+        if self._memmap.size != _GRID_SIZE + _BOUND_SIZE + _SAT_SIZE:
+            raise ValueError(f"物性表文件大小不符: {path}")
+        # 普通 ndarray 视图（不复制数据），避免 memmap 子类在大量索引时的额外开销
+        data = self._memmap.view(np.ndarray)
+        end = _GRID_SIZE
+        self.grids = data[:end].reshape(2, NP * NX, NPROP)
+        self.bounds = data[end:end + _BOUND_SIZE].reshape(2, NP - 1, NX - 1)
+        end += _BOUND_SIZE
+        self.sat_lines = data[end:end + 2 * NPROP * NS].reshape(2, NS, NPROP)
+        self.sat_bounds = data[end + 2 * NPROP * NS:].reshape(2, NS - 1)
+        # (p, h) 反解时只用比焓一列，单独存一份连续的 float64 副本
+        self.enthalpy = self.grids[:, :, 1].astype(float)
+
+    def locate(self, p, T):
+        """各点所在网格侧、坐标和误差上界；不可查表的点误差上界为 inf"""
+        inside = (p >= P_LO) & (p <= P_HI) & (T >= if97.T_MIN) & (T <= if97.T25)
+        p_safe = np.where(inside, p, P_LO)
+        T_safe = np.where(inside, T, if97.T_MIN)
+        ts = _split_temperature(p_safe)
+        # 与 IF97 一致：恰好在饱和线上的点按液相处理（p ≥ psat(T) 为区域 1）
+        side = (T_safe > ts).astype(np.intp)
+        xi = np.where(side, _xi(np.maximum(T_safe, ts), ts, 1), _xi(np.minimum(T_safe, ts), ts, 0))
+        u = np.clip((np.log(p_safe) - _LN_P_LO) / _DU, 0, NP - 1)
+        x = np.clip(xi / _DX, 0, NX - 1)
+        cell_u = np.minimum(u.astype(np.intp), NP - 2)
+        cell_x = np.minimum(x.astype(np.intp), NX - 2)
+        bound = np.where(inside, self.bounds[side, cell_u, cell_x], np.inf)
+        return side, u, x, bound
+
+    def error_bound(self, p, T):
+        """查表结果的相对误差上界，超过 TOLERANCE 的点查表时会改用精确计算"""
+        p, T = np.broadcast_arrays(np.asarray(p, dtype=float), np.asarray(T, dtype=float))
+        with np.errstate(invalid="ignore", divide="ignore"):
+            bound = self.locate(p.ravel(), T.ravel())[3].reshape(p.shape)
+        return if97._scalar(bound.astype(float))
+
+    def state_pt(self, p, T):
+        n = p.size
+        side, u, x, bound = self.locate(p, T)
+        tabulated = bound <= TOLERANCE
+        out = if97._empty(n)
+        out["mu"] = np.full(n, np.nan)
+        out["k"] = np.full(n, np.nan)
+        iu, wu = _cubic_weights(u, NP)
+        ix, wx = _cubic_weights(x, NX)
+        for s in (0, 1):
+            mask = tabulated & (side == s)
+            if mask.any():
+                values = _to_values(_interp2(self.grids[s], iu[mask], wu[mask], ix[mask], wx[mask]))
+                for name, row in zip(_PROPS, values):
+                    out[name][mask] = row
+        exact = ~tabulated
+        if exact.any():
+            state = if97._state_pt(p[exact], T[exact])
+            for name in if97._FIELDS:
+                out[name][exact] = state[name]
+            out["mu"][exact] = if97.viscosity(T[exact], state["rho"])
+            out["k"][exact] = if97.thermal_conductivity(T[exact], state["rho"])
+        out["p"], out["T"] = p.copy(), T.copy()
+        out["region"] = if97.region_pt(p, T)
+        out["u"] = np.where(exact, out["u"], out["h"] - p * 1e3 / out["rho"])
+        out["x"] = if97._single_phase_quality(out)
+        return out
+
+    def _enthalpy(self, side, iu, wu, x):
+        """网格 side 上 (u, x) 处插值的比焓及 dh/dx（x 为温度方向的浮点节点坐标）"""
+        ix, wx = _cubic_weights(x, NX)
+        block = np.take(self.enthalpy[side], (iu * NX + ix)[:, None] + _STENCIL).reshape(-1, 4, 4)
+        along_x = np.einsum("ni,nij->nj", wu, block)
+        return np.einsum("nj,nj->n", wx, along_x), np.einsum("nj,nj->n", _cubic_slopes(x, NX), along_x)
+
+    def _saturated_enthalpy(self, p):
+        """饱和液、饱和汽比焓（P_LO ≤ p < PC），与 state_px 一致：饱和线超差处用精确值"""
+        u = np.clip((np.log(p) - _LN_P_LO) / _DU_SAT, 0, NS - 1)
+        cell = np.minimum(u.astype(np.intp), NS - 2)
+        exact = self.sat_bounds[:, cell].max(axis=0) > TOLERANCE
+        iu, wu = _cubic_weights(u, NS)
+        nodes = iu[:, None] + np.arange(4)
+        h_l, h_v = (np.einsum("ni,ni->n", wu, np.take(self.sat_lines[s][:, 1], nodes)) for s in (0, 1))
+        if exact.any():
+            liq, vap = if97._saturation(p[exact], if97._tsat(p[exact]))
+            h_l[exact], h_v[exact] = liq["h"], vap["h"]
+        return h_l, h_v
+
+    def state_ph(self, p, h):
+        """
+        已知压力和比焓：亚临界时比焓落在饱和液、饱和汽之间为两相区（按干度查饱和线），
+        否则在所在一侧网格上沿温度方向反解节点坐标，再按 state_pt 查表；
+        误差上界超限的单元和网格外的点改用精确计算
+        """
+        n = p.size
+        inside = (p >= P_LO) & (p <= P_HI) & np.isfinite(h)
+        u = np.clip((np.log(np.where(inside, p, P_LO)) - _LN_P_LO) / _DU, 0, NP - 1)
+        iu, wu = _cubic_weights(u, NP)
+        sub = inside & (p < if97.PC)
+        h_l = np.full(n, np.nan)
+        h_v = np.full(n, np.nan)
+        if sub.any():
+            h_l[sub], h_v[sub] = self._saturated_enthalpy(p[sub])
+        two_phase = sub & (h > h_l) & (h < h_v)
+        side = (h >= h_v).astype(np.intp)
+        beyond = inside & ~sub
+        if beyond.any():
+            # 超临界压力：与分界线上的网格比焓比较
+            side[beyond] = h[beyond] >= self._enthalpy(1, iu[beyond], wu[beyond], np.zeros(beyond.sum()))[0]
+        T = np.full(n, np.nan)
+        for s in (0, 1):
+            mask = inside & ~two_phase & (side == s)
+            if not mask.any():
+                continue
+            im, wm, hm = iu[mask], wu[mask], h[mask]
+            # 温度方向两端的网格比焓：液相侧 ξ=0、1 为 T_MIN 和分界线，汽相侧为分界线和 T25
+            lo, hi = (self._enthalpy(s, im, wm, np.full(mask.sum(), x))[0] for x in (0.0, NX - 1.0))
+            # 初值：节点温度按 ξ^GAMMA 向分界线加密，比焓近似随 T 线性变化
+            fraction = np.clip((hm - lo) / (hi - lo), 0.0, 1.0)
+            guess = fraction ** (1 / GAMMA) if s else 1 - (1 - fraction) ** (1 / GAMMA)
+
+            def residual(x, idx, s=s, im=im, wm=wm, hm=hm):
+                value, slope = self._enthalpy(s, im[idx], wm[idx], x)
+                return value - hm[idx], slope
+
+            x = if97._solve_increasing(residual, np.zeros(mask.sum()), np.full(mask.sum(), NX - 1.0),
+                                       guess * (NX - 1), rtol=1e-7)
+            T[mask] = _grid_points(u[mask], x * _DX, s)[1]
+
+        out = if97._empty(n)
+        out["mu"] = np.full(n, np.nan)
+        out["k"] = np.full(n, np.nan)
+        single = np.isfinite(T)
+        tabulated = np.zeros(n, dtype=bool)
+        if single.any():
+            tabulated[single] = self.locate(p[single], T[single])[3] <= TOLERANCE
+        if tabulated.any():
+            state = self.state_pt(p[tabulated], T[tabulated])
+            for name in out:
+                out[name][tabulated] = state[name]
+        if two_phase.any():
+            x = (h[two_phase] - h_l[two_phase]) / (h_v[two_phase] - h_l[two_phase])
+            state = self.state_px(p[two_phase], x)
+            for name in if97._FIELDS:
+                out[name][two_phase] = state[name]
+        exact = ~tabulated & ~two_phase
+        if exact.any():
+            state = if97._state_p_y(p[exact], h[exact], "h")
+            for name in if97._FIELDS:
+                out[name][exact] = state[name]
+        # 精确计算和两相区的点补上输运性质（与 if97.SteamState 的按 (T, ρ) 计算一致）
+        missing = np.isnan(out["mu"]) & np.isfinite(out["rho"])
+        if missing.any():
+            out["mu"][missing] = if97.viscosity(out["T"][missing], out["rho"][missing])
+            out["k"][missing] = if97.thermal_conductivity(out["T"][missing], out["rho"][missing])
+        out["p"] = p.copy()
+        return out
+
+    def state_px(self, p, x):
+        n = p.size
+        inside = (p >= P_LO) & (p <= if97.PC)
+        u = np.clip((np.log(np.where(inside, p, P_LO)) - _LN_P_LO) / _DU_SAT, 0, NS - 1)
+        cell = np.minimum(u.astype(np.intp), NS - 2)
+        tabulated = inside & (self.sat_bounds[:, cell].max(axis=0) <= TOLERANCE)
+        out = if97._empty(n)
+        if tabulated.any():
+            iu, wu = _cubic_weights(u[tabulated], NS)
+            liq, vap = (_to_values(_interp1(self.sat_lines[s], iu, wu)) for s in (0, 1))
+            xt = x[tabulated]
+            xt = np.where((xt >= 0) & (xt <= 1), xt, np.nan)
+            out["rho"][tabulated] = 1.0 / ((1 - xt) / liq[0] + xt / vap[0])
+            out["h"][tabulated] = (1 - xt) * liq[1] + xt * vap[1]
+            out["s"][tabulated] = (1 - xt) * liq[2] + xt * vap[2]
+            out["T"][tabulated] = if97._tsat(p[tabulated])
+            out["x"][tabulated] = xt
+            out["region"][tabulated] = np.where(np.isnan(xt), 0, 4)
+            out["u"] = out["h"] - p * 1e3 / out["rho"]
+        exact = ~tabulated
+        if exact.any():
+            state = if97._state_px(p[exact], x[exact])
+            for name in if97._FIELDS:
+                out[name][exact] = state[name]
+        out["p"] = p.copy()
+        return out
+
+
+def load(path=None):
+    """加载物性表（默认路径下不存在或损坏时自动重新生成），返回 SteamTable"""
+    global _table
+    if path is None and _table is not None:
+        return _table
+    with _lock:
+        if path is None and _table is not None:
+            return _table
+        target = path or default_path()
+        try:
+            table = SteamTable(target)
+        except (OSError, ValueError):
+            logger.info("生成 IF97 物性网格: {}", target)
+            start = time.perf_counter()
+            build(target)
+            table = SteamTable(target)
+            logger.info("IF97 物性网格生成完成，用时 {:.1f} s", time.perf_counter() - start)
+        if path is None:
+            _table = table
+        return table
+
+
+def _preload():
+    global _preload_failed_at
+    try:
+        load()
+        _preload_failed_at = None
+    except Exception as e:
+        _preload_failed_at = time.monotonic()
+        logger.warning("IF97 物性网格加载失败，继续使用精确计算: {}", e)
+
+
+def preload():
+    """在后台线程加载（必要时生成）默认物性表，不阻塞调用线程；已加载或正在加载时直接返回"""
+    global _preload_thread
+    with _lock:
+        if _table is not None or (_preload_thread is not None and _preload_thread.is_alive()):
+            return
+        _preload_thread = threading.Thread(target=_preload, name="steam-table", daemon=True)
+        _preload_thread.start()
+
+
+def _active_table(mode):
+    """mode 对应的物性表；精确模式或后台加载尚未完成（或失败）时返回 None"""
+    mode = mode or _mode
+    if mode not in (EXACT, TABLE):
+        raise ValueError(f"未知的物性计算模式: {mode}")
+    if mode != TABLE:
+        return None
+    # 后台加载尚未完成或已失败时按精确计算，不在调用线程（可能是界面线程）中建表；
+    # 失败后隔 PRELOAD_RETRY_SECONDS 在后台重试
+    if _table is None and _preload_thread is not None:
+        if (not _preload_thread.is_alive() and _preload_failed_at is not None
+                and time.monotonic() - _preload_failed_at >= PRELOAD_RETRY_SECONDS):
+            preload()
+        return None
+    return load()
+
+
+def props_pt(p, T, mode=None):
+    """已知压力 (MPa) 和温度 (K)；mode 为 None 时使用 set_mode 设置的默认模式"""
+    table = _active_table(mode)
+    if table is None:
+        return if97.props_pt(p, T)
+    return if97._evaluate(table.state_pt, p, T)
+
+
+def props_ph(p, h, mode=None):
+    """已知压力 (MPa) 和比焓 (kJ/kg)"""
+    table = _active_table(mode)
+    if table is None:
+        return if97.props_ph(p, h)
+    return if97._evaluate(table.state_ph, p, h)
+
+
+def props_px(p, x, mode=None):
+    """已知饱和压力 (MPa) 和干度"""
+    table = _active_table(mode)
+    if table is None:
+        return if97.props_px(p, x)
+    return if97._evaluate(table.state_px, p, x)
+
+
+def error_bound(p, T):
+    """查表模式下各点的相对误差上界（改用精确计算的点为 inf）"""
+    return load().error_bound(p, T)